@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Trace store microbenchmark: traces/sec before and after the write-behind
+rework.
+
+"before" replays the previous implementation — a fresh ``sqlite3.connect``
+plus one INSERT and commit per trace, under a global lock, on the caller's
+thread. "after" uses the current :class:`TraceStore` (persistent WAL
+connection, queued ``executemany`` batches) and reports both the caller-side
+rate (what the request path pays) and the end-to-end rate including the
+final flush.
+
+Usage:
+    python scripts/bench_traces.py
+    python scripts/bench_traces.py --count 20000 --threads 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Ensure the project root is on sys.path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from ollabridge.tracing.store import _COLUMNS, _SCHEMA, TraceRecord, TraceStore
+
+
+def _legacy_store(path: Path):
+    lock = threading.Lock()
+    with sqlite3.connect(path) as conn:
+        conn.executescript(_SCHEMA)
+    placeholders = ", ".join("?" for _ in _COLUMNS)
+    sql = f"INSERT OR REPLACE INTO traces ({', '.join(_COLUMNS)}) VALUES ({placeholders})"
+
+    def record(trace: TraceRecord) -> None:
+        values = trace.model_dump()
+        with lock, sqlite3.connect(path, timeout=5) as conn:
+            conn.execute(sql, [values[c] for c in _COLUMNS])
+
+    return record
+
+
+def _run(record, traces: list[TraceRecord], threads: int) -> float:
+    chunks = [traces[i::threads] for i in range(threads)]
+
+    def worker(chunk: list[TraceRecord]) -> None:
+        for t in chunk:
+            record(t)
+
+    started = time.perf_counter()
+    pool = [threading.Thread(target=worker, args=(c,)) for c in chunks]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    traces = [
+        TraceRecord(requested_model="bench", provider="ollama-local", latency_ms=i)
+        for i in range(args.count)
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before = _run(_legacy_store(Path(tmp) / "legacy.db"), traces, args.threads)
+
+        store = TraceStore(Path(tmp) / "traces.db")
+        enqueue = _run(store.record, traces, args.threads)
+        flush_started = time.perf_counter()
+        store.flush(timeout=120)
+        end_to_end = enqueue + (time.perf_counter() - flush_started)
+        store.close()
+        stored = sqlite3.connect(store.path).execute(
+            "SELECT COUNT(*) FROM traces"
+        ).fetchone()[0]
+
+    print(f"traces: {args.count}  threads: {args.threads}")
+    print(f"before  (connect per trace):   {args.count / before:>10,.0f} traces/s")
+    print(f"after   (caller enqueue):      {args.count / enqueue:>10,.0f} traces/s")
+    print(f"after   (enqueue + flush):     {args.count / end_to_end:>10,.0f} traces/s")
+    print(f"stored {stored} rows; dropped {args.count - stored}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,8 @@ Wraps the Ollama HTTP API the catalog cares about:
 - ``POST /api/show``   — per-model details (template, parameters, families)
 - ``POST /api/chat``   — 1-token probe used by the per-model health check
 - ``POST /api/pull``   — streaming model download (admin "Pull Model")
+- ``GET  /api/ps``     — models loaded in memory (warm pool, routing)
+- ``POST /api/generate`` without a prompt — load / keep alive / unload
 
 The client is intentionally narrow: it only owns the runtime conversation,
 not the orchestration logic. Caller code (parser, sync, health) consumes
@@ -25,6 +27,8 @@ from typing import Any, AsyncIterator, Optional
 
 import httpx
 
+from ollabridge.core.http_pool import http_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,11 +48,19 @@ class LocalRuntimeClient:
 
     # ── HTTP helper ─────────────────────────────────────────
 
-    def _http(self, *, timeout: Optional[float] = None) -> httpx.AsyncClient:
-        return httpx.AsyncClient(
-            base_url=self.base_url,
-            timeout=timeout if timeout is not None else self.timeout,
-            headers={"Accept": "application/json"},
+    def _request_kwargs(self, timeout: Optional[float]) -> dict[str, Any]:
+        return {
+            "timeout": timeout if timeout is not None else self.timeout,
+            "headers": {"Accept": "application/json"},
+        }
+
+    async def _request(
+        self, method: str, path: str, *, timeout: Optional[float] = None, **kwargs: Any
+    ) -> httpx.Response:
+        # Shared keep-alive pool: the scheduler and health checker hit the
+        # same runtime every few seconds.
+        return await http_client(self.base_url).request(
+            method, f"{self.base_url}{path}", **self._request_kwargs(timeout), **kwargs
         )
 
     # ── Discovery ───────────────────────────────────────────
@@ -56,10 +68,9 @@ class LocalRuntimeClient:
     async def list_tags(self) -> list[dict[str, Any]]:
         """Return the raw entries from ``/api/tags`` (``models`` array)."""
         try:
-            async with self._http() as client:
-                resp = await client.get("/api/tags")
-                resp.raise_for_status()
-                data = resp.json()
+            resp = await self._request("GET", "/api/tags")
+            resp.raise_for_status()
+            data = resp.json()
         except httpx.HTTPError as exc:
             logger.warning("local runtime /api/tags failed: %s", exc)
             return []
@@ -72,11 +83,10 @@ class LocalRuntimeClient:
     async def show(self, model: str) -> dict[str, Any]:
         """Fetch ``/api/show`` details for one model. Empty dict on failure."""
         try:
-            async with self._http() as client:
-                resp = await client.post("/api/show", json={"name": model})
-                resp.raise_for_status()
-                data = resp.json()
-                return data if isinstance(data, dict) else {}
+            resp = await self._request("POST", "/api/show", json={"name": model})
+            resp.raise_for_status()
+            data = resp.json()
+            return data if isinstance(data, dict) else {}
         except httpx.HTTPError as exc:
             logger.debug("local runtime /api/show(%s) failed: %s", model, exc)
             return {}
@@ -84,12 +94,44 @@ class LocalRuntimeClient:
     async def ping(self) -> bool:
         """Cheapest reachability check — used by node health card."""
         try:
-            async with self._http(timeout=5.0) as client:
-                resp = await client.get("/api/tags")
-                return resp.status_code < 500
+            resp = await self._request("GET", "/api/tags", timeout=5.0)
+            return resp.status_code < 500
         except httpx.HTTPError:
             return False
 
+    # ── Resident models (warm pool) ─────────────────────────
+
+    async def list_running(self) -> Optional[list[dict[str, Any]]]:
+        """Return the raw ``/api/ps`` entries; None if the runtime is unreachable."""
+        try:
+            resp = await self._request("GET", "/api/ps", timeout=5.0)
+            resp.raise_for_status()
+            data = resp.json()
+        except (httpx.HTTPError, ValueError) as exc:
+            logger.debug("local runtime /api/ps failed: %s", exc)
+            return None
+
+        models = data.get("models") if isinstance(data, dict) else None
+        return models if isinstance(models, list) else []
+
+    async def keep_alive(self, model: str, keep_alive: float) -> bool:
+        """Load *model* (if needed) and keep it for *keep_alive* seconds.
+
+        ``keep_alive=0`` unloads it. Loading a large model can take a while,
+        hence the long timeout.
+        """
+        try:
+            resp = await self._request(
+                "POST",
+                "/api/generate",
+                timeout=300.0,
+                json={"model": model, "keep_alive": keep_alive},
+            )
+            return resp.status_code < 400
+        except httpx.HTTPError as exc:
+            logger.warning("local runtime keep_alive(%s) failed: %s", model, exc)
+            return False
+
     # ── Health probe (1-token chat) ─────────────────────────
 
     async def probe_chat(self, model: str) -> tuple[bool, Optional[str], Optional[float]]:
@@ -106,8 +148,7 @@ class LocalRuntimeClient:
         }
         started = time.monotonic()
         try:
-            async with self._http(timeout=15.0) as client:
-                resp = await client.post("/api/chat", json=payload)
+            resp = await self._request("POST", "/api/chat", timeout=15.0, json=payload)
         except httpx.HTTPError as exc:
             return False, exc.__class__.__name__, None
         latency_ms = (time.monotonic() - started) * 1000.0
@@ -129,19 +170,20 @@ class LocalRuntimeClient:
         and the stream terminates with ``{"status": "success"}``. Errors
         are forwarded as ``{"status": "error", "error": "..."}``.
         """
-        url = "/api/pull"
+        url = f"{self.base_url}/api/pull"
         body = {"name": model, "stream": True}
         try:
-            async with self._http(timeout=self.pull_timeout) as client:
-                async with client.stream("POST", url, json=body) as resp:
-                    resp.raise_for_status()
-                    async for line in resp.aiter_lines():
-                        if not line:
-                            continue
-                        try:
-                            yield json.loads(line)
-                        except json.JSONDecodeError:
-                            continue
+            async with http_client(url).stream(
+                "POST", url, json=body, **self._request_kwargs(self.pull_timeout)
+            ) as resp:
+                resp.raise_for_status()
+                async for line in resp.aiter_lines():
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
         except httpx.HTTPError as exc:
             yield {"status": "error", "error": str(exc)}
 
@@ -150,9 +192,10 @@ class LocalRuntimeClient:
     async def delete(self, model: str) -> bool:
         """Run ``ollama rm <model>`` via the HTTP API. Returns success bool."""
         try:
-            async with self._http(timeout=30.0) as client:
-                resp = await client.request("DELETE", "/api/delete", json={"name": model})
-                return resp.status_code < 400
+            resp = await self._request(
+                "DELETE", "/api/delete", timeout=30.0, json={"name": model}
+            )
+            return resp.status_code < 400
         except httpx.HTTPError as exc:
             logger.warning("local runtime /api/delete(%s) failed: %s", model, exc)
             return False
@@ -0,0 +1,315 @@
+"""
+Resident-model polling and warm-pool management for Ollama runtimes.
+
+Every ``interval_s`` seconds the manager asks each Ollama node which models
+it has loaded in memory (``/api/ps``; relay nodes answer through their
+agent's ``ps`` op) and records them on the node in the registry, where the
+router uses them to prefer nodes that hold the model already.
+
+Nodes whose :class:`WarmPoolPolicy` is enabled are also managed:
+
+- the pool — the catalog's top models for the node plus any pinned in the
+  policy — is loaded, and its keep-alive refreshed before it runs out or
+  after a request reset it to the runtime default;
+- when the loaded models take more than the node's memory budget, models
+  outside the pool that have been idle for ``idle_s`` are unloaded, least
+  recently used first.
+
+Errors are logged and swallowed — the next tick retries. Direct endpoints
+are OpenAI-compatible servers without ``/api/ps`` and are left alone.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, fields, replace
+from typing import Any, Callable, Mapping, Optional, Protocol
+
+from ollabridge.addons.local_catalog.client import LocalRuntimeClient
+from ollabridge.addons.local_catalog.repository import LocalCatalogRepository
+from ollabridge.core.registry import RuntimeNodeState, RuntimeRegistry, model_key
+
+logger = logging.getLogger(__name__)
+
+_GB = 1024**3
+
+
+class _Runtime(Protocol):
+    async def list_running(self) -> Optional[list[dict[str, Any]]]: ...
+
+    async def keep_alive(self, model: str, keep_alive: float) -> bool: ...
+
+
+class _RelayRuntime:
+    """The same two calls, sent to a relay node's agent."""
+
+    def __init__(self, hub: Any, node_id: str) -> None:
+        self.hub = hub
+        self.node_id = node_id
+
+    async def list_running(self) -> Optional[list[dict[str, Any]]]:
+        try:
+            frame = await self.hub.request(self.node_id, "ps", {}, timeout_s=10)
+        except Exception as exc:
+            logger.debug("relay ps failed for node=%s: %s", self.node_id, exc)
+            return None
+        if not frame.get("ok", True):
+            return None
+        return (frame.get("data") or {}).get("models") or []
+
+    async def keep_alive(self, model: str, keep_alive: float) -> bool:
+        try:
+            frame = await self.hub.request(
+                self.node_id,
+                "keep_alive",
+                {"model": model, "keep_alive": keep_alive},
+                timeout_s=300,
+            )
+        except Exception as exc:
+            logger.warning("relay keep_alive(%s) failed for node=%s: %s", model, self.node_id, exc)
+            return False
+        return bool(frame.get("ok", True))
+
+
+@dataclass(frozen=True)
+class WarmPoolPolicy:
+    """Warm-pool settings for one node."""
+
+    enabled: bool = False
+    top: int = 2  # catalog top models to keep loaded
+    models: tuple[str, ...] = ()  # always kept loaded, ahead of the top models
+    keep_alive: float = 1800.0  # seconds
+    idle_s: float = 600.0
+    vram_budget_gb: float = 0.0  # 0 = never unload
+
+    def merged(self, overrides: Mapping[str, Any]) -> "WarmPoolPolicy":
+        known = {f.name for f in fields(self)}
+        unknown = sorted(set(overrides) - known)
+        if unknown:
+            logger.warning("ignoring unknown warm pool settings: %s", ", ".join(unknown))
+        values = {k: v for k, v in overrides.items() if k in known}
+        if isinstance(values.get("models"), str):
+            values["models"] = [m.strip() for m in values["models"].split(",")]
+        if "models" in values:
+            values["models"] = tuple(m for m in values["models"] if m)
+        return replace(self, **values)
+
+
+def _name(entry: Mapping[str, Any]) -> str:
+    return str(entry.get("name") or entry.get("model") or "")
+
+
+def _vram(entry: Mapping[str, Any]) -> int:
+    return int(entry.get("size_vram") or entry.get("size") or 0)
+
+
+class WarmPoolManager:
+    def __init__(
+        self,
+        registry: RuntimeRegistry,
+        *,
+        relay_hub: Any = None,
+        catalog: Callable[[], Optional[LocalCatalogRepository]] = lambda: None,
+        defaults: WarmPoolPolicy = WarmPoolPolicy(),
+        overrides: Mapping[str, Mapping[str, Any]] | None = None,
+        interval_s: float = 15.0,
+        initial_delay_s: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.registry = registry
+        self.relay_hub = relay_hub
+        self.catalog = catalog
+        self.defaults = defaults
+        self.interval_s = interval_s
+        self.initial_delay_s = initial_delay_s
+        self._clock = clock
+        self._policies = {
+            node_id: defaults.merged(values) for node_id, values in (overrides or {}).items()
+        }
+        self._clients: dict[str, LocalRuntimeClient] = {}
+        self._used: dict[tuple[str, str], float] = {}
+        self._refreshed: dict[tuple[str, str], float] = {}
+        self._vram: dict[str, int] = {}
+        self.polls = 0
+        self.poll_errors = 0
+        self.loads = 0
+        self.unloads = 0
+        self._task: asyncio.Task | None = None
+        self._stop = asyncio.Event()
+
+    def policy_for(self, node_id: str) -> WarmPoolPolicy:
+        return self._policies.get(node_id, self.defaults)
+
+    def note_use(self, node_id: str, model: str) -> None:
+        """Record that a request for *model* was sent to *node_id*."""
+        self._used[(node_id, model_key(model))] = self._clock()
+
+    # ── Lifecycle ───────────────────────────────────────────
+
+    async def start(self) -> None:
+        if self._task and not self._task.done():
+            return
+        self._stop.clear()
+        self._task = asyncio.create_task(self._run(), name="warm-pool")
+        logger.info(
+            "warm pool started (interval=%.0fs, pool=%s)",
+            self.interval_s,
+            "on" if any(p.enabled for p in (self.defaults, *self._policies.values())) else "off",
+        )
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task:
+            try:
+                await asyncio.wait_for(self._task, timeout=5.0)
+            except asyncio.TimeoutError:
+                self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=self.initial_delay_s)
+            return
+        except asyncio.TimeoutError:
+            pass
+
+        while not self._stop.is_set():
+            await self.tick()
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=self.interval_s)
+                return
+            except asyncio.TimeoutError:
+                continue
+
+    # ── One pass ────────────────────────────────────────────
+
+    async def tick(self) -> None:
+        """Poll every reachable Ollama node once and apply its policy."""
+        jobs = []
+        for node in self.registry.snapshot().healthy():
+            runtime = self._runtime(node)
+            if runtime is not None:
+                jobs.append(self._tick_node(node, runtime))
+        for result in await asyncio.gather(*jobs, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error("warm pool tick raised", exc_info=result)
+
+    def _runtime(self, node: RuntimeNodeState) -> Optional[_Runtime]:
+        if node.connector == "local_ollama" and node.endpoint:
+            client = self._clients.get(node.endpoint)
+            if client is None:
+                client = self._clients[node.endpoint] = LocalRuntimeClient(node.endpoint)
+            return client
+        if (
+            node.connector == "relay_link"
+            and self.relay_hub is not None
+            and "resident" in ((node.meta or {}).get("capabilities") or [])
+        ):
+            return _RelayRuntime(self.relay_hub, node.node_id)
+        return None
+
+    async def _tick_node(self, node: RuntimeNodeState, runtime: _Runtime) -> None:
+        running = await runtime.list_running()
+        self.polls += 1
+        if running is None:
+            self.poll_errors += 1
+            return
+        loaded = {model_key(_name(e)): e for e in running if _name(e)}
+        await self.registry.set_resident(node.node_id, [_name(e) for e in loaded.values()])
+        self._vram[node.node_id] = sum(_vram(e) for e in loaded.values())
+
+        policy = self.policy_for(node.node_id)
+        if not policy.enabled:
+            return
+        pool = self._pool(node.node_id, policy)
+        # Make room first, so the pool's loads fit in the budget.
+        if policy.vram_budget_gb > 0:
+            await self._evict(node.node_id, runtime, policy, loaded, pool)
+        await self._warm(node.node_id, runtime, policy, loaded, pool)
+
+    def _pool(self, node_id: str, policy: WarmPoolPolicy) -> list[str]:
+        names = list(policy.models)
+        repo = self.catalog()
+        if repo is not None and policy.top > 0:
+            names += [m.external_model_id for m in repo.list_top(node_id)[: policy.top]]
+        out: dict[str, str] = {}
+        for name in names:
+            out.setdefault(model_key(name), name)
+        return list(out.values())
+
+    async def _warm(
+        self,
+        node_id: str,
+        runtime: _Runtime,
+        policy: WarmPoolPolicy,
+        loaded: Mapping[str, Any],
+        pool: list[str],
+    ) -> None:
+        now = self._clock()
+        for model in pool:
+            slot = (node_id, model_key(model))
+            refreshed = self._refreshed.get(slot)
+            if (
+                slot[1] in loaded
+                and refreshed is not None
+                and now - refreshed < policy.keep_alive / 2
+                # A request sets the runtime's default keep-alive again.
+                and self._used.get(slot, float("-inf")) <= refreshed
+            ):
+                continue
+            if await runtime.keep_alive(model, policy.keep_alive):
+                self._refreshed[slot] = now
+                if slot[1] not in loaded:
+                    self.loads += 1
+                    logger.info("warm pool loaded %s on node=%s", model, node_id)
+
+    async def _evict(
+        self,
+        node_id: str,
+        runtime: _Runtime,
+        policy: WarmPoolPolicy,
+        loaded: dict[str, Any],
+        pool: list[str],
+    ) -> None:
+        budget = policy.vram_budget_gb * _GB
+        used = sum(_vram(e) for e in loaded.values())
+        if used <= budget:
+            return
+        now = self._clock()
+        keep = {model_key(m) for m in pool}
+        last_use = {key: self._used.get((node_id, key), float("-inf")) for key in loaded}
+        idle = sorted(
+            (used_at, key)
+            for key, used_at in last_use.items()
+            if key not in keep and now - used_at >= policy.idle_s
+        )
+        for _, key in idle:
+            if used <= budget:
+                break
+            entry = loaded[key]
+            if await runtime.keep_alive(_name(entry), 0):
+                used -= _vram(entry)
+                del loaded[key]
+                self._refreshed.pop((node_id, key), None)
+                self.unloads += 1
+                logger.info("warm pool unloaded %s on node=%s (idle)", key, node_id)
+
+    def stats(self) -> dict[str, Any]:
+        nodes = self.registry.snapshot().by_id
+        return {
+            "polls": self.polls,
+            "poll_errors": self.poll_errors,
+            "loads": self.loads,
+            "unloads": self.unloads,
+            "nodes": {
+                node_id: {
+                    "resident": list(nodes[node_id].resident),
+                    "vram_bytes": vram,
+                    "pool": self.policy_for(node_id).enabled,
+                }
+                for node_id, vram in sorted(self._vram.items())
+                if node_id in nodes
+            },
+        }
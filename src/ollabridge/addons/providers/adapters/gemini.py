@@ -10,9 +10,8 @@ from __future__ import annotations
 import logging
 from typing import Any
 
-import httpx
-
 from ollabridge.addons.providers.base import BaseProviderAdapter
+from ollabridge.core.http_pool import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -81,33 +80,34 @@ class GeminiAdapter(BaseProviderAdapter):
         if generation_config:
             payload["generationConfig"] = generation_config
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            resp = await client.post(
-                self._chat_url(model),
-                json=payload,
-                headers={"Content-Type": "application/json"},
-            )
-            resp.raise_for_status()
-            return self._from_gemini_response(resp.json(), model)
+        url = self._chat_url(model)
+        resp = await http_client(url).post(
+            url,
+            json=payload,
+            headers={"Content-Type": "application/json"},
+            timeout=self.timeout,
+        )
+        resp.raise_for_status()
+        return self._from_gemini_response(resp.json(), model)
 
     async def health_check(self) -> bool:
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                resp = await client.get(self._models_url())
-                return resp.status_code == 200
+            url = self._models_url()
+            resp = await http_client(url).get(url, timeout=10.0)
+            return resp.status_code == 200
         except Exception:
             return False
 
     async def list_models(self) -> list[dict]:
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.get(self._models_url())
-                resp.raise_for_status()
-                data = resp.json()
-                return [
-                    {"id": m.get("name", "").replace("models/", ""), "object": "model"}
-                    for m in data.get("models", [])
-                ]
+            url = self._models_url()
+            resp = await http_client(url).get(url, timeout=15.0)
+            resp.raise_for_status()
+            data = resp.json()
+            return [
+                {"id": m.get("name", "").replace("models/", ""), "object": "model"}
+                for m in data.get("models", [])
+            ]
         except Exception as exc:
             logger.warning("Gemini list_models failed: %s", exc)
             return []
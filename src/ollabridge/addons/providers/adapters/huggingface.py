@@ -28,7 +28,7 @@ Free-credit safety:
 from __future__ import annotations
 
 import logging
-from typing import Any
+from typing import Any, AsyncIterator
 
 import httpx
 
@@ -40,6 +40,8 @@ from ollabridge.addons.providers.errors import (
     ProviderTimeout,
     ProviderUnavailable,
 )
+from ollabridge.core.http_pool import http_client
+from ollabridge.core.streaming import iter_openai_deltas
 
 logger = logging.getLogger(__name__)
 
@@ -143,27 +145,34 @@ class HuggingFaceAdapter(BaseProviderAdapter):
 
     # ── Public surface ──────────────────────────────────────
 
-    async def chat(self, model: str, messages: list[dict], **kwargs: Any) -> dict:
-        """Send an OpenAI-compatible chat completion through HF's router.
-
-        ``model`` accepts either a bare model id (``deepseek-ai/DeepSeek-V3``)
-        or a pinned model:provider pair (``deepseek-ai/DeepSeek-V3:together``).
-        Multimodal messages with ``image_url`` content parts are forwarded
-        unchanged — HF's router supports them on VLM models.
-        """
+    @staticmethod
+    def _chat_payload(
+        model: str, messages: list[dict], *, stream: bool, **kwargs: Any
+    ) -> dict[str, Any]:
         payload: dict[str, Any] = {
             "model": model,
             "messages": messages,
-            "stream": False,
+            "stream": stream,
         }
         for key in _PASSTHROUGH_PARAMS:
             if kwargs.get(key) is not None:
                 payload[key] = kwargs[key]
+        return payload
 
+    async def chat(self, model: str, messages: list[dict], **kwargs: Any) -> dict:
+        """Send an OpenAI-compatible chat completion through HF's router.
+
+        ``model`` accepts either a bare model id (``deepseek-ai/DeepSeek-V3``)
+        or a pinned model:provider pair (``deepseek-ai/DeepSeek-V3:together``).
+        Multimodal messages with ``image_url`` content parts are forwarded
+        unchanged — HF's router supports them on VLM models.
+        """
+        payload = self._chat_payload(model, messages, stream=False, **kwargs)
         url = f"{self._api_base()}/chat/completions"
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(url, headers=self._headers(), json=payload)
+            response = await http_client(url).post(
+                url, headers=self._headers(), json=payload, timeout=self.timeout
+            )
         except httpx.TimeoutException as exc:
             raise ProviderTimeout(f"Hugging Face request timed out: {exc}") from exc
         except httpx.HTTPError as exc:
@@ -172,6 +181,31 @@ class HuggingFaceAdapter(BaseProviderAdapter):
         self._raise_for_status(response)
         return response.json()
 
+    async def chat_stream(
+        self, model: str, messages: list[dict], **kwargs: Any
+    ) -> AsyncIterator[str]:
+        """Stream an OpenAI-compatible chat completion through HF's router.
+
+        Status errors map to the same structured exceptions as :meth:`chat`
+        and are raised before the first fragment, so the router can still
+        fail over.
+        """
+        payload = self._chat_payload(model, messages, stream=True, **kwargs)
+        url = f"{self._api_base()}/chat/completions"
+        try:
+            async with http_client(url).stream(
+                "POST", url, headers=self._headers(), json=payload, timeout=self.timeout
+            ) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                self._raise_for_status(response)
+                async for chunk in iter_openai_deltas(response):
+                    yield chunk
+        except httpx.TimeoutException as exc:
+            raise ProviderTimeout(f"Hugging Face request timed out: {exc}") from exc
+        except httpx.HTTPError as exc:
+            raise ProviderUnavailable(f"Hugging Face network error: {exc}") from exc
+
     async def list_models(self) -> list[dict]:
         """List models currently served by HF Inference Providers.
 
@@ -181,8 +215,7 @@ class HuggingFaceAdapter(BaseProviderAdapter):
         """
         url = f"{self._api_base()}/models"
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, headers=self._headers())
+            response = await http_client(url).get(url, headers=self._headers(), timeout=30.0)
         except httpx.HTTPError as exc:
             raise ProviderUnavailable(f"Hugging Face network error: {exc}") from exc
 
@@ -193,11 +226,9 @@ class HuggingFaceAdapter(BaseProviderAdapter):
     async def health_check(self) -> bool:
         """Cheap reachability probe against ``/v1/models``."""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    f"{self._api_base()}/models", headers=self._headers()
-                )
-                # 401/403 still means HF is reachable — we just don't have a token.
-                return response.status_code < 500
+            url = f"{self._api_base()}/models"
+            response = await http_client(url).get(url, headers=self._headers(), timeout=10.0)
+            # 401/403 still means HF is reachable — we just don't have a token.
+            return response.status_code < 500
         except Exception:
             return False
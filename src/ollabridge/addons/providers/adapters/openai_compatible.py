@@ -8,11 +8,11 @@ This is the base for Groq, DeepSeek, OpenRouter, and similar APIs.
 from __future__ import annotations
 
 import logging
-from typing import Any
-
-import httpx
+from typing import Any, AsyncIterator
 
 from ollabridge.addons.providers.base import BaseProviderAdapter
+from ollabridge.core.http_pool import http_client
+from ollabridge.core.streaming import iter_openai_deltas
 
 logger = logging.getLogger(__name__)
 
@@ -32,37 +32,58 @@ class OpenAICompatibleAdapter(BaseProviderAdapter):
     def _models_url(self) -> str:
         return f"{self.base_url}/v1/models"
 
-    async def chat(self, model: str, messages: list[dict], **kwargs: Any) -> dict:
+    def _chat_payload(
+        self, model: str, messages: list[dict], *, stream: bool, **kwargs: Any
+    ) -> dict[str, Any]:
         payload: dict[str, Any] = {
             "model": model,
             "messages": messages,
-            "stream": False,
+            "stream": stream,
         }
         if kwargs.get("temperature") is not None:
             payload["temperature"] = kwargs["temperature"]
         if kwargs.get("max_tokens") is not None:
             payload["max_tokens"] = kwargs["max_tokens"]
+        return payload
+
+    async def chat(self, model: str, messages: list[dict], **kwargs: Any) -> dict:
+        payload = self._chat_payload(model, messages, stream=False, **kwargs)
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            resp = await client.post(self._chat_url(), json=payload, headers=self._headers())
+        url = self._chat_url()
+        resp = await http_client(url).post(
+            url, json=payload, headers=self._headers(), timeout=self.timeout
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    async def chat_stream(
+        self, model: str, messages: list[dict], **kwargs: Any
+    ) -> AsyncIterator[str]:
+        payload = self._chat_payload(model, messages, stream=True, **kwargs)
+
+        url = self._chat_url()
+        async with http_client(url).stream(
+            "POST", url, json=payload, headers=self._headers(), timeout=self.timeout
+        ) as resp:
             resp.raise_for_status()
-            return resp.json()
+            async for chunk in iter_openai_deltas(resp):
+                yield chunk
 
     async def health_check(self) -> bool:
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                resp = await client.get(self._models_url(), headers=self._headers())
-                return resp.status_code == 200
+            url = self._models_url()
+            resp = await http_client(url).get(url, headers=self._headers(), timeout=10.0)
+            return resp.status_code == 200
         except Exception:
             return False
 
     async def list_models(self) -> list[dict]:
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.get(self._models_url(), headers=self._headers())
-                resp.raise_for_status()
-                data = resp.json()
-                return data.get("data", [])
+            url = self._models_url()
+            resp = await http_client(url).get(url, headers=self._headers(), timeout=15.0)
+            resp.raise_for_status()
+            data = resp.json()
+            return data.get("data", [])
         except Exception as exc:
             logger.warning("Failed to list models: %s", exc)
             return []
@@ -8,7 +8,7 @@ can talk to any backend uniformly.
 from __future__ import annotations
 
 import abc
-from typing import Any
+from typing import Any, AsyncIterator
 
 
 class BaseProviderAdapter(abc.ABC):
@@ -48,6 +48,23 @@ class BaseProviderAdapter(abc.ABC):
             }
         """
 
+    async def chat_stream(
+        self, model: str, messages: list[dict], **kwargs: Any
+    ) -> AsyncIterator[str]:
+        """
+        Stream assistant content fragments.
+
+        Default implementation performs a buffered :meth:`chat` and yields
+        the whole reply once; adapters with a native SSE transport override it.
+        """
+        result = await self.chat(model, messages, **kwargs)
+        choices = result.get("choices") or []
+        content = ""
+        if choices and isinstance(choices[0], dict):
+            content = (choices[0].get("message") or {}).get("content") or ""
+        if content:
+            yield str(content)
+
     async def health_check(self) -> bool:
         """
         Quick connectivity check.
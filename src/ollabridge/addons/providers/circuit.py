@@ -0,0 +1,98 @@
+"""
+Per-provider circuit breaker.
+
+closed ──(N failures within window)──▶ open ──(cooldown)──▶ half-open
+  ▲                                      ▲                     │
+  └────────────── probe succeeds ────────┴── probe fails ──────┘
+
+While open the router skips the provider without an upstream round-trip.
+Half-open admits exactly one probe — a health check or a real request —
+whose outcome closes or re-opens the circuit. A probe that never reports
+back (e.g. a cancelled hedge) releases its slot after ``probe_timeout_s``.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Any, Callable
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        window_s: float = 60.0,
+        cooldown_s: float = 30.0,
+        probe_timeout_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.window_s = window_s
+        self.cooldown_s = cooldown_s
+        self.probe_timeout_s = probe_timeout_s
+        self._clock = clock
+        self._failures: deque[float] = deque()
+        self._open = False
+        self._open_until = 0.0
+        self._probe_until = 0.0
+        self.opened_count = 0
+
+    @property
+    def state(self) -> str:
+        if not self._open:
+            return CLOSED
+        return HALF_OPEN if self._clock() >= self._open_until else OPEN
+
+    def available(self) -> bool:
+        """O(1), side-effect free: could a call be admitted right now?"""
+        if not self._open:
+            return True
+        now = self._clock()
+        return now >= self._open_until and now >= self._probe_until
+
+    def try_acquire(self) -> bool:
+        """Admit a call; in half-open this claims the single probe slot."""
+        if not self._open:
+            return True
+        if not self.available():
+            return False
+        self._probe_until = self._clock() + self.probe_timeout_s
+        return True
+
+    def record_success(self) -> None:
+        self._failures.clear()
+        self._open = False
+        self._probe_until = 0.0
+
+    def record_failure(self) -> None:
+        now = self._clock()
+        if self._open:
+            # A failed probe (or a straggler) keeps the circuit open.
+            self._trip(now)
+            return
+        self._failures.append(now)
+        while self._failures and now - self._failures[0] > self.window_s:
+            self._failures.popleft()
+        if len(self._failures) >= self.failure_threshold:
+            self._trip(now)
+
+    def _trip(self, now: float) -> None:
+        if not self._open:
+            self.opened_count += 1
+        self._open = True
+        self._open_until = now + self.cooldown_s
+        self._probe_until = 0.0
+        self._failures.clear()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "state": self.state,
+            "recent_failures": len(self._failures),
+            "opened_count": self.opened_count,
+        }
@@ -2,12 +2,23 @@
 Provider health checking.
 
 Runs periodic or on-demand health probes against registered providers.
+Probes feed each provider's circuit breaker: an open circuit is left alone
+until its cooldown ends, then exactly one probe decides whether it closes.
+
+Environment (scheduler):
+
+- ``OBRIDGE_PROVIDER_HEALTH_ENABLED``     (default ``true``)
+- ``OBRIDGE_PROVIDER_HEALTH_INTERVAL_S``  (default ``30``)
+- ``OBRIDGE_PROVIDER_HEALTH_INITIAL_S``   (default ``10``)
+- ``OBRIDGE_PROVIDER_HEALTH_CONCURRENCY`` (default ``8``)
 """
 
 from __future__ import annotations
 
+import asyncio
 import datetime as dt
 import logging
+import os
 
 from ollabridge.addons.providers.models import HealthStatus
 from ollabridge.addons.providers.registry import ProviderRegistry
@@ -15,13 +26,35 @@ from ollabridge.addons.providers.registry import ProviderRegistry
 logger = logging.getLogger(__name__)
 
 
+def _envint(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _envbool(name: str, default: bool) -> bool:
+    val = os.environ.get(name)
+    if val is None:
+        return default
+    return val.strip().lower() in {"1", "true", "yes", "on"}
+
+
 async def check_provider_health(registry: ProviderRegistry, provider_id: str) -> HealthStatus:
-    """Run a health check on a single provider and update its state."""
+    """Run a health check on a single provider and update its state.
+
+    A provider whose circuit is open (still cooling down, or another probe
+    is already in flight) is not contacted; its current status is returned.
+    """
     adapter = registry.get_adapter(provider_id)
     state = registry.get_state(provider_id)
     if not adapter or not state:
         return HealthStatus.UNKNOWN
 
+    breaker = registry.get_breaker(provider_id)
+    if breaker is not None and not breaker.try_acquire():
+        return state.health
+
     try:
         ok = await adapter.health_check()
         new_status = HealthStatus.HEALTHY if ok else HealthStatus.DOWN
@@ -29,15 +62,104 @@ async def check_provider_health(registry: ProviderRegistry, provider_id: str) ->
         logger.warning("Health check failed for %s: %s", provider_id, exc)
         new_status = HealthStatus.DOWN
 
+    if breaker is not None:
+        if new_status == HealthStatus.HEALTHY:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+
     state.last_check = dt.datetime.now(dt.timezone.utc)
     await registry.update_health(provider_id, new_status)
     return new_status
 
 
-async def check_all_health(registry: ProviderRegistry) -> dict[str, HealthStatus]:
-    """Run health checks on all enabled providers. Returns {id: status}."""
-    results: dict[str, HealthStatus] = {}
+async def check_all_health(
+    registry: ProviderRegistry,
+    *,
+    concurrency: int = 8,
+    skip_keyless: bool = False,
+) -> dict[str, HealthStatus]:
+    """Run health checks on all enabled providers concurrently. Returns {id: status}.
+
+    ``skip_keyless`` leaves out providers without a usable credential —
+    the router never sends them traffic, so probing them is only noise.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _one(provider_id: str) -> HealthStatus:
+        async with semaphore:
+            return await check_provider_health(registry, provider_id)
+
+    ids = []
     for config in registry.list_enabled():
-        status = await check_provider_health(registry, config.id)
-        results[config.id] = status
-    return results
+        adapter = registry.get_adapter(config.id)
+        if skip_keyless and adapter is not None and not getattr(adapter, "has_credential", True):
+            continue
+        ids.append(config.id)
+
+    statuses = await asyncio.gather(*(_one(pid) for pid in ids))
+    return dict(zip(ids, statuses))
+
+
+class ProviderHealthScheduler:
+    """Background task probing every provider each ``interval_s`` seconds."""
+
+    def __init__(
+        self,
+        registry: ProviderRegistry,
+        *,
+        interval_s: int | None = None,
+        initial_delay_s: int | None = None,
+        concurrency: int | None = None,
+        enabled: bool | None = None,
+    ) -> None:
+        self.registry = registry
+        self.interval_s = interval_s if interval_s is not None else _envint("OBRIDGE_PROVIDER_HEALTH_INTERVAL_S", 30)
+        self.initial_delay_s = initial_delay_s if initial_delay_s is not None else _envint("OBRIDGE_PROVIDER_HEALTH_INITIAL_S", 10)
+        self.concurrency = concurrency if concurrency is not None else _envint("OBRIDGE_PROVIDER_HEALTH_CONCURRENCY", 8)
+        self.enabled = enabled if enabled is not None else _envbool("OBRIDGE_PROVIDER_HEALTH_ENABLED", True)
+        self._task: asyncio.Task | None = None
+        self._stop = asyncio.Event()
+
+    async def start(self) -> None:
+        if not self.enabled:
+            logger.info("provider health scheduler disabled")
+            return
+        if self._task and not self._task.done():
+            return
+        self._stop.clear()
+        self._task = asyncio.create_task(self._run(), name="provider-health")
+        logger.info(
+            "provider health scheduler started (interval=%ds, initial=%ds, concurrency=%d)",
+            self.interval_s, self.initial_delay_s, self.concurrency,
+        )
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task:
+            try:
+                await asyncio.wait_for(self._task, timeout=5.0)
+            except asyncio.TimeoutError:
+                self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=self.initial_delay_s)
+            return
+        except asyncio.TimeoutError:
+            pass
+
+        while not self._stop.is_set():
+            try:
+                await check_all_health(
+                    self.registry, concurrency=self.concurrency, skip_keyless=True
+                )
+            except Exception:
+                logger.exception("scheduled provider health check raised")
+
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=self.interval_s)
+                return
+            except asyncio.TimeoutError:
+                continue
@@ -39,6 +39,7 @@ from ollabridge.addons.providers.errors import (
     ProviderTimeout,
     ProviderUnavailable,
 )
+from ollabridge.core.http_pool import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -149,8 +150,9 @@ class HFMediaService:
         headers = {"Content-Type": "application/json", **_auth_headers(self.api_key, self.bill_to)}
 
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.post(url, headers=headers, json=payload)
+            response = await http_client(url).post(
+                url, headers=headers, json=payload, timeout=timeout
+            )
         except httpx.TimeoutException as exc:
             raise ProviderTimeout(f"HF image gen timed out: {exc}") from exc
         except httpx.HTTPError as exc:
@@ -203,8 +205,9 @@ class HFMediaService:
         headers = {"Content-Type": "application/json", **_auth_headers(self.api_key, self.bill_to)}
 
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.post(url, headers=headers, json=payload)
+            response = await http_client(url).post(
+                url, headers=headers, json=payload, timeout=timeout
+            )
         except httpx.TimeoutException as exc:
             raise ProviderTimeout(f"HF video gen timed out: {exc}") from exc
         except httpx.HTTPError as exc:
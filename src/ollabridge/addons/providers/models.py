@@ -109,3 +109,19 @@ class RouteResult(BaseModel):
     model: str
     score: float = 0.0
     reason: str = ""
+
+
+class HedgePolicy(BaseModel):
+    """Hedging for one alias: race the next candidate if the first is slow."""
+
+    delay_ms: Optional[float] = None    # None = primary's observed p95
+    default_delay_ms: float = 2000.0    # until the primary has latency samples
+    min_delay_ms: float = 100.0
+
+
+class HedgingConfig(BaseModel):
+    """The optional ``hedging:`` section of model_aliases.yaml."""
+
+    budget: float = 0.05                # share of routed requests that may hedge
+    burst: int = 10
+    aliases: dict[str, HedgePolicy] = Field(default_factory=dict)
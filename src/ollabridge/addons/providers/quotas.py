@@ -46,6 +46,7 @@ def reset_monthly_quotas(registry: ProviderRegistry) -> int:
         # Restore health if it was quota-exhausted
         if state.health == HealthStatus.QUOTA_EXHAUSTED:
             state.health = HealthStatus.UNKNOWN
+        registry.invalidate(config.id)
         count += 1
     logger.info("Reset monthly quotas for %d providers", count)
     return count
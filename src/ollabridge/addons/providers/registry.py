@@ -2,6 +2,11 @@
 Provider registry — holds all provider configs and runtime state.
 
 Thread-safe (uses asyncio lock) for concurrent request handling.
+
+``version`` is bumped whenever the routable set can change (register,
+toggle, alias reload, health change) and each provider has a state stamp
+bumped on every state update, so the router can cache resolutions and
+rescore only the providers that changed.
 """
 
 from __future__ import annotations
@@ -13,10 +18,13 @@ from typing import Optional
 from ollabridge.addons.providers.models import (
     AliasCandidate,
     HealthStatus,
+    HedgePolicy,
+    HedgingConfig,
     ProviderConfig,
     ProviderState,
 )
 from ollabridge.addons.providers.base import BaseProviderAdapter
+from ollabridge.addons.providers.circuit import CircuitBreaker
 
 logger = logging.getLogger(__name__)
 
@@ -24,12 +32,27 @@ logger = logging.getLogger(__name__)
 class ProviderRegistry:
     """In-memory registry of providers, their state, and adapters."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = 5,
+        failure_window_s: float = 60.0,
+        cooldown_s: float = 30.0,
+    ) -> None:
         self._lock = asyncio.Lock()
         self._configs: dict[str, ProviderConfig] = {}
         self._states: dict[str, ProviderState] = {}
         self._adapters: dict[str, BaseProviderAdapter] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._version = 0
+        self._stamps: dict[str, int] = {}
+        self._breaker_args = {
+            "failure_threshold": failure_threshold,
+            "window_s": failure_window_s,
+            "cooldown_s": cooldown_s,
+        }
         self._aliases: dict[str, list[AliasCandidate]] = {}
+        self._hedging = HedgingConfig()
 
     # ── Registration ────────────────────────────────────────
 
@@ -39,6 +62,9 @@ class ProviderRegistry:
             self._adapters[config.id] = adapter
             if config.id not in self._states:
                 self._states[config.id] = ProviderState(provider_id=config.id)
+            if config.id not in self._breakers:
+                self._breakers[config.id] = CircuitBreaker(**self._breaker_args)
+            self._changed(config.id, routing=True)
             logger.info("Registered provider: %s (%s)", config.id, config.kind)
 
     async def unregister(self, provider_id: str) -> None:
@@ -46,11 +72,15 @@ class ProviderRegistry:
             self._configs.pop(provider_id, None)
             self._states.pop(provider_id, None)
             self._adapters.pop(provider_id, None)
+            self._breakers.pop(provider_id, None)
+            self._stamps.pop(provider_id, None)
+            self._version += 1
 
     # ── Aliases ─────────────────────────────────────────────
 
     def set_aliases(self, aliases: dict[str, list[AliasCandidate]]) -> None:
         self._aliases = aliases
+        self._version += 1
 
     def resolve_alias(self, alias: str) -> list[AliasCandidate] | None:
         return self._aliases.get(alias)
@@ -62,6 +92,18 @@ class ProviderRegistry:
     def aliases(self) -> dict[str, list[AliasCandidate]]:
         return dict(self._aliases)
 
+    # ── Hedging ─────────────────────────────────────────────
+
+    def set_hedging(self, hedging: HedgingConfig) -> None:
+        self._hedging = hedging
+
+    def hedge_policy(self, alias: str) -> HedgePolicy | None:
+        return self._hedging.aliases.get(alias)
+
+    @property
+    def hedging(self) -> HedgingConfig:
+        return self._hedging
+
     # ── Lookups ─────────────────────────────────────────────
 
     def get_config(self, provider_id: str) -> Optional[ProviderConfig]:
@@ -73,25 +115,57 @@ class ProviderRegistry:
     def get_adapter(self, provider_id: str) -> Optional[BaseProviderAdapter]:
         return self._adapters.get(provider_id)
 
+    def get_breaker(self, provider_id: str) -> Optional[CircuitBreaker]:
+        return self._breakers.get(provider_id)
+
     def list_providers(self) -> list[ProviderConfig]:
         return list(self._configs.values())
 
     def list_enabled(self) -> list[ProviderConfig]:
         return [c for c in self._configs.values() if c.enabled]
 
+    # ── Versioning ──────────────────────────────────────────
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def state_stamp(self, provider_id: str) -> int:
+        return self._stamps.get(provider_id, 0)
+
+    def _changed(self, provider_id: str, *, routing: bool = False) -> None:
+        self._stamps[provider_id] = self._stamps.get(provider_id, 0) + 1
+        if routing:
+            self._version += 1
+
+    def invalidate(self, provider_id: str) -> None:
+        """Mark *provider_id* changed after its state was edited in place."""
+        self._changed(provider_id, routing=True)
+
     # ── State updates ───────────────────────────────────────
 
+    def set_enabled(self, provider_id: str, enabled: bool) -> bool:
+        config = self._configs.get(provider_id)
+        if not config:
+            return False
+        if config.enabled != enabled:
+            config.enabled = enabled
+            self._changed(provider_id, routing=True)
+        return True
+
     async def update_health(self, provider_id: str, health: HealthStatus, error: str | None = None) -> None:
         async with self._lock:
             state = self._states.get(provider_id)
             if not state:
                 return
+            changed = state.health != health
             state.health = health
             state.last_error = error
             if health == HealthStatus.HEALTHY:
                 state.consecutive_failures = 0
             else:
                 state.consecutive_failures += 1
+            self._changed(provider_id, routing=changed)
 
     async def record_request(
         self, provider_id: str, latency_ms: float, tokens: int = 0, success: bool = True
@@ -100,6 +174,13 @@ class ProviderRegistry:
             state = self._states.get(provider_id)
             if not state:
                 return
+            health_before = state.health
+            breaker = self._breakers.get(provider_id)
+            if breaker is not None:
+                if success:
+                    breaker.record_success()
+                else:
+                    breaker.record_failure()
             state.request_count += 1
             state.monthly_requests_used += 1
             state.monthly_tokens_used += tokens
@@ -122,6 +203,8 @@ class ProviderRegistry:
             if state.is_quota_exhausted:
                 state.health = HealthStatus.QUOTA_EXHAUSTED
 
+            self._changed(provider_id, routing=state.health != health_before)
+
     @property
     def provider_count(self) -> int:
         return len(self._configs)
@@ -6,42 +6,93 @@ Supports:
 - Concrete model routing (finds providers that serve the requested model)
 - Score-based ranking with health, latency, tier, and quota awareness
 - Automatic failover to next-best candidate
+- Optional request hedging per alias, capped by a traffic budget
+- Request deadlines: candidates expected to miss them are skipped
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
-from typing import Any
+from typing import Any, AsyncIterator
 
 from ollabridge.addons.providers.errors import (
     ProviderAuthError,
     ProviderBadRequest,
-    ProviderError,
     ProviderQuotaExceeded,
 )
+from ollabridge.addons.providers.base import BaseProviderAdapter
 from ollabridge.addons.providers.models import (
     HealthStatus,
+    HedgePolicy,
     ProviderConfig,
     RouteResult,
 )
 from ollabridge.addons.providers.registry import ProviderRegistry
 from ollabridge.addons.providers.scoring import compute_score
+from ollabridge.core.deadline import Deadline, DeadlineExceeded
+from ollabridge.core.latency import LatencyTracker
 
 logger = logging.getLogger(__name__)
 
+# Bare model names come straight from clients; bound the resolution cache.
+_RESOLVE_CACHE_SIZE = 1024
+
+
+class HedgeBudget:
+    """Token bucket capping hedges at a share of routed traffic.
+
+    Every request on a hedged alias earns ``budget`` tokens (capped at
+    ``burst``) and firing a hedge spends one, so over time at most that
+    fraction of requests is duplicated. Starts with one token. Each alias
+    has its own bucket, so a busy alias cannot spend a quiet one's hedges.
+    """
+
+    def __init__(self) -> None:
+        self.tokens = 1.0
+        self.requests = 0
+        self.hedges = 0
+        self.wins = 0
+
+    def earn(self, budget: float, burst: int) -> None:
+        self.requests += 1
+        self.tokens = min(max(1.0, float(burst)), self.tokens + max(0.0, budget))
+
+    def try_spend(self) -> bool:
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        self.hedges += 1
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.wins,
+            "tokens": round(self.tokens, 3),
+        }
+
 
 class ProviderRouter:
     """Routes chat requests to the best available provider."""
 
     def __init__(self, registry: ProviderRegistry) -> None:
         self.registry = registry
+        self.latency = LatencyTracker()
+        self.hedge_budgets: dict[str, HedgeBudget] = {}
+        # model/alias -> (registry version, [(config, model)]) before
+        # availability filtering; provider id -> (state stamp, score).
+        self._resolved: dict[str, tuple[int, list[tuple[ProviderConfig, str]]]] = {}
+        self._scores: dict[str, tuple[int, float]] = {}
 
     def _is_available(self, config: ProviderConfig) -> bool:
         """Check if a provider can actually serve a request.
 
-        A provider is unavailable if disabled, in a terminal health state, or
-        — crucially — has no usable credential. Attempting a keyless external
+        A provider is unavailable if disabled, in a terminal health state,
+        behind an open circuit breaker, or — crucially — has no usable
+        credential. Attempting a keyless external
         provider only produces 401/403 noise and a wasted round-trip, so we
         skip it here instead of failing over from it.
         """
@@ -56,6 +107,9 @@ class ProviderRouter:
             HealthStatus.QUOTA_EXHAUSTED,
         ):
             return False
+        breaker = self.registry.get_breaker(config.id)
+        if breaker is not None and not breaker.available():
+            return False
         adapter = self.registry.get_adapter(config.id)
         if adapter is not None and not getattr(adapter, "has_credential", True):
             logger.debug(
@@ -66,16 +120,29 @@ class ProviderRouter:
             return False
         return True
 
+    def _score(self, config: ProviderConfig) -> float | None:
+        """Score *config*, reusing the last score while its state is unchanged."""
+        state = self.registry.get_state(config.id)
+        if not state:
+            return None
+        stamp = self.registry.state_stamp(config.id)
+        cached = self._scores.get(config.id)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        score = compute_score(config, state)
+        self._scores[config.id] = (stamp, score)
+        return score
+
     def _rank_candidates(
         self, candidates: list[tuple[ProviderConfig, str]]
     ) -> list[RouteResult]:
         """Score and rank a list of (config, model) candidates."""
         scored: list[RouteResult] = []
         for config, model in candidates:
-            state = self.registry.get_state(config.id)
-            if not state:
+            score = self._score(config)
+            if score is None:
                 continue
-            score = compute_score(config, state)
+            state = self.registry.get_state(config.id)
             scored.append(
                 RouteResult(
                     provider_id=config.id,
@@ -88,6 +155,46 @@ class ProviderRouter:
         scored.sort(key=lambda r: r.score, reverse=True)
         return scored
 
+    def _match(self, model_or_alias: str) -> list[tuple[ProviderConfig, str]]:
+        """(config, model) pairs that could serve *model_or_alias*.
+
+        Cached until the registry version changes. Availability (health,
+        circuit, credential) is deliberately not part of the cached answer —
+        it is checked in O(1) per candidate on every :meth:`resolve`.
+        """
+        version = self.registry.version
+        hit = self._resolved.get(model_or_alias)
+        if hit is not None and hit[0] == version:
+            return hit[1]
+
+        pairs: list[tuple[ProviderConfig, str]] = []
+        # 1. Check if it's an alias
+        alias_candidates = self.registry.resolve_alias(model_or_alias)
+        if alias_candidates:
+            for ac in alias_candidates:
+                config = self.registry.get_config(ac.provider)
+                if config:
+                    pairs.append((config, ac.model))
+        else:
+            # 2. Not an alias. Only offer the concrete model to a provider
+            #    that plausibly serves it — i.e. the model id namespaces to
+            #    the provider (e.g. "openai/...", "google/...") or the
+            #    provider id / kind is named in the model string. We do NOT
+            #    fan a bare model name out to every provider: an Ollama-style
+            #    local model such as "granite3.2:latest" would otherwise be
+            #    sent to Gemini/Groq/etc., producing 401/403/404 noise before
+            #    the gateway falls back to the local runtime. When nothing
+            #    matches we return no candidates so the gateway uses its own
+            #    local/relay routing.
+            for config in self.registry.list_providers():
+                if self._provider_serves_model(config, model_or_alias):
+                    pairs.append((config, model_or_alias))
+
+        if len(self._resolved) >= _RESOLVE_CACHE_SIZE:
+            self._resolved.clear()
+        self._resolved[model_or_alias] = (version, pairs)
+        return pairs
+
     def resolve(self, model_or_alias: str) -> list[RouteResult]:
         """
         Resolve a model name or alias to a ranked list of routing candidates.
@@ -98,33 +205,48 @@ class ProviderRouter:
 
         Returns a list of RouteResult sorted by score (best first).
         """
-        # 1. Check if it's an alias
-        alias_candidates = self.registry.resolve_alias(model_or_alias)
-        if alias_candidates:
-            candidates: list[tuple[ProviderConfig, str]] = []
-            for ac in alias_candidates:
-                config = self.registry.get_config(ac.provider)
-                if config and self._is_available(config):
-                    candidates.append((config, ac.model))
-            return self._rank_candidates(candidates)
-
-        # 2. Not an alias. Only offer the concrete model to a provider that
-        #    plausibly serves it — i.e. the model id namespaces to the
-        #    provider (e.g. "openai/...", "google/...") or the provider id /
-        #    kind is named in the model string. We do NOT fan a bare model
-        #    name out to every provider: an Ollama-style local model such as
-        #    "granite3.2:latest" would otherwise be sent to Gemini/Groq/etc.,
-        #    producing 401/403/404 noise before the gateway falls back to the
-        #    local runtime. When nothing matches we return no candidates so
-        #    the gateway uses its own local/relay routing.
-        candidates = []
-        for config in self.registry.list_enabled():
-            if self._is_available(config) and self._provider_serves_model(
-                config, model_or_alias
-            ):
-                candidates.append((config, model_or_alias))
+        candidates = [
+            (config, model)
+            for config, model in self._match(model_or_alias)
+            if self._is_available(config)
+        ]
         return self._rank_candidates(candidates)
 
+    def resolve_targets(
+        self,
+        targets: list[tuple[str, str]],
+        *,
+        max_latency_ms: float | None = None,
+    ) -> list[RouteResult]:
+        """Candidates for explicit ``(provider_id, model)`` targets, in order.
+
+        Used for routing policies, whose preference order wins over scores.
+        Unavailable providers are dropped, and so are targets whose observed
+        p95 exceeds ``max_latency_ms`` (unmeasured targets stay).
+        """
+        routes: list[RouteResult] = []
+        for provider_id, model in targets:
+            config = self.registry.get_config(provider_id)
+            if not config or not self._is_available(config):
+                continue
+            if max_latency_ms is not None:
+                p95 = self.latency.p95(provider_id, model)
+                if p95 is not None and p95 > max_latency_ms:
+                    continue
+            score = self._score(config)
+            if score is None:
+                continue
+            routes.append(
+                RouteResult(
+                    provider_id=provider_id,
+                    provider_config=config,
+                    model=model,
+                    score=score,
+                    reason="policy",
+                )
+            )
+        return routes
+
     @staticmethod
     def _provider_serves_model(config: ProviderConfig, model: str) -> bool:
         """Heuristic: does this provider plausibly serve *model*?
@@ -149,10 +271,125 @@ class ProviderRouter:
             return True
         return False
 
+    async def _record_failure(
+        self, route: RouteResult, exc: Exception, latency_ms: float
+    ) -> None:
+        """Book-keep a failed attempt so the next candidate can be tried."""
+        if isinstance(exc, ProviderQuotaExceeded):
+            await self.registry.record_request(
+                route.provider_id, latency_ms=latency_ms, success=False
+            )
+            await self.registry.update_health(
+                route.provider_id,
+                HealthStatus.QUOTA_EXHAUSTED,
+                error=str(exc),
+            )
+            logger.warning(
+                "Provider %s quota exhausted (%.0fms): %s — failing over",
+                route.provider_id,
+                latency_ms,
+                exc,
+            )
+        elif isinstance(exc, ProviderAuthError):
+            # Wrong/missing credentials: failing over to the same provider
+            # via another model won't help. Skip remaining routes on this
+            # provider but keep trying others.
+            await self.registry.record_request(
+                route.provider_id, latency_ms=latency_ms, success=False
+            )
+            logger.warning(
+                "Provider %s auth error (%.0fms): %s — skipping provider",
+                route.provider_id,
+                latency_ms,
+                exc,
+            )
+        elif isinstance(exc, ProviderBadRequest):
+            # 4xx that isn't auth/quota — usually a model-specific issue.
+            # Move on to next route without penalising provider health.
+            await self.registry.record_request(
+                route.provider_id, latency_ms=latency_ms, success=True
+            )
+            logger.warning(
+                "Provider %s rejected request for model %s (%.0fms): %s",
+                route.provider_id,
+                route.model,
+                latency_ms,
+                exc,
+            )
+        else:
+            await self.registry.record_request(
+                route.provider_id, latency_ms=latency_ms, success=False
+            )
+            logger.warning(
+                "Provider %s failed (%.0fms): %s — trying next candidate",
+                route.provider_id,
+                latency_ms,
+                exc,
+            )
+
+    async def _record_success(
+        self, route: RouteResult, result: dict, latency_ms: float
+    ) -> None:
+        # Extract token usage for quota tracking
+        usage = result.get("usage", {})
+        total_tokens = usage.get("total_tokens", 0)
+        await self.registry.record_request(
+            route.provider_id,
+            latency_ms=latency_ms,
+            tokens=total_tokens,
+            success=True,
+        )
+        self.latency.observe(route.provider_id, route.model, total_ms=latency_ms)
+
+        logger.info(
+            "Provider %s responded in %.0fms (tokens=%d)",
+            route.provider_id,
+            latency_ms,
+            total_tokens,
+        )
+
+    def hedge_stats(self) -> dict[str, dict[str, Any]]:
+        """Hedge counters per alias."""
+        return {alias: budget.stats() for alias, budget in sorted(self.hedge_budgets.items())}
+
+    def _claim(self, route: RouteResult) -> bool:
+        """Admit an attempt on *route*; a half-open circuit admits one probe."""
+        breaker = self.registry.get_breaker(route.provider_id)
+        return breaker is None or breaker.try_acquire()
+
+    def _hedge_delay(self, policy: HedgePolicy, route: RouteResult) -> float:
+        """Seconds to wait on *route* before racing the next candidate."""
+        delay_ms = policy.delay_ms
+        if delay_ms is None:
+            delay_ms = self.latency.p95(route.provider_id, route.model)
+        if delay_ms is None:
+            delay_ms = policy.default_delay_ms
+        return max(policy.min_delay_ms, delay_ms) / 1000.0
+
+    def _fits(self, route: RouteResult, deadline: Deadline | None) -> bool:
+        """Can *route* be expected to answer before *deadline*?"""
+        if deadline is None:
+            return True
+        expected = self.latency.estimate(route.provider_id, route.model)
+        if deadline.allows(expected):
+            return True
+        logger.info(
+            "Skipping %s (model=%s): expected %.0fms, %.0fms left",
+            route.provider_id,
+            route.model,
+            expected,
+            deadline.remaining_ms(),
+        )
+        return False
+
     async def route_chat(
         self,
         model_or_alias: str,
         messages: list[dict],
+        *,
+        candidates: list[RouteResult] | None = None,
+        attribution: dict[str, Any] | None = None,
+        deadline: Deadline | None = None,
         **kwargs: Any,
     ) -> dict:
         """
@@ -161,112 +398,239 @@ class ProviderRouter:
         Tries candidates in score order. On failure, moves to the next.
         Returns the first successful OpenAI-compatible response dict.
         Raises RuntimeError if all candidates fail.
+
+        If the alias has a hedge policy and the current attempt has not
+        answered within the hedge delay (fixed, or the candidate's p95),
+        the next candidate is started too — at most once per request and
+        only while the hedge budget allows. The first answer wins and the
+        other call is cancelled. ``attribution``, when given, is filled
+        with the serving ``provider``/``model`` and ``hedged``/``hedge_won``.
+
+        Pass ``candidates`` from an earlier :meth:`resolve` to skip resolving
+        the same request twice.
+
+        With a ``deadline``, candidates whose expected latency exceeds the
+        time left are skipped, and :class:`DeadlineExceeded` is raised (the
+        call in flight cancelled) once it passes.
         """
-        candidates = self.resolve(model_or_alias)
+        if candidates is None:
+            candidates = self.resolve(model_or_alias)
         if not candidates:
             raise RuntimeError(
                 f"No available provider for model/alias '{model_or_alias}'. "
                 "Check provider health and quotas."
             )
 
-        last_error: Exception | None = None
+        routes: list[tuple[RouteResult, BaseProviderAdapter]] = []
         for route in candidates:
             adapter = self.registry.get_adapter(route.provider_id)
-            if not adapter:
-                continue
+            if adapter:
+                routes.append((route, adapter))
 
-            start = time.monotonic()
-            try:
-                logger.info(
-                    "Routing to %s (model=%s score=%.3f)",
-                    route.provider_id,
-                    route.model,
-                    route.score,
-                )
-                result = await adapter.chat(route.model, messages, **kwargs)
-                latency_ms = (time.monotonic() - start) * 1000
+        policy = self.registry.hedge_policy(model_or_alias)
+        if policy is not None:
+            hedging = self.registry.hedging
+            budget = self.hedge_budgets.get(model_or_alias)
+            if budget is None:
+                budget = self.hedge_budgets[model_or_alias] = HedgeBudget()
+            budget.earn(hedging.budget, hedging.burst)
 
-                # Extract token usage for quota tracking
-                usage = result.get("usage", {})
-                total_tokens = usage.get("total_tokens", 0)
-                await self.registry.record_request(
-                    route.provider_id,
-                    latency_ms=latency_ms,
-                    tokens=total_tokens,
-                    success=True,
-                )
+        pending: dict[asyncio.Task, tuple[RouteResult, float, bool]] = {}
+        next_index = 0
+        hedge_at: float | None = None
+        hedged = False
+        skipped_late = False
 
-                logger.info(
-                    "Provider %s responded in %.0fms (tokens=%d)",
-                    route.provider_id,
-                    latency_ms,
-                    total_tokens,
-                )
-                return result
+        def launch(is_hedge: bool) -> bool:
+            nonlocal next_index, hedge_at, skipped_late
+            while next_index < len(routes):
+                route, adapter = routes[next_index]
+                next_index += 1
+                if not self._fits(route, deadline):
+                    skipped_late = True
+                    continue
+                if self._claim(route):
+                    break
+            else:
+                return False
+            logger.info(
+                "%s %s (model=%s score=%.3f)",
+                "Hedging to" if is_hedge else "Routing to",
+                route.provider_id,
+                route.model,
+                route.score,
+            )
+            task = asyncio.ensure_future(adapter.chat(route.model, messages, **kwargs))
+            pending[task] = (route, time.monotonic(), is_hedge)
+            if policy is not None and not hedged and not is_hedge:
+                hedge_at = time.monotonic() + self._hedge_delay(policy, route)
+            return True
 
-            except ProviderQuotaExceeded as exc:
-                latency_ms = (time.monotonic() - start) * 1000
-                await self.registry.record_request(
-                    route.provider_id, latency_ms=latency_ms, success=False
-                )
-                await self.registry.update_health(
-                    route.provider_id,
-                    HealthStatus.QUOTA_EXHAUSTED,
-                    error=str(exc),
-                )
-                logger.warning(
-                    "Provider %s quota exhausted (%.0fms): %s — failing over",
-                    route.provider_id,
-                    latency_ms,
-                    exc,
-                )
-                last_error = exc
+        last_error: Exception | None = None
+        try:
+            while pending or next_index < len(routes):
+                if deadline is not None:
+                    deadline.check()
+                if not pending and not launch(is_hedge=False):
+                    break
 
-            except ProviderAuthError as exc:
-                # Wrong/missing credentials: failing over to the same provider
-                # via another model won't help. Skip remaining routes on this
-                # provider but keep trying others.
-                latency_ms = (time.monotonic() - start) * 1000
-                await self.registry.record_request(
-                    route.provider_id, latency_ms=latency_ms, success=False
-                )
-                logger.warning(
-                    "Provider %s auth error (%.0fms): %s — skipping provider",
-                    route.provider_id,
-                    latency_ms,
-                    exc,
+                timeout = None
+                if hedge_at is not None and not hedged and next_index < len(routes):
+                    timeout = max(0.0, hedge_at - time.monotonic())
+                out_of_time = False
+                if deadline is not None:
+                    left = deadline.remaining()
+                    if timeout is None or left <= timeout:
+                        timeout, out_of_time = left, True
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
                 )
-                last_error = exc
+                if not done:
+                    if out_of_time:
+                        raise DeadlineExceeded(
+                            f"No provider answered '{model_or_alias}' within the deadline"
+                        )
+                    hedge_at = None  # one hedge per attempt; over budget, wait it out
+                    if budget.try_spend():
+                        hedged = launch(is_hedge=True)
+                    continue
+
+                for task in done:
+                    route, start, is_hedge = pending.pop(task)
+                    latency_ms = (time.monotonic() - start) * 1000
+                    exc = task.exception()
+                    if exc is not None:
+                        await self._record_failure(route, exc, latency_ms)
+                        last_error = exc
+                        continue
+
+                    result = task.result()
+                    await self._record_success(route, result, latency_ms)
+                    if is_hedge:
+                        budget.wins += 1
+                    if attribution is not None:
+                        attribution.update(
+                            provider=route.provider_id,
+                            model=route.model,
+                            hedged=hedged,
+                            hedge_won=is_hedge,
+                        )
+                    return result
+        finally:
+            # The loser of a hedge race (or everything, if our caller was
+            # cancelled) is abandoned; that is not the provider's fault.
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        if skipped_late and last_error is None:
+            raise DeadlineExceeded(
+                f"No provider for '{model_or_alias}' can answer within the deadline"
+            )
+        raise RuntimeError(
+            f"All providers failed for '{model_or_alias}'. Last error: {last_error}"
+        )
+
+    async def route_chat_stream(
+        self,
+        model_or_alias: str,
+        messages: list[dict],
+        *,
+        candidates: list[RouteResult] | None = None,
+        deadline: Deadline | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat request from the best provider with failover.
+
+        Failover only happens before the first fragment: a candidate that
+        errors while opening its stream is skipped exactly like in
+        :meth:`route_chat`. Once content has been yielded the stream is
+        committed to that provider and later errors propagate.
+        ``candidates`` works as in :meth:`route_chat`; ``deadline`` bounds
+        the wait for the first fragment.
+        """
+        if candidates is None:
+            candidates = self.resolve(model_or_alias)
+        if not candidates:
+            raise RuntimeError(
+                f"No available provider for model/alias '{model_or_alias}'. "
+                "Check provider health and quotas."
+            )
+
+        last_error: Exception | None = None
+        skipped_late = False
+        for route in candidates:
+            if deadline is not None:
+                deadline.check()
+            if not self._fits(route, deadline):
+                skipped_late = True
+                continue
+            adapter = self.registry.get_adapter(route.provider_id)
+            if not adapter or not self._claim(route):
+                continue
 
-            except ProviderBadRequest as exc:
-                # 4xx that isn't auth/quota — usually a model-specific issue.
-                # Move on to next route without penalising provider health.
+            start = time.monotonic()
+            logger.info(
+                "Streaming from %s (model=%s score=%.3f)",
+                route.provider_id,
+                route.model,
+                route.score,
+            )
+            stream = adapter.chat_stream(route.model, messages, **kwargs)
+            try:
+                if deadline is None:
+                    first = await stream.__anext__()
+                else:
+                    first = await asyncio.wait_for(
+                        stream.__anext__(), timeout=deadline.remaining()
+                    )
+            except StopAsyncIteration:
+                first = None
+            except Exception as exc:
+                if deadline is not None and (
+                    deadline.expired or isinstance(exc, asyncio.TimeoutError)
+                ):
+                    # Out of time, not the provider's fault: no failure recorded.
+                    await stream.aclose()
+                    raise DeadlineExceeded(
+                        f"No answer from {route.provider_id} within the deadline"
+                    ) from exc
                 latency_ms = (time.monotonic() - start) * 1000
-                await self.registry.record_request(
-                    route.provider_id, latency_ms=latency_ms, success=True
-                )
-                logger.warning(
-                    "Provider %s rejected request for model %s (%.0fms): %s",
-                    route.provider_id,
-                    route.model,
-                    latency_ms,
-                    exc,
-                )
+                await self._record_failure(route, exc, latency_ms)
                 last_error = exc
+                continue
 
-            except (ProviderError, Exception) as exc:
+            ttft_ms = (time.monotonic() - start) * 1000
+            # A consumer that stops early (client disconnect) is not the
+            # provider's fault; only upstream exceptions count as failures.
+            failed = completed = False
+            try:
+                if first is not None:
+                    yield first
+                    async for chunk in stream:
+                        yield chunk
+                completed = True
+            except Exception:
+                failed = True
+                raise
+            finally:
+                await stream.aclose()
                 latency_ms = (time.monotonic() - start) * 1000
                 await self.registry.record_request(
-                    route.provider_id, latency_ms=latency_ms, success=False
-                )
-                logger.warning(
-                    "Provider %s failed (%.0fms): %s — trying next candidate",
-                    route.provider_id,
-                    latency_ms,
-                    exc,
+                    route.provider_id, latency_ms=latency_ms, success=not failed
                 )
-                last_error = exc
+                if completed:
+                    self.latency.observe(
+                        route.provider_id, route.model, total_ms=latency_ms, ttft_ms=ttft_ms
+                    )
+            return
 
+        if skipped_late and last_error is None:
+            raise DeadlineExceeded(
+                f"No provider for '{model_or_alias}' can answer within the deadline"
+            )
         raise RuntimeError(
             f"All providers failed for '{model_or_alias}'. Last error: {last_error}"
         )
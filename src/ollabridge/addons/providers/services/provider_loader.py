@@ -11,7 +11,11 @@ from pathlib import Path
 
 import yaml
 
-from ollabridge.addons.providers.models import AliasCandidate, ProviderConfig
+from ollabridge.addons.providers.models import (
+    AliasCandidate,
+    HedgingConfig,
+    ProviderConfig,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -79,6 +83,33 @@ def load_aliases(path: str | Path | None = None) -> dict[str, list[AliasCandidat
     return aliases
 
 
+def load_hedging(path: str | Path | None = None) -> HedgingConfig:
+    """
+    Load the optional ``hedging:`` section of model_aliases.yaml.
+
+    Returns a HedgingConfig; an absent or invalid section disables hedging.
+    """
+    if path is None:
+        path = _CATALOG_DIR / "model_aliases.yaml"
+    path = Path(path)
+
+    if not path.exists():
+        return HedgingConfig()
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+
+    try:
+        hedging = HedgingConfig(**(data.get("hedging") or {}))
+    except Exception as exc:
+        logger.warning("Ignoring invalid hedging section in %s: %s", path, exc)
+        return HedgingConfig()
+
+    if hedging.aliases:
+        logger.info("Hedging enabled for %d aliases", len(hedging.aliases))
+    return hedging
+
+
 def append_provider_to_seed(provider: dict, path: str | Path | None = None) -> None:
     """
     Append a single provider entry to providers.seed.yaml.
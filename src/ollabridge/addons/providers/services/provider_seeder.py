@@ -16,6 +16,7 @@ from ollabridge.addons.providers.registry import ProviderRegistry
 from ollabridge.addons.providers.router import ProviderRouter
 from ollabridge.addons.providers.services.provider_loader import (
     load_aliases,
+    load_hedging,
     load_provider_seed,
 )
 
@@ -99,6 +100,7 @@ async def seed_providers(
     # Load aliases
     aliases = load_aliases(aliases_path)
     registry.set_aliases(aliases)
+    registry.set_hedging(load_hedging(aliases_path))
 
     # Create router
     router = ProviderRouter(registry)
@@ -124,5 +126,6 @@ def reload_aliases(
     """
     aliases = load_aliases(aliases_path)
     registry.set_aliases(aliases)
+    registry.set_hedging(load_hedging(aliases_path))
     logger.info("Reloaded %d aliases", len(aliases))
     return len(aliases)
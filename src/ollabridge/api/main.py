@@ -1,33 +1,61 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import os
 import re
 import time
-from collections import deque
+import uuid
+from contextlib import nullcontext
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, AsyncIterator, Awaitable, Callable, TypeVar
 
 import httpx
 from fastapi import FastAPI, Depends, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from pydantic import BaseModel
 
 from ollabridge.core.settings import settings
 from ollabridge.core.security import require_api_key, set_pairing_manager
+from ollabridge.cache import (
+    ChatCache,
+    EmbeddingCache,
+    ModelListCache,
+    SemanticCache,
+    chat_cache_key,
+)
+from ollabridge.core.admission import AdmissionController, AdmissionRejected
+from ollabridge.connectors.homepilot import HomePilotUpstreamError
+from ollabridge.core.coalesce import Coalescer, StreamTee, request_key
+from ollabridge.core.embeddings import (
+    EmbeddingItem,
+    estimate_tokens as estimate_embedding_tokens,
+    has_token_arrays,
+    normalize_input as normalize_embedding_input,
+    split_batches as split_embedding_batches,
+    vectors_from_payload,
+)
+from ollabridge.core.deadline import Deadline, DeadlineExceeded
 from ollabridge.core.enrollment import create_join_token
+from ollabridge.core.flow_metrics import GROUP_DIMENSIONS, FlowMetrics
+from ollabridge.core.http_pool import close_http_pool, get_http_pool
 from ollabridge.core import runtime_settings as rts
 from ollabridge.db.database import init_db, session
+from ollabridge.db.log_writer import close_request_log_writer, get_request_log_writer
 from ollabridge.db.models import RequestLog
 from ollabridge.api.state import build_state
 from ollabridge.api.relay import RelayHub, build_relay_router
 from ollabridge.core.registry import RuntimeNodeState
+from ollabridge.core.router import RouteDecision
+from ollabridge.policies import PolicyTable
 
 log = logging.getLogger("ollabridge")
+T = TypeVar("T")
 limiter = Limiter(key_func=get_remote_address, default_limits=[settings.RATE_LIMIT])
 
 
@@ -41,11 +69,18 @@ class ChatReq(BaseModel):
     messages: list[ChatMessage]
     temperature: float | None = None
     max_tokens: int | None = None
+    stream: bool = False
+    # Seconds the client is willing to wait; X-Request-Timeout overrides it.
+    timeout: float | None = None
+    # OpenAI end-user id; keeps that user's conversation on one node.
+    user: str | None = None
 
 
 class EmbeddingsReq(BaseModel):
     model: str | None = None
-    input: str
+    # OpenAI-style: a string, a list of strings, a token array, or a list
+    # of token arrays.
+    input: str | list[str] | list[int] | list[list[int]]
 
 
 class SourceHealthReq(BaseModel):
@@ -54,16 +89,6 @@ class SourceHealthReq(BaseModel):
     api_key: str | None = None
 
 
-class FlowEvent(BaseModel):
-    ts: float
-    path: str
-    model: str | None = None
-    ok: bool = True
-    latency_ms: int = 0
-    prompt_tokens_est: int = 0
-    completion_tokens_est: int = 0
-
-
 class SettingsPatch(BaseModel):
     default_model: str | None = None
     default_embed_model: str | None = None
@@ -158,6 +183,20 @@ def _normalize_content(raw_content: str) -> str:
     return text
 
 
+def _write_request_log(
+    request: Request, *, model: str | None, latency_ms: int, ok: bool
+) -> None:
+    get_request_log_writer().submit(
+        RequestLog(
+            path=str(request.url.path),
+            model=model,
+            latency_ms=latency_ms,
+            ok=ok,
+            client=request.client.host if request.client else None,
+        )
+    )
+
+
 def _record_flow_event(
     app: FastAPI,
     *,
@@ -167,53 +206,69 @@ def _record_flow_event(
     latency_ms: int,
     prompt_tokens_est: int = 0,
     completion_tokens_est: int = 0,
+    node: str | None = None,
 ) -> None:
-    events = getattr(app.state, "flow_events", None)
-    if events is None:
-        events = deque(maxlen=512)
-        app.state.flow_events = events
-
-    events.append(
-        FlowEvent(
-            ts=time.time(),
-            path=path,
-            model=model,
-            ok=ok,
-            latency_ms=latency_ms,
-            prompt_tokens_est=prompt_tokens_est,
-            completion_tokens_est=completion_tokens_est,
-        ).model_dump()
+    app.state.flow_metrics.record(
+        path=path,
+        model=model,
+        node=node,
+        ok=ok,
+        latency_ms=latency_ms,
+        prompt_tokens=prompt_tokens_est,
+        completion_tokens=completion_tokens_est,
     )
 
 
-def _compute_flow_metrics(app: FastAPI) -> dict[str, Any]:
-    now = time.time()
-    events = list(getattr(app.state, "flow_events", []))
-    recent_8 = [e for e in events if now - float(e.get("ts", 0)) <= 8]
-    recent_60 = [e for e in events if now - float(e.get("ts", 0)) <= 60]
-
-    requests_8s = len(recent_8)
-    requests_1m = len(recent_60)
-    prompt_1m = int(sum(int(e.get("prompt_tokens_est", 0) or 0) for e in recent_60))
-    completion_1m = int(
-        sum(int(e.get("completion_tokens_est", 0) or 0) for e in recent_60)
-    )
+def _compute_flow_metrics(app: FastAPI, group_by: str | None = None) -> dict[str, Any]:
+    metrics: FlowMetrics = app.state.flow_metrics
+    snapshot = metrics.snapshot(group_by)
+    last_1m = snapshot["windows"]["1m"]
+    requests_8s = metrics.count(8)
+    prompt_1m = last_1m["prompt_tokens"]
+    completion_1m = last_1m["completion_tokens"]
     total_1m = prompt_1m + completion_1m
-    avg_latency_1m = (
-        int(sum(int(e.get("latency_ms", 0) or 0) for e in recent_60) / requests_1m)
-        if requests_1m
-        else 0
-    )
 
     return {
         "active": requests_8s > 0,
         "requests_8s": requests_8s,
-        "requests_1m": requests_1m,
-        "avg_latency_ms_1m": avg_latency_1m,
+        "requests_1m": last_1m["requests"],
+        "avg_latency_ms_1m": last_1m["avg_latency_ms"],
         "est_prompt_tokens_1m": prompt_1m,
         "est_completion_tokens_1m": completion_1m,
         "est_total_tokens_1m": total_1m,
         "est_tokens_per_sec": round(total_1m / 60.0, 2),
+        **snapshot,
+        "request_log": get_request_log_writer().stats(),
+        "embedding_cache": (
+            cache.stats()
+            if (cache := getattr(app.state, "embedding_cache", None)) is not None
+            else None
+        ),
+        "chat_cache": (
+            cache.stats()
+            if (cache := getattr(app.state, "chat_cache", None)) is not None
+            else None
+        ),
+        "semantic_cache": (
+            cache.stats()
+            if (cache := getattr(app.state, "semantic_cache", None)) is not None
+            else None
+        ),
+        "affinity": dict(app.state.obridge.router.affinity),
+        "residency": dict(app.state.obridge.router.residency),
+        "warm_pool": (
+            pool.stats() if (pool := getattr(app.state, "warm_pool", None)) is not None else None
+        ),
+        "coalescing": (
+            coalescer.stats()
+            if (coalescer := getattr(app.state, "coalescer", None)) is not None
+            else None
+        ),
+        "admission": (
+            admission.stats()
+            if (admission := getattr(app.state, "admission", None)) is not None
+            else None
+        ),
     }
 
 
@@ -282,11 +337,1047 @@ async def _reconfigure_nodes(application: FastAPI, cfg: dict[str, Any]) -> None:
         await registry.remove(hp_node_id)
 
 
+# ---------------------------------------------------------------------------
+# Streaming chat — OpenAI-compatible ``stream=true`` over SSE
+# ---------------------------------------------------------------------------
+
+
+async def _prime_stream(stream: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Pull the first fragment eagerly.
+
+    Upstream errors (connection refused, 4xx/5xx, unknown model) therefore
+    surface before the HTTP response has started and can still be turned
+    into a regular error status — or trigger a fallback.
+    """
+    try:
+        first: str | None = await stream.__anext__()
+    except StopAsyncIteration:
+        first = None
+
+    async def _replay() -> AsyncIterator[str]:
+        try:
+            if first is not None:
+                yield first
+                async for chunk in stream:
+                    yield chunk
+        finally:
+            await stream.aclose()
+
+    return _replay()
+
+
+async def _on_stream_close(
+    stream: AsyncIterator[str], callback: Callable[[bool, bool], None]
+) -> AsyncIterator[str]:
+    """Pass *stream* through, then call ``callback(completed, failed)`` once.
+
+    ``completed`` is True only if the upstream stream ran to its end;
+    ``failed`` only if the upstream raised (not when the consumer left).
+    """
+    completed = failed = False
+    try:
+        async for chunk in stream:
+            yield chunk
+        completed = True
+    except Exception:
+        failed = True
+        raise
+    finally:
+        callback(completed, failed)
+        await stream.aclose()
+
+
+async def _embed_batch(
+    app: FastAPI,
+    model: str,
+    batch: list[EmbeddingItem],
+    *,
+    single: bool,
+    auth_key: str,
+    deadline: Deadline | None = None,
+) -> tuple[list[list[float]], str]:
+    """Embed one sub-batch on the next routed node. Returns ``(vectors, node_id)``.
+
+    The sub-batch waits for an admission slot on the node like a chat
+    call, so an embedding burst queues (or is shed with 429) instead of
+    piling onto a saturated runtime.
+    """
+    router = app.state.obridge.router
+    node = (await router.choose_node(model=model)).node
+    _note_use(app, node, model)
+    admitted = await _admit(
+        app, node, model, auth_key=auth_key, addon_routes=[], deadline=deadline
+    )
+    t0 = time.time()
+    try:
+        with app.state.obridge.registry.track(node.node_id):
+            vectors = await _embed_on_node(app, node, model, batch, single=single)
+    except Exception:
+        router.latency.observe_failure(
+            node.node_id, model, elapsed_ms=(time.time() - t0) * 1000
+        )
+        raise
+    finally:
+        if admitted:
+            app.state.admission.release(node.node_id)
+    router.latency.observe(node.node_id, model, total_ms=(time.time() - t0) * 1000)
+    return vectors, node.node_id
+
+
+async def _embed_on_node(
+    app: FastAPI,
+    node: RuntimeNodeState,
+    model: str,
+    batch: list[EmbeddingItem],
+    *,
+    single: bool,
+) -> list[list[float]]:
+    # A bare input keeps the single-value wire format older nodes expect.
+    wire_input: Any = batch[0] if single else batch
+
+    if node.connector == "relay_link":
+        hub = app.state.relay_hub
+
+        async def _relay(value: Any, expected: int) -> list[list[float]]:
+            frame = await hub.request(
+                node.node_id, "embeddings", {"model": model, "input": value}
+            )
+            if not frame.get("ok", True):
+                raise RuntimeError(frame.get("error") or "upstream error")
+            return vectors_from_payload(frame.get("data") or {}, expected)
+
+        caps = (node.meta or {}).get("capabilities") or []
+        if single or "embed_batch" in caps:
+            return await _relay(wire_input, len(batch))
+        # Nodes without batch support get one request per item, concurrently.
+        parts = await asyncio.gather(*(_relay(item, 1) for item in batch))
+        return [vec for part in parts for vec in part]
+
+    if node.connector == "direct_endpoint":
+        data = await app.state.obridge.direct.embeddings(
+            base=node.endpoint or "",
+            payload={"model": model, "input": wire_input},
+        )
+        return vectors_from_payload(data, len(batch))
+
+    from ollabridge.providers.ollama_client import embed as ollama_embed
+
+    vectors = await ollama_embed(model=model, inputs=list(batch))
+    if len(vectors) != len(batch):
+        raise RuntimeError(
+            f"upstream returned {len(vectors)} embeddings, expected {len(batch)}"
+        )
+    return vectors
+
+
+async def _node_models(app: FastAPI, node: RuntimeNodeState) -> list[dict[str, Any]]:
+    """Model entries advertised by one node (raises on failure)."""
+    if node.connector == "homepilot":
+        hp_connector = getattr(app.state, "homepilot_connector", None)
+        if not hp_connector:
+            return []
+        hp_key = ""
+        if isinstance(node.meta, dict):
+            hp_key = str(node.meta.get("api_key") or "")
+        data = await hp_connector.models(base=node.endpoint or "", api_key=hp_key)
+        out = []
+        for m in data.get("data", []):
+            if isinstance(m, dict):
+                m["owned_by"] = m.get("owned_by", "homepilot")
+                out.append(m)
+        return out
+
+    if node.connector == "relay_link":
+        frame = await app.state.relay_hub.request(
+            node.node_id, "models", {}, timeout_s=settings.MODELS_NODE_TIMEOUT
+        )
+        return list((frame.get("data") or {}).get("data", []))
+
+    if node.connector == "direct_endpoint":
+        data = await app.state.obridge.direct.models(base=node.endpoint or "")
+        return list(data.get("data", []))
+
+    from ollabridge.providers.ollama_client import list_models as ollama_list
+
+    return [{"id": m_name, "object": "model"} for m_name in await ollama_list()]
+
+
+async def _aggregate_models(app: FastAPI) -> list[dict[str, Any]]:
+    """Query every healthy node concurrently and merge their model lists.
+
+    Each node gets ``MODELS_NODE_TIMEOUT`` seconds; a node that fails or
+    times out contributes its last successful listing instead, so one slow
+    runtime cannot stall or empty the response. Fresh listings also refresh
+    the registry's model index (HomePilot keeps its persona discovery list).
+    """
+    registry = app.state.obridge.registry
+    nodes = [n for n in await registry.list() if n.healthy]
+    last_good: dict[str, list[dict[str, Any]]] = app.state.node_models_last_good
+
+    async def _one(node: RuntimeNodeState) -> list[dict[str, Any]]:
+        try:
+            models = await asyncio.wait_for(
+                _node_models(app, node), timeout=settings.MODELS_NODE_TIMEOUT
+            )
+        except Exception as e:
+            log.warning("Failed to list models from node %s: %r", node.node_id, e)
+            return last_good.get(node.node_id, [])
+        last_good[node.node_id] = models
+        if node.connector != "homepilot":
+            await registry.set_models(
+                node.node_id, [str(m["id"]) for m in models if m.get("id")]
+            )
+        return models
+
+    results = await asyncio.gather(*(_one(n) for n in nodes))
+    live = {n.node_id for n in nodes}
+    for node_id in list(last_good):
+        if node_id not in live:
+            del last_good[node_id]
+    return [m for models in results for m in models]
+
+
+class PolicyRejected(HTTPException):
+    """No target allowed by the request's routing policy is available."""
+
+
+def _add_trace_fields(request: Request, **fields: Any) -> None:
+    """Attach trace fields decided deep in the call chain to this request."""
+    extra = getattr(request.state, "trace_fields", None)
+    if extra is None:
+        extra = request.state.trace_fields = {}
+    extra.update(fields)
+
+
+def _request_deadline(req: ChatReq, request: Request) -> Deadline:
+    """The request's deadline: ``X-Request-Timeout`` (seconds), else the
+    body's ``timeout``, else ``REQUEST_TIMEOUT``; capped at
+    ``REQUEST_TIMEOUT_MAX``."""
+    seconds = req.timeout
+    header = request.headers.get("x-request-timeout")
+    if header is not None:
+        try:
+            seconds = float(header)
+        except ValueError:
+            raise HTTPException(400, "X-Request-Timeout must be a number of seconds")
+    if seconds is None:
+        seconds = settings.REQUEST_TIMEOUT
+    if not seconds > 0:
+        raise HTTPException(400, "request timeout must be a positive number of seconds")
+    return Deadline(min(seconds, settings.REQUEST_TIMEOUT_MAX))
+
+
+async def _before_deadline(deadline: Deadline, awaitable: Awaitable[T]) -> T:
+    """Await *awaitable*, cancelling it once *deadline* passes.
+
+    Backstop for hops that take no deadline of their own (direct and
+    HomePilot connectors); the rest size their timeouts from it.
+    """
+    try:
+        return await asyncio.wait_for(awaitable, timeout=deadline.budget(float("inf")))
+    except asyncio.TimeoutError as exc:
+        if isinstance(exc, DeadlineExceeded) or deadline.expired:
+            raise DeadlineExceeded(
+                f"request deadline of {deadline.seconds:g}s exceeded"
+            ) from exc
+        raise
+
+
+def _conversation_key(
+    app: FastAPI, req: ChatReq, auth_key: str, model: str
+) -> str | None:
+    """Sticky-routing key for the conversation *req* belongs to, if any.
+
+    Only requests that carry a multi-turn signal get one: the bridge session
+    of a paired device, the OpenAI ``user`` field, or more than one user
+    turn (keyed by the conversation's opening, messages up to the first
+    user turn, which every later turn repeats). Everything else is left to
+    the routing strategy.
+    """
+    if not settings.ROUTING_AFFINITY:
+        return None
+    device_id = _resolve_device_id(app, auth_key)
+    if device_id:
+        session = app.state.obridge.sessions.get_session(device_id, model)
+        if session is not None:
+            return f"session:{session.homepilot_conversation_id}"
+    if req.user:
+        return f"user:{req.user}"
+    if sum(m.role == "user" for m in req.messages) < 2:
+        return None
+    opening: list[dict[str, str]] = []
+    for m in req.messages:
+        opening.append({"role": m.role, "content": m.content})
+        if m.role == "user":
+            break
+    return request_key("conversation", opening)
+
+
+def _coalesce_key(
+    app: FastAPI,
+    req: ChatReq,
+    request: Request,
+    auth_key: str,
+    model: str,
+    payload_messages: list[dict[str, Any]],
+) -> str | None:
+    """Single-flight key for a chat request, or ``None`` to run it alone.
+
+    Only deterministic requests (an explicit ``temperature=0``, as for the
+    response cache) are coalesced: the upstream default samples, so other
+    requests expect distinct answers. The tenant is part of the key, since
+    the shared call is admitted under it, and so are the device identity
+    and client type, because HomePilot replies depend on them.
+    """
+    if not settings.COALESCE_ENABLED or req.temperature != 0:
+        return None
+    device_id = _resolve_device_id(app, auth_key)
+    return request_key(
+        "chat",
+        chat_cache_key(
+            model,
+            payload_messages,
+            {"temperature": req.temperature, "max_tokens": req.max_tokens},
+        ),
+        req.stream,
+        device_id or auth_key,
+        request.headers.get("x-client-type", ""),
+    )
+
+
+async def _admit(
+    app: FastAPI,
+    node: RuntimeNodeState,
+    model: str,
+    *,
+    auth_key: str,
+    addon_routes: list[Any],
+    deadline: Deadline | None,
+) -> bool:
+    """Wait for an admission slot on *node*.
+
+    Returns whether a slot was taken; the caller releases it once the
+    upstream call is over. Requests that cloud providers will serve
+    (non-empty ``addon_routes``, see :func:`_addon_routes`) skip the
+    queue — it protects runtimes, providers have their own limits.
+    """
+    admission: AdmissionController | None = getattr(app.state, "admission", None)
+    if admission is None or addon_routes:
+        return False
+    await admission.admit(
+        node.node_id,
+        model,
+        limit=node.capacity * settings.ADMISSION_SLOTS_PER_CAPACITY,
+        tenant=_resolve_device_id(app, auth_key) or auth_key,
+        deadline=deadline,
+    )
+    return True
+
+
+def _addon_routes(
+    app: FastAPI,
+    node: RuntimeNodeState,
+    model: str,
+    provider_candidates: list[Any] | None,
+) -> list[Any]:
+    """Provider routes that will serve *model* instead of *node*.
+
+    A policy's candidates as given; otherwise what the provider add-on
+    resolves for a local Ollama node, which tries the add-on before the
+    runtime. Empty when the node itself serves the request.
+    """
+    if provider_candidates is not None:
+        return provider_candidates
+    provider_router = getattr(app.state, "provider_router", None)
+    if node.connector != "local_ollama" or not provider_router:
+        return []
+    try:
+        return provider_router.resolve(model)
+    except Exception:
+        return []
+
+
+# Stands in for a node when a policy sends the request to providers and no
+# local runtime is up; it never receives a call.
+_PROVIDER_NODE = RuntimeNodeState(node_id="provider-addon", connector="provider_addon")
+
+
+async def _route_by_policy(
+    app: FastAPI,
+    request: Request,
+    model: str,
+    *,
+    default_model: str,
+    deadline: Deadline | None = None,
+    affinity: str | None = None,
+) -> tuple[str, RouteDecision, list[Any]] | None:
+    """Apply the routing policy matching *model* (e.g. ``fast``), if any.
+
+    Compiled targets are tried in preference order against live state: a
+    local target needs a healthy node with the model (and the target's
+    ``device_tag``, if any) whose p95 fits the policy's latency budget;
+    provider targets need an available provider within budget and become
+    the failover list. Returns ``(model, decision,
+    provider_candidates)`` for the first viable target — an empty candidate
+    list means "local only, skip the provider add-on". Returns ``None``
+    when no policy matches, or nothing is viable and the policy allows
+    fallback to default routing. Otherwise the request is rejected (503).
+    """
+    table = getattr(app.state, "policy_table", None)
+    if table is None:
+        return None
+    provider_router = getattr(app.state, "provider_router", None)
+    policy = table.lookup(
+        model, provider_router.registry if provider_router is not None else None
+    )
+    if policy is None:
+        return None
+    _add_trace_fields(request, route_policy=policy.name)
+
+    router = app.state.obridge.router
+    providers_checked = False
+    for i, target in enumerate(policy.targets):
+        if target.type == "local_device":
+            local_model = target.model or default_model
+            try:
+                decision = await router.choose_node(
+                    model=local_model,
+                    require_model=target.model is not None,
+                    max_latency_ms=policy.max_latency_ms,
+                    deadline=deadline,
+                    affinity=affinity,
+                    tag=target.device_tag,
+                )
+            except (RuntimeError, DeadlineExceeded):
+                continue
+            return local_model, decision, []
+
+        if provider_router is None or providers_checked:
+            continue
+        providers_checked = True
+        candidates = provider_router.resolve_targets(
+            [
+                (t.provider_id, t.model)
+                for t in policy.targets[i:]
+                if t.type == "external_provider" and t.provider_id and t.model
+            ],
+            max_latency_ms=policy.max_latency_ms,
+        )
+        if candidates:
+            try:
+                decision = await router.choose_node()
+            except RuntimeError:
+                # The providers serve the request; a gateway without a
+                # healthy local node can still route it.
+                decision = RouteDecision(node=_PROVIDER_NODE)
+            return model, decision, candidates
+
+    if policy.fallback:
+        return None
+    raise PolicyRejected(
+        status_code=503,
+        detail=f"routing policy {policy.name!r}: no allowed target is available",
+    )
+
+
+async def _open_chat_stream(
+    app: FastAPI,
+    req: ChatReq,
+    request: Request,
+    auth_key: str,
+    *,
+    node: RuntimeNodeState,
+    model: str,
+    payload_messages: list[dict[str, Any]],
+    provider_candidates: list[Any] | None = None,
+    addon_routes: list[Any] | None = None,
+    deadline: Deadline | None = None,
+) -> tuple[AsyncIterator[str], str | None, bool]:
+    """Open a primed fragment stream on *node*.
+
+    Returns ``(stream, trace_provider, fallback_used)``.
+    ``provider_candidates`` comes from a routing policy: a non-empty list
+    is streamed from those providers, an empty one skips the add-on.
+    ``addon_routes`` is the add-on's resolution of *model* when the caller
+    already has it (see :func:`_addon_routes`).
+    ``deadline`` bounds the wait for the first fragment.
+    """
+    if provider_candidates:
+        stream = app.state.provider_router.route_chat_stream(
+            model,
+            payload_messages,
+            candidates=provider_candidates,
+            deadline=deadline,
+            temperature=req.temperature,
+            max_tokens=req.max_tokens,
+        )
+        return await _prime_stream(stream), "provider-addon", False
+
+    if node.connector == "relay_link":
+        stream = app.state.relay_hub.stream(
+            node.node_id,
+            "chat",
+            {"model": model, "messages": payload_messages},
+            timeout_s=settings.RELAY_STREAM_TIMEOUT,
+            window=settings.RELAY_STREAM_WINDOW,
+            deadline=deadline,
+        )
+        return await _prime_stream(stream), None, False
+
+    if node.connector == "direct_endpoint":
+        # The node agent's /node/v1/chat is buffered only: the reply is
+        # fetched whole and replayed as a single chunk.
+        stream = app.state.obridge.direct.chat_stream(
+            base=node.endpoint or "",
+            payload={"model": model, "messages": payload_messages},
+        )
+        return await _prime_stream(stream), None, False
+
+    if node.connector == "homepilot":
+        hp_connector = getattr(app.state, "homepilot_connector", None)
+        if hp_connector is None:
+            from ollabridge.connectors.homepilot import HomePilotConnector
+
+            hp_connector = HomePilotConnector()
+            app.state.homepilot_connector = hp_connector
+
+        hp_payload: dict[str, Any] = {
+            "model": model,
+            "messages": payload_messages,
+            "api_key": (node.meta or {}).get("api_key", ""),
+            "client_type": request.headers.get("x-client-type", ""),
+        }
+        if req.temperature is not None:
+            hp_payload["temperature"] = req.temperature
+        if req.max_tokens is not None:
+            hp_payload["max_tokens"] = req.max_tokens
+
+        # Same bridge-session continuity as the buffered path. The SSE body
+        # carries no conversation_id, so new sessions use the stable id.
+        device_id = _resolve_device_id(app, auth_key)
+        if device_id:
+            sessions = app.state.obridge.sessions
+            bridge_session = sessions.get_session(device_id, model)
+            if bridge_session:
+                hp_payload["conversation_id"] = bridge_session.homepilot_conversation_id
+                sessions.touch_session(device_id, model)
+            else:
+                sessions.upsert_session(
+                    device_id=device_id,
+                    model=model,
+                    homepilot_conversation_id=f"hp-{device_id}-{model}",
+                )
+
+        stream = hp_connector.chat_stream(base=node.endpoint or "", payload=hp_payload)
+        return await _prime_stream(stream), "homepilot", False
+
+    # Provider addon first (failover happens before the first fragment),
+    # then the local Ollama runtime — mirroring the buffered path.
+    provider_router = getattr(app.state, "provider_router", None)
+    if provider_router and provider_candidates is None:
+        try:
+            candidates = (
+                provider_router.resolve(model) if addon_routes is None else addon_routes
+            )
+            if candidates:
+                stream = provider_router.route_chat_stream(
+                    model,
+                    payload_messages,
+                    candidates=candidates,
+                    deadline=deadline,
+                    temperature=req.temperature,
+                    max_tokens=req.max_tokens,
+                )
+                return await _prime_stream(stream), "provider-addon", False
+        except Exception as addon_exc:
+            log.debug(
+                "Addon providers exhausted for model=%s, falling back to Ollama: %s",
+                model,
+                addon_exc,
+            )
+
+    from ollabridge.providers.ollama_client import chat_stream as ollama_chat_stream
+
+    stream = ollama_chat_stream(model=model, messages=payload_messages, deadline=deadline)
+    return (
+        await _prime_stream(stream),
+        "ollama-local",
+        bool(provider_router) and provider_candidates is None,
+    )
+
+
+async def _provider_chat(
+    app: FastAPI,
+    req: ChatReq,
+    request: Request,
+    model: str,
+    payload_messages: list[dict[str, Any]],
+    candidates: list[Any],
+    deadline: Deadline | None = None,
+) -> str:
+    """Buffered chat through the provider add-on; raises if it yields nothing."""
+    attribution: dict[str, Any] = {}
+    result_data = await app.state.provider_router.route_chat(
+        model,
+        payload_messages,
+        candidates=candidates,
+        attribution=attribution,
+        deadline=deadline,
+        temperature=req.temperature,
+        max_tokens=req.max_tokens,
+    )
+    if attribution.get("hedged"):
+        _add_trace_fields(request, hedged=True, hedge_won=attribution["hedge_won"])
+    choices = result_data.get("choices", [])
+    if not choices:
+        raise RuntimeError(f"provider returned no choices for '{model}'")
+    return choices[0].get("message", {}).get("content", "")
+
+
+async def _chat_on_node(
+    app: FastAPI,
+    req: ChatReq,
+    request: Request,
+    auth_key: str,
+    *,
+    node: RuntimeNodeState,
+    model: str,
+    payload_messages: list[dict[str, Any]],
+    provider_candidates: list[Any] | None = None,
+    addon_routes: list[Any] | None = None,
+    deadline: Deadline | None = None,
+) -> tuple[str, dict[str, Any], str | None, bool]:
+    """Run a buffered chat completion on *node*.
+
+    Returns ``(content, data, trace_provider, fallback_used)``; ``data`` is
+    the raw HomePilot reply (attachments, directives) and empty otherwise.
+    ``provider_candidates`` and ``addon_routes`` work as in
+    :func:`_open_chat_stream`; each
+    hop's timeout is cut to what is left of ``deadline``.
+    """
+    data: dict[str, Any] = {}
+    trace_provider: str | None = None
+    trace_fallback = False
+
+    if provider_candidates:
+        content = await _provider_chat(
+            app, req, request, model, payload_messages, provider_candidates, deadline
+        )
+        return content, data, "provider-addon", False
+
+    if node.connector == "relay_link":
+        frame = await app.state.relay_hub.request(
+            node.node_id,
+            "chat",
+            {"model": model, "messages": payload_messages},
+            deadline=deadline,
+        )
+        if not frame.get("ok", True):
+            raise RuntimeError(frame.get("error") or "upstream error")
+        content = (frame.get("data") or {}).get("content", "")
+
+    elif node.connector == "direct_endpoint":
+        data = await app.state.obridge.direct.chat(
+            base=node.endpoint or "",
+            payload={"model": model, "messages": payload_messages},
+        )
+        content = data.get("content", "")
+
+    elif node.connector == "homepilot":
+        hp_connector = getattr(app.state, "homepilot_connector", None)
+        if hp_connector is None:
+            from ollabridge.connectors.homepilot import HomePilotConnector
+
+            hp_connector = HomePilotConnector()
+            app.state.homepilot_connector = hp_connector
+
+        hp_payload = {
+            "model": model,
+            "messages": payload_messages,
+            "api_key": (node.meta or {}).get("api_key", ""),
+            "client_type": request.headers.get("x-client-type", ""),
+        }
+        if req.temperature is not None:
+            hp_payload["temperature"] = req.temperature
+        if req.max_tokens is not None:
+            hp_payload["max_tokens"] = req.max_tokens
+
+        # --- Phase 2: Bridge session persistence ---
+        # Resolve device identity and reuse existing HomePilot
+        # conversation so Memory V2 continues naturally.
+        device_id = _resolve_device_id(app, auth_key)
+        bridge_session = None
+        if device_id:
+            sessions = app.state.obridge.sessions
+            bridge_session = sessions.get_session(device_id, model)
+            if bridge_session:
+                hp_payload["conversation_id"] = (
+                    bridge_session.homepilot_conversation_id
+                )
+                sessions.touch_session(device_id, model)
+
+        data = await hp_connector.chat(
+            base=node.endpoint or "", payload=hp_payload
+        )
+
+        # Forward structured errors from HomePilot (e.g. persona unpublished)
+        if data.get("error"):
+            raise HTTPException(
+                status_code=data.get("status_code", 502),
+                detail=data.get("error_body", {"detail": "upstream error"}),
+            )
+
+        content = data.get("content", "")
+
+        # Store session mapping if we got a conversation_id back
+        if device_id and not bridge_session:
+            conv_id = (data.get("raw") or {}).get("conversation_id", "")
+            if not conv_id:
+                # Use a stable hash so the same device+model always
+                # maps to the same conversation lineage
+                conv_id = f"hp-{device_id}-{model}"
+            app.state.obridge.sessions.upsert_session(
+                device_id=device_id,
+                model=model,
+                homepilot_conversation_id=conv_id,
+            )
+
+    else:
+        # --- Addon: multi-provider routing ---
+        # Try the additive provider layer before falling back to local Ollama.
+        provider_router = getattr(app.state, "provider_router", None)
+        addon_handled = False
+        if provider_router and provider_candidates is None:
+            try:
+                candidates = (
+                    provider_router.resolve(model) if addon_routes is None else addon_routes
+                )
+                if candidates:
+                    content = await _provider_chat(
+                        app, req, request, model, payload_messages, candidates, deadline
+                    )
+                    addon_handled = True
+            except Exception as addon_exc:
+                log.debug(
+                    "Addon providers exhausted for model=%s, falling back to Ollama: %s",
+                    model,
+                    addon_exc,
+                )
+
+        if addon_handled:
+            trace_provider = "provider-addon"
+        if not addon_handled:
+            trace_fallback = bool(provider_router) and provider_candidates is None
+            trace_provider = "ollama-local"
+            from ollabridge.providers.ollama_client import chat as ollama_chat
+
+            content = await ollama_chat(
+                model=model, messages=payload_messages, deadline=deadline
+            )
+
+    if node.connector == "homepilot":
+        trace_provider = "homepilot"
+
+    return content, data, trace_provider, trace_fallback
+
+
+def _sse_chat_response(
+    app: FastAPI,
+    request: Request,
+    req: ChatReq,
+    *,
+    stream: AsyncIterator[str],
+    model: str,
+    t0: float,
+    prompt_tokens_est: int,
+    trace_provider: str | None,
+    trace_device: str | None,
+    trace_fallback: bool,
+) -> StreamingResponse:
+    """Re-encode fragments as ``chat.completion.chunk`` SSE events.
+
+    Request log, flow metrics and the trace are written once the stream
+    closes — whether it completed, failed mid-way or the client went away.
+    """
+    from ollabridge.core.streaming import SSE_DONE, chat_chunk, sse_event
+
+    chunk_id = f"chatcmpl-{uuid.uuid4().hex}"
+    created = int(time.time())
+
+    async def _events() -> AsyncIterator[str]:
+        completion_chars = 0
+        error_category: str | None = "ClientDisconnected"
+        try:
+            yield sse_event(
+                chat_chunk(
+                    chunk_id=chunk_id, model=model, role="assistant", created=created
+                )
+            )
+            async for piece in stream:
+                completion_chars += len(piece)
+                yield sse_event(
+                    chat_chunk(
+                        chunk_id=chunk_id, model=model, content=piece, created=created
+                    )
+                )
+            yield sse_event(
+                chat_chunk(
+                    chunk_id=chunk_id,
+                    model=model,
+                    finish_reason="stop",
+                    created=created,
+                )
+            )
+            yield SSE_DONE
+            error_category = None
+        except Exception as e:
+            # Headers are already sent: report in-band, OpenAI style.
+            from ollabridge.core.redact import redact_text
+
+            error_category = type(e).__name__
+            yield sse_event(
+                {"error": {"message": redact_text(str(e)), "type": error_category}}
+            )
+        finally:
+            await stream.aclose()
+            ok = error_category is None
+            latency = int((time.time() - t0) * 1000)
+            tokens_out = int(completion_chars / 4) if completion_chars else 0
+            _write_request_log(request, model=model, latency_ms=latency, ok=ok)
+            _record_flow_event(
+                app,
+                path=str(request.url.path),
+                model=model,
+                ok=ok,
+                latency_ms=latency,
+                prompt_tokens_est=prompt_tokens_est,
+                completion_tokens_est=tokens_out,
+                node=trace_device,
+            )
+            app.state.record_trace(
+                request,
+                requested_model=req.model or None,
+                resolved_model=model,
+                provider=trace_provider,
+                device=trace_device,
+                fallback_used=trace_fallback,
+                tokens_in=prompt_tokens_est,
+                tokens_out=tokens_out,
+                latency_ms=latency,
+                estimated_cost_usd=(
+                    0.0 if trace_provider in (None, "ollama-local") else None
+                ),
+                ok=ok,
+                error_category=error_category,
+            )
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _build_embedding_cache() -> EmbeddingCache | None:
+    if not settings.EMBED_CACHE_ENABLED:
+        return None
+    from ollabridge.core import paths
+
+    return EmbeddingCache(
+        max_entries=settings.EMBED_CACHE_MAX_ENTRIES,
+        disk_dir=paths.data_dir() / "embedding_cache" if settings.EMBED_CACHE_DISK else None,
+        disk_max_bytes=settings.EMBED_CACHE_DISK_MAX_MB * 1024 * 1024,
+    )
+
+
+def _cache_directives(request: Request) -> set[str]:
+    raw = request.headers.get("cache-control") or ""
+    return {part.strip().lower() for part in raw.split(",") if part.strip()}
+
+
+def _build_chat_cache() -> ChatCache:
+    # Always built: policies can enable caching even when the global
+    # switch is off. The disk tier only opens on first use.
+    from ollabridge.core import paths
+
+    return ChatCache(
+        max_entries=settings.CHAT_CACHE_MAX_ENTRIES,
+        ttl_s=settings.CHAT_CACHE_TTL,
+        db_path=paths.data_dir() / "chat_cache.db" if settings.CHAT_CACHE_DISK else None,
+    )
+
+
+def _build_semantic_cache() -> SemanticCache:
+    from ollabridge.core import paths
+
+    return SemanticCache(
+        threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+        max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+        ttl_s=settings.SEMANTIC_CACHE_TTL,
+        disk_dir=paths.data_dir() / "semantic_cache" if settings.SEMANTIC_CACHE_DISK else None,
+    )
+
+
+def _build_warm_pool(app: FastAPI) -> Any:
+    from ollabridge.addons.local_catalog.warm_pool import WarmPoolManager, WarmPoolPolicy
+
+    return WarmPoolManager(
+        app.state.obridge.registry,
+        relay_hub=app.state.relay_hub,
+        catalog=lambda: getattr(app.state, "local_catalog_repo", None),
+        defaults=WarmPoolPolicy(
+            enabled=settings.WARM_POOL_ENABLED,
+            top=settings.WARM_POOL_TOP,
+            keep_alive=settings.WARM_POOL_KEEP_ALIVE,
+            idle_s=settings.WARM_POOL_IDLE,
+            vram_budget_gb=settings.WARM_POOL_VRAM_BUDGET_GB,
+        ).merged({"models": settings.WARM_POOL_MODELS}),
+        overrides=settings.WARM_POOL_NODES,
+        interval_s=settings.RESIDENT_POLL_INTERVAL,
+    )
+
+
+def _note_use(app: FastAPI, node: RuntimeNodeState, model: str) -> None:
+    """Tell the warm pool *model* is in use on *node* (it keeps it loaded)."""
+    if (pool := app.state.warm_pool) is not None:
+        pool.note_use(node.node_id, model)
+
+
+@dataclass(frozen=True)
+class _CachePlan:
+    exact: bool  # exact-match tier applies (temperature=0)
+    semantic: bool  # semantic tier applies
+    read: bool  # look up before going upstream (False for no-cache)
+    ttl_s: float | None
+    scope: str  # semantic scope: policy, embedding model, earlier turns
+
+
+def _chat_cache_plan(
+    app: FastAPI, req: ChatReq, request: Request, model: str
+) -> _CachePlan | None:
+    """Which response caches apply to this completion, or ``None``.
+
+    Streaming requests are never cached. The exact tier only takes
+    deterministic (``temperature=0``) requests; the semantic tier needs a
+    final user message. The policy matching *model* decides when it says
+    anything, otherwise ``CHAT_CACHE_ENABLED`` / ``SEMANTIC_CACHE_ENABLED``
+    do. ``Cache-Control: no-cache`` skips the lookup (the fresh reply is
+    still stored); ``no-store`` skips the caches.
+    """
+    if req.stream:
+        return None
+    exact, semantic = settings.CHAT_CACHE_ENABLED, settings.SEMANTIC_CACHE_ENABLED
+    ttl_s, policy_name = None, ""
+    table = getattr(app.state, "policy_table", None)
+    if table is not None:
+        provider_router = getattr(app.state, "provider_router", None)
+        policy = table.lookup(
+            model, provider_router.registry if provider_router is not None else None
+        )
+        if policy is not None:
+            policy_name, ttl_s = policy.name, policy.cache_ttl_s
+            if policy.cache_enabled is not None:
+                exact = policy.cache_enabled
+            if policy.cache_semantic is not None:
+                semantic = policy.cache_semantic
+            if policy.cache_enabled is False:
+                semantic = False
+    exact = exact and req.temperature == 0 and getattr(app.state, "chat_cache", None) is not None
+    semantic = (
+        semantic
+        and getattr(app.state, "semantic_cache", None) is not None
+        and bool(req.messages)
+        and req.messages[-1].role == "user"
+        and bool(req.messages[-1].content.strip())
+    )
+    if not (exact or semantic):
+        return None
+    directives = _cache_directives(request)
+    if directives & {"no-cache", "no-store"}:
+        for tier, on in (("chat_cache", exact), ("semantic_cache", semantic)):
+            if on:
+                getattr(app.state, tier).note_bypass()
+        if "no-store" in directives:
+            return None
+    scope = request_key(
+        policy_name,
+        rts.get("default_embed_model", settings.DEFAULT_EMBED_MODEL),
+        [{"role": m.role, "content": m.content} for m in req.messages[:-1]],
+    )
+    return _CachePlan(
+        exact=exact,
+        semantic=semantic,
+        read=not directives & {"no-cache", "no-store"},
+        ttl_s=ttl_s,
+        scope=scope,
+    )
+
+
+async def _semantic_vector(
+    app: FastAPI, text: str, deadline: Deadline, auth_key: str
+) -> list[float] | None:
+    """Embedding of *text* for the semantic cache; ``None`` when unavailable.
+
+    Goes through the embedding cache, so a repeated question costs no
+    upstream call. An embedding failure only disables the semantic tier
+    for this request.
+    """
+    model = rts.get("default_embed_model", settings.DEFAULT_EMBED_MODEL)
+    cache: EmbeddingCache | None = app.state.embedding_cache
+    if cache is not None and (
+        hit := (await asyncio.to_thread(cache.get_many, model, [text]))[0]
+    ) is not None:
+        return hit
+    try:
+        vectors, _ = await _before_deadline(
+            deadline,
+            _embed_batch(
+                app, model, [text], single=True, auth_key=auth_key, deadline=deadline
+            ),
+        )
+    except DeadlineExceeded:
+        raise
+    except Exception:
+        log.debug("semantic cache: embedding the prompt failed", exc_info=True)
+        return None
+    if not vectors:
+        return None
+    if cache is not None:
+        await asyncio.to_thread(cache.put_many, model, [text], vectors)
+    return vectors[0]
+
+
 def create_app() -> FastAPI:
     app = FastAPI(title=settings.APP_NAME)
     app.state.limiter = limiter
     app.state.obridge = build_state()
     app.state.relay_hub = RelayHub(app.state.obridge.registry)
+    app.state.flow_metrics = FlowMetrics()
+    app.state.embedding_cache = _build_embedding_cache()
+    app.state.chat_cache = _build_chat_cache()
+    app.state.semantic_cache = _build_semantic_cache()
+    app.state.coalescer = Coalescer()
+    app.state.warm_pool = _build_warm_pool(app) if settings.RESIDENT_POLL_ENABLED else None
+    app.state.admission = (
+        AdmissionController(
+            max_queue=settings.ADMISSION_MAX_QUEUE,
+            max_wait_s=settings.ADMISSION_MAX_WAIT,
+        )
+        if settings.ADMISSION_ENABLED
+        else None
+    )
+    app.state.node_models_last_good = {}
+    app.state.policy_table = (
+        PolicyTable(reload_interval=settings.POLICIES_RELOAD_INTERVAL)
+        if settings.POLICIES_ENABLED
+        else None
+    )
+    app.state.models_cache = ModelListCache(
+        lambda: _aggregate_models(app),
+        version=lambda: app.state.obridge.registry.version,
+        ttl=settings.MODELS_CACHE_TTL,
+        max_stale=settings.MODELS_MAX_STALE,
+    )
 
     origins = _parse_origins(settings.CORS_ORIGINS)
     app.add_middleware(
@@ -331,13 +1422,15 @@ def create_app() -> FastAPI:
             from ollabridge.tracing import TraceRecord, get_trace_store
 
             rid = getattr(request.state, "request_id", "") or new_request_id()
+            # Set deeper in the call chain (e.g. hedge attribution).
+            extra = getattr(request.state, "trace_fields", None) or {}
             get_trace_store().record(
                 TraceRecord(
                     request_id=rid,
                     path=str(request.url.path),
                     client_type=request.headers.get("x-client-type") or None,
                     cloud_relay=request.headers.get("x-ollabridge-relay") == "1",
-                    **fields,
+                    **{**extra, **fields},
                 )
             )
         except Exception:  # pragma: no cover - tracing must never break serving
@@ -348,7 +1441,6 @@ def create_app() -> FastAPI:
     @app.on_event("startup")
     def _startup() -> None:
         init_db()
-        app.state.flow_events = deque(maxlen=512)
 
         import asyncio
 
@@ -358,12 +1450,17 @@ def create_app() -> FastAPI:
             await _reconfigure_nodes(app, cfg)
 
         asyncio.get_event_loop().create_task(_init_nodes())
+        if app.state.warm_pool is not None:
+            asyncio.get_event_loop().create_task(app.state.warm_pool.start())
 
         # Initialize addons: provider orchestration layer + HF catalog + secret store
         async def _init_providers() -> None:
             try:
                 from pathlib import Path
 
+                from ollabridge.addons.providers.health import (
+                    ProviderHealthScheduler,
+                )
                 from ollabridge.addons.providers.hf_catalog.client import (
                     HuggingFaceCatalogClient,
                 )
@@ -422,6 +1519,10 @@ def create_app() -> FastAPI:
                 app.state.hf_catalog_snapshot = snapshot
                 app.state.hf_catalog_sync = sync_service
 
+                health_scheduler = ProviderHealthScheduler(registry)
+                await health_scheduler.start()
+                app.state.provider_health_scheduler = health_scheduler
+
                 log.info(
                     "Provider addon initialized: %d providers, %d aliases, "
                     "%d HF catalog rows (encrypted=%s)",
@@ -437,6 +1538,7 @@ def create_app() -> FastAPI:
                 app.state.secret_store = None
                 app.state.hf_catalog_snapshot = None
                 app.state.hf_catalog_sync = None
+                app.state.provider_health_scheduler = None
 
         asyncio.get_event_loop().create_task(_init_providers())
 
@@ -508,6 +1610,26 @@ def create_app() -> FastAPI:
 
         asyncio.get_event_loop().create_task(_init_local_catalog())
 
+    @app.on_event("shutdown")
+    async def _shutdown() -> None:
+        import asyncio
+
+        health_scheduler = getattr(app.state, "provider_health_scheduler", None)
+        if health_scheduler is not None:
+            await health_scheduler.stop()
+        if app.state.warm_pool is not None:
+            await app.state.warm_pool.stop()
+        await close_http_pool()
+        if app.state.embedding_cache is not None:
+            app.state.embedding_cache.close()
+        app.state.chat_cache.close()
+        app.state.semantic_cache.close()
+        await asyncio.to_thread(close_request_log_writer)
+
+        from ollabridge.tracing import close_trace_store
+
+        await asyncio.to_thread(close_trace_store)
+
     if settings.RELAY_ENABLED:
         app.include_router(
             build_relay_router(
@@ -612,9 +1734,14 @@ def create_app() -> FastAPI:
     async def chat_completions(
         req: ChatReq,
         request: Request,
+        response: Response,
         _key: str = Depends(require_api_key),
     ) -> dict[str, Any]:
         model = req.model or rts.get("default_model", settings.DEFAULT_MODEL)
+        deadline = _request_deadline(req, request)
+        cache_plan = _chat_cache_plan(app, req, request, model)
+        cache_key: str | None = None
+        semantic_vector: list[float] | None = None
         t0 = time.time()
         prompt_tokens_est = sum(_estimate_tokens(m.content) for m in req.messages)
         trace_provider: str | None = None
@@ -625,139 +1752,248 @@ def create_app() -> FastAPI:
             payload_messages = [
                 {"role": m.role, "content": m.content} for m in req.messages
             ]
-            decision = await app.state.obridge.router.choose_node(model=model)
-            node = decision.node
-            trace_device = node.node_id
-
-            if node.connector == "relay_link":
-                frame = await app.state.relay_hub.request(
-                    node.node_id,
-                    "chat",
-                    {"model": model, "messages": payload_messages},
-                )
-                if not frame.get("ok", True):
-                    raise RuntimeError(frame.get("error") or "upstream error")
-                content = (frame.get("data") or {}).get("content", "")
-
-            elif node.connector == "direct_endpoint":
-                data = await app.state.obridge.direct.chat(
-                    base=node.endpoint or "",
-                    payload={"model": model, "messages": payload_messages},
-                )
-                content = data.get("content", "")
-
-            elif node.connector == "homepilot":
-                hp_connector = getattr(app.state, "homepilot_connector", None)
-                if hp_connector is None:
-                    from ollabridge.connectors.homepilot import HomePilotConnector
-
-                    hp_connector = HomePilotConnector()
-                    app.state.homepilot_connector = hp_connector
-
-                hp_payload = {
-                    "model": model,
-                    "messages": payload_messages,
-                    "api_key": (node.meta or {}).get("api_key", ""),
-                    "client_type": request.headers.get("x-client-type", ""),
-                }
-                if req.temperature is not None:
-                    hp_payload["temperature"] = req.temperature
-                if req.max_tokens is not None:
-                    hp_payload["max_tokens"] = req.max_tokens
-
-                # --- Phase 2: Bridge session persistence ---
-                # Resolve device identity and reuse existing HomePilot
-                # conversation so Memory V2 continues naturally.
-                device_id = _resolve_device_id(app, _key)
-                bridge_session = None
-                if device_id:
-                    sessions = app.state.obridge.sessions
-                    bridge_session = sessions.get_session(device_id, model)
-                    if bridge_session:
-                        hp_payload["conversation_id"] = (
-                            bridge_session.homepilot_conversation_id
+            provider_candidates: list[Any] | None = None
+            affinity = _conversation_key(app, req, _key, model)
+            policy_route = await _route_by_policy(
+                app,
+                request,
+                model,
+                default_model=rts.get("default_model", settings.DEFAULT_MODEL),
+                deadline=deadline,
+                affinity=affinity,
+            )
+            if policy_route is not None:
+                model, decision, provider_candidates = policy_route
+
+            if cache_plan is not None:
+                cached: str | None = None
+                cache_source = "cache"
+                if cache_plan.exact:
+                    cache_key = chat_cache_key(
+                        model,
+                        payload_messages,
+                        {"temperature": req.temperature, "max_tokens": req.max_tokens},
+                    )
+                    if cache_plan.read:
+                        cached = await asyncio.to_thread(app.state.chat_cache.get, cache_key)
+                if cached is None and cache_plan.semantic:
+                    semantic_vector = await _semantic_vector(
+                        app, payload_messages[-1]["content"], deadline, _key
+                    )
+                    if semantic_vector is not None and cache_plan.read:
+                        match = await asyncio.to_thread(
+                            app.state.semantic_cache.lookup,
+                            model,
+                            cache_plan.scope,
+                            semantic_vector,
                         )
-                        sessions.touch_session(device_id, model)
-
-                data = await hp_connector.chat(
-                    base=node.endpoint or "", payload=hp_payload
+                        if match is not None:
+                            cached, cache_source = match[0], "semantic-cache"
+                _add_trace_fields(request, cache_hit=cached is not None)
+                response.headers["X-OllaBridge-Cache"] = (
+                    "miss"
+                    if cached is None
+                    else "semantic-hit" if cache_source == "semantic-cache" else "hit"
                 )
-
-                # Forward structured errors from HomePilot (e.g. persona unpublished)
-                if data.get("error"):
-                    raise HTTPException(
-                        status_code=data.get("status_code", 502),
-                        detail=data.get("error_body", {"detail": "upstream error"}),
+                if cached is not None:
+                    # Served without a node, a queue slot or an upstream call.
+                    latency = int((time.time() - t0) * 1000)
+                    _write_request_log(request, model=model, latency_ms=latency, ok=True)
+                    _record_flow_event(
+                        app,
+                        path=str(request.url.path),
+                        model=model,
+                        ok=True,
+                        latency_ms=latency,
+                        prompt_tokens_est=prompt_tokens_est,
+                        completion_tokens_est=_estimate_tokens(cached),
+                        node=None,
                     )
+                    _record_trace(
+                        request,
+                        requested_model=req.model or None,
+                        resolved_model=model,
+                        provider=cache_source,
+                        tokens_in=prompt_tokens_est,
+                        tokens_out=_estimate_tokens(cached),
+                        latency_ms=0,  # no upstream call
+                        estimated_cost_usd=0.0,
+                        ok=True,
+                    )
+                    return {
+                        "id": "ollabridge-chat",
+                        "object": "chat.completion",
+                        "choices": [
+                            {
+                                "index": 0,
+                                "message": {"role": "assistant", "content": cached},
+                            }
+                        ],
+                    }
 
-                content = data.get("content", "")
-
-                # Store session mapping if we got a conversation_id back
-                if device_id and not bridge_session:
-                    conv_id = (data.get("raw") or {}).get("conversation_id", "")
-                    if not conv_id:
-                        # Use a stable hash so the same device+model always
-                        # maps to the same conversation lineage
-                        conv_id = f"hp-{device_id}-{model}"
-                    app.state.obridge.sessions.upsert_session(
-                        device_id=device_id,
-                        model=model,
-                        homepilot_conversation_id=conv_id,
+            router = app.state.obridge.router
+            registry = app.state.obridge.registry
+            flight_key = _coalesce_key(app, req, request, _key, model, payload_messages)
+
+            async def _dispatch(
+                deadline: Deadline,
+            ) -> tuple[RuntimeNodeState, Any, str | None, bool]:
+                """Route, admit and call upstream; shared by coalesced duplicates.
+
+                Returns ``(node, result, trace_provider, fallback_used)``.
+                ``result`` is ``(content, data)`` for buffered requests, the
+                chunk stream for streams (a :class:`StreamTee` when shared).
+                """
+                nonlocal trace_device
+                if policy_route is None:
+                    decision = await router.choose_node(
+                        model=model, deadline=deadline, affinity=affinity
                     )
+                else:
+                    decision = policy_route[1]
+                node = decision.node
+                trace_device = node.node_id
+                # Provider-served calls stay off the node's load and latency.
+                addon = _addon_routes(app, node, model, provider_candidates)
+                if not addon:
+                    _note_use(app, node, model)
+
+                admitted = await _admit(
+                    app,
+                    node,
+                    model,
+                    auth_key=_key,
+                    addon_routes=addon,
+                    deadline=deadline,
+                )
+                t_node = time.time()
+
+                def _release_admission() -> None:
+                    if admitted:
+                        app.state.admission.release(node.node_id)
+
+                def _record_failure() -> None:
+                    # Errors and timeouts count against the node, so the
+                    # latency strategy stops preferring a broken one.
+                    if not addon:
+                        router.latency.observe_failure(
+                            node.node_id, model, elapsed_ms=(time.time() - t_node) * 1000
+                        )
 
-            else:
-                # --- Addon: multi-provider routing ---
-                # Try the additive provider layer before falling back to local Ollama.
-                provider_router = getattr(app.state, "provider_router", None)
-                addon_handled = False
-                if provider_router:
+                if req.stream:
+                    if not addon:
+                        registry.acquire(node.node_id)
                     try:
-                        candidates = provider_router.resolve(model)
-                        if candidates:
-                            result_data = await provider_router.route_chat(
+                        stream, provider, fallback = await _before_deadline(
+                            deadline,
+                            _open_chat_stream(
+                                app,
+                                req,
+                                request,
+                                _key,
+                                node=node,
+                                model=model,
+                                payload_messages=payload_messages,
+                                provider_candidates=provider_candidates,
+                                addon_routes=addon,
+                                deadline=deadline,
+                            ),
+                        )
+                    except BaseException as exc:
+                        if not addon:
+                            registry.release(node.node_id)
+                        _release_admission()
+                        if isinstance(exc, Exception):
+                            _record_failure()
+                        raise
+                    ttft_ms = (time.time() - t_node) * 1000
+
+                    def _stream_closed(completed: bool, failed: bool) -> None:
+                        if not addon:
+                            registry.release(node.node_id)
+                        _release_admission()
+                        if failed:
+                            _record_failure()
+                        elif completed and provider != "provider-addon":
+                            router.latency.observe(
+                                node.node_id,
                                 model,
-                                payload_messages,
-                                temperature=req.temperature,
-                                max_tokens=req.max_tokens,
+                                total_ms=(time.time() - t_node) * 1000,
+                                ttft_ms=ttft_ms,
                             )
-                            choices = result_data.get("choices", [])
-                            if choices:
-                                content = (
-                                    choices[0].get("message", {}).get("content", "")
-                                )
-                                addon_handled = True
-                    except Exception as addon_exc:
-                        log.debug(
-                            "Addon providers exhausted for model=%s, falling back to Ollama: %s",
-                            model,
-                            addon_exc,
-                        )
 
-                if addon_handled:
-                    trace_provider = "provider-addon"
-                if not addon_handled:
-                    trace_fallback = bool(provider_router)
-                    trace_provider = "ollama-local"
-                    from ollabridge.providers.ollama_client import chat as ollama_chat
+                    stream = _on_stream_close(stream, _stream_closed)
+                    if flight_key is not None:
+                        stream = StreamTee(stream)
+                    return node, stream, provider, fallback
+
+                try:
+                    with nullcontext() if addon else registry.track(node.node_id):
+                        content, data, provider, fallback = await _before_deadline(
+                            deadline,
+                            _chat_on_node(
+                                app,
+                                req,
+                                request,
+                                _key,
+                                node=node,
+                                model=model,
+                                payload_messages=payload_messages,
+                                provider_candidates=provider_candidates,
+                                addon_routes=addon,
+                                deadline=deadline,
+                            ),
+                        )
+                except Exception:
+                    _record_failure()
+                    raise
+                finally:
+                    _release_admission()
+                if provider != "provider-addon":
+                    router.latency.observe(
+                        node.node_id, model, total_ms=(time.time() - t_node) * 1000
+                    )
+                return node, (content, data), provider, fallback
 
-                    content = await ollama_chat(model=model, messages=payload_messages)
+            shared = False
+            if flight_key is None:
+                node, upstream, trace_provider, trace_fallback = await _dispatch(deadline)
+            else:
+                # The shared call gets the longest budget any joiner may
+                # ask for, so a leader's short timeout cannot fail the
+                # followers; each waiter gives up at its own deadline, and
+                # the call is cancelled once every one of them has.
+                # Teed streams stay joinable until the upstream ends.
+                (node, upstream, trace_provider, trace_fallback), shared = (
+                    await _before_deadline(
+                        deadline,
+                        app.state.coalescer.run(
+                            flight_key,
+                            lambda: _dispatch(Deadline(settings.REQUEST_TIMEOUT_MAX)),
+                            linger=(lambda r: r[1].finished) if req.stream else None,
+                        ),
+                    )
+                )
+            trace_device = node.node_id
 
-            if node.connector == "homepilot":
-                trace_provider = "homepilot"
+            if req.stream:
+                return _sse_chat_response(
+                    app,
+                    request,
+                    req,
+                    stream=upstream.subscribe() if flight_key is not None else upstream,
+                    model=model,
+                    t0=t0,
+                    prompt_tokens_est=prompt_tokens_est,
+                    trace_provider=trace_provider,
+                    trace_device=trace_device,
+                    trace_fallback=trace_fallback,
+                )
+            content, data = upstream
 
             latency = int((time.time() - t0) * 1000)
 
-            with session() as s:
-                s.add(
-                    RequestLog(
-                        path=str(request.url.path),
-                        model=model,
-                        latency_ms=latency,
-                        ok=True,
-                        client=request.client.host if request.client else None,
-                    )
-                )
-                s.commit()
+            _write_request_log(request, model=model, latency_ms=latency, ok=True)
 
             _record_flow_event(
                 app,
@@ -767,6 +2003,7 @@ def create_app() -> FastAPI:
                 latency_ms=latency,
                 prompt_tokens_est=prompt_tokens_est,
                 completion_tokens_est=_estimate_tokens(content),
+                node=trace_device,
             )
 
             _record_trace(
@@ -791,6 +2028,27 @@ def create_app() -> FastAPI:
             client_type = request.headers.get("x-client-type", "")
             content = _normalize_content(content)
 
+            # HomePilot replies depend on persona memory, not just the prompt.
+            # The caches write to disk, so they are filled off the event loop.
+            if cache_plan is not None and not shared and node.connector != "homepilot":
+                if cache_key is not None:
+                    await asyncio.to_thread(
+                        app.state.chat_cache.put,
+                        cache_key,
+                        model,
+                        content,
+                        ttl_s=cache_plan.ttl_s,
+                    )
+                if semantic_vector is not None:
+                    await asyncio.to_thread(
+                        app.state.semantic_cache.put,
+                        model,
+                        cache_plan.scope,
+                        semantic_vector,
+                        content,
+                        ttl_s=cache_plan.ttl_s,
+                    )
+
             result: dict[str, Any] = {
                 "id": "ollabridge-chat",
                 "object": "chat.completion",
@@ -834,17 +2092,19 @@ def create_app() -> FastAPI:
 
         except Exception as e:
             latency = int((time.time() - t0) * 1000)
-            with session() as s:
-                s.add(
-                    RequestLog(
-                        path=str(request.url.path),
-                        model=model,
-                        latency_ms=latency,
-                        ok=False,
-                        client=request.client.host if request.client else None,
-                    )
-                )
-                s.commit()
+            shed = isinstance(e, AdmissionRejected)
+            # Policy rejections and upstream errors with a status of their
+            # own (a streamed HomePilot 4xx such as an unknown persona) reach
+            # the client as-is rather than as a 500.
+            forwarded = (
+                HTTPException(e.status_code, e.error_body)
+                if isinstance(e, HomePilotUpstreamError)
+                else e if isinstance(e, HTTPException) else None
+            )
+            out_of_time = forwarded is None and not shed and (
+                isinstance(e, DeadlineExceeded) or deadline.expired
+            )
+            _write_request_log(request, model=model, latency_ms=latency, ok=False)
 
             _record_flow_event(
                 app,
@@ -854,6 +2114,7 @@ def create_app() -> FastAPI:
                 latency_ms=latency,
                 prompt_tokens_est=prompt_tokens_est,
                 completion_tokens_est=0,
+                node=trace_device,
             )
 
             _record_trace(
@@ -866,9 +2127,24 @@ def create_app() -> FastAPI:
                 tokens_in=prompt_tokens_est,
                 latency_ms=latency,
                 ok=False,
-                error_category=type(e).__name__,
+                error_category=(
+                    "deadline_exceeded"
+                    if out_of_time
+                    else "load_shed" if shed else type(e).__name__
+                ),
             )
 
+            if forwarded is not None:
+                raise forwarded
+            if shed:
+                raise HTTPException(
+                    429, str(e), headers={"Retry-After": str(e.retry_after)}
+                )
+            if out_of_time:
+                raise HTTPException(
+                    504, f"request deadline of {deadline.seconds:g}s exceeded"
+                )
+
             # Redact any credential-shaped content before it reaches the client.
             from ollabridge.core.redact import redact_text
 
@@ -920,48 +2196,76 @@ def create_app() -> FastAPI:
             "default_embed_model", settings.DEFAULT_EMBED_MODEL
         )
         t0 = time.time()
-        prompt_tokens_est = _estimate_tokens(req.input)
-
         try:
-            decision = await app.state.obridge.router.choose_node(model=model)
-            node = decision.node
-
-            if node.connector == "relay_link":
-                frame = await app.state.relay_hub.request(
-                    node.node_id,
-                    "embeddings",
-                    {"model": model, "input": req.input},
-                )
-                if not frame.get("ok", True):
-                    raise RuntimeError(frame.get("error") or "upstream error")
-                vec = (frame.get("data") or {}).get("embedding", [])
-
-            elif node.connector == "direct_endpoint":
-                data = await app.state.obridge.direct.embeddings(
-                    base=node.endpoint or "",
-                    payload={"model": model, "input": req.input},
-                )
-                vec = data.get("embedding", [])
+            items, single = normalize_embedding_input(req.input)
+        except ValueError as e:
+            raise HTTPException(422, str(e))
+        if len(items) > settings.EMBED_MAX_INPUTS:
+            raise HTTPException(
+                422, f"input has {len(items)} items; limit is {settings.EMBED_MAX_INPUTS}"
+            )
+        if has_token_arrays(items):
+            # Ollama embeds text only, and neither relay agents nor direct
+            # endpoints can tokenize back; reject up front on every connector.
+            raise HTTPException(422, "token-array input is not supported; send text")
+        prompt_tokens_est = estimate_embedding_tokens(items)
+        devices: set[str] = set()
 
-            else:
-                from ollabridge.providers.ollama_client import (
-                    embeddings as ollama_embed,
-                )
+        try:
+            # Oversized inputs are split and the sub-batches fanned out
+            # concurrently; each one picks its own node, so load spreads
+            # across every healthy runtime serving the model.
+            gate = asyncio.Semaphore(max(1, settings.EMBED_MAX_CONCURRENCY))
+            tenant = _resolve_device_id(app, _key) or _key
+
+            async def _embed(batch: list[Any]) -> tuple[list[list[float]], str]:
+                async with gate:
+                    return await _embed_batch(
+                        app, model, batch, single=single, auth_key=_key
+                    )
 
-                vec = await ollama_embed(model=model, text=req.input)
+            async def _run(batch: list[Any]) -> list[list[float]]:
+                # Identical sub-batches in flight together are embedded once
+                # (within a tenant: the shared call is admitted under it).
+                if settings.COALESCE_ENABLED:
+                    (vectors, node_id), _ = await app.state.coalescer.run(
+                        request_key("embed", model, batch, single, tenant),
+                        lambda: _embed(batch),
+                    )
+                else:
+                    vectors, node_id = await _embed(batch)
+                devices.add(node_id)
+                return vectors
+
+            # Cache-Control: no-cache skips lookups (fresh vectors are still
+            # stored); no-store skips the cache entirely.
+            cache: EmbeddingCache | None = app.state.embedding_cache
+            directives = _cache_directives(request)
+            read_cache = cache is not None and not directives & {"no-cache", "no-store"}
+            write_cache = cache is not None and "no-store" not in directives
+            if cache is not None and not read_cache:
+                cache.note_bypass(len(items))
+
+            cached = (
+                await asyncio.to_thread(cache.get_many, model, items)
+                if read_cache
+                else [None] * len(items)
+            )
+            vectors: list[Any] = list(cached)
+            miss_idx = [i for i, vec in enumerate(cached) if vec is None]
+            misses = [items[i] for i in miss_idx]
+
+            # Only the misses go upstream; a bare input stays bare.
+            batches = split_embedding_batches(misses, settings.EMBED_BATCH_SIZE)
+            results = await asyncio.gather(*(_run(b) for _, b in batches))
+            fresh = [vec for chunk in results for vec in chunk]
+            for i, vec in zip(miss_idx, fresh):
+                vectors[i] = vec
+            if write_cache and misses:
+                await asyncio.to_thread(cache.put_many, model, misses, fresh)
 
             latency = int((time.time() - t0) * 1000)
-            with session() as s:
-                s.add(
-                    RequestLog(
-                        path=str(request.url.path),
-                        model=model,
-                        latency_ms=latency,
-                        ok=True,
-                        client=request.client.host if request.client else None,
-                    )
-                )
-                s.commit()
+            _write_request_log(request, model=model, latency_ms=latency, ok=True)
 
             _record_flow_event(
                 app,
@@ -971,13 +2275,14 @@ def create_app() -> FastAPI:
                 latency_ms=latency,
                 prompt_tokens_est=prompt_tokens_est,
                 completion_tokens_est=0,
+                node=",".join(sorted(devices)) or None,
             )
 
             _record_trace(
                 request,
                 requested_model=req.model or None,
                 resolved_model=model,
-                device=node.node_id,
+                device=",".join(sorted(devices)) or None,
                 tokens_in=prompt_tokens_est,
                 latency_ms=latency,
                 ok=True,
@@ -985,23 +2290,20 @@ def create_app() -> FastAPI:
 
             return {
                 "object": "list",
-                "data": [{"object": "embedding", "embedding": vec, "index": 0}],
+                "data": [
+                    {"object": "embedding", "embedding": vec, "index": i}
+                    for i, vec in enumerate(vectors)
+                ],
                 "model": model,
+                "usage": {
+                    "prompt_tokens": prompt_tokens_est,
+                    "total_tokens": prompt_tokens_est,
+                },
             }
 
         except Exception as e:
             latency = int((time.time() - t0) * 1000)
-            with session() as s:
-                s.add(
-                    RequestLog(
-                        path=str(request.url.path),
-                        model=model,
-                        latency_ms=latency,
-                        ok=False,
-                        client=request.client.host if request.client else None,
-                    )
-                )
-                s.commit()
+            _write_request_log(request, model=model, latency_ms=latency, ok=False)
 
             _record_flow_event(
                 app,
@@ -1011,26 +2313,39 @@ def create_app() -> FastAPI:
                 latency_ms=latency,
                 prompt_tokens_est=prompt_tokens_est,
                 completion_tokens_est=0,
+                node=",".join(sorted(devices)) or None,
             )
 
             _record_trace(
                 request,
                 requested_model=req.model or None,
                 resolved_model=model,
+                device=",".join(sorted(devices)) or None,
                 tokens_in=prompt_tokens_est,
                 latency_ms=latency,
                 ok=False,
-                error_category=type(e).__name__,
+                error_category=(
+                    "load_shed" if isinstance(e, AdmissionRejected) else type(e).__name__
+                ),
             )
 
+            if isinstance(e, AdmissionRejected):
+                raise HTTPException(
+                    429, str(e), headers={"Retry-After": str(e.retry_after)}
+                )
+
             from ollabridge.core.redact import redact_text
 
-            raise HTTPException(500, redact_text(str(e)))
+            status = 422 if isinstance(e, ValueError) else 500
+            raise HTTPException(status, redact_text(str(e)))
 
     @app.get("/admin/recent")
     async def admin_recent(_key: str = Depends(require_api_key)) -> dict[str, Any]:
+        import asyncio
+
         from sqlmodel import select
 
+        await asyncio.to_thread(get_request_log_writer().flush)
         with session() as s:
             rows = s.exec(
                 select(RequestLog).order_by(RequestLog.ts.desc()).limit(200)
@@ -1039,8 +2354,21 @@ def create_app() -> FastAPI:
 
     @app.get("/admin/runtimes")
     async def admin_runtimes(_key: str = Depends(require_api_key)) -> dict[str, Any]:
-        nodes = await app.state.obridge.registry.list()
-        return {"runtimes": [n.__dict__ for n in nodes]}
+        registry = app.state.obridge.registry
+        router = app.state.obridge.router
+        nodes = await registry.list()
+        return {
+            "strategy": router.strategy,
+            "runtimes": [
+                {
+                    **n.__dict__,
+                    "last_seen": registry.last_seen(n.node_id) or n.last_seen,
+                    "inflight": registry.inflight(n.node_id),
+                    "latency": router.latency.for_node(n.node_id),
+                }
+                for n in nodes
+            ],
+        }
 
     @app.post("/admin/enroll")
     async def admin_enroll(_key: str = Depends(require_api_key)) -> dict[str, Any]:
@@ -1244,62 +2572,52 @@ def create_app() -> FastAPI:
                     "models": [],
                 }
 
+    @app.get("/admin/http-pool")
+    async def admin_http_pool(
+        _key: str = Depends(require_api_key),
+    ) -> dict[str, Any]:
+        """Upstream connection-pool usage (open/idle/waiting per origin)."""
+        return get_http_pool().stats()
+
+    @app.delete("/admin/embedding-cache")
+    async def admin_embedding_cache_invalidate(
+        model: str | None = None,
+        _key: str = Depends(require_api_key),
+    ) -> dict[str, Any]:
+        """Drop cached embeddings for one model, or all models."""
+        cache: EmbeddingCache | None = app.state.embedding_cache
+        if cache is None:
+            return {"ok": True, "enabled": False, "removed": 0}
+        removed = await asyncio.to_thread(cache.invalidate, model)
+        return {"ok": True, "enabled": True, "model": model, "removed": removed}
+
+    @app.delete("/admin/chat-cache")
+    async def admin_chat_cache_invalidate(
+        model: str | None = None,
+        _key: str = Depends(require_api_key),
+    ) -> dict[str, Any]:
+        """Drop cached chat completions (exact and semantic) for one model, or all."""
+        removed = await asyncio.to_thread(app.state.chat_cache.invalidate, model)
+        semantic = await asyncio.to_thread(app.state.semantic_cache.invalidate, model)
+        return {"ok": True, "model": model, "removed": removed, "semantic_removed": semantic}
+
     @app.get("/admin/flow-metrics")
     async def admin_flow_metrics(
+        group_by: str | None = None,
         _key: str = Depends(require_api_key),
     ) -> dict[str, Any]:
-        return _compute_flow_metrics(app)
+        if group_by is not None and group_by not in GROUP_DIMENSIONS:
+            raise HTTPException(
+                422, f"group_by must be one of: {', '.join(GROUP_DIMENSIONS)}"
+            )
+        return _compute_flow_metrics(app, group_by)
 
     @app.get("/v1/models")
     async def list_models(
         response: Response, _key: str = Depends(require_api_key)
     ) -> dict[str, Any]:
-        all_models: list[dict[str, Any]] = []
-        nodes = await app.state.obridge.registry.list()
-
-        for node in nodes:
-            if not node.healthy:
-                continue
-            try:
-                if node.connector == "homepilot":
-                    hp_connector = getattr(app.state, "homepilot_connector", None)
-                    if hp_connector:
-                        hp_key = ""
-                        if isinstance(node.meta, dict):
-                            hp_key = str(node.meta.get("api_key") or "")
-                        data = await hp_connector.models(
-                            base=node.endpoint or "", api_key=hp_key
-                        )
-                        for m in data.get("data", []):
-                            if isinstance(m, dict):
-                                m["owned_by"] = m.get("owned_by", "homepilot")
-                                all_models.append(m)
-
-                elif node.connector == "relay_link":
-                    frame = await app.state.relay_hub.request(
-                        node.node_id, "models", {}
-                    )
-                    for m in (frame.get("data") or {}).get("data", []):
-                        all_models.append(m)
-
-                elif node.connector == "direct_endpoint":
-                    data = await app.state.obridge.direct.models(
-                        base=node.endpoint or ""
-                    )
-                    for m in data.get("data", []):
-                        all_models.append(m)
-
-                else:
-                    from ollabridge.providers.ollama_client import (
-                        list_models as ollama_list,
-                    )
-
-                    models = await ollama_list()
-                    for m_name in models:
-                        all_models.append({"id": m_name, "object": "model"})
-
-            except Exception as e:
-                log.warning("Failed to list models from node %s: %s", node.node_id, e)
+        all_models, cache_state = await app.state.models_cache.get()
+        response.headers["X-OllaBridge-Cache"] = cache_state
 
         if not all_models:
             response.headers["X-OllaBridge-Warning"] = "models_unavailable"
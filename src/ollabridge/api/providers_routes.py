@@ -101,7 +101,7 @@ def _hf_components(request: Request):
     return snapshot, sync
 
 
-def _provider_summary(config, state) -> dict:
+def _provider_summary(config, state, breaker=None) -> dict:
     return {
         "id": config.id,
         "name": config.name,
@@ -126,6 +126,7 @@ def _provider_summary(config, state) -> dict:
             "is_quota_exhausted": state.is_quota_exhausted,
             "last_error": state.last_error,
         } if state else None,
+        "circuit": breaker.snapshot() if breaker else None,
     }
 
 
@@ -138,7 +139,9 @@ async def list_providers(request: Request) -> dict[str, Any]:
     items = []
     for config in registry.list_providers():
         state = registry.get_state(config.id)
-        items.append(_provider_summary(config, state))
+        items.append(
+            _provider_summary(config, state, registry.get_breaker(config.id))
+        )
     return {
         "providers": items,
         "total": len(items),
@@ -153,7 +156,11 @@ async def list_aliases(request: Request) -> dict[str, Any]:
         name: [{"provider": c.provider, "model": c.model} for c in cands]
         for name, cands in registry.aliases.items()
     }
-    return {"aliases": aliases, "total": len(aliases)}
+    hedging = registry.hedging.model_dump()
+    router_ = getattr(request.app.state, "provider_router", None)
+    if router_ is not None:
+        hedging["stats"] = router_.hedge_stats()
+    return {"aliases": aliases, "total": len(aliases), "hedging": hedging}
 
 
 @router.get("/{provider_id}", dependencies=[Depends(require_api_key)])
@@ -163,26 +170,22 @@ async def get_provider(provider_id: str, request: Request) -> dict[str, Any]:
     if not config:
         raise HTTPException(status_code=404, detail=f"provider '{provider_id}' not found")
     state = registry.get_state(provider_id)
-    return _provider_summary(config, state)
+    return _provider_summary(config, state, registry.get_breaker(provider_id))
 
 
 @router.post("/{provider_id}/enable", dependencies=[Depends(require_api_key)])
 async def enable_provider(provider_id: str, request: Request) -> dict[str, Any]:
     registry = _registry(request)
-    config = registry.get_config(provider_id)
-    if not config:
+    if not registry.set_enabled(provider_id, True):
         raise HTTPException(status_code=404, detail=f"provider '{provider_id}' not found")
-    config.enabled = True
     return {"ok": True, "provider": provider_id, "enabled": True}
 
 
 @router.post("/{provider_id}/disable", dependencies=[Depends(require_api_key)])
 async def disable_provider(provider_id: str, request: Request) -> dict[str, Any]:
     registry = _registry(request)
-    config = registry.get_config(provider_id)
-    if not config:
+    if not registry.set_enabled(provider_id, False):
         raise HTTPException(status_code=404, detail=f"provider '{provider_id}' not found")
-    config.enabled = False
     return {"ok": True, "provider": provider_id, "enabled": False}
 
 
@@ -252,6 +255,7 @@ async def hf_connect(
         # bill_to is HF adapter-specific; set defensively.
         if hasattr(adapter, "bill_to"):
             adapter.bill_to = body.bill_to
+        registry.invalidate("huggingface-free")
 
     return {
         "ok": True,
@@ -275,6 +279,7 @@ async def hf_disconnect(request: Request) -> dict[str, Any]:
         adapter.api_key = None
         if hasattr(adapter, "bill_to"):
             adapter.bill_to = None
+        registry.invalidate("huggingface-free")
 
     return {"ok": True, "connected": False}
 
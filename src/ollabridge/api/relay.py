@@ -3,11 +3,13 @@ from __future__ import annotations
 import asyncio
 import json
 import uuid
+from collections import deque
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from ollabridge.core.deadline import Deadline, budget
 from ollabridge.core.enrollment import verify_join_token
 from ollabridge.core.registry import RuntimeNodeState, RuntimeRegistry
 
@@ -18,19 +20,93 @@ class _RelayConn:
     ws: WebSocket
 
 
+class _RelayStream:
+    """Receive side of one streamed relay request.
+
+    ``delta`` frames are buffered up to ``capacity`` chunks. Nodes that honour
+    credits never exceed that; a node that ignores them overflows the buffer
+    and the stream fails instead of growing without bound or blocking the
+    connection's receive loop (which carries every other request too).
+    """
+
+    def __init__(self, node_id: str, capacity: int) -> None:
+        self.node_id = node_id
+        self.capacity = capacity
+        self.finished = False
+        self._chunks: deque[str] = deque()
+        self._error: Optional[BaseException] = None
+        self._ready = asyncio.Event()
+
+    def feed(self, frame: dict[str, Any]) -> None:
+        if self.finished:
+            return
+        mtype = frame.get("type")
+        if mtype == "delta":
+            if len(self._chunks) >= self.capacity:
+                self.fail(RuntimeError("relay stream buffer overflow"))
+                return
+            self._chunks.append(str(frame.get("content") or ""))
+        elif mtype == "done":
+            self.finished = True
+        elif mtype == "res":
+            # Nodes without streaming support answer with a single response.
+            if frame.get("ok", True):
+                self._chunks.append(str((frame.get("data") or {}).get("content") or ""))
+                self.finished = True
+            else:
+                self.fail(RuntimeError(frame.get("error") or "upstream error"))
+        self._ready.set()
+
+    def fail(self, exc: BaseException) -> None:
+        if self.finished:
+            return
+        self._error = exc
+        self.finished = True
+        self._ready.set()
+
+    async def next(self, timeout_s: float) -> Optional[str]:
+        """Next chunk, or ``None`` once the node finished the stream."""
+        while not self._chunks:
+            if self.finished:
+                if self._error is not None:
+                    raise self._error
+                return None
+            self._ready.clear()
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout_s)
+        return self._chunks.popleft()
+
+
 class RelayHub:
     """Multiplex requests to nodes connected over WebSocket.
 
     Protocol is simple JSON frames:
-    - node -> server: {"type":"hello", "node_id":"...", ...}
+    - node -> server: {"type":"hello", "node_id":"...", "capabilities":[...], ...}
     - server -> node: {"type":"req", "id":"...", "op":"chat|embeddings|models", "payload":{...}}
     - node -> server: {"type":"res", "id":"...", "ok":true, "data":{...}}
+    - server -> node: {"type":"cancel", "id":"..."} when the caller gave up
+      (timeout or client disconnect) before the response arrived
+
+    Streamed requests (:meth:`stream`) carry ``"window": N`` on the ``req``
+    frame; the node answers with ``{"type":"delta", "id", "content"}`` frames
+    and a final ``{"type":"done", "id"}``. Each delta spends one credit; the
+    gateway returns credits with ``{"type":"credit", "id", "n"}`` as the
+    client consumes chunks, so a slow client slows the node down rather than
+    piling chunks up in memory.
+
+    Requests made under a :class:`~ollabridge.core.deadline.Deadline` carry
+    ``"deadline_ms"`` (time left when sent) on the ``req`` frame; nodes drop
+    work that is still queued once it has passed.
+
+    Nodes run up to ``capacity`` requests concurrently and may answer out of
+    order; responses are matched by ``id``. When a node disconnects, all of
+    its pending requests and streams fail immediately.
     """
 
     def __init__(self, registry: RuntimeRegistry) -> None:
         self.registry = registry
         self._conns: dict[str, _RelayConn] = {}
-        self._pending: dict[str, asyncio.Future[dict[str, Any]]] = {}
+        self._pending: dict[str, tuple[str, asyncio.Future[dict[str, Any]]]] = {}
+        self._streams: dict[str, _RelayStream] = {}
         self._lock = asyncio.Lock()
 
     async def attach(self, node_id: str, ws: WebSocket) -> None:
@@ -40,33 +116,140 @@ class RelayHub:
     async def detach(self, node_id: str) -> None:
         async with self._lock:
             self._conns.pop(node_id, None)
+            for owner, fut in self._pending.values():
+                if owner == node_id and not fut.done():
+                    fut.set_exception(RuntimeError("node disconnected"))
+            for stream in self._streams.values():
+                if stream.node_id == node_id:
+                    stream.fail(RuntimeError("node disconnected"))
         await self.registry.remove(node_id)
 
-    async def request(self, node_id: str, op: str, payload: dict[str, Any], *, timeout_s: float = 120) -> dict[str, Any]:
+    async def request(
+        self,
+        node_id: str,
+        op: str,
+        payload: dict[str, Any],
+        *,
+        timeout_s: float = 120,
+        deadline: Deadline | None = None,
+    ) -> dict[str, Any]:
+        timeout_s = budget(deadline, timeout_s)
         async with self._lock:
             conn = self._conns.get(node_id)
             if not conn:
                 raise RuntimeError("node not connected")
             req_id = str(uuid.uuid4())
             fut: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
-            self._pending[req_id] = fut
-            await conn.ws.send_text(json.dumps({"type": "req", "id": req_id, "op": op, "payload": payload}))
+            self._pending[req_id] = (node_id, fut)
+            frame: dict[str, Any] = {"type": "req", "id": req_id, "op": op, "payload": payload}
+            if deadline is not None:
+                frame["deadline_ms"] = int(deadline.remaining_ms())
+            await conn.ws.send_text(json.dumps(frame))
 
         try:
             return await asyncio.wait_for(fut, timeout=timeout_s)
         finally:
             async with self._lock:
                 self._pending.pop(req_id, None)
+                conn = self._conns.get(node_id)
+                if fut.cancelled():
+                    await self._send_cancel(conn, req_id)
 
-    async def handle_frame(self, node_id: str, frame: dict[str, Any]) -> None:
-        if frame.get("type") != "res":
+    async def stream(
+        self,
+        node_id: str,
+        op: str,
+        payload: dict[str, Any],
+        *,
+        timeout_s: float = 120,
+        window: int = 32,
+        deadline: Deadline | None = None,
+    ) -> AsyncIterator[str]:
+        """Stream ``delta`` chunks for one request.
+
+        ``timeout_s`` bounds the wait for each chunk (the first included).
+        A ``deadline`` additionally bounds the wait for the first chunk;
+        once the reply has started it runs to completion.
+        Closing the iterator early — the HTTP client went away — sends a
+        ``cancel`` frame so the node stops generating.
+        """
+        window = max(1, int(window))
+        first_timeout = budget(deadline, timeout_s)
+        req_id = str(uuid.uuid4())
+        relay_stream = _RelayStream(node_id, capacity=window)
+        async with self._lock:
+            conn = self._conns.get(node_id)
+            if not conn:
+                raise RuntimeError("node not connected")
+            self._streams[req_id] = relay_stream
+            frame: dict[str, Any] = {
+                "type": "req",
+                "id": req_id,
+                "op": op,
+                "payload": {**payload, "stream": True},
+                "window": window,
+            }
+            if deadline is not None:
+                frame["deadline_ms"] = int(deadline.remaining_ms())
+            await conn.ws.send_text(json.dumps(frame))
+
+        refill = max(1, window // 2)
+        consumed = 0
+        started = False
+        try:
+            while True:
+                chunk = await relay_stream.next(timeout_s if started else first_timeout)
+                started = True
+                if chunk is None:
+                    return
+                consumed += 1
+                if consumed >= refill and not relay_stream.finished:
+                    await self._send(node_id, {"type": "credit", "id": req_id, "n": consumed})
+                    consumed = 0
+                if chunk:
+                    yield chunk
+        finally:
+            async with self._lock:
+                self._streams.pop(req_id, None)
+                if not relay_stream.finished:
+                    await self._send_cancel(self._conns.get(node_id), req_id)
+
+    async def _send(self, node_id: str, frame: dict[str, Any]) -> None:
+        # Best effort: a dead socket is reported through detach().
+        async with self._lock:
+            conn = self._conns.get(node_id)
+            if conn is None:
+                return
+            try:
+                await conn.ws.send_text(json.dumps(frame))
+            except Exception:
+                pass
+
+    @staticmethod
+    async def _send_cancel(conn: Optional[_RelayConn], req_id: str) -> None:
+        """Tell the node to drop work nobody is waiting for (best effort)."""
+        if conn is None:
             return
+        try:
+            await conn.ws.send_text(json.dumps({"type": "cancel", "id": req_id}))
+        except Exception:
+            pass
+
+    async def handle_frame(self, node_id: str, frame: dict[str, Any]) -> None:
+        mtype = frame.get("type")
         req_id = frame.get("id")
-        if not req_id:
+        if mtype not in ("res", "delta", "done") or not req_id:
             return
         async with self._lock:
-            fut = self._pending.get(req_id)
-        if fut and not fut.done():
+            relay_stream = self._streams.get(req_id)
+            entry = self._pending.get(req_id)
+        if relay_stream is not None:
+            relay_stream.feed(frame)
+            return
+        if mtype != "res" or entry is None:
+            return
+        fut = entry[1]
+        if not fut.done():
             fut.set_result(frame)
 
 
@@ -101,6 +284,7 @@ def build_relay_router(*, registry: RuntimeRegistry, hub: RelayHub) -> APIRouter
             tags = list(hello.get("tags") or [])
             models = list(hello.get("models") or [])
             capacity = int(hello.get("capacity") or 1)
+            capabilities = [str(c) for c in (hello.get("capabilities") or [])]
 
             await hub.attach(node_id, ws)
             await registry.upsert(
@@ -110,7 +294,7 @@ def build_relay_router(*, registry: RuntimeRegistry, hub: RelayHub) -> APIRouter
                     tags=tags,
                     models=models,
                     capacity=capacity,
-                    meta={"via": "relay"},
+                    meta={"via": "relay", "capabilities": capabilities},
                 )
             )
             await ws.send_text(json.dumps({"type": "hello_ack", "node_id": node_id}))
@@ -4,9 +4,11 @@ from dataclasses import dataclass
 
 from ollabridge.connectors.direct_endpoint import DirectEndpointConnector
 from ollabridge.core.consumer_registry import ConsumerRegistry
+from ollabridge.core.latency import LatencyTracker
 from ollabridge.core.registry import RuntimeRegistry
 from ollabridge.core.router import Router
 from ollabridge.core.session_bridge import SessionBridge
+from ollabridge.core.settings import settings
 
 
 @dataclass
@@ -20,7 +22,22 @@ class AppState:
 
 def build_state() -> AppState:
     registry = RuntimeRegistry()
-    router = Router(registry)
+    router = Router(
+        registry,
+        strategy=settings.ROUTING_STRATEGY,
+        latency=LatencyTracker(
+            alpha=settings.LATENCY_EWMA_ALPHA,
+            window=settings.LATENCY_WINDOW,
+            failure_ms=settings.LATENCY_FAILURE_MS,
+            max_age_s=settings.LATENCY_MAX_AGE,
+        ),
+        exploration=settings.ROUTING_EXPLORATION,
+        model_fallback=settings.ROUTING_MODEL_FALLBACK,
+        affinity_load_factor=settings.ROUTING_AFFINITY_LOAD,
+        resident_load=(
+            settings.ROUTING_RESIDENT_LOAD if settings.RESIDENT_POLL_ENABLED else None
+        ),
+    )
     return AppState(
         registry=registry,
         router=router,
@@ -19,22 +19,18 @@ import httpx
 from fastapi import APIRouter, Request
 from starlette.responses import JSONResponse
 
+from ollabridge.core.http_pool import http_client
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["world-state"])
 
-# Shared HTTP client for relaying to HomePilot
-_relay_client: httpx.AsyncClient | None = None
+_RELAY_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
 
 
-def _get_client() -> httpx.AsyncClient:
-    global _relay_client
-    if _relay_client is None:
-        _relay_client = httpx.AsyncClient(
-            timeout=httpx.Timeout(10.0, connect=5.0),
-            follow_redirects=True,
-        )
-    return _relay_client
+def _get_client(base: str) -> httpx.AsyncClient:
+    """Pooled HTTP client for relaying to HomePilot."""
+    return http_client(base)
 
 
 async def _find_homepilot_base(app: Any) -> str | None:
@@ -63,11 +59,13 @@ async def world_state_relay(request: Request) -> JSONResponse:
     body = await request.json()
 
     try:
-        client = _get_client()
+        client = _get_client(base)
         await client.post(
             f"{base}/v1/world-state/update",
             json=body,
             headers={"Content-Type": "application/json"},
+            timeout=_RELAY_TIMEOUT,
+            follow_redirects=True,
         )
     except Exception as e:
         logger.debug("[world-state] relay failed: %s", e)
@@ -85,11 +83,13 @@ async def world_state_relay_legacy(request: Request) -> JSONResponse:
     body = await request.json()
 
     try:
-        client = _get_client()
+        client = _get_client(base)
         await client.post(
             f"{base}/world-state/update",
             json=body,
             headers={"Content-Type": "application/json"},
+            timeout=_RELAY_TIMEOUT,
+            follow_redirects=True,
         )
     except Exception as e:
         logger.debug("[world-state] legacy relay failed: %s", e)
@@ -107,8 +107,12 @@ async def motion_plan_relay(persona_id: str, request: Request) -> JSONResponse:
         return JSONResponse(status_code=200, content={"motion_plan": None})
 
     try:
-        client = _get_client()
-        resp = await client.get(f"{base}/v1/persona/{persona_id}/motion")
+        client = _get_client(base)
+        resp = await client.get(
+            f"{base}/v1/persona/{persona_id}/motion",
+            timeout=_RELAY_TIMEOUT,
+            follow_redirects=True,
+        )
         resp.raise_for_status()
         return JSONResponse(status_code=200, content=resp.json())
     except Exception as e:
@@ -0,0 +1,16 @@
+"""Response caches: chat completions (exact and semantic), embeddings and the
+merged model listing."""
+
+from ollabridge.cache.chat import ChatCache, chat_cache_key
+from ollabridge.cache.embedding import EmbeddingCache, cache_key
+from ollabridge.cache.model_list import ModelListCache
+from ollabridge.cache.semantic import SemanticCache
+
+__all__ = [
+    "ChatCache",
+    "EmbeddingCache",
+    "ModelListCache",
+    "SemanticCache",
+    "cache_key",
+    "chat_cache_key",
+]
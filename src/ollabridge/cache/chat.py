@@ -0,0 +1,219 @@
+"""Exact-match cache for deterministic chat completions.
+
+Keys are ``sha256`` of the canonical JSON of (resolved model, messages,
+sampling parameters), so the same ``temperature=0`` request always maps to
+the same entry regardless of key order or whitespace in the client's body.
+
+Two tiers:
+
+- memory: a bounded LRU of ``(expires_at, content)``;
+- disk (optional): a SQLite table in ``<data dir>/chat_cache.db`` that
+  survives restarts. Disk hits are promoted to memory.
+
+Entries expire after their TTL in both tiers. All operations are
+thread-safe.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from ollabridge.core import paths
+
+log = logging.getLogger("ollabridge.cache")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chat_cache (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    content TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chat_cache_model ON chat_cache (model);
+"""
+
+
+def chat_cache_key(model: str, messages: list[dict[str, Any]], params: dict[str, Any]) -> str:
+    """Digest identifying a completion request; ``None`` params are ignored."""
+    body = {
+        "model": model,
+        "messages": [{"role": m.get("role"), "content": m.get("content")} for m in messages],
+        "params": {k: v for k, v in params.items() if v is not None},
+    }
+    canonical = json.dumps(body, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ChatCache:
+    """Two-tier (memory LRU + optional SQLite) completion cache."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1000,
+        ttl_s: float = 3600.0,
+        db_path: Path | str | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_s = ttl_s
+        self.db_path = Path(db_path) if db_path else None
+        self._clock = clock
+        self._lru: OrderedDict[str, tuple[float, str, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._counters = {
+            "hits_memory": 0,
+            "hits_disk": 0,
+            "misses": 0,
+            "stores": 0,
+            "expired": 0,
+            "evictions": 0,
+            "bypassed": 0,
+        }
+
+    # ── lookups ───────────────────────────────────────────────
+
+    def get(self, key: str) -> Optional[str]:
+        now = self._clock()
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                expires, _, content = entry
+                if expires > now:
+                    self._lru.move_to_end(key)
+                    self._counters["hits_memory"] += 1
+                    return content
+                del self._lru[key]
+                self._counters["expired"] += 1
+            row = self._disk_get(key, now)
+            if row is not None:
+                self._counters["hits_disk"] += 1
+                self._remember(key, *row)
+                return row[2]
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, key: str, model: str, content: str, *, ttl_s: float | None = None) -> None:
+        expires = self._clock() + (self.ttl_s if ttl_s is None else ttl_s)
+        with self._lock:
+            self._remember(key, expires, model, content)
+            self._disk_put(key, model, content, expires)
+            self._counters["stores"] += 1
+
+    def note_bypass(self, count: int = 1) -> None:
+        with self._lock:
+            self._counters["bypassed"] += count
+
+    # ── invalidation / stats ──────────────────────────────────
+
+    def invalidate(self, model: str | None = None) -> int:
+        """Drop cached completions for ``model`` (all when ``None``).
+
+        Returns the number of in-memory entries removed; the disk tier is
+        cleared for the same scope.
+        """
+        with self._lock:
+            keys = [k for k, (_, m, _) in self._lru.items() if model is None or m == model]
+            for k in keys:
+                del self._lru[k]
+            conn = self._db()
+            if conn is not None:
+                try:
+                    if model is None:
+                        conn.execute("DELETE FROM chat_cache")
+                    else:
+                        conn.execute("DELETE FROM chat_cache WHERE model = ?", (model,))
+                except sqlite3.Error:
+                    log.warning("chat disk cache delete failed", exc_info=True)
+            return len(keys)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            hits = self._counters["hits_memory"] + self._counters["hits_disk"]
+            lookups = hits + self._counters["misses"]
+            return {
+                **self._counters,
+                "entries": len(self._lru),
+                "max_entries": self.max_entries,
+                "ttl_s": self.ttl_s,
+                "disk": self.db_path is not None,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ── internals (lock held) ─────────────────────────────────
+
+    def _remember(self, key: str, expires: float, model: str, content: str) -> None:
+        if self.max_entries <= 0:
+            return
+        self._lru[key] = (expires, model, content)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _db(self) -> sqlite3.Connection | None:
+        if self.db_path is None:
+            return None
+        if self._conn is None:
+            try:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(
+                    self.db_path, timeout=5, check_same_thread=False, isolation_level=None
+                )
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.executescript(_SCHEMA)
+                paths.tighten_permissions(self.db_path)
+            except (sqlite3.Error, OSError):
+                log.warning("chat disk cache unavailable at %s", self.db_path, exc_info=True)
+                self.db_path = None
+                return None
+            self._conn = conn
+        return self._conn
+
+    def _disk_get(self, key: str, now: float) -> tuple[float, str, str] | None:
+        conn = self._db()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT expires, model, content FROM chat_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[0] <= now:
+                conn.execute("DELETE FROM chat_cache WHERE key = ?", (key,))
+                self._counters["expired"] += 1
+                return None
+            return row[0], row[1], row[2]
+        except sqlite3.Error:
+            log.debug("chat disk cache read failed", exc_info=True)
+            return None
+
+    def _disk_put(self, key: str, model: str, content: str, expires: float) -> None:
+        conn = self._db()
+        if conn is None:
+            return
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO chat_cache (key, model, content, expires) "
+                "VALUES (?, ?, ?, ?)",
+                (key, model, content, expires),
+            )
+        except sqlite3.Error:
+            log.warning("chat disk cache write failed", exc_info=True)
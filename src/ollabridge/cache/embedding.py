@@ -0,0 +1,350 @@
+"""Content-addressed embedding cache.
+
+Keys are ``sha256(model, normalised input)``; strings are NFC-normalised
+and token arrays hashed by value, so the same text always hits regardless
+of which request (or batch position) it arrived in.
+
+Two tiers:
+
+- memory: a bounded LRU of ``array('f')`` vectors;
+- disk (optional): one directory per model under
+  ``<data dir>/embedding_cache`` holding ``vectors.f32`` (contiguous
+  float32 rows, read through ``mmap``) and ``index.bin`` (append-only
+  ``digest → row`` records, loaded into a dict on open). Disk hits are
+  promoted to memory. A partial row left by a torn write is cut off before
+  the next append, so later rows stay aligned. When a model's vectors
+  would outgrow ``disk_max_bytes`` its disk tier is cleared and refilled
+  from scratch; ``0`` leaves it unbounded.
+
+A model's dimension is fixed by its first stored vector; a vector with a
+different dimension (model re-pulled under the same name) invalidates that
+model's cache. All operations are thread-safe.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import shutil
+import struct
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+log = logging.getLogger("ollabridge.cache")
+
+_INDEX_RECORD = struct.Struct("<32sQ")
+
+
+def cache_key(model: str, item: str | Sequence[int]) -> bytes:
+    """Digest identifying ``item`` embedded by ``model``."""
+    if isinstance(item, str):
+        body = "s:" + unicodedata.normalize("NFC", item)
+    else:
+        body = "t:" + ",".join(str(int(t)) for t in item)
+    return hashlib.sha256(f"{model}\0{body}".encode("utf-8")).digest()
+
+
+class _ModelStore:
+    """Float32 row file + digest index for one model."""
+
+    def __init__(self, root: Path, model: str) -> None:
+        self.dir = root / hashlib.sha256(model.encode("utf-8")).hexdigest()[:32]
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = self.dir / "vectors.f32"
+        self._index_path = self.dir / "index.bin"
+        self._meta_path = self.dir / "meta.json"
+        self.dim: int | None = None
+        self.rows: dict[bytes, int] = {}
+        self._mm: mmap.mmap | None = None
+        self._mapped_size = 0
+        self.nbytes = 0
+        if self._meta_path.exists():
+            try:
+                self.dim = int(json.loads(self._meta_path.read_text())["dim"])
+            except (ValueError, KeyError, json.JSONDecodeError):
+                self.dim = None
+        if self.dim:
+            self._load_index()
+        else:
+            self._meta_path.write_text(json.dumps({"model": model, "dim": None}))
+
+    def _load_index(self) -> None:
+        if not self._index_path.exists() or not self._vectors_path.exists():
+            return
+        self.nbytes = self._align()
+        data = self._index_path.read_bytes()
+        usable = len(data) - len(data) % _INDEX_RECORD.size
+        n_rows = self.nbytes // (4 * self.dim)
+        records = list(_INDEX_RECORD.iter_unpack(data[:usable]))
+        for digest, row in records:
+            if row < n_rows:  # ignore index entries for torn vector writes
+                self.rows[digest] = row
+        if len(self.rows) < len(records) or usable < len(data):
+            # Drop the dead records: their rows will be reused by appends.
+            tmp = self._index_path.with_suffix(".tmp")
+            tmp.write_bytes(b"".join(_INDEX_RECORD.pack(d, r) for d, r in self.rows.items()))
+            os.replace(tmp, self._index_path)
+
+    def _align(self) -> int:
+        """Cut a torn trailing row off ``vectors.f32``; returns the new size."""
+        size = os.path.getsize(self._vectors_path)
+        whole = size - size % (4 * self.dim)  # type: ignore[operator]
+        if whole != size:
+            log.info("embedding disk cache: dropping a torn row in %s", self.dir)
+            os.truncate(self._vectors_path, whole)
+        return whole
+
+    def get(self, digest: bytes) -> array | None:
+        row = self.rows.get(digest)
+        if row is None or not self.dim:
+            return None
+        width = 4 * self.dim
+        end = (row + 1) * width
+        if end > self._mapped_size:
+            self._remap()
+            if end > self._mapped_size:
+                return None
+        vec = array("f")
+        vec.frombytes(self._mm[row * width : end])  # type: ignore[index]
+        return vec
+
+    def put(self, digest: bytes, vec: array, model: str) -> bool:
+        """Append ``vec``. Returns False on a dimension mismatch (not stored)."""
+        if digest in self.rows:
+            return True
+        if self.dim is None:
+            self.dim = len(vec)
+            self._meta_path.write_text(json.dumps({"model": model, "dim": self.dim}))
+        if len(vec) != self.dim:
+            return False
+        width = 4 * self.dim
+        with open(self._vectors_path, "ab") as fh:
+            size = fh.tell()
+            if size % width:  # an earlier write was torn
+                size -= size % width
+                fh.truncate(size)
+            fh.write(vec.tobytes())
+        self.nbytes = size + width
+        with open(self._index_path, "ab") as fh:
+            fh.write(_INDEX_RECORD.pack(digest, size // width))
+        self.rows[digest] = size // width
+        return True
+
+    def _remap(self) -> None:
+        self.close()
+        if not self._vectors_path.exists():
+            return
+        size = os.path.getsize(self._vectors_path)
+        if size == 0:
+            return
+        with open(self._vectors_path, "rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapped_size = size
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+        self._mm = None
+        self._mapped_size = 0
+
+    def destroy(self) -> None:
+        self.close()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+
+class EmbeddingCache:
+    """Two-tier (memory LRU + optional mmap disk) embedding cache."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 50_000,
+        disk_dir: Path | str | None = None,
+        disk_max_bytes: int = 0,
+    ) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_bytes = max(0, int(disk_max_bytes))
+        self._lru: OrderedDict[tuple[str, bytes], array] = OrderedDict()
+        self._stores: dict[str, _ModelStore] = {}
+        self._dims: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits_memory": 0,
+            "hits_disk": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "disk_resets": 0,
+            "bypassed": 0,
+        }
+
+    # ── lookups ───────────────────────────────────────────────
+
+    def get_many(
+        self, model: str, items: Sequence[str | Sequence[int]]
+    ) -> list[Optional[list[float]]]:
+        """Return cached vectors aligned with ``items`` (``None`` for misses)."""
+        out: list[Optional[list[float]]] = []
+        with self._lock:
+            for item in items:
+                digest = cache_key(model, item)
+                vec = self._lru.get((model, digest))
+                if vec is not None:
+                    self._lru.move_to_end((model, digest))
+                    self._counters["hits_memory"] += 1
+                    out.append(vec.tolist())
+                    continue
+                vec = self._disk_get(model, digest)
+                if vec is not None:
+                    self._counters["hits_disk"] += 1
+                    self._remember(model, digest, vec)
+                    out.append(vec.tolist())
+                    continue
+                self._counters["misses"] += 1
+                out.append(None)
+        return out
+
+    def put_many(
+        self,
+        model: str,
+        items: Sequence[str | Sequence[int]],
+        vectors: Sequence[Sequence[float]],
+    ) -> None:
+        with self._lock:
+            for item, values in zip(items, vectors):
+                if not values:
+                    continue
+                vec = array("f", values)
+                known = self._dims.get(model)
+                if known is None:
+                    store = self._open_store(model)
+                    known = store.dim if store is not None else None
+                if known is not None and known != len(vec):
+                    log.info("embedding dimension changed for %s; resetting its cache", model)
+                    self._drop_model(model)
+                self._dims[model] = len(vec)
+                digest = cache_key(model, item)
+                self._remember(model, digest, vec)
+                self._disk_put(model, digest, vec)
+                self._counters["stores"] += 1
+
+    def note_bypass(self, count: int = 1) -> None:
+        with self._lock:
+            self._counters["bypassed"] += count
+
+    # ── invalidation / stats ──────────────────────────────────
+
+    def invalidate(self, model: str | None = None) -> int:
+        """Drop cached vectors for ``model`` (all models when ``None``).
+
+        Returns the number of in-memory entries removed; disk tiers for the
+        model are deleted as well.
+        """
+        with self._lock:
+            if model is not None:
+                return self._drop_model(model)
+            removed = len(self._lru)
+            self._lru.clear()
+            self._dims.clear()
+            for store in self._stores.values():
+                store.destroy()
+            self._stores.clear()
+            if self.disk_dir is not None:
+                shutil.rmtree(self.disk_dir, ignore_errors=True)
+            return removed
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = (
+                self._counters["hits_memory"]
+                + self._counters["hits_disk"]
+                + self._counters["misses"]
+            )
+            hits = self._counters["hits_memory"] + self._counters["hits_disk"]
+            return {
+                **self._counters,
+                "entries": len(self._lru),
+                "max_entries": self.max_entries,
+                "disk": self.disk_dir is not None,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            for store in self._stores.values():
+                store.close()
+
+    # ── internals (lock held) ─────────────────────────────────
+
+    def _drop_model(self, model: str) -> int:
+        keys = [k for k in self._lru if k[0] == model]
+        for k in keys:
+            del self._lru[k]
+        self._dims.pop(model, None)
+        store = self._stores.pop(model, None) or self._open_store(model)
+        self._stores.pop(model, None)
+        if store is not None:
+            store.destroy()
+        return len(keys)
+
+    def _remember(self, model: str, digest: bytes, vec: array) -> None:
+        if self.max_entries <= 0:
+            return
+        key = (model, digest)
+        self._lru[key] = vec
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _open_store(self, model: str) -> _ModelStore | None:
+        if self.disk_dir is None:
+            return None
+        store = self._stores.get(model)
+        if store is None:
+            try:
+                store = _ModelStore(self.disk_dir, model)
+            except OSError:
+                log.warning("embedding disk cache unavailable for %s", model, exc_info=True)
+                return None
+            self._stores[model] = store
+        return store
+
+    def _disk_get(self, model: str, digest: bytes) -> array | None:
+        store = self._open_store(model)
+        if store is None:
+            return None
+        try:
+            return store.get(digest)
+        except (OSError, ValueError):
+            log.debug("embedding disk cache read failed", exc_info=True)
+            return None
+
+    def _disk_put(self, model: str, digest: bytes, vec: array) -> None:
+        store = self._open_store(model)
+        if store is None:
+            return
+        if (
+            self.disk_max_bytes
+            and digest not in store.rows
+            and store.nbytes + 4 * len(vec) > self.disk_max_bytes
+        ):
+            log.info("embedding disk cache for %s is full; starting it over", model)
+            store.destroy()
+            self._stores.pop(model, None)
+            self._counters["disk_resets"] += 1
+            store = self._open_store(model)
+            if store is None:
+                return
+        try:
+            store.put(digest, vec, model)
+        except OSError:
+            log.warning("embedding disk cache write failed", exc_info=True)
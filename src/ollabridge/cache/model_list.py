@@ -0,0 +1,76 @@
+"""Stale-while-revalidate cache for the merged ``/v1/models`` listing.
+
+The value is tied to the registry version it was built from:
+
+- fresh   — same registry version and younger than ``ttl``: served as is;
+- stale   — same version, older than ``ttl`` but within ``max_stale``:
+  served immediately while one background refresh runs;
+- miss    — nothing cached, registry changed, or too old: the caller
+  awaits a refresh (concurrent callers share the same in-flight one).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+log = logging.getLogger("ollabridge.cache")
+
+Fetcher = Callable[[], Awaitable[list[dict[str, Any]]]]
+
+
+class ModelListCache:
+    def __init__(
+        self,
+        fetch: Fetcher,
+        *,
+        version: Callable[[], int],
+        ttl: float = 10.0,
+        max_stale: float = 300.0,
+    ) -> None:
+        self._fetch = fetch
+        self._version = version
+        self.ttl = ttl
+        self.max_stale = max(ttl, max_stale)
+        self._value: Optional[list[dict[str, Any]]] = None
+        self._built_at = 0.0
+        self._built_version = -1
+        self._refresh: Optional[asyncio.Task[list[dict[str, Any]]]] = None
+
+    async def get(self) -> tuple[list[dict[str, Any]], str]:
+        """Return ``(models, state)`` where state is fresh, stale or miss."""
+        if self._value is not None and self._built_version == self._version():
+            age = time.monotonic() - self._built_at
+            if age < self.ttl:
+                return self._value, "fresh"
+            if age < self.max_stale:
+                self._ensure_refresh()
+                return self._value, "stale"
+        # Shield so a cancelled client request does not abort the shared refresh.
+        return await asyncio.shield(self._ensure_refresh()), "miss"
+
+    def invalidate(self) -> None:
+        self._value = None
+
+    def _ensure_refresh(self) -> asyncio.Task[list[dict[str, Any]]]:
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.get_running_loop().create_task(self._run())
+            self._refresh.add_done_callback(_log_failure)
+        return self._refresh
+
+    async def _run(self) -> list[dict[str, Any]]:
+        value = await self._fetch()
+        # Read the version afterwards: the fetch itself refreshes node model
+        # lists in the registry. A node joining mid-fetch is picked up by the
+        # next refresh, at most ``ttl`` later.
+        self._value = value
+        self._built_at = time.monotonic()
+        self._built_version = self._version()
+        return value
+
+
+def _log_failure(task: asyncio.Task[Any]) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        log.warning("model list refresh failed: %s", task.exception())
@@ -0,0 +1,402 @@
+"""Semantic response cache: answers reused across paraphrased prompts.
+
+The final user message is embedded, and the vector is compared by cosine
+similarity with the prompts of earlier answers in the same scope. A scope
+is one model plus an opaque caller-defined string (policy, embedding model
+and the conversation before the final message). The best match at or
+above ``threshold`` is served.
+
+The index is a brute-force scan over unit-length float32 rows. With NumPy
+(``pip install ollabridge[semantic]``) the scan is one matrix-vector
+product; without it, it is a plain Python loop. ``max_entries`` bounds the
+index with LRU eviction across scopes, which keeps the scan small enough
+that an approximate structure (IVF/HNSW) would not pay for itself.
+
+With ``disk_dir``, each scope persists in its own directory:
+
+- ``vectors.f32`` holds fixed-width float32 rows, memory-mapped when NumPy
+  is available;
+- ``entries.jsonl`` is an append-only log of ``row → answer`` records,
+  compacted when the scope is opened.
+
+A scope whose last answer is evicted or expires is removed along with its
+directory.
+
+All operations are thread-safe.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import operator
+import os
+import shutil
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional, Sequence
+
+from ollabridge.core.flow_metrics import LatencyHistogram
+
+try:  # One matrix-vector product per lookup instead of a Python loop.
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None  # type: ignore[assignment]
+
+log = logging.getLogger("ollabridge.cache")
+
+_MIN_ROWS = 64
+
+
+def _unit(vector: Sequence[float]) -> Optional[array]:
+    vec = array("f", vector)
+    norm = math.sqrt(sum(x * x for x in vec))
+    if not norm:
+        return None
+    return array("f", (x / norm for x in vec))
+
+
+class _Rows:
+    """Fixed-width float32 row storage, optionally backed by a file."""
+
+    def __init__(self, dim: int, path: Optional[Path]) -> None:
+        self.dim = dim
+        self.path = path
+        self.capacity = 0
+        self._mat: Any = None  # numpy array / memmap
+        self._list: list[Optional[array]] = []
+        if path is not None and path.exists():
+            self._open_existing()
+
+    def _open_existing(self) -> None:
+        assert self.path is not None
+        rows = os.path.getsize(self.path) // (4 * self.dim)
+        if np is not None:
+            self.capacity = rows
+            if rows:
+                self._mat = np.memmap(self.path, dtype=np.float32, mode="r+", shape=(rows, self.dim))
+            return
+        data = array("f")
+        with open(self.path, "rb") as fh:
+            data.frombytes(fh.read(rows * 4 * self.dim))
+        self._list = [data[i * self.dim : (i + 1) * self.dim] for i in range(rows)]
+        self.capacity = rows
+
+    def _grow(self, needed: int) -> None:
+        capacity = max(_MIN_ROWS, self.capacity)
+        while capacity < needed:
+            capacity *= 2
+        if np is None:
+            self._list.extend([None] * (capacity - len(self._list)))
+        elif self.path is not None:
+            if self._mat is not None:
+                self._mat.flush()
+                self._mat = None
+            with open(self.path, "ab") as fh:
+                fh.truncate(capacity * 4 * self.dim)
+            self._mat = np.memmap(self.path, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+        else:
+            grown = np.zeros((capacity, self.dim), dtype=np.float32)
+            if self._mat is not None:
+                grown[: self.capacity] = self._mat
+            self._mat = grown
+        self.capacity = capacity
+
+    def set(self, row: int, vec: array) -> None:
+        if row >= self.capacity:
+            self._grow(row + 1)
+        if np is not None:
+            self._mat[row] = np.frombuffer(vec.tobytes(), dtype=np.float32)
+            return
+        self._list[row] = vec
+        if self.path is not None:
+            with open(self.path, "r+b" if self.path.exists() else "w+b") as fh:
+                fh.seek(row * 4 * self.dim)
+                fh.write(vec.tobytes())
+
+    def best(self, query: array, rows: Sequence[int]) -> tuple[int, float]:
+        """Row among *rows* most similar to *query*, and its similarity."""
+        if np is not None:
+            idx = np.fromiter(rows, dtype=np.int64, count=len(rows))
+            q = np.frombuffer(query.tobytes(), dtype=np.float32)
+            scores = self._mat[idx] @ q
+            i = int(np.argmax(scores))
+            return int(idx[i]), float(scores[i])
+        best_row, best_score = -1, -2.0
+        for row in rows:
+            score = sum(map(operator.mul, query, self._list[row]))  # type: ignore[arg-type]
+            if score > best_score:
+                best_row, best_score = row, score
+        return best_row, best_score
+
+    def flush(self) -> None:
+        if np is not None and isinstance(self._mat, np.memmap):
+            self._mat.flush()
+
+
+class _Scope:
+    def __init__(self, model: str, scope: str, dim: int, root: Optional[Path]) -> None:
+        self.model = model
+        self.scope = scope
+        self.dim = dim
+        self.answers: dict[int, tuple[float, str]] = {}  # row -> (expires, answer)
+        self.free: list[int] = []
+        self.size = 0  # high-water row
+        self.dir = root / _scope_dir(model, scope) if root is not None else None
+        if self.dir is not None:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            self._log = self.dir / "entries.jsonl"
+            (self.dir / "meta.json").write_text(
+                json.dumps({"model": model, "scope": scope, "dim": dim})
+            )
+        self.rows = _Rows(dim, self.dir / "vectors.f32" if self.dir is not None else None)
+
+    def load(self) -> None:
+        """Replay and compact the entry log (disk-backed scopes only)."""
+        if self.dir is None or not self._log.exists():
+            return
+        for line in self._log.read_text(encoding="utf-8").splitlines():
+            try:
+                rec = json.loads(line)
+                row = int(rec["row"])
+            except (ValueError, KeyError, TypeError):
+                continue  # torn write
+            if row >= self.rows.capacity:
+                continue
+            if rec.get("drop"):
+                self.answers.pop(row, None)
+            else:
+                self.answers[row] = (float(rec["expires"]), str(rec["answer"]))
+        self.size = max(self.answers, default=-1) + 1
+        self.free = [r for r in range(self.size) if r not in self.answers]
+        tmp = self._log.with_suffix(".tmp")
+        tmp.write_text(
+            "".join(
+                json.dumps({"row": r, "expires": e, "answer": a}) + "\n"
+                for r, (e, a) in self.answers.items()
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp, self._log)
+
+    def add(self, vec: array, answer: str, expires: float) -> int:
+        row = self.free.pop() if self.free else self.size
+        self.size = max(self.size, row + 1)
+        self.rows.set(row, vec)
+        self.answers[row] = (expires, answer)
+        self._append({"row": row, "expires": expires, "answer": answer})
+        return row
+
+    def drop(self, row: int) -> None:
+        if self.answers.pop(row, None) is not None:
+            self.free.append(row)
+            self._append({"row": row, "drop": True})
+
+    def _append(self, rec: dict[str, Any]) -> None:
+        if self.dir is None:
+            return
+        with open(self._log, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(rec) + "\n")
+
+    def destroy(self) -> None:
+        self.rows.flush()
+        if self.dir is not None:
+            shutil.rmtree(self.dir, ignore_errors=True)
+
+
+def _scope_dir(model: str, scope: str) -> str:
+    return hashlib.sha256(f"{model}\0{scope}".encode("utf-8")).hexdigest()[:32]
+
+
+class SemanticCache:
+    """Similarity-matched answer cache over a bounded vector index."""
+
+    def __init__(
+        self,
+        *,
+        threshold: float = 0.95,
+        max_entries: int = 5000,
+        ttl_s: float = 3600.0,
+        disk_dir: Path | str | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.threshold = threshold
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_s = ttl_s
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._clock = clock
+        self._scopes: dict[tuple[str, str], _Scope] = {}
+        self._lru: OrderedDict[tuple[tuple[str, str], int], None] = OrderedDict()
+        self._lookup_us = LatencyHistogram()
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "expired": 0,
+            "evictions": 0,
+            "bypassed": 0,
+        }
+
+    # ── lookups ───────────────────────────────────────────────
+
+    def lookup(
+        self, model: str, scope: str, vector: Sequence[float]
+    ) -> Optional[tuple[str, float]]:
+        """Best cached ``(answer, similarity)`` at or above the threshold."""
+        query = _unit(vector)
+        t0 = time.perf_counter()
+        with self._lock:
+            self._load_all()
+            try:
+                hit = self._search((model, scope), query) if query is not None else None
+            finally:
+                self._lookup_us.record(int((time.perf_counter() - t0) * 1_000_000))
+            self._counters["hits" if hit is not None else "misses"] += 1
+            return hit
+
+    def put(
+        self,
+        model: str,
+        scope: str,
+        vector: Sequence[float],
+        answer: str,
+        *,
+        ttl_s: float | None = None,
+    ) -> None:
+        vec = _unit(vector)
+        if vec is None or self.max_entries <= 0:
+            return
+        expires = self._clock() + (self.ttl_s if ttl_s is None else ttl_s)
+        key = (model, scope)
+        with self._lock:
+            self._load_all()
+            current = self._scopes.get(key)
+            if current is not None and current.dim != len(vec):
+                log.info("embedding dimension changed for %s; resetting its semantic cache", model)
+                self._drop_scope(key)
+                current = None
+            if current is None:
+                try:
+                    current = self._scopes[key] = _Scope(model, scope, len(vec), self.disk_dir)
+                except OSError:
+                    log.warning("semantic disk cache unavailable", exc_info=True)
+                    self.disk_dir = None
+                    current = self._scopes[key] = _Scope(model, scope, len(vec), None)
+            try:
+                row = current.add(vec, answer, expires)
+            except OSError:
+                log.warning("semantic disk cache write failed", exc_info=True)
+                return
+            self._lru[(key, row)] = None
+            self._counters["stores"] += 1
+            while len(self._lru) > self.max_entries:
+                self._evict_oldest()
+                self._counters["evictions"] += 1
+
+    def note_bypass(self, count: int = 1) -> None:
+        with self._lock:
+            self._counters["bypassed"] += count
+
+    # ── invalidation / stats ──────────────────────────────────
+
+    def invalidate(self, model: str | None = None) -> int:
+        """Drop cached answers for ``model`` (all when ``None``); returns the count."""
+        with self._lock:
+            self._load_all()
+            keys = [k for k in self._scopes if model is None or k[0] == model]
+            removed = sum(len(self._scopes[k].answers) for k in keys)
+            for key in keys:
+                self._drop_scope(key)
+            return removed
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "entries": len(self._lru),
+                "max_entries": self.max_entries,
+                "threshold": self.threshold,
+                "disk": self.disk_dir is not None,
+                "vectorized": np is not None,
+                "hit_rate": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+                "lookup_us": {
+                    "p50": self._lookup_us.percentile(50),
+                    "p95": self._lookup_us.percentile(95),
+                    "p99": self._lookup_us.percentile(99),
+                },
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            for scope in self._scopes.values():
+                scope.rows.flush()
+
+    # ── internals (lock held) ─────────────────────────────────
+
+    def _search(self, key: tuple[str, str], query: array) -> Optional[tuple[str, float]]:
+        current = self._scopes.get(key)
+        if current is None or not current.answers or current.dim != len(query):
+            return None
+        now = self._clock()
+        for row in [r for r, (expires, _) in current.answers.items() if expires <= now]:
+            current.drop(row)
+            self._lru.pop((key, row), None)
+            self._counters["expired"] += 1
+        if not current.answers:
+            self._drop_scope(key)
+            return None
+        row, score = current.rows.best(query, list(current.answers))
+        if score < self.threshold:
+            return None
+        self._lru.move_to_end((key, row))
+        return current.answers[row][1], score
+
+    def _evict_oldest(self) -> None:
+        (key, row), _ = self._lru.popitem(last=False)
+        current = self._scopes[key]
+        current.drop(row)
+        # Scopes are per conversation prefix: an emptied one would otherwise
+        # keep its directory, preallocated vectors and memmap for good.
+        if not current.answers:
+            self._drop_scope(key)
+
+    def _drop_scope(self, key: tuple[str, str]) -> None:
+        current = self._scopes.pop(key, None)
+        if current is None:
+            return
+        for row in current.answers:
+            self._lru.pop((key, row), None)
+        current.destroy()
+
+    def _load_all(self) -> None:
+        """Open every persisted scope once, oldest answers first in the LRU."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.disk_dir is None or not self.disk_dir.is_dir():
+            return
+        for path in sorted(self.disk_dir.iterdir()):
+            try:
+                meta = json.loads((path / "meta.json").read_text())
+                current = _Scope(meta["model"], meta["scope"], int(meta["dim"]), self.disk_dir)
+                current.load()
+            except (OSError, ValueError, KeyError, TypeError):
+                log.warning("skipping unreadable semantic cache scope %s", path, exc_info=True)
+                continue
+            if not current.answers:
+                current.destroy()
+                continue
+            key = (current.model, current.scope)
+            self._scopes[key] = current
+            for row in current.answers:
+                self._lru[(key, row)] = None
+        while len(self._lru) > self.max_entries:
+            self._evict_oldest()
@@ -22,8 +22,6 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any, Optional
 
-import httpx
-
 try:
     from websockets.asyncio.client import connect as ws_connect
 except ImportError:
@@ -38,6 +36,7 @@ from ollabridge.cloud.device_config import (
     load_cloud_device_credentials,
     save_cloud_device_credentials,
 )
+from ollabridge.core.http_pool import http_client
 
 log = logging.getLogger("ollabridge.cloud")
 
@@ -308,21 +307,21 @@ class CloudBridgeManager:
 
         models: list[str] = []
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                resp = await client.get(f"{gateway_url}/v1/models", headers=headers)
-                if resp.status_code == 200:
-                    for m in resp.json().get("data", []):
-                        models.append(m["id"])
+            url = f"{gateway_url}/v1/models"
+            resp = await http_client(url).get(url, headers=headers, timeout=10.0)
+            if resp.status_code == 200:
+                for m in resp.json().get("data", []):
+                    models.append(m["id"])
         except Exception as exc:
             log.warning("Model discovery via local gateway failed: %s", exc)
 
             # Fallback: try Ollama directly
             try:
-                async with httpx.AsyncClient(timeout=8.0) as client:
-                    resp = await client.get(f"{self._ollama_url}/api/tags")
-                    if resp.status_code == 200:
-                        for m in resp.json().get("models", []):
-                            models.append(m["name"])
+                url = f"{self._ollama_url}/api/tags"
+                resp = await http_client(url).get(url, timeout=8.0)
+                if resp.status_code == 200:
+                    for m in resp.json().get("models", []):
+                        models.append(m["name"])
             except Exception:
                 pass
 
@@ -389,14 +388,15 @@ class CloudBridgeManager:
         if keys and keys[0].strip():
             headers["X-API-Key"] = keys[0].strip()
 
-        async with httpx.AsyncClient(timeout=180.0) as client:
-            resp = await client.post(
-                f"{gateway_url}/v1/chat/completions",
-                json=payload,
-                headers=headers,
-            )
-            resp.raise_for_status()
-            return resp.json()
+        url = f"{gateway_url}/v1/chat/completions"
+        resp = await http_client(url).post(
+            url,
+            json=payload,
+            headers=headers,
+            timeout=180.0,
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def _fetch_media(self, payload: dict) -> dict:
         """Fetch media from local HomePilot and return as base64.
@@ -432,20 +432,19 @@ class CloudBridgeManager:
         if keys and keys[0].strip():
             headers["X-API-Key"] = keys[0].strip()
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.get(url, headers=headers)
-            resp.raise_for_status()
+        resp = await http_client(url).get(url, headers=headers, timeout=30.0)
+        resp.raise_for_status()
 
-            if len(resp.content) > max_size:
-                raise ValueError(f"File exceeds {max_size // 1024 // 1024}MB limit")
+        if len(resp.content) > max_size:
+            raise ValueError(f"File exceeds {max_size // 1024 // 1024}MB limit")
 
-            mime_type = resp.headers.get("content-type", "application/octet-stream")
+        mime_type = resp.headers.get("content-type", "application/octet-stream")
 
-            return {
-                "content": base64.b64encode(resp.content).decode(),
-                "mime_type": mime_type,
-                "size_bytes": len(resp.content),
-            }
+        return {
+            "content": base64.b64encode(resp.content).decode(),
+            "mime_type": mime_type,
+            "size_bytes": len(resp.content),
+        }
 
     async def _bridge_loop(self) -> None:
         """Main bridge loop with auto-reconnect."""
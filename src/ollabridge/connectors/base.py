@@ -15,6 +15,17 @@ class Connector(ABC):
     async def embeddings(self, *, base: str, payload: dict[str, Any]) -> dict[str, Any]:
         """Execute an embeddings request and return the upstream JSON."""
 
+    async def chat_stream(self, *, base: str, payload: dict[str, Any]) -> AsyncIterator[str]:
+        """Stream content fragments for a chat request.
+
+        Connectors without a native streaming transport fall back to the
+        buffered :meth:`chat` and emit its content as a single fragment.
+        """
+        data = await self.chat(base=base, payload=payload)
+        content = str(data.get("content", "") or "")
+        if content:
+            yield content
+
     async def models(self, *, base: str) -> dict[str, Any]:
         """Best-effort list models."""
         return {"data": []}
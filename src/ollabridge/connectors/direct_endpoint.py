@@ -2,9 +2,8 @@ from __future__ import annotations
 
 from typing import Any
 
-import httpx
-
 from ollabridge.connectors.base import Connector
+from ollabridge.core.http_pool import http_client
 
 
 class DirectEndpointConnector(Connector):
@@ -13,20 +12,22 @@ class DirectEndpointConnector(Connector):
     This is the highest performance path when a node has a stable, reachable endpoint.
     """
 
-    def __init__(self) -> None:
-        self._client = httpx.AsyncClient(timeout=120)
+    timeout: float = 120
 
     async def chat(self, *, base: str, payload: dict[str, Any]) -> dict[str, Any]:
-        r = await self._client.post(f"{base.rstrip('/')}/node/v1/chat", json=payload)
+        url = f"{base.rstrip('/')}/node/v1/chat"
+        r = await http_client(url).post(url, json=payload, timeout=self.timeout)
         r.raise_for_status()
         return r.json()
 
     async def embeddings(self, *, base: str, payload: dict[str, Any]) -> dict[str, Any]:
-        r = await self._client.post(f"{base.rstrip('/')}/node/v1/embeddings", json=payload)
+        url = f"{base.rstrip('/')}/node/v1/embeddings"
+        r = await http_client(url).post(url, json=payload, timeout=self.timeout)
         r.raise_for_status()
         return r.json()
 
     async def models(self, *, base: str) -> dict[str, Any]:
-        r = await self._client.get(f"{base.rstrip('/')}/node/v1/models")
+        url = f"{base.rstrip('/')}/node/v1/models"
+        r = await http_client(url).get(url, timeout=self.timeout)
         r.raise_for_status()
         return r.json()
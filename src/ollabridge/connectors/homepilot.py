@@ -11,24 +11,32 @@ OpenAI-compatible format, enabling any OllaBridge client (including
 """
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, AsyncIterator
 
 import httpx
 
 from ollabridge.connectors.base import Connector
+from ollabridge.core.http_pool import http_client
+from ollabridge.core.streaming import iter_openai_deltas
+
+
+class HomePilotUpstreamError(RuntimeError):
+    """Structured HomePilot error surfaced while opening a stream."""
+
+    def __init__(self, status_code: int, error_body: Any) -> None:
+        super().__init__(f"HomePilot returned {status_code}")
+        self.status_code = status_code
+        self.error_body = error_body
 
 
 class HomePilotConnector(Connector):
     """Connects to a HomePilot instance via its OpenAI-compatible API."""
 
     def __init__(self) -> None:
-        self._client = httpx.AsyncClient(
-            timeout=httpx.Timeout(120.0, connect=10.0),
-            follow_redirects=True,
-        )
+        self._timeout = httpx.Timeout(120.0, connect=10.0)
 
     async def aclose(self) -> None:
-        await self._client.aclose()
+        """No-op: connections live in the shared pool (``core.http_pool``)."""
 
     def _headers(self, api_key: str = "") -> dict[str, str]:
         headers: dict[str, str] = {
@@ -39,13 +47,13 @@ class HomePilotConnector(Connector):
             headers["X-API-Key"] = api_key
         return headers
 
-    async def chat(self, *, base: str, payload: dict[str, Any]) -> dict[str, Any]:
-        url = f"{base.rstrip('/')}/v1/chat/completions"
-
+    def _chat_request(
+        self, payload: dict[str, Any], *, stream: bool
+    ) -> tuple[dict[str, Any], dict[str, str]]:
         request_body: dict[str, Any] = {
             "model": payload.get("model", "default"),
             "messages": payload.get("messages", []),
-            "stream": False,
+            "stream": stream,
         }
 
         passthrough_fields = (
@@ -70,8 +78,19 @@ class HomePilotConnector(Connector):
         client_type = payload.get("client_type", "")
         if client_type:
             headers["X-Client-Type"] = client_type
+        return request_body, headers
 
-        response = await self._client.post(url, json=request_body, headers=headers)
+    async def chat(self, *, base: str, payload: dict[str, Any]) -> dict[str, Any]:
+        url = f"{base.rstrip('/')}/v1/chat/completions"
+        request_body, headers = self._chat_request(payload, stream=False)
+
+        response = await http_client(url).post(
+            url,
+            json=request_body,
+            headers=headers,
+            timeout=self._timeout,
+            follow_redirects=True,
+        )
 
         # Propagate structured errors from HomePilot (e.g. 404 persona_unpublished)
         if response.status_code >= 400:
@@ -110,6 +129,34 @@ class HomePilotConnector(Connector):
 
         return result
 
+    async def chat_stream(self, *, base: str, payload: dict[str, Any]) -> AsyncIterator[str]:
+        """Stream persona reply fragments from HomePilot's SSE endpoint.
+
+        Structured upstream errors (e.g. 404 persona_unpublished) are raised
+        as :class:`HomePilotUpstreamError` before any fragment is yielded.
+        """
+        url = f"{base.rstrip('/')}/v1/chat/completions"
+        request_body, headers = self._chat_request(payload, stream=True)
+        headers["Accept"] = "text/event-stream"
+
+        async with http_client(url).stream(
+            "POST",
+            url,
+            json=request_body,
+            headers=headers,
+            timeout=self._timeout,
+            follow_redirects=True,
+        ) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                try:
+                    error_body = response.json()
+                except Exception:
+                    error_body = {"detail": response.text}
+                raise HomePilotUpstreamError(response.status_code, error_body)
+            async for chunk in iter_openai_deltas(response):
+                yield chunk
+
     async def embeddings(self, *, base: str, payload: dict[str, Any]) -> dict[str, Any]:
         return {"embedding": []}
 
@@ -117,7 +164,9 @@ class HomePilotConnector(Connector):
         url = f"{base.rstrip('/')}/v1/models"
         headers = self._headers(api_key)
         try:
-            response = await self._client.get(url, headers=headers)
+            response = await http_client(url).get(
+                url, headers=headers, timeout=self._timeout, follow_redirects=True
+            )
             response.raise_for_status()
             data = response.json()
             if isinstance(data, dict) and isinstance(data.get("data"), list):
@@ -17,6 +17,7 @@ from typing import Any
 import httpx
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
+from ollabridge.core.http_pool import http_client
 from ollabridge.core.settings import settings
 from ollabridge.core.security import require_api_key
 from ollabridge.core import runtime_settings as rts
@@ -108,22 +109,23 @@ async def media_proxy(
         params["token"] = api_key
 
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await client.get(upstream_url, headers=headers, params=params)
-            if resp.status_code >= 400:
-                raise HTTPException(resp.status_code, f"Upstream returned {resp.status_code}")
-
-            content_type = resp.headers.get("content-type", "")
-            if not content_type:
-                content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
-
-            return Response(
-                content=resp.content,
-                media_type=content_type,
-                headers={
-                    "Cache-Control": "private, max-age=3600, immutable",
-                },
-            )
+        resp = await http_client(upstream_url).get(
+            upstream_url, headers=headers, params=params, timeout=30
+        )
+        if resp.status_code >= 400:
+            raise HTTPException(resp.status_code, f"Upstream returned {resp.status_code}")
+
+        content_type = resp.headers.get("content-type", "")
+        if not content_type:
+            content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+        return Response(
+            content=resp.content,
+            media_type=content_type,
+            headers={
+                "Cache-Control": "private, max-age=3600, immutable",
+            },
+        )
     except httpx.HTTPError as e:
         log.warning("Media proxy error for %s: %s", path, e)
         raise HTTPException(502, f"Failed to fetch media: {e}")
@@ -16,6 +16,8 @@ from typing import Any, Optional
 
 import httpx
 
+from ollabridge.core.http_pool import http_client
+
 
 @dataclass(frozen=True)
 class PersonaContext:
@@ -127,15 +129,12 @@ class MemoryBridge:
     """
 
     def __init__(self, *, cache_ttl_seconds: float = 60.0) -> None:
-        self._client = httpx.AsyncClient(
-            timeout=httpx.Timeout(10.0, connect=5.0),
-            follow_redirects=True,
-        )
+        self._timeout = httpx.Timeout(10.0, connect=5.0)
         self._cache: dict[str, _CacheEntry] = {}
         self._cache_ttl = cache_ttl_seconds
 
     async def aclose(self) -> None:
-        await self._client.aclose()
+        """No-op: connections live in the shared pool (``core.http_pool``)."""
 
     # ----- public API -----
 
@@ -225,9 +224,12 @@ class MemoryBridge:
         agent_data: dict[str, Any] = {}
         if personality_id:
             try:
-                resp = await self._client.get(
-                    f"{base}/api/personalities/{personality_id}",
+                url = f"{base}/api/personalities/{personality_id}"
+                resp = await http_client(url).get(
+                    url,
                     headers=headers,
+                    timeout=self._timeout,
+                    follow_redirects=True,
                 )
                 if resp.status_code == 200:
                     agent_data = resp.json()
@@ -241,10 +243,13 @@ class MemoryBridge:
         if pid:
             for category, target in [("fact", user_facts), ("preference", user_prefs)]:
                 try:
-                    resp = await self._client.get(
-                        f"{base}/persona/memory",
+                    url = f"{base}/persona/memory"
+                    resp = await http_client(url).get(
+                        url,
                         params={"project_id": pid, "category": category},
                         headers=headers,
+                        timeout=self._timeout,
+                        follow_redirects=True,
                     )
                     if resp.status_code == 200:
                         body = resp.json()
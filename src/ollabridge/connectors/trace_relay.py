@@ -19,6 +19,8 @@ from typing import Any, Dict, List, Optional
 
 import httpx
 
+from ollabridge.core.http_pool import http_client
+
 log = logging.getLogger(__name__)
 
 
@@ -27,19 +29,16 @@ class TraceRelay:
     Relays trace event batches from the 3D client to HomePilot's
     spatial memory service.
 
-    Thread-safe: uses a shared httpx.AsyncClient.
+    Connections come from the process-wide pool in ``core.http_pool``.
     """
 
     def __init__(self, homepilot_base: str = "", api_key: str = ""):
         self._base = homepilot_base.rstrip("/") if homepilot_base else ""
         self._api_key = api_key
-        self._client = httpx.AsyncClient(
-            timeout=httpx.Timeout(30.0, connect=5.0),
-            follow_redirects=True,
-        )
+        self._timeout = httpx.Timeout(30.0, connect=5.0)
 
     async def aclose(self) -> None:
-        await self._client.aclose()
+        """No-op: connections live in the shared pool (``core.http_pool``)."""
 
     def configure(self, homepilot_base: str, api_key: str = "") -> None:
         """Update HomePilot base URL at runtime (e.g., after pairing)."""
@@ -94,10 +93,12 @@ class TraceRelay:
 
         for attempt in range(max_retries):
             try:
-                resp = await self._client.post(
+                resp = await http_client(url).post(
                     url,
                     json=payload,
                     headers=self._headers(),
+                    timeout=self._timeout,
+                    follow_redirects=True,
                 )
                 if resp.status_code < 400:
                     result = resp.json()
@@ -153,8 +154,12 @@ class TraceRelay:
         }
 
         try:
-            resp = await self._client.get(
-                url, params=params, headers=self._headers()
+            resp = await http_client(url).get(
+                url,
+                params=params,
+                headers=self._headers(),
+                timeout=self._timeout,
+                follow_redirects=True,
             )
             if resp.status_code == 200:
                 return resp.json()
@@ -174,10 +179,12 @@ class TraceRelay:
 
         url = f"{self._base}/api/spatial/context-block"
         try:
-            resp = await self._client.get(
+            resp = await http_client(url).get(
                 url,
                 params={"persona_id": persona_id},
                 headers=self._headers(),
+                timeout=self._timeout,
+                follow_redirects=True,
             )
             if resp.status_code == 200:
                 body = resp.json()
@@ -0,0 +1,286 @@
+"""Admission control in front of node dispatch.
+
+Each node admits at most ``limit`` concurrent requests (its capacity times
+``ADMISSION_SLOTS_PER_CAPACITY``). Requests beyond that wait in a bounded
+FIFO per ``(node, model)`` instead of piling up inside the runtime:
+
+- Inside a queue, tenants (API keys or paired devices) are served round
+  robin, so one client's burst cannot starve the others.
+- A full queue makes room by evicting the newest waiter of the tenant with
+  the most queued requests, as long as that tenant holds more than the
+  newcomer; otherwise the newcomer is shed.
+- A freed slot goes to the queue whose head has waited longest.
+- A waiter that is not admitted within ``max_wait_s`` is shed.
+
+Shed requests carry a ``retry_after`` hint derived from the node's recent
+drain rate (completions per second over the last ``drain_window_s``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from ollabridge.core.deadline import Deadline, DeadlineExceeded
+from ollabridge.core.flow_metrics import LatencyHistogram
+
+
+class AdmissionRejected(RuntimeError):
+    """Load shed: the node's queue is full or the wait ran out."""
+
+    def __init__(self, message: str, *, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+@dataclass(eq=False)
+class _Waiter:
+    tenant: str
+    enqueued: float
+    future: asyncio.Future = field(repr=False)
+
+
+class _ModelQueue:
+    """FIFO per tenant, tenants served round robin."""
+
+    def __init__(self) -> None:
+        self.tenants: dict[str, deque[_Waiter]] = {}  # insertion order = turn order
+        self.size = 0
+
+    def push(self, waiter: _Waiter) -> None:
+        self.tenants.setdefault(waiter.tenant, deque()).append(waiter)
+        self.size += 1
+
+    def oldest(self) -> Optional[float]:
+        heads = [w[0].enqueued for w in self.tenants.values()]
+        return min(heads) if heads else None
+
+    def pop(self) -> Optional[_Waiter]:
+        for tenant, waiters in self.tenants.items():
+            waiter = waiters.popleft()
+            del self.tenants[tenant]
+            if waiters:
+                self.tenants[tenant] = waiters  # back of the rotation
+            self.size -= 1
+            return waiter
+        return None
+
+    def remove(self, waiter: _Waiter) -> None:
+        waiters = self.tenants.get(waiter.tenant)
+        if waiters is None or waiter not in waiters:
+            return
+        waiters.remove(waiter)
+        if not waiters:
+            del self.tenants[waiter.tenant]
+        self.size -= 1
+
+    def evict_for(self, tenant: str) -> Optional[_Waiter]:
+        """Newest waiter of the biggest tenant, if it holds more than *tenant*."""
+        if not self.tenants:
+            return None
+        biggest = max(self.tenants, key=lambda t: len(self.tenants[t]))
+        mine = len(self.tenants.get(tenant, ()))
+        if biggest == tenant or len(self.tenants[biggest]) <= mine + 1:
+            return None
+        waiter = self.tenants[biggest].pop()
+        if not self.tenants[biggest]:
+            del self.tenants[biggest]
+        self.size -= 1
+        return waiter
+
+
+class _NodeState:
+    def __init__(self) -> None:
+        self.active = 0
+        self.limit = 1
+        self.queues: dict[str, _ModelQueue] = {}
+        self.releases: deque[float] = deque()
+
+    @property
+    def queued(self) -> int:
+        return sum(q.size for q in self.queues.values())
+
+    def oldest(self) -> Optional[float]:
+        return min((q.oldest() for q in self.queues.values() if q.size), default=None)
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        *,
+        max_queue: int = 64,
+        max_wait_s: float = 30.0,
+        drain_window_s: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_queue = max(0, max_queue)
+        self.max_wait_s = max_wait_s
+        self.drain_window_s = drain_window_s
+        self._clock = clock
+        self._nodes: dict[str, _NodeState] = {}
+        self._wait = LatencyHistogram()
+        self.admitted = 0
+        self.queued = 0
+        self.shed = {"queue_full": 0, "timeout": 0, "evicted": 0}
+
+    async def admit(
+        self,
+        node_id: str,
+        model: str,
+        *,
+        limit: int,
+        tenant: str = "",
+        deadline: Deadline | None = None,
+    ) -> float:
+        """Wait for a slot on *node_id*; returns the seconds spent queued.
+
+        Every successful call must be paired with :meth:`release`. Raises
+        :class:`AdmissionRejected` when shed and :class:`DeadlineExceeded`
+        when the request's deadline runs out first.
+        """
+        node = self._nodes.get(node_id)
+        if node is None:
+            node = self._nodes[node_id] = _NodeState()
+        node.limit = max(1, limit)
+
+        if node.active < node.limit and not node.queued:
+            node.active += 1
+            self._admitted(0.0)
+            return 0.0
+
+        queue = node.queues.get(model)
+        if queue is None:
+            queue = node.queues[model] = _ModelQueue()
+        if queue.size >= self.max_queue:
+            victim = queue.evict_for(tenant)
+            if victim is None:
+                self.shed["queue_full"] += 1
+                raise AdmissionRejected(
+                    f"node {node_id!r} queue for {model!r} is full",
+                    retry_after=self.retry_after(node_id),
+                )
+            self.shed["evicted"] += 1
+            victim.future.set_exception(
+                AdmissionRejected(
+                    f"node {node_id!r} queue for {model!r} is full",
+                    retry_after=self.retry_after(node_id),
+                )
+            )
+
+        waiter = _Waiter(
+            tenant=tenant,
+            enqueued=self._clock(),
+            future=asyncio.get_running_loop().create_future(),
+        )
+        queue.push(waiter)
+        self.queued += 1
+        self._dispatch(node)
+
+        timeout, bound_by_deadline = self.max_wait_s, False
+        if deadline is not None:
+            left = deadline.remaining()
+            if left < timeout:
+                timeout, bound_by_deadline = left, True
+        try:
+            await asyncio.wait_for(waiter.future, timeout=timeout)
+        except asyncio.TimeoutError:
+            queue.remove(waiter)
+            if bound_by_deadline:
+                raise DeadlineExceeded("request deadline passed while queued") from None
+            self.shed["timeout"] += 1
+            raise AdmissionRejected(
+                f"no slot on node {node_id!r} within {self.max_wait_s:g}s",
+                retry_after=self.retry_after(node_id),
+            ) from None
+        except asyncio.CancelledError:
+            queue.remove(waiter)
+            if waiter.future.done() and not waiter.future.cancelled():
+                if waiter.future.exception() is None:
+                    self.release(node_id)  # granted just as the caller went away
+            raise
+        finally:
+            if not queue.size and node.queues.get(model) is queue:
+                del node.queues[model]
+
+        waited = self._clock() - waiter.enqueued
+        self._admitted(waited)
+        return waited
+
+    def release(self, node_id: str) -> None:
+        node = self._nodes.get(node_id)
+        if node is None:
+            return
+        node.active = max(0, node.active - 1)
+        now = self._clock()
+        node.releases.append(now)
+        while node.releases and now - node.releases[0] > self.drain_window_s:
+            node.releases.popleft()
+        self._dispatch(node)
+
+    def _dispatch(self, node: _NodeState) -> None:
+        """Hand free slots to waiters, longest-waiting queue first."""
+        while node.active < node.limit:
+            queue = min(
+                (q for q in node.queues.values() if q.size),
+                key=lambda q: q.oldest(),
+                default=None,
+            )
+            if queue is None:
+                return
+            waiter = queue.pop()
+            if waiter is None or waiter.future.done():
+                continue
+            node.active += 1
+            waiter.future.set_result(None)
+
+    def _admitted(self, waited_s: float) -> None:
+        self.admitted += 1
+        self._wait.record(int(waited_s * 1000))
+
+    def drain_rate(self, node_id: str) -> float:
+        """Completions per second on *node_id* over the drain window."""
+        node = self._nodes.get(node_id)
+        if node is None or not node.releases:
+            return 0.0
+        now = self._clock()
+        recent = [t for t in node.releases if now - t <= self.drain_window_s]
+        span = max(1.0, now - recent[0]) if recent else self.drain_window_s
+        return len(recent) / span
+
+    def retry_after(self, node_id: str) -> int:
+        """Seconds until the current backlog should have drained."""
+        node = self._nodes.get(node_id)
+        backlog = (node.queued if node else 0) + 1
+        rate = self.drain_rate(node_id)
+        if rate <= 0:
+            return max(1, math.ceil(self.max_wait_s))
+        return min(60, max(1, math.ceil(backlog / rate)))
+
+    def stats(self) -> dict[str, Any]:
+        now = self._clock()
+        return {
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "shed": dict(self.shed),
+            "wait_ms": {
+                "p50": self._wait.percentile(50),
+                "p95": self._wait.percentile(95),
+                "p99": self._wait.percentile(99),
+            },
+            "nodes": {
+                node_id: {
+                    "active": node.active,
+                    "limit": node.limit,
+                    "queue_depth": {m: q.size for m, q in node.queues.items() if q.size},
+                    "oldest_wait_ms": (
+                        int((now - oldest) * 1000) if (oldest := node.oldest()) is not None else 0
+                    ),
+                    "drain_per_s": round(self.drain_rate(node_id), 2),
+                }
+                for node_id, node in self._nodes.items()
+            },
+        }
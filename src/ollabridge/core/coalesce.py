@@ -0,0 +1,158 @@
+"""Single-flight coalescing of identical in-flight requests.
+
+When N identical requests arrive together (a dashboard fan-out, a retry
+storm), only the first — the leader — runs upstream; the others await its
+result. The shared work runs in its own task, so the leader's client going
+away does not cancel it for the followers. It is cancelled only once every
+waiter has left.
+
+Streams are shared through a :class:`StreamTee`: one task pumps the
+upstream and every subscriber replays the buffered chunks from the start.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def request_key(*parts: Any) -> str:
+    """Digest of the canonical JSON of *parts*."""
+    canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class StreamTee:
+    """Fan one upstream stream out to any number of subscribers.
+
+    Chunks are buffered, so a subscriber that joins late still sees the
+    whole stream. The source is closed when it ends, or when the last
+    subscriber leaves before the end.
+    """
+
+    def __init__(self, source: AsyncIterator[str]) -> None:
+        self._source = source
+        self._chunks: list[str] = []
+        self._error: Optional[BaseException] = None
+        self._ended = False
+        self._changed = asyncio.Event()
+        self._subscribers = 0
+        self._pump: Optional[asyncio.Task] = None
+        self.finished: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    def subscribe(self) -> AsyncIterator[str]:
+        # Counted now rather than on first iteration, so a follower that has
+        # not started reading yet keeps the pump alive.
+        self._subscribers += 1
+        if self._pump is None:
+            self._pump = asyncio.ensure_future(self._run())
+        return self._replay()
+
+    async def _replay(self) -> AsyncIterator[str]:
+        i = 0
+        try:
+            while True:
+                if i < len(self._chunks):
+                    yield self._chunks[i]
+                    i += 1
+                    continue
+                if self._ended:
+                    if self._error is not None:
+                        raise self._error
+                    return
+                await self._changed.wait()
+        finally:
+            self._subscribers -= 1
+            if not self._subscribers and self._pump is not None and not self._pump.done():
+                self._pump.cancel()
+
+    async def _run(self) -> None:
+        try:
+            async for chunk in self._source:
+                self._chunks.append(chunk)
+                self._notify()
+        except asyncio.CancelledError:
+            self._error = RuntimeError("shared stream abandoned by every client")
+        except Exception as exc:
+            self._error = exc
+        finally:
+            self._ended = True
+            self._notify()
+            if not self.finished.done():
+                self.finished.set_result(None)
+            await self._source.aclose()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+
+class _Flight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class Coalescer:
+    def __init__(self) -> None:
+        self._flights: dict[str, _Flight] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def run(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        *,
+        linger: Callable[[T], Awaitable[Any]] | None = None,
+    ) -> tuple[T, bool]:
+        """Run ``fn()`` once per *key*; returns ``(result, shared)``.
+
+        ``shared`` is True for followers. Exceptions reach every waiter.
+        With *linger*, the flight stays joinable after ``fn`` returns until
+        ``linger(result)`` completes (e.g. until a teed stream ends).
+        """
+        flight = self._flights.get(key)
+        shared = flight is not None
+        if flight is None:
+            flight = self._flights[key] = _Flight(asyncio.ensure_future(fn()))
+            flight.task.add_done_callback(lambda t: self._landed(key, flight, t, linger))
+            self.leaders += 1
+        else:
+            self.coalesced += 1
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task), shared
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                flight.task.cancel()  # every client has gone away
+
+    def _landed(
+        self,
+        key: str,
+        flight: _Flight,
+        task: asyncio.Task,
+        linger: Callable[[Any], Awaitable[Any]] | None,
+    ) -> None:
+        def _forget(_: Any = None) -> None:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+        if task.cancelled() or task.exception() is not None or linger is None:
+            _forget()
+            return
+        asyncio.ensure_future(linger(task.result())).add_done_callback(_forget)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._flights),
+        }
@@ -0,0 +1,60 @@
+"""End-to-end request deadlines.
+
+A :class:`Deadline` is created once per request (from ``X-Request-Timeout``,
+the body's ``timeout`` field or ``REQUEST_TIMEOUT``) and handed down the call
+chain. Every hop sizes its own timeout with :meth:`Deadline.budget` instead of
+a fixed 120s, so retries, provider failover and relay round-trips together
+never outlive the client's budget.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable, Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request's deadline passed before an answer was produced."""
+
+
+class Deadline:
+    def __init__(self, seconds: float, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self.seconds = seconds
+        self._clock = clock
+        self._expires = clock() + seconds
+
+    def remaining(self) -> float:
+        """Seconds left, never negative."""
+        return max(0.0, self._expires - self._clock())
+
+    def remaining_ms(self) -> float:
+        return self.remaining() * 1000
+
+    @property
+    def expired(self) -> bool:
+        return self._clock() >= self._expires
+
+    def check(self) -> None:
+        if self.expired:
+            raise DeadlineExceeded(f"request deadline of {self.seconds:g}s exceeded")
+
+    def budget(self, cap: float) -> float:
+        """Timeout for one hop: *cap*, shortened to what is left.
+
+        Raises :class:`DeadlineExceeded` when nothing is left, so callers
+        fail fast instead of starting work that cannot finish in time.
+        """
+        self.check()
+        return min(cap, self.remaining())
+
+    def allows(self, expected_ms: Optional[float]) -> bool:
+        """Could work expected to take *expected_ms* finish in time?
+
+        Unknown expectations (``None``) are given the benefit of the doubt.
+        """
+        return expected_ms is None or expected_ms <= self.remaining_ms()
+
+
+def budget(deadline: Optional[Deadline], cap: float) -> float:
+    """``deadline.budget(cap)``, or *cap* when there is no deadline."""
+    return deadline.budget(cap) if deadline is not None else cap
@@ -0,0 +1,82 @@
+"""Embedding request helpers: input normalisation, batch splitting, and
+parsing the different response shapes upstreams return.
+
+OpenAI's ``/v1/embeddings`` accepts ``input`` as a string, a list of
+strings, a token array (``list[int]``) or a list of token arrays. Internally
+every request becomes a flat list of items; ``single`` remembers whether
+the caller sent a bare value so the wire format to older nodes is kept.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Union
+
+EmbeddingItem = Union[str, list[int]]
+
+
+def normalize_input(value: Any) -> tuple[list[EmbeddingItem], bool]:
+    """Return ``(items, single)`` for an OpenAI-style ``input`` value.
+
+    Raises :class:`ValueError` on empty or malformed input.
+    """
+    if isinstance(value, str):
+        return [value], True
+    if isinstance(value, list) and value and all(isinstance(t, int) for t in value):
+        return [list(value)], True
+    if not isinstance(value, list) or not value:
+        raise ValueError("input must be a non-empty string or list")
+    items: list[EmbeddingItem] = []
+    for item in value:
+        if isinstance(item, str):
+            items.append(item)
+        elif isinstance(item, list) and item and all(isinstance(t, int) for t in item):
+            items.append(list(item))
+        else:
+            raise ValueError("input items must be strings or token arrays")
+    return items, False
+
+
+def has_token_arrays(items: list[EmbeddingItem]) -> bool:
+    return any(not isinstance(item, str) for item in items)
+
+
+def estimate_tokens(items: list[EmbeddingItem]) -> int:
+    total = 0
+    for item in items:
+        if isinstance(item, str):
+            total += max(1, len(item) // 4) if item else 0
+        else:
+            total += len(item)
+    return total
+
+
+def split_batches(
+    items: list[EmbeddingItem], max_items: int
+) -> list[tuple[int, list[EmbeddingItem]]]:
+    """Split ``items`` into ``(offset, batch)`` chunks of at most ``max_items``."""
+    size = max(1, int(max_items))
+    return [(i, items[i : i + size]) for i in range(0, len(items), size)]
+
+
+def vectors_from_payload(data: dict[str, Any], expected: int) -> list[list[float]]:
+    """Extract ``expected`` vectors from a node/runtime response.
+
+    Accepts Ollama ``/api/embed`` (``embeddings``), OpenAI (``data`` with
+    ``index``) and the legacy single-vector shape (``embedding``).
+    """
+    vectors: list[list[float]] | None = None
+    if isinstance(data.get("embeddings"), list):
+        vectors = data["embeddings"]
+    elif isinstance(data.get("data"), list):
+        rows = sorted(
+            (r for r in data["data"] if isinstance(r, dict)),
+            key=lambda r: int(r.get("index", 0)),
+        )
+        vectors = [r.get("embedding") or [] for r in rows]
+    elif "embedding" in data and expected == 1:
+        vectors = [data.get("embedding") or []]
+
+    if vectors is None or len(vectors) != expected:
+        got = "none" if vectors is None else len(vectors)
+        raise RuntimeError(f"upstream returned {got} embeddings, expected {expected}")
+    return vectors
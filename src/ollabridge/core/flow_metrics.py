@@ -0,0 +1,242 @@
+"""Windowed request metrics for the flow dashboard.
+
+Every request is folded into two rings of time buckets instead of being
+kept as an event:
+
+- a per-second ring covering the last 5 minutes (``requests_8s``, 1m, 5m);
+- a per-minute ring covering the last hour (1h).
+
+Each bucket holds counters, token sums and a :class:`LatencyHistogram` for
+the total and for every ``model``/``path``/``node`` seen in that interval.
+Recording is O(1); a snapshot merges at most 300 + 60 buckets regardless of
+traffic, so rates stay exact at any request rate and percentiles need no
+per-event scan.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from typing import Any, Callable, Optional
+
+GROUP_DIMENSIONS = ("model", "path", "node")
+
+# Histogram layout: values below _SUB are exact, above that each power of two
+# is split into _SUB/2 linear sub-buckets, i.e. about 3% relative error.
+_SUB_BITS = 6
+_SUB = 1 << _SUB_BITS
+_HALF = _SUB >> 1
+_MAX_VALUE_MS = (1 << 32) - 1
+
+
+def _bucket_index(value: int) -> int:
+    if value < _SUB:
+        return max(0, value)
+    value = min(value, _MAX_VALUE_MS)
+    shift = value.bit_length() - _SUB_BITS
+    return _SUB + (shift - 1) * _HALF + ((value >> shift) - _HALF)
+
+
+def _bucket_value(index: int) -> int:
+    """Midpoint of the values that map to ``index``."""
+    if index < _SUB:
+        return index
+    shift, offset = divmod(index - _SUB, _HALF)
+    shift += 1
+    low = (offset + _HALF) << shift
+    return low + ((1 << shift) >> 1)
+
+
+class LatencyHistogram:
+    """Log-linear (HDR-style) histogram of millisecond latencies.
+
+    Sparse and mergeable: two histograms combine by adding their bucket
+    counts, which is how per-second buckets roll up into windows.
+    """
+
+    __slots__ = ("counts", "total")
+
+    def __init__(self) -> None:
+        self.counts: dict[int, int] = {}
+        self.total = 0
+
+    def record(self, value_ms: int) -> None:
+        idx = _bucket_index(int(value_ms))
+        self.counts[idx] = self.counts.get(idx, 0) + 1
+        self.total += 1
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for idx, n in other.counts.items():
+            self.counts[idx] = self.counts.get(idx, 0) + n
+        self.total += other.total
+
+    def percentile(self, q: float) -> int:
+        if not self.total:
+            return 0
+        rank = max(1, math.ceil(q / 100.0 * self.total))
+        seen = 0
+        for idx in sorted(self.counts):
+            seen += self.counts[idx]
+            if seen >= rank:
+                return _bucket_value(idx)
+        return _bucket_value(max(self.counts))
+
+
+class _Stats:
+    __slots__ = (
+        "requests",
+        "errors",
+        "latency_ms_sum",
+        "prompt_tokens",
+        "completion_tokens",
+        "hist",
+    )
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.latency_ms_sum = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.hist = LatencyHistogram()
+
+    def add(self, ok: bool, latency_ms: int, prompt: int, completion: int) -> None:
+        self.requests += 1
+        self.errors += 0 if ok else 1
+        self.latency_ms_sum += latency_ms
+        self.prompt_tokens += prompt
+        self.completion_tokens += completion
+        self.hist.record(latency_ms)
+
+    def merge(self, other: "_Stats") -> None:
+        self.requests += other.requests
+        self.errors += other.errors
+        self.latency_ms_sum += other.latency_ms_sum
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.hist.merge(other.hist)
+
+    def summary(self, seconds: float) -> dict[str, Any]:
+        tokens = self.prompt_tokens + self.completion_tokens
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "rps": round(self.requests / seconds, 3),
+            "avg_latency_ms": (
+                int(self.latency_ms_sum / self.requests) if self.requests else 0
+            ),
+            "p50_ms": self.hist.percentile(50),
+            "p95_ms": self.hist.percentile(95),
+            "p99_ms": self.hist.percentile(99),
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "tokens_per_sec": round(tokens / seconds, 2),
+        }
+
+
+# Key of the all-requests aggregate inside a bucket.
+_TOTAL = ("", "")
+
+
+class _Ring:
+    """Fixed number of ``width``-second buckets addressed by epoch index."""
+
+    def __init__(self, slots: int, width: int) -> None:
+        self.width = width
+        self._epochs = [-1] * slots
+        self._buckets: list[dict[tuple[str, str], _Stats]] = [{} for _ in range(slots)]
+
+    def bucket(self, now: float) -> dict[tuple[str, str], _Stats]:
+        epoch = int(now // self.width)
+        slot = epoch % len(self._epochs)
+        if self._epochs[slot] != epoch:
+            self._epochs[slot] = epoch
+            self._buckets[slot] = {}
+        return self._buckets[slot]
+
+    def merged(self, now: float, span: int, dimension: str | None) -> dict[tuple[str, str], _Stats]:
+        """Merge the last ``span`` buckets (current one included)."""
+        current = int(now // self.width)
+        out: dict[tuple[str, str], _Stats] = {}
+        for epoch, bucket in zip(self._epochs, self._buckets):
+            if not current - span < epoch <= current:
+                continue
+            for key, stats in bucket.items():
+                if key[0] and key[0] != dimension:
+                    continue
+                acc = out.get(key)
+                if acc is None:
+                    acc = out[key] = _Stats()
+                acc.merge(stats)
+        return out
+
+
+# window name -> (ring, number of buckets, seconds covered)
+_WINDOWS = {"1m": ("second", 60, 60), "5m": ("second", 300, 300), "1h": ("minute", 60, 3600)}
+
+
+class FlowMetrics:
+    """Thread-safe rolling request metrics with optional group breakdowns."""
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._rings = {"second": _Ring(300, 1), "minute": _Ring(60, 60)}
+
+    def record(
+        self,
+        *,
+        path: str,
+        model: str | None,
+        node: str | None = None,
+        ok: bool,
+        latency_ms: int,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+    ) -> None:
+        keys = [_TOTAL, ("path", path)]
+        if model:
+            keys.append(("model", model))
+        if node:
+            keys.append(("node", node))
+        now = self._clock()
+        latency_ms = max(0, int(latency_ms))
+        with self._lock:
+            for ring in self._rings.values():
+                bucket = ring.bucket(now)
+                for key in keys:
+                    stats = bucket.get(key)
+                    if stats is None:
+                        stats = bucket[key] = _Stats()
+                    stats.add(ok, latency_ms, prompt_tokens, completion_tokens)
+
+    def count(self, seconds: int) -> int:
+        """Requests in the last ``seconds`` (at most 300)."""
+        with self._lock:
+            merged = self._rings["second"].merged(self._clock(), seconds, None)
+        return merged[_TOTAL].requests if _TOTAL in merged else 0
+
+    def snapshot(self, group_by: Optional[str] = None) -> dict[str, Any]:
+        """Summaries per window, plus per-group ones when ``group_by`` is set."""
+        if group_by is not None and group_by not in GROUP_DIMENSIONS:
+            raise ValueError(f"group_by must be one of {', '.join(GROUP_DIMENSIONS)}")
+        now = self._clock()
+        windows: dict[str, Any] = {}
+        groups: dict[str, dict[str, Any]] = {}
+        with self._lock:
+            for name, (ring, span, seconds) in _WINDOWS.items():
+                merged = self._rings[ring].merged(now, span, group_by)
+                windows[name] = merged.get(_TOTAL, _Stats()).summary(seconds)
+                for (dim, value), stats in merged.items():
+                    if dim and dim == group_by:
+                        groups.setdefault(value, {})[name] = stats.summary(seconds)
+        out: dict[str, Any] = {"windows": windows}
+        if group_by is not None:
+            empty = _Stats().summary(1)
+            for per_window in groups.values():
+                for name in _WINDOWS:
+                    per_window.setdefault(name, dict(empty))
+            out["group_by"] = group_by
+            out["groups"] = groups
+        return out
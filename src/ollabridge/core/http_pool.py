@@ -0,0 +1,206 @@
+"""Process-wide pooled HTTP clients for upstream calls.
+
+Every upstream (Ollama, HomePilot, node agents, cloud providers, the Hugging
+Face router) gets one long-lived ``httpx.AsyncClient`` keyed by origin, so
+TCP/TLS connections are kept alive and reused across requests instead of
+being re-established per call.
+
+Callers pass per-request ``timeout=`` (and ``follow_redirects=``/headers)
+rather than baking them into the client, which keeps one pool per origin
+regardless of how many call sites share it.
+
+The pool is owned by the app lifecycle: :func:`close_http_pool` runs on
+shutdown. Clients are bound to the event loop that created them; when a new
+loop shows up (CLI ``asyncio.run`` calls, test clients) the stale clients
+are closed — on their own loop if it still runs, else on the new one — and
+rebuilt lazily.
+
+Clients never keep cookies: the pool is shared by every tenant, so a
+``Set-Cookie`` from one upstream reply must not ride along on the next
+caller's request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import http.cookiejar
+import importlib.util
+import logging
+import threading
+from typing import Any
+
+import httpx
+
+from ollabridge.core.settings import settings
+
+log = logging.getLogger("ollabridge.http_pool")
+
+
+def _origin(url: str | httpx.URL) -> str:
+    u = httpx.URL(url)
+    port = u.port or (443 if u.scheme == "https" else 80)
+    return f"{u.scheme}://{u.host}:{port}"
+
+
+def _current_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class _NoCookies(http.cookiejar.DefaultCookiePolicy):
+    """Cookie policy that refuses to store any cookie."""
+
+    def set_ok(self, cookie: http.cookiejar.Cookie, request: Any) -> bool:
+        return False
+
+
+async def _close_quietly(clients: list[httpx.AsyncClient]) -> None:
+    for client in clients:
+        try:
+            await client.aclose()
+        except Exception:  # pragma: no cover - best-effort cleanup
+            log.debug("closing pooled client failed", exc_info=True)
+
+
+class HttpClientPool:
+    """One keep-alive ``httpx.AsyncClient`` per upstream origin."""
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = 100,
+        max_keepalive: int = 20,
+        keepalive_expiry: float = 30.0,
+        connect_timeout: float = 10.0,
+        http2: bool = False,
+    ) -> None:
+        if http2 and importlib.util.find_spec("h2") is None:
+            log.warning("HTTP_POOL_HTTP2 requested but 'h2' is not installed; using HTTP/1.1")
+            http2 = False
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.connect_timeout = connect_timeout
+        self.http2 = http2
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+        self._closing: set[asyncio.Future] = set()
+
+    def client(self, url: str | httpx.URL) -> httpx.AsyncClient:
+        """Return the pooled client for ``url``'s origin, creating it on first use."""
+        key = _origin(url)
+        loop = _current_loop()
+        with self._lock:
+            if loop is not None and loop is not self._loop:
+                # Connections belong to the loop that opened them.
+                self._retire(list(self._clients.values()), self._loop, loop)
+                self._clients.clear()
+                self._loop = loop
+            client = self._clients.get(key)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    timeout=httpx.Timeout(120.0, connect=self.connect_timeout),
+                    limits=self.limits,
+                    http2=self.http2,
+                    cookies=http.cookiejar.CookieJar(policy=_NoCookies()),
+                )
+                self._clients[key] = client
+            return client
+
+    def _retire(
+        self,
+        clients: list[httpx.AsyncClient],
+        old: asyncio.AbstractEventLoop | None,
+        new: asyncio.AbstractEventLoop,
+    ) -> None:
+        """Close clients left behind by a previous event loop."""
+        if not clients:
+            return
+        if old is not None and old.is_running() and not old.is_closed():
+            asyncio.run_coroutine_threadsafe(_close_quietly(clients), old)
+            return
+        task = new.create_task(_close_quietly(clients))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def aclose(self) -> None:
+        """Close every pooled client (idempotent)."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        await _close_quietly(clients)
+
+    def stats(self) -> dict[str, Any]:
+        """Connection counts per origin, for sizing the limits."""
+        with self._lock:
+            items = list(self._clients.items())
+        upstreams: dict[str, dict[str, int]] = {}
+        for origin, client in items:
+            upstreams[origin] = _client_stats(client)
+        totals = {
+            key: sum(u[key] for u in upstreams.values())
+            for key in ("open", "active", "idle", "waiting")
+        }
+        return {
+            "limits": {
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+                "keepalive_expiry": self.limits.keepalive_expiry,
+            },
+            "http2": self.http2,
+            "totals": totals,
+            "upstreams": upstreams,
+        }
+
+
+def _client_stats(client: httpx.AsyncClient) -> dict[str, int]:
+    # httpcore exposes the connection list publicly; the request queue is
+    # private, so read it defensively.
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []) or [])
+    idle = sum(1 for c in connections if c.is_idle())
+    requests = list(getattr(pool, "_requests", []) or [])
+    waiting = sum(1 for r in requests if r.is_queued())
+    return {
+        "open": len(connections),
+        "active": len(connections) - idle,
+        "idle": idle,
+        "waiting": waiting,
+    }
+
+
+_pool: HttpClientPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_http_pool() -> HttpClientPool:
+    """Process-wide HTTP client pool singleton."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HttpClientPool(
+                max_connections=settings.HTTP_POOL_MAX_CONNECTIONS,
+                max_keepalive=settings.HTTP_POOL_MAX_KEEPALIVE,
+                keepalive_expiry=settings.HTTP_POOL_KEEPALIVE_EXPIRY,
+                connect_timeout=settings.HTTP_POOL_CONNECT_TIMEOUT,
+                http2=settings.HTTP_POOL_HTTP2,
+            )
+        return _pool
+
+
+def http_client(url: str | httpx.URL) -> httpx.AsyncClient:
+    """Shortcut for ``get_http_pool().client(url)``."""
+    return get_http_pool().client(url)
+
+
+async def close_http_pool() -> None:
+    """Close pooled connections; called from the app shutdown hook."""
+    with _pool_lock:
+        pool = _pool
+    if pool is not None:
+        await pool.aclose()
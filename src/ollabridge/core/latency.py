@@ -0,0 +1,131 @@
+"""Per-(node, model) latency statistics for routing and ``/admin/runtimes``.
+
+For every pair the tracker keeps an EWMA and a sliding window of the last
+``window`` samples (for p95), separately for total latency and
+time-to-first-token. Samples older than ``max_age_s`` drop out of the p95,
+and a pair without a sample for that long has no estimate either: a node
+excluded for being slow gets no traffic, hence no new samples, and would
+otherwise stay excluded after it recovered. Buffered calls only report a total; streamed calls
+report both. A failed or timed-out call counts as a total of at least
+``failure_ms``, so a broken node looks slow rather than unmeasured.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+
+def _p95(samples: deque[tuple[float, float]], since: float) -> Optional[float]:
+    ordered = sorted(value for at, value in samples if at >= since)
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+
+
+class _Series:
+    __slots__ = ("ewma", "window")
+
+    def __init__(self, size: int) -> None:
+        self.ewma: Optional[float] = None
+        self.window: deque[tuple[float, float]] = deque(maxlen=size)  # (at, ms)
+
+    def add(self, value: float, alpha: float, at: float) -> None:
+        self.ewma = value if self.ewma is None else alpha * value + (1 - alpha) * self.ewma
+        self.window.append((at, value))
+
+    def summary(self, since: float) -> dict[str, Any]:
+        p95 = _p95(self.window, since)
+        return {
+            "ewma_ms": round(self.ewma, 1) if self.ewma is not None else None,
+            "p95_ms": round(p95, 1) if p95 is not None else None,
+        }
+
+
+class _PairStats:
+    __slots__ = ("total", "ttft", "samples", "updated", "seen")
+
+    def __init__(self, size: int) -> None:
+        self.total = _Series(size)
+        self.ttft = _Series(size)
+        self.samples = 0
+        self.updated = 0.0  # wall clock, for display
+        self.seen = 0.0  # tracker clock, for ageing
+
+
+class LatencyTracker:
+    """EWMA + windowed p95 of total latency and TTFT per (node_id, model)."""
+
+    def __init__(
+        self,
+        *,
+        alpha: float = 0.2,
+        window: int = 128,
+        failure_ms: float = 30_000.0,
+        max_age_s: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.alpha = min(1.0, max(0.01, alpha))
+        self.window = max(1, int(window))
+        self.failure_ms = max(0.0, float(failure_ms))
+        self.max_age_s = max(0.0, float(max_age_s))  # 0 = samples never age
+        self._clock = clock
+        self._stats: dict[tuple[str, str], _PairStats] = {}
+
+    def observe(
+        self,
+        node_id: str,
+        model: str,
+        *,
+        total_ms: float,
+        ttft_ms: Optional[float] = None,
+    ) -> None:
+        stats = self._stats.get((node_id, model))
+        if stats is None:
+            stats = self._stats[(node_id, model)] = _PairStats(self.window)
+        now = self._clock()
+        stats.total.add(float(total_ms), self.alpha, now)
+        if ttft_ms is not None:
+            stats.ttft.add(float(ttft_ms), self.alpha, now)
+        stats.samples += 1
+        stats.updated = time.time()
+        stats.seen = now
+
+    def observe_failure(self, node_id: str, model: str, *, elapsed_ms: float) -> None:
+        """Record a call that errored or ran out of time as a slow one."""
+        self.observe(node_id, model, total_ms=max(float(elapsed_ms), self.failure_ms))
+
+    def estimate(self, node_id: str, model: str) -> Optional[float]:
+        """EWMA total latency in ms, or ``None`` without a recent sample."""
+        stats = self._stats.get((node_id, model))
+        if stats is None or stats.seen < self._since():
+            return None
+        return stats.total.ewma
+
+    def p95(self, node_id: str, model: str) -> Optional[float]:
+        """Windowed p95 total latency in ms, or ``None`` without recent samples."""
+        stats = self._stats.get((node_id, model))
+        return _p95(stats.total.window, self._since()) if stats is not None else None
+
+    def _since(self) -> float:
+        """Oldest sample time still counted."""
+        return self._clock() - self.max_age_s if self.max_age_s else float("-inf")
+
+    def forget(self, node_id: str) -> None:
+        for key in [k for k in self._stats if k[0] == node_id]:
+            del self._stats[key]
+
+    def for_node(self, node_id: str) -> dict[str, dict[str, Any]]:
+        since = self._since()
+        return {
+            model: {
+                "samples": stats.samples,
+                "total": stats.total.summary(since),
+                "ttft": stats.ttft.summary(since),
+                "updated": stats.updated,
+            }
+            for (nid, model), stats in self._stats.items()
+            if nid == node_id
+        }
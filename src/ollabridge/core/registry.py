@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass, field
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
-from typing import Any, Optional
+from types import MappingProxyType
+from typing import Any, Iterator, Mapping, Optional
 
 
 @dataclass
@@ -17,43 +19,206 @@ class RuntimeNodeState:
     models: list[str] = field(default_factory=list)
     capacity: int = 1
     meta: dict[str, Any] = field(default_factory=dict)
+    # Models currently loaded in the runtime's memory (Ollama /api/ps), as
+    # last reported by the resident-model poller.
+    resident: list[str] = field(default_factory=list)
     last_seen: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     healthy: bool = True
 
 
+def model_key(name: str) -> str:
+    """Index key for a model name (``llama3`` and ``llama3:latest`` match)."""
+    return name[: -len(":latest")] if name.endswith(":latest") else name
+
+
+def is_resident(node: RuntimeNodeState, model: str) -> bool:
+    """Whether *node* reported *model* loaded in memory at its last poll."""
+    key = model_key(model)
+    return any(model_key(m) == key for m in node.resident)
+
+
+@dataclass(frozen=True)
+class RegistrySnapshot:
+    """Immutable view of the registry at one ``version``.
+
+    ``nodes`` is ordered by node_id. Node objects inside a snapshot are never
+    mutated by the registry; changes publish a new snapshot with new node
+    objects instead.
+    """
+
+    version: int
+    nodes: tuple[RuntimeNodeState, ...]
+    by_id: Mapping[str, RuntimeNodeState]
+    by_model: Mapping[str, frozenset[str]]
+    unlisted: frozenset[str]
+
+    def healthy(self) -> list[RuntimeNodeState]:
+        return [n for n in self.nodes if n.healthy]
+
+    def nodes_for_model(
+        self, model: str, *, include_unlisted: bool = False
+    ) -> list[RuntimeNodeState]:
+        """Nodes advertising *model* (plus unlisted ones if asked), by node_id."""
+        ids = self.by_model.get(model_key(model), frozenset())
+        if include_unlisted:
+            ids = ids | self.unlisted
+        return [self.by_id[i] for i in sorted(ids)]
+
+
 class RuntimeRegistry:
     """In-memory registry for live node connections.
 
     Persistent data (routes, audit logs, etc.) should live in the DB.
     This registry is strictly for real-time routing.
+
+    Reads are lock-free: writers (``upsert``, ``remove``, ``set_models``,
+    health changes) serialise on a lock, rebuild a :class:`RegistrySnapshot`
+    and swap it in with a single assignment, so readers always see a
+    consistent snapshot without waiting.
+
+    An inverted index maps each advertised model to the nodes serving it;
+    nodes that advertise no models at all are tracked separately as
+    "unlisted" (they may serve anything, e.g. a local Ollama before its
+    first model refresh).
+
+    Heartbeats (``touch`` without a health change) only update a separate
+    ``last_seen`` map and leave the snapshot alone. Resident-model updates
+    publish a new snapshot but keep the version: what a node has loaded
+    right now does not change what it can serve.
     """
 
     def __init__(self) -> None:
         self._lock = asyncio.Lock()
         self._nodes: dict[str, RuntimeNodeState] = {}
+        self._last_seen: dict[str, datetime] = {}
+        self._inflight: dict[str, int] = {}
+        self._snapshot = RegistrySnapshot(
+            version=0,
+            nodes=(),
+            by_id=MappingProxyType({}),
+            by_model=MappingProxyType({}),
+            unlisted=frozenset(),
+        )
+
+    @property
+    def version(self) -> int:
+        """Bumped whenever membership, models or health change.
+
+        Derived views (cached model lists, routing tables) compare against
+        it to know when they are out of date; heartbeats do not bump it.
+        """
+        return self._snapshot.version
+
+    def snapshot(self) -> RegistrySnapshot:
+        return self._snapshot
+
+    # ── writers ───────────────────────────────────────────────
 
     async def upsert(self, node: RuntimeNodeState) -> None:
         async with self._lock:
             node.last_seen = datetime.now(timezone.utc)
             self._nodes[node.node_id] = node
+            self._last_seen[node.node_id] = node.last_seen
+            self._publish()
+
+    async def set_models(self, node_id: str, models: list[str]) -> bool:
+        """Replace a node's advertised models. Returns True if they changed."""
+        async with self._lock:
+            n = self._nodes.get(node_id)
+            if n is None or sorted(n.models) == sorted(models):
+                return False
+            self._nodes[node_id] = replace(n, models=list(models))
+            self._publish()
+            return True
+
+    async def set_resident(self, node_id: str, models: list[str]) -> bool:
+        """Replace a node's resident (loaded) models. Returns True if they changed."""
+        async with self._lock:
+            n = self._nodes.get(node_id)
+            if n is None or sorted(n.resident) == sorted(models):
+                return False
+            self._nodes[node_id] = replace(n, resident=list(models))
+            self._publish(bump=False)
+            return True
 
     async def touch(self, node_id: str, *, healthy: Optional[bool] = None) -> None:
+        if node_id not in self._snapshot.by_id:
+            return
+        self._last_seen[node_id] = datetime.now(timezone.utc)
+        if healthy is None or healthy == self._snapshot.by_id[node_id].healthy:
+            return
         async with self._lock:
             n = self._nodes.get(node_id)
-            if not n:
-                return
-            n.last_seen = datetime.now(timezone.utc)
-            if healthy is not None:
-                n.healthy = healthy
+            if n is not None and n.healthy != healthy:
+                self._nodes[node_id] = replace(n, healthy=healthy)
+                self._publish()
 
     async def remove(self, node_id: str) -> None:
         async with self._lock:
-            self._nodes.pop(node_id, None)
+            if self._nodes.pop(node_id, None) is not None:
+                self._last_seen.pop(node_id, None)
+                self._publish()
+
+    def _publish(self, *, bump: bool = True) -> None:
+        """Rebuild and swap in the snapshot (lock held)."""
+        nodes = tuple(sorted(self._nodes.values(), key=lambda n: n.node_id))
+        by_model: dict[str, set[str]] = {}
+        unlisted: set[str] = set()
+        for n in nodes:
+            if not n.models:
+                unlisted.add(n.node_id)
+            for m in n.models:
+                by_model.setdefault(model_key(m), set()).add(n.node_id)
+        self._snapshot = RegistrySnapshot(
+            version=self._snapshot.version + (1 if bump else 0),
+            nodes=nodes,
+            by_id=MappingProxyType({n.node_id: n for n in nodes}),
+            by_model=MappingProxyType({k: frozenset(v) for k, v in by_model.items()}),
+            unlisted=frozenset(unlisted),
+        )
+
+    # ── lock-free readers ─────────────────────────────────────
 
     async def get(self, node_id: str) -> Optional[RuntimeNodeState]:
-        async with self._lock:
-            return self._nodes.get(node_id)
+        return self._snapshot.by_id.get(node_id)
 
     async def list(self) -> list[RuntimeNodeState]:
-        async with self._lock:
-            return list(self._nodes.values())
+        return list(self._snapshot.nodes)
+
+    async def nodes_for_model(
+        self, model: str, *, include_unlisted: bool = False
+    ) -> list[RuntimeNodeState]:
+        return self._snapshot.nodes_for_model(model, include_unlisted=include_unlisted)
+
+    def last_seen(self, node_id: str) -> Optional[datetime]:
+        """Time of the node's last frame or heartbeat."""
+        return self._last_seen.get(node_id)
+
+    # ── in-flight accounting ──────────────────────────────────
+    # Plain counters touched only from the event loop, so no lock: the
+    # router reads them on every request and they never change membership.
+
+    def acquire(self, node_id: str) -> None:
+        self._inflight[node_id] = self._inflight.get(node_id, 0) + 1
+
+    def release(self, node_id: str) -> None:
+        left = self._inflight.get(node_id, 0) - 1
+        if left > 0:
+            self._inflight[node_id] = left
+        else:
+            self._inflight.pop(node_id, None)
+
+    @contextmanager
+    def track(self, node_id: str) -> Iterator[None]:
+        """Count one outstanding upstream call on *node_id* for the block."""
+        self.acquire(node_id)
+        try:
+            yield
+        finally:
+            self.release(node_id)
+
+    def inflight(self, node_id: str) -> int:
+        return self._inflight.get(node_id, 0)
+
+    def inflight_counts(self) -> dict[str, int]:
+        return dict(self._inflight)
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
-import itertools
+import bisect
+import hashlib
+import math
+import random
 from dataclasses import dataclass
 from typing import Optional
 
-from ollabridge.core.registry import RuntimeRegistry, RuntimeNodeState
+from ollabridge.core.deadline import Deadline, DeadlineExceeded
+from ollabridge.core.latency import LatencyTracker
+from ollabridge.core.registry import RuntimeRegistry, RuntimeNodeState, is_resident
 
 
 @dataclass(frozen=True)
@@ -12,38 +17,247 @@ class RouteDecision:
     node: RuntimeNodeState
 
 
+ROUTING_STRATEGIES = ("round_robin", "least_outstanding", "p2c", "latency")
+MODEL_FALLBACKS = ("any", "none")
+
+_VNODES_PER_SLOT = 64  # ring points per unit of capacity
+_PROBE_LIMIT = 3  # picks an unmeasured node gets before it ranks as slow
+_MAX_RING_SLOTS = 16
+
+
+def _ring_hash(value: str) -> int:
+    return int.from_bytes(hashlib.sha256(value.encode("utf-8")).digest()[:8], "big")
+
+
 class Router:
     """Selects a node for a request.
 
-    This is intentionally simple for v1. You can extend it with:
-    - tag-based routing
-    - per-model pinned routes
-    - weighted load balancing
-    - latency-aware selection
+    Strategies (``ROUTING_STRATEGY``):
+    - ``round_robin``: rotate over healthy nodes in node_id order;
+    - ``least_outstanding``: lowest in-flight / capacity wins, ties rotate;
+    - ``p2c``: power of two choices — sample two nodes at random and take
+      the less loaded one (cheap, and avoids herding on a single "best" node
+      when several gateways share the fleet);
+    - ``latency``: lowest expected latency for the requested model, i.e. the
+      node's EWMA latency for that model scaled by ``1 + load``. Nodes that
+      have never served the model are tried first — for at most
+      ``_PROBE_LIMIT`` picks, after which a node still without a sample
+      (its calls never finish) ranks as the tracker's ``failure_ms`` —
+      and with probability
+      ``exploration`` a random node is picked so slow nodes keep being
+      sampled and can recover. Falls back to ``least_outstanding`` when no
+      model is given.
+
+    Load is the registry's in-flight count divided by the node's advertised
+    ``capacity``, so a 4-slot GPU box takes four times the share of a
+    1-slot laptop.
+
+    Candidates come from the registry's model index: nodes advertising the
+    model plus nodes that advertise no model list. Nodes whose list lacks
+    the model are skipped. If nobody qualifies, ``model_fallback`` decides:
+    ``any`` healthy node (models served through the provider add-on live
+    behind the local runtime) or ``none`` (fail). ``require_model=True``
+    only accepts nodes that advertise the model. ``tag`` further restricts
+    the candidates to nodes carrying that tag (a policy's ``device_tag``).
+
+    Nodes that already hold the model in memory (``resident``, polled from
+    the runtime) are preferred over ones that would have to cold-load it,
+    as long as their load is below ``resident_load``; once every resident
+    node is that busy, the others compete too. ``resident_load=None``
+    turns the preference off.
+
+    An ``affinity`` key (one conversation) overrides the strategy: the key
+    is consistently hashed onto a ring of the candidates, weighted by
+    capacity, so every turn lands on the node that holds the conversation's
+    warm KV cache. Bounded load keeps that from overloading a node: one
+    whose in-flight count has reached ``affinity_load_factor`` times its
+    capacity-weighted share of the current load is passed over for the next
+    node on the ring. Node churn only moves the keys of the affected node.
     """
 
-    def __init__(self, registry: RuntimeRegistry) -> None:
+    def __init__(
+        self,
+        registry: RuntimeRegistry,
+        *,
+        strategy: str = "round_robin",
+        latency: Optional[LatencyTracker] = None,
+        exploration: float = 0.05,
+        model_fallback: str = "any",
+        affinity_load_factor: float = 1.25,
+        resident_load: Optional[float] = 1.0,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        if strategy not in ROUTING_STRATEGIES:
+            raise ValueError(
+                f"unknown routing strategy {strategy!r}; expected one of {', '.join(ROUTING_STRATEGIES)}"
+            )
+        if model_fallback not in MODEL_FALLBACKS:
+            raise ValueError(
+                f"unknown model fallback {model_fallback!r}; expected one of {', '.join(MODEL_FALLBACKS)}"
+            )
+        self.model_fallback = model_fallback
         self.registry = registry
+        self.strategy = strategy
+        self.latency = latency or LatencyTracker()
+        self.exploration = exploration
+        self.affinity_load_factor = max(1.0, affinity_load_factor)
+        self.affinity = {"sticky": 0, "spilled": 0}
+        self.resident_load = resident_load
+        self.residency = {"warm": 0, "cold": 0}
         self._rr_counter = 0
+        self._rng = rng or random.Random()
+        self._rings: dict[tuple[tuple[str, int], ...], tuple[list[int], list[str]]] = {}
+        self._probes: dict[tuple[str, str], int] = {}
+
+    def load(self, node: RuntimeNodeState) -> float:
+        return self.registry.inflight(node.node_id) / max(1, node.capacity)
+
+    async def choose_node(
+        self,
+        *,
+        model: str | None = None,
+        require_model: bool = False,
+        max_latency_ms: float | None = None,
+        deadline: Deadline | None = None,
+        affinity: str | None = None,
+        tag: str | None = None,
+    ) -> RouteDecision:
+        nodes = await self._candidates(model, require_model)
+        if tag is not None:
+            nodes = [n for n in nodes if tag in n.tags]
+        if model and max_latency_ms is not None:
+            # A latency budget (routing policy) rules out nodes whose observed
+            # p95 for the model is over it; unmeasured nodes stay eligible,
+            # and so do nodes whose slow samples have aged out.
+            nodes = [
+                n
+                for n in nodes
+                if (p95 := self.latency.p95(n.node_id, model)) is None
+                or p95 <= max_latency_ms
+            ]
+        if model and deadline is not None and nodes:
+            # Nodes expected (EWMA) to answer after the deadline are skipped;
+            # if that is all of them, fail now rather than at the deadline.
+            # Estimates age out, so a node is only written off until its
+            # slow period is LATENCY_MAX_AGE old.
+            nodes = [n for n in nodes if deadline.allows(self.latency.estimate(n.node_id, model))]
+            if not nodes:
+                raise DeadlineExceeded("no runtime is expected to answer within the deadline")
+        if not nodes:
+            raise RuntimeError("no healthy runtimes available")
+        if model and self.resident_load is not None:
+            nodes = self._prefer_resident(nodes, model)
+
+        if affinity is not None and len(nodes) > 1:
+            return RouteDecision(node=self._sticky(nodes, affinity))
+
+        # Snapshots keep nodes in node_id order, which keeps rotation stable.
+        if self.strategy == "p2c" and len(nodes) > 1:
+            a, b = self._rng.sample(nodes, 2)
+            return RouteDecision(node=a if self.load(a) <= self.load(b) else b)
+        if self.strategy == "latency" and model:
+            return RouteDecision(node=self._fastest(nodes, model))
+        if self.strategy in ("least_outstanding", "latency"):
+            lowest = min(self.load(n) for n in nodes)
+            nodes = [n for n in nodes if self.load(n) == lowest]
 
-    async def choose_node(self, *, model: str | None = None, require_model: bool = False) -> RouteDecision:
-        nodes = [n for n in await self.registry.list() if n.healthy]
+        return RouteDecision(node=self._next(nodes))
+
+    async def _candidates(self, model: str | None, require_model: bool) -> list[RuntimeNodeState]:
+        snap = self.registry.snapshot()
 
         # Smart routing: persona:* and personality:* models go to HomePilot nodes
         if model and (model.startswith("persona:") or model.startswith("personality:")):
-            hp_nodes = [n for n in nodes if n.connector == "homepilot"]
+            hp_nodes = [n for n in snap.healthy() if n.connector == "homepilot"]
             if hp_nodes:
                 # Prefer HomePilot nodes for persona models
-                nodes = hp_nodes
+                if require_model:
+                    hp_nodes = [n for n in hp_nodes if model in (n.models or [])]
+                return hp_nodes
 
-        if require_model and model:
-            nodes = [n for n in nodes if model in (n.models or [])]
-        if not nodes:
-            raise RuntimeError("no healthy runtimes available")
+        if not model:
+            return snap.healthy()
 
-        # round-robin over available nodes
-        # Create a stable order by node_id
-        nodes = sorted(nodes, key=lambda n: n.node_id)
+        holders = snap.nodes_for_model(model, include_unlisted=not require_model)
+        nodes = [n for n in holders if n.healthy]
+        if nodes or require_model or self.model_fallback == "none":
+            return nodes
+        return snap.healthy()
+
+    def _prefer_resident(
+        self, nodes: list[RuntimeNodeState], model: str
+    ) -> list[RuntimeNodeState]:
+        if not any(n.resident for n in nodes):
+            return nodes  # no residency reports (polling off, or nothing loaded)
+        ready = [
+            n for n in nodes if is_resident(n, model) and self.load(n) < self.resident_load
+        ]
+        self.residency["warm" if ready else "cold"] += 1
+        return ready or nodes
+
+    def _next(self, nodes: list[RuntimeNodeState]) -> RuntimeNodeState:
+        # round-robin over the remaining candidates
         idx = self._rr_counter % len(nodes)
         self._rr_counter += 1
-        return RouteDecision(node=nodes[idx])
+        return nodes[idx]
+
+    def _fastest(self, nodes: list[RuntimeNodeState], model: str) -> RuntimeNodeState:
+        estimates = {n.node_id: self.latency.estimate(n.node_id, model) for n in nodes}
+        unexplored = []
+        for n in nodes:
+            key = (n.node_id, model)
+            if estimates[n.node_id] is not None:
+                self._probes.pop(key, None)
+            elif self._probes.get(key, 0) < _PROBE_LIMIT:
+                unexplored.append(n)
+            else:
+                estimates[n.node_id] = self.latency.failure_ms
+        if unexplored:
+            node = self._next(unexplored)
+            key = (node.node_id, model)
+            self._probes[key] = self._probes.get(key, 0) + 1
+            return node
+        if len(nodes) > 1 and self._rng.random() < self.exploration:
+            return self._rng.choice(nodes)
+        return min(nodes, key=lambda n: estimates[n.node_id] * (1.0 + self.load(n)))
+
+    def _sticky(self, nodes: list[RuntimeNodeState], key: str) -> RuntimeNodeState:
+        hashes, owners = self._ring(nodes)
+        by_id = {n.node_id: n for n in nodes}
+        total_capacity = sum(max(1, n.capacity) for n in nodes)
+        # Counting this request keeps the bound above zero on an idle fleet.
+        total_inflight = sum(self.registry.inflight(n.node_id) for n in nodes) + 1
+
+        start = bisect.bisect(hashes, _ring_hash(key))
+        tried: set[str] = set()
+        for i in range(len(hashes)):
+            node = by_id[owners[(start + i) % len(hashes)]]
+            if node.node_id in tried:
+                continue
+            bound = math.ceil(
+                self.affinity_load_factor * total_inflight * max(1, node.capacity) / total_capacity
+            )
+            if self.registry.inflight(node.node_id) < bound:
+                self.affinity["spilled" if tried else "sticky"] += 1
+                return node
+            tried.add(node.node_id)
+            if len(tried) == len(nodes):
+                break
+        # Unreachable: the bounds sum to more than the current load.
+        self.affinity["spilled"] += 1
+        return min(nodes, key=self.load)
+
+    def _ring(self, nodes: list[RuntimeNodeState]) -> tuple[list[int], list[str]]:
+        shape = tuple((n.node_id, max(1, n.capacity)) for n in nodes)
+        ring = self._rings.get(shape)
+        if ring is None:
+            points = sorted(
+                (_ring_hash(f"{node_id}#{i}"), node_id)
+                for node_id, capacity in shape
+                for i in range(_VNODES_PER_SLOT * min(capacity, _MAX_RING_SLOTS))
+            )
+            ring = ([h for h, _ in points], [node_id for _, node_id in points])
+            if len(self._rings) >= 64:
+                self._rings.clear()
+            self._rings[shape] = ring
+        return ring
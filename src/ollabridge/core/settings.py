@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Any
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -26,9 +27,155 @@ class Settings(BaseSettings):
     OLLAMA_BASE_URL: str = "http://localhost:11434"
     OLLAMA_CHAT_PATH: str = "/api/chat"
     OLLAMA_EMBED_PATH: str = "/api/embeddings"
+    OLLAMA_BATCH_EMBED_PATH: str = "/api/embed"
     DEFAULT_MODEL: str = "deepseek-r1"
     DEFAULT_EMBED_MODEL: str = "nomic-embed-text"
 
+    # /v1/embeddings batching: at most EMBED_MAX_INPUTS items per request,
+    # sent upstream in sub-batches of EMBED_BATCH_SIZE, with up to
+    # EMBED_MAX_CONCURRENCY sub-batches in flight across healthy nodes.
+    EMBED_MAX_INPUTS: int = 2048
+    EMBED_BATCH_SIZE: int = 64
+    EMBED_MAX_CONCURRENCY: int = 4
+
+    # Embedding cache keyed by (model, input hash). The memory tier holds
+    # EMBED_CACHE_MAX_ENTRIES vectors; EMBED_CACHE_DISK adds a float32 mmap
+    # tier under DATA_DIR/embedding_cache that survives restarts. A model's
+    # disk tier is cleared once it would outgrow EMBED_CACHE_DISK_MAX_MB
+    # (0 = unbounded).
+    EMBED_CACHE_ENABLED: bool = True
+    EMBED_CACHE_MAX_ENTRIES: int = 50_000
+    EMBED_CACHE_DISK: bool = False
+    EMBED_CACHE_DISK_MAX_MB: int = 1024
+
+    # GET /v1/models: nodes are queried concurrently, each bounded by
+    # MODELS_NODE_TIMEOUT. The merged list is cached for MODELS_CACHE_TTL
+    # seconds, then served stale (while refreshing in the background) for up
+    # to MODELS_MAX_STALE seconds. Registry changes invalidate it.
+    MODELS_NODE_TIMEOUT: float = 5.0
+    MODELS_CACHE_TTL: float = 10.0
+    MODELS_MAX_STALE: float = 300.0
+
+    # Node selection for chat/embeddings:
+    #   round_robin        – rotate over healthy nodes
+    #   least_outstanding  – fewest in-flight requests per unit of capacity
+    #   p2c                – power of two random choices by the same load
+    #   latency            – lowest EWMA latency for the model x (1 + load),
+    #                        exploring a random node ROUTING_EXPLORATION of
+    #                        the time so slow nodes can recover
+    ROUTING_STRATEGY: str = "least_outstanding"
+    ROUTING_EXPLORATION: float = 0.05
+    # Requests go to nodes advertising the model (or advertising no model
+    # list). When none qualify: "any" healthy node (default; provider add-on
+    # models are served behind the local runtime) or "none" to fail.
+    ROUTING_MODEL_FALLBACK: str = "any"
+    # Conversation affinity: turns of one conversation (paired-device bridge
+    # session, OpenAI "user" field, or the opening messages of a request
+    # with several user turns) stick to one node so its KV cache is reused;
+    # single-turn requests follow ROUTING_STRATEGY. A node already over
+    # ROUTING_AFFINITY_LOAD x its share of the load is skipped for the next
+    # one on the consistent-hash ring.
+    ROUTING_AFFINITY: bool = True
+    ROUTING_AFFINITY_LOAD: float = 1.25
+    # Resident models: every RESIDENT_POLL_INTERVAL seconds each Ollama
+    # runtime (the local node directly, relay nodes through their agent)
+    # reports which models it has loaded in memory (/api/ps). Requests go to
+    # a node already holding the model while its load (in-flight per unit
+    # of capacity) is below ROUTING_RESIDENT_LOAD; past that, nodes that
+    # would have to cold-load it compete as well.
+    RESIDENT_POLL_ENABLED: bool = True
+    RESIDENT_POLL_INTERVAL: float = 15.0
+    ROUTING_RESIDENT_LOAD: float = 1.0
+    # Warm pool (opt-in): keep the local catalog's WARM_POOL_TOP top models,
+    # plus WARM_POOL_MODELS (comma separated), loaded with a keep-alive of
+    # WARM_POOL_KEEP_ALIVE seconds. When a node's loaded models take more
+    # than WARM_POOL_VRAM_BUDGET_GB (0 = no budget), models outside the pool
+    # unused for WARM_POOL_IDLE seconds are unloaded, least recently used
+    # first. WARM_POOL_NODES overrides these per node id, as JSON, e.g.
+    # {"gpu-1": {"enabled": true, "top": 3, "vram_budget_gb": 22}}.
+    WARM_POOL_ENABLED: bool = False
+    WARM_POOL_TOP: int = 2
+    WARM_POOL_MODELS: str = ""
+    WARM_POOL_KEEP_ALIVE: float = 1800.0
+    WARM_POOL_IDLE: float = 600.0
+    WARM_POOL_VRAM_BUDGET_GB: float = 0.0
+    WARM_POOL_NODES: dict[str, dict[str, Any]] = {}
+    # Per-(node, model) latency stats: EWMA smoothing and p95 sample window.
+    # A failed or timed-out call is recorded as at least LATENCY_FAILURE_MS.
+    # Samples older than LATENCY_MAX_AGE seconds leave the p95 (0 = never).
+    LATENCY_EWMA_ALPHA: float = 0.2
+    LATENCY_WINDOW: int = 128
+    LATENCY_FAILURE_MS: float = 30_000.0
+    LATENCY_MAX_AGE: float = 300.0
+
+    # Routing policies (~/.ollabridge/policies.yaml merged with the built-in
+    # aliases such as "fast", "cheap" and "local-private") are enforced on
+    # chat requests. The file is checked for changes at most every
+    # POLICIES_RELOAD_INTERVAL seconds.
+    POLICIES_ENABLED: bool = True
+    POLICIES_RELOAD_INTERVAL: float = 2.0
+
+    # End-to-end deadline for a chat request, in seconds, when the client
+    # sends neither X-Request-Timeout nor a "timeout" field. Routing,
+    # retries, provider failover and relay hops all share it; once it is
+    # spent the request fails with 504. Client values are capped at
+    # REQUEST_TIMEOUT_MAX.
+    REQUEST_TIMEOUT: float = 300.0
+    REQUEST_TIMEOUT_MAX: float = 600.0
+
+    # Exact-match chat completion cache (opt-in). Only temperature=0,
+    # non-streaming requests are cached, keyed by model, messages and
+    # sampling parameters. Policies can turn it on or off per alias
+    # ("cache: {enabled: ...}"); local-private never caches unless its
+    # policy says so. CHAT_CACHE_DISK adds a SQLite tier under DATA_DIR.
+    CHAT_CACHE_ENABLED: bool = False
+    CHAT_CACHE_MAX_ENTRIES: int = 1000
+    CHAT_CACHE_TTL: float = 3600.0
+    CHAT_CACHE_DISK: bool = False
+
+    # Semantic cache (opt-in): the final user message is embedded with
+    # default_embed_model and matched against earlier prompts of the same
+    # model, policy and conversation prefix. An answer whose prompt has
+    # cosine similarity >= SEMANTIC_CACHE_THRESHOLD is served. The index
+    # holds SEMANTIC_CACHE_MAX_ENTRIES answers (LRU) for SEMANTIC_CACHE_TTL
+    # seconds; SEMANTIC_CACHE_DISK persists it under DATA_DIR.
+    SEMANTIC_CACHE_ENABLED: bool = False
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 5000
+    SEMANTIC_CACHE_TTL: float = 3600.0
+    SEMANTIC_CACHE_DISK: bool = False
+
+    # Request coalescing: identical chat and embedding requests that are in
+    # flight together run upstream once and share the result (streams are
+    # teed). Chat requests with an explicit temperature > 0 are left alone.
+    COALESCE_ENABLED: bool = True
+
+    # Admission control: a node runs at most capacity x
+    # ADMISSION_SLOTS_PER_CAPACITY chat requests at once. Further requests
+    # wait in a FIFO per node and model, holding at most ADMISSION_MAX_QUEUE
+    # requests. API keys and devices are served round robin. A request is
+    # shed with 429 + Retry-After when its queue is full or it has waited
+    # ADMISSION_MAX_WAIT seconds. Requests served by cloud providers are
+    # not queued.
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_SLOTS_PER_CAPACITY: int = 2
+    ADMISSION_MAX_QUEUE: int = 64
+    ADMISSION_MAX_WAIT: float = 30.0
+
+    # Streaming chat from relay nodes: at most RELAY_STREAM_WINDOW chunks
+    # may be in flight per stream before the node waits for credit, and each
+    # chunk (the first included) must arrive within RELAY_STREAM_TIMEOUT.
+    RELAY_STREAM_WINDOW: int = 32
+    RELAY_STREAM_TIMEOUT: float = 120.0
+
+    # Shared upstream HTTP pool (one keep-alive pool per upstream origin).
+    # HTTP/2 needs the optional "h2" package (pip install ollabridge[http2]).
+    HTTP_POOL_MAX_CONNECTIONS: int = 100
+    HTTP_POOL_MAX_KEEPALIVE: int = 20
+    HTTP_POOL_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_POOL_CONNECT_TIMEOUT: float = 10.0
+    HTTP_POOL_HTTP2: bool = False
+
     # Control-plane / Node enrollment
     MODE: str = "gateway"  # gateway | node
     RELAY_ENABLED: bool = True
@@ -64,6 +211,18 @@ class Settings(BaseSettings):
     DATA_DIR: Path = Path.home() / ".ollabridge"
     DATABASE_URL: str | None = None
 
+    # Request-log write-behind: rows are queued in memory and committed in
+    # batches by a background thread. When the queue is full new rows are
+    # dropped (counted, never blocking a request).
+    REQUEST_LOG_QUEUE_SIZE: int = 10_000
+    REQUEST_LOG_BATCH_SIZE: int = 200
+    REQUEST_LOG_FLUSH_INTERVAL: float = 1.0
+
+    # Trace store retention: keep the newest N traces (0 disables), pruned
+    # by the trace writer thread every TRACE_PRUNE_INTERVAL seconds.
+    TRACE_RETENTION_ROWS: int = 100_000
+    TRACE_PRUNE_INTERVAL: float = 300.0
+
 
 settings = Settings()
 settings.DATA_DIR.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,74 @@
+"""OpenAI-compatible streaming helpers.
+
+Two halves of the same wire format live here:
+
+- parsing: upstreams that speak OpenAI SSE (HomePilot, OpenAI-compatible
+  providers, the Hugging Face router) emit ``data: {...}`` lines whose
+  ``choices[0].delta.content`` carries the next text fragment;
+- emitting: the gateway re-encodes fragments as ``chat.completion.chunk``
+  events terminated by ``data: [DONE]``.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from typing import Any, AsyncIterator
+
+import httpx
+
+SSE_DONE = "data: [DONE]\n\n"
+
+
+def sse_event(data: dict[str, Any]) -> str:
+    """Encode one SSE ``data:`` event."""
+    return f"data: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def chat_chunk(
+    *,
+    chunk_id: str,
+    model: str,
+    content: str | None = None,
+    role: str | None = None,
+    finish_reason: str | None = None,
+    created: int | None = None,
+) -> dict[str, Any]:
+    """Build one ``chat.completion.chunk`` object."""
+    delta: dict[str, Any] = {}
+    if role is not None:
+        delta["role"] = role
+    if content is not None:
+        delta["content"] = content
+    return {
+        "id": chunk_id,
+        "object": "chat.completion.chunk",
+        "created": created if created is not None else int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+async def iter_openai_deltas(response: httpx.Response) -> AsyncIterator[str]:
+    """Yield non-empty ``delta.content`` fragments from an OpenAI SSE body.
+
+    Malformed lines, keep-alive comments and role-only deltas are skipped;
+    iteration stops at ``data: [DONE]`` or when the upstream closes.
+    """
+    async for line in response.aiter_lines():
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            return
+        try:
+            obj = json.loads(data)
+        except json.JSONDecodeError:
+            continue
+        choices = obj.get("choices") if isinstance(obj, dict) else None
+        if not choices or not isinstance(choices[0], dict):
+            continue
+        delta = choices[0].get("delta") or {}
+        content = delta.get("content") if isinstance(delta, dict) else None
+        if content:
+            yield str(content)
@@ -0,0 +1,216 @@
+"""Write-behind persistence for :class:`RequestLog` rows.
+
+Request handlers call :meth:`RequestLogWriter.submit`, which only appends to
+a bounded in-memory queue; a daemon thread drains it and commits rows in
+batched transactions (every ``batch_size`` rows or ``flush_interval``
+seconds, whichever comes first). The event loop never waits on SQLite.
+
+Backpressure policy: request logs are diagnostics, so serving never blocks
+on them. When the queue is full the *new* row is dropped and counted in
+``stats()["dropped"]`` (a warning is logged at most once per minute). A
+batch that fails to commit is discarded and counted in ``failed``.
+
+Call :meth:`flush` to wait for everything queued so far (readers such as
+``/admin/recent`` do this), and :meth:`close` on shutdown to drain the
+queue before the process exits.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from typing import Any
+
+from ollabridge.core.settings import settings
+from ollabridge.db.database import session
+from ollabridge.db.models import RequestLog
+
+log = logging.getLogger("ollabridge.db.log_writer")
+
+_STOP = object()
+
+
+class RequestLogWriter:
+    """Bounded queue + background thread that batches RequestLog inserts."""
+
+    def __init__(
+        self,
+        *,
+        max_queue: int = 10_000,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+    ) -> None:
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0.01, flush_interval)
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max(1, max_queue))
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self._written = 0
+        self._dropped = 0
+        self._failed = 0
+        self._last_drop_warning = 0.0
+
+    # ── producer side ─────────────────────────────────────────
+
+    def submit(self, row: RequestLog) -> bool:
+        """Queue ``row`` for persistence. Returns False if it was dropped."""
+        if self._closed:
+            return False
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+                now = time.monotonic()
+                warn = now - self._last_drop_warning >= 60.0
+                if warn:
+                    self._last_drop_warning = now
+            if warn:
+                log.warning(
+                    "request log queue full (%d); dropping rows (total dropped=%d)",
+                    self._queue.maxsize,
+                    self._dropped,
+                )
+            return False
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until every row queued before this call is committed."""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Drain the queue and stop the writer thread (idempotent)."""
+        self._closed = True
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            log.warning("request log writer did not accept stop; %d rows pending",
+                        self._queue.qsize())
+            return
+        thread.join(timeout)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "capacity": self._queue.maxsize,
+                "written": self._written,
+                "dropped": self._dropped,
+                "failed": self._failed,
+            }
+
+    # ── consumer side ─────────────────────────────────────────
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="ollabridge-request-log", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        batch: list[RequestLog] = []
+        waiters: list[threading.Event] = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            timeout = max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            stop = item is _STOP
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            elif isinstance(item, RequestLog):
+                batch.append(item)
+
+            due = (
+                stop
+                or waiters
+                or len(batch) >= self.batch_size
+                or time.monotonic() >= deadline
+            )
+            if not due:
+                continue
+            # Take whatever else is already queued so a flush or stop covers it.
+            if stop or waiters:
+                stop = self._drain(batch, waiters) or stop
+            if batch:
+                self._commit(batch)
+                batch = []
+            for event in waiters:
+                event.set()
+            waiters = []
+            deadline = time.monotonic() + self.flush_interval
+            if stop:
+                return
+
+    def _drain(self, batch: list[RequestLog], waiters: list[threading.Event]) -> bool:
+        stop = False
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return stop
+            if item is _STOP:
+                stop = True
+            elif isinstance(item, threading.Event):
+                waiters.append(item)
+            elif isinstance(item, RequestLog):
+                batch.append(item)
+
+    def _commit(self, batch: list[RequestLog]) -> None:
+        try:
+            with session() as s:
+                s.add_all(batch)
+                s.commit()
+        except Exception:
+            with self._lock:
+                self._failed += len(batch)
+            log.warning("request log batch of %d rows failed", len(batch), exc_info=True)
+            return
+        with self._lock:
+            self._written += len(batch)
+
+
+_writer: RequestLogWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def get_request_log_writer() -> RequestLogWriter:
+    """Process-wide request log writer singleton."""
+    global _writer
+    with _writer_lock:
+        if _writer is None or _writer._closed:
+            _writer = RequestLogWriter(
+                max_queue=settings.REQUEST_LOG_QUEUE_SIZE,
+                batch_size=settings.REQUEST_LOG_BATCH_SIZE,
+                flush_interval=settings.REQUEST_LOG_FLUSH_INTERVAL,
+            )
+        return _writer
+
+
+def close_request_log_writer(timeout: float = 5.0) -> None:
+    """Flush pending rows and stop the writer; called on app shutdown."""
+    with _writer_lock:
+        writer = _writer
+    if writer is not None:
+        writer.close(timeout)
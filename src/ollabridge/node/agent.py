@@ -2,17 +2,20 @@ from __future__ import annotations
 
 import asyncio
 import json
+import logging
 import os
 import platform as py_platform
 import socket
 import uuid
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Awaitable, Callable, Optional
 
 import websockets
 
 from ollabridge.node.runtime import LocalRuntime
 
+log = logging.getLogger("ollabridge.node")
+
 
 @dataclass(frozen=True)
 class NodeConfig:
@@ -30,12 +33,146 @@ class CloudDeviceConfig:
     device_id: str
     device_token: str
     runtime_base_url: str
+    capacity: int = 1
 
 
 def default_node_id() -> str:
     return os.environ.get("OBRIDGE_NODE_ID") or f"node-{socket.gethostname()}-{uuid.uuid4().hex[:6]}"
 
 
+class _FrameWriter:
+    """Serialize outgoing frames: request tasks and the heartbeat share one socket."""
+
+    def __init__(self, ws: Any) -> None:
+        self._ws = ws
+        self._lock = asyncio.Lock()
+
+    async def send(self, frame: dict[str, Any]) -> None:
+        data = json.dumps(frame)
+        async with self._lock:
+            await self._ws.send(data)
+
+
+class _StreamCredit:
+    """Flow-control window for one streamed reply.
+
+    The gateway puts ``"window": N`` on streamed requests and returns credit
+    with ``credit`` frames as its client consumes chunks. Requests without a
+    window (e.g. from OllaBridge Cloud) stream unthrottled.
+    """
+
+    def __init__(self, window: Optional[int]) -> None:
+        self._available = window
+        self._changed = asyncio.Event()
+
+    def grant(self, n: int) -> None:
+        if self._available is not None:
+            self._available += max(0, int(n))
+            self._changed.set()
+
+    async def acquire(self) -> None:
+        if self._available is None:
+            return
+        while self._available <= 0:
+            self._changed.clear()
+            await self._changed.wait()
+        self._available -= 1
+
+
+Handler = Callable[[dict[str, Any], _StreamCredit], Awaitable[None]]
+
+
+class _RequestDispatcher:
+    """Run each ``req`` frame as its own task, at most ``capacity`` at a time.
+
+    Requests beyond capacity wait on the semaphore in arrival order. A
+    ``{"type": "cancel", "id": ...}`` frame aborts the matching task whether
+    it is still waiting or already running; nothing is sent back for it.
+    ``credit`` frames are routed to the request's :class:`_StreamCredit`.
+
+    A ``deadline_ms`` on the frame is the gateway's remaining budget: a
+    request still queued when it runs out is dropped (the gateway has
+    already answered 504), and a buffered one still running is cut off at
+    that point. Streams that started in time are left to finish.
+    """
+
+    def __init__(self, handler: Handler, capacity: int) -> None:
+        self._handler = handler
+        self._slots = asyncio.Semaphore(max(1, int(capacity)))
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+        self._credits: dict[str, _StreamCredit] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    def submit(self, frame: dict[str, Any]) -> None:
+        req_id = str(frame.get("id") or "")
+        window = frame.get("window")
+        credit = _StreamCredit(int(window) if isinstance(window, int) and window > 0 else None)
+        task = asyncio.create_task(self._run(frame, credit))
+        if req_id:
+            self._tasks[req_id] = task
+            self._credits[req_id] = credit
+            task.add_done_callback(lambda t: self._forget(req_id, t))
+
+    def grant(self, req_id: Any, n: Any) -> None:
+        credit = self._credits.get(str(req_id or ""))
+        if credit is not None:
+            credit.grant(int(n or 0))
+
+    def handle_control(self, frame: dict[str, Any]) -> None:
+        """Route a non-``req`` frame (cancel / credit)."""
+        mtype = frame.get("type")
+        if mtype == "cancel":
+            self.cancel(frame.get("id"))
+        elif mtype == "credit":
+            self.grant(frame.get("id"), frame.get("n"))
+
+    def cancel(self, req_id: Any) -> bool:
+        task = self._tasks.get(str(req_id or ""))
+        if task is None:
+            return False
+        task.cancel()
+        return True
+
+    async def aclose(self) -> None:
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _forget(self, req_id: str, task: asyncio.Task[None]) -> None:
+        if self._tasks.get(req_id) is task:
+            del self._tasks[req_id]
+            self._credits.pop(req_id, None)
+
+    async def _run(self, frame: dict[str, Any], credit: _StreamCredit) -> None:
+        deadline_ms = frame.get("deadline_ms")
+        expires = None
+        if isinstance(deadline_ms, (int, float)):
+            expires = asyncio.get_running_loop().time() + deadline_ms / 1000
+        try:
+            async with self._slots:
+                if expires is None:
+                    await self._handler(frame, credit)
+                    return
+                remaining = expires - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    log.debug("relay request %s expired in queue", frame.get("id"))
+                    return
+                if (frame.get("payload") or {}).get("stream") is True:
+                    await self._handler(frame, credit)
+                else:
+                    await asyncio.wait_for(self._handler(frame, credit), timeout=remaining)
+        except asyncio.TimeoutError:
+            log.debug("relay request %s ran past its deadline", frame.get("id"))
+        except Exception as e:
+            # Only reachable when the reply itself cannot be sent (socket gone);
+            # the receive loop notices the closed connection on its own.
+            log.debug("relay request %s failed: %r", frame.get("id"), e)
+
+
 async def run_node(config: NodeConfig) -> None:
     """Connect to the Local Control Plane and serve inference over the relay link."""
     runtime = LocalRuntime(config.runtime_base_url)
@@ -50,28 +187,37 @@ async def run_node(config: NodeConfig) -> None:
             "tags": config.tags,
             "models": models,
             "capacity": config.capacity,
+            "capabilities": ["embed_batch", "cancel", "chat_stream", "resident"],
             "meta": {"platform": py_platform.platform()},
         }
         await ws.send(json.dumps(hello))
         _ = await ws.recv()  # hello_ack
 
-        while True:
-            raw = await ws.recv()
-            frame = json.loads(raw)
-            if frame.get("type") != "req":
-                continue
+        writer = _FrameWriter(ws)
 
+        async def handle(frame: dict[str, Any], credit: _StreamCredit) -> None:
             req_id = frame.get("id")
             op = frame.get("op")
             payload = frame.get("payload") or {}
 
             try:
+                if op == "chat" and payload.get("stream") is True:
+                    async for chunk in runtime.chat_stream(model=payload["model"], messages=payload["messages"]):
+                        await credit.acquire()
+                        await writer.send({"type": "delta", "id": req_id, "content": chunk})
+                    await writer.send({"type": "done", "id": req_id})
+                    return
                 if op == "chat":
                     content = await runtime.chat(model=payload["model"], messages=payload["messages"])
                     res = {"type": "res", "id": req_id, "ok": True, "data": {"content": content}}
                 elif op == "embeddings":
-                    emb = await runtime.embeddings(model=payload["model"], text=payload.get("input") or "")
-                    res = {"type": "res", "id": req_id, "ok": True, "data": {"embedding": emb}}
+                    inp = payload.get("input")
+                    if isinstance(inp, list):
+                        embs = await runtime.embed(model=payload["model"], inputs=inp)
+                        res = {"type": "res", "id": req_id, "ok": True, "data": {"embeddings": embs}}
+                    else:
+                        emb = await runtime.embeddings(model=payload["model"], text=inp or "")
+                        res = {"type": "res", "id": req_id, "ok": True, "data": {"embedding": emb}}
                 elif op == "models":
                     models = await runtime.list_models()
                     res = {
@@ -80,12 +226,30 @@ async def run_node(config: NodeConfig) -> None:
                         "ok": True,
                         "data": {"object": "list", "data": [{"id": m, "object": "model"} for m in models]},
                     }
+                elif op == "ps":
+                    res = {"type": "res", "id": req_id, "ok": True, "data": {"models": await runtime.list_running()}}
+                elif op == "keep_alive":
+                    await runtime.keep_alive(model=payload["model"], keep_alive=payload.get("keep_alive", 0))
+                    res = {"type": "res", "id": req_id, "ok": True, "data": {}}
                 else:
                     res = {"type": "res", "id": req_id, "ok": False, "error": f"unknown op: {op}"}
             except Exception as e:
                 res = {"type": "res", "id": req_id, "ok": False, "error": str(e)}
 
-            await ws.send(json.dumps(res))
+            await writer.send(res)
+
+        dispatcher = _RequestDispatcher(handle, config.capacity)
+        try:
+            while True:
+                raw = await ws.recv()
+                frame = json.loads(raw)
+                mtype = frame.get("type")
+                if mtype == "req":
+                    dispatcher.submit(frame)
+                else:
+                    dispatcher.handle_control(frame)
+        finally:
+            await dispatcher.aclose()
 
 
 def _platform_short() -> str:
@@ -130,98 +294,111 @@ async def run_cloud_device(config: CloudDeviceConfig) -> None:
             "client_version": "ollabridge-local-cloud-compat/0.1.0",
             "platform": _platform_short(),
             "models": models,
-            "capabilities": ["chat", "embeddings", "models"],
+            "capabilities": ["chat", "embeddings", "models", "cancel"],
+            "capacity": config.capacity,
             "protocol_version": "0.1.0",
         }
         await ws.send(json.dumps(hello))
 
+        writer = _FrameWriter(ws)
         stop = asyncio.Event()
 
         async def heartbeat() -> None:
             # Device should ping every 30-60 seconds; Cloud responds pong
             while not stop.is_set():
                 try:
-                    await ws.send(json.dumps({"type": "ping"}))
+                    await writer.send({"type": "ping"})
                 except Exception:
                     return
                 await asyncio.sleep(30)
 
-        hb_task = asyncio.create_task(heartbeat())
-
-        try:
-            while True:
-                raw = await ws.recv()
-                frame = json.loads(raw)
-
-                mtype = frame.get("type")
-                if mtype in ("pong", "hello_ack"):
-                    continue
-
-                if mtype != "req":
-                    continue
-
-                req_id = frame.get("id")
-                op = frame.get("op")
-                payload = frame.get("payload") or {}
+        async def handle(frame: dict[str, Any], credit: _StreamCredit) -> None:
+            req_id = frame.get("id")
+            op = frame.get("op")
+            payload = frame.get("payload") or {}
 
-                # Cloud: op in {chat, embeddings, models}
-                try:
-                    if op == "models":
-                        models = await runtime.list_models()
-                        res = {
+            # Cloud: op in {chat, embeddings, models}
+            try:
+                if op == "models":
+                    models = await runtime.list_models()
+                    await writer.send(
+                        {
                             "type": "res",
                             "id": req_id,
                             "ok": True,
                             "data": {"object": "list", "data": [{"id": m, "object": "model"} for m in models]},
                         }
-                        await ws.send(json.dumps(res))
-                        continue
-
-                    if op == "embeddings":
-                        model = payload.get("model") or ""
-                        text = payload.get("input") or payload.get("text") or ""
-                        emb = await runtime.embeddings(model=model, text=str(text))
-                        res = {
+                    )
+                    return
+
+                if op == "embeddings":
+                    model = payload.get("model") or ""
+                    text = payload.get("input") or payload.get("text") or ""
+                    if isinstance(text, list):
+                        embs = await runtime.embed(model=model, inputs=text)
+                    else:
+                        embs = [await runtime.embeddings(model=model, text=str(text))]
+                    await writer.send(
+                        {
                             "type": "res",
                             "id": req_id,
                             "ok": True,
                             "data": {
                                 "object": "list",
                                 "model": model,
-                                "data": [{"object": "embedding", "index": 0, "embedding": emb}],
+                                "data": [
+                                    {"object": "embedding", "index": i, "embedding": emb}
+                                    for i, emb in enumerate(embs)
+                                ],
                             },
                         }
-                        await ws.send(json.dumps(res))
-                        continue
-
-                    if op == "chat":
-                        model = payload.get("model") or ""
-                        messages = payload.get("messages") or []
-                        stream = bool(payload.get("stream") is True)
+                    )
+                    return
 
-                        if not stream:
-                            content = await runtime.chat(model=model, messages=messages)
-                            res = {
+                if op == "chat":
+                    model = payload.get("model") or ""
+                    messages = payload.get("messages") or []
+                    stream = bool(payload.get("stream") is True)
+
+                    if not stream:
+                        content = await runtime.chat(model=model, messages=messages)
+                        await writer.send(
+                            {
                                 "type": "res",
                                 "id": req_id,
                                 "ok": True,
                                 "data": _chat_completion_payload(model=model, content=content),
                             }
-                            await ws.send(json.dumps(res))
-                            continue
+                        )
+                        return
+
+                    # Streaming: send delta chunks + done
+                    async for chunk in runtime.chat_stream(model=model, messages=messages):
+                        await credit.acquire()
+                        await writer.send({"type": "delta", "id": req_id, "content": chunk})
+                    await writer.send({"type": "done", "id": req_id})
+                    return
+
+                # Unknown op
+                await writer.send({"type": "res", "id": req_id, "ok": False, "error": f"unknown op: {op}"})
+
+            except Exception as e:
+                # Cloud protocol supports either res(ok=false) or error frames; keep it simple:
+                await writer.send({"type": "res", "id": req_id, "ok": False, "error": str(e)})
 
-                        # Streaming: send delta chunks + done
-                        async for chunk in runtime.chat_stream(model=model, messages=messages):
-                            await ws.send(json.dumps({"type": "delta", "id": req_id, "content": chunk}))
-                        await ws.send(json.dumps({"type": "done", "id": req_id}))
-                        continue
+        hb_task = asyncio.create_task(heartbeat())
+        dispatcher = _RequestDispatcher(handle, config.capacity)
 
-                    # Unknown op
-                    await ws.send(json.dumps({"type": "res", "id": req_id, "ok": False, "error": f"unknown op: {op}"}))
+        try:
+            while True:
+                raw = await ws.recv()
+                frame = json.loads(raw)
 
-                except Exception as e:
-                    # Cloud protocol supports either res(ok=false) or error frames; keep it simple:
-                    await ws.send(json.dumps({"type": "res", "id": req_id, "ok": False, "error": str(e)}))
+                mtype = frame.get("type")
+                if mtype == "req":
+                    dispatcher.submit(frame)
+                else:
+                    dispatcher.handle_control(frame)
 
         finally:
             stop.set()
@@ -229,3 +406,4 @@ async def run_cloud_device(config: CloudDeviceConfig) -> None:
                 hb_task.cancel()
             except Exception:
                 pass
+            await dispatcher.aclose()
@@ -30,7 +30,7 @@ def join(
     runtime_base_url: str = typer.Option("http://127.0.0.1:11434", "--runtime", help="Local runtime base URL"),
     node_id: str = typer.Option("", "--node-id", help="Stable node identifier"),
     tags: str = typer.Option("", "--tags", help="Comma-separated tags for routing"),
-    capacity: int = typer.Option(1, "--capacity", help="Concurrent capacity hint"),
+    capacity: int = typer.Option(1, "--capacity", help="Requests served concurrently"),
     model: str = typer.Option("", "--ensure-model", help="If set, ensure this chat model exists"),
 ):
     """Join this machine to an OllaBridge Local Control Plane (outbound-only)."""
@@ -136,6 +136,7 @@ def cloud_connect(
     device_id: str = typer.Option("", "--device-id", help="Override device_id; otherwise use saved credentials"),
     device_token: str = typer.Option("", "--device-token", help="Override device_token; otherwise use saved credentials"),
     runtime_base_url: str = typer.Option("http://127.0.0.1:11434", "--runtime", help="Local runtime base URL"),
+    capacity: int = typer.Option(1, "--capacity", help="Requests served concurrently"),
     model: str = typer.Option("", "--ensure-model", help="If set, ensure this chat model exists"),
 ):
     """
@@ -161,7 +162,9 @@ def cloud_connect(
         )
         raise typer.Exit(code=2)
 
-    cfg = CloudDeviceConfig(cloud_url=cloud_url, device_id=did, device_token=tok, runtime_base_url=runtime_base_url)
+    cfg = CloudDeviceConfig(
+        cloud_url=cloud_url, device_id=did, device_token=tok, runtime_base_url=runtime_base_url, capacity=capacity
+    )
 
     console.print(
         Panel(
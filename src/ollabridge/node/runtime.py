@@ -10,6 +10,16 @@ def _join(base: str, path: str) -> str:
     return base.rstrip("/") + "/" + path.lstrip("/")
 
 
+def _endpoint_missing(r: httpx.Response) -> bool:
+    if r.status_code != 404:
+        return False
+    try:
+        body = r.json()
+    except ValueError:
+        return True
+    return not (isinstance(body, dict) and body.get("error"))
+
+
 class LocalRuntime:
     """Minimal adapter around an Ollama-like HTTP runtime."""
 
@@ -61,6 +71,18 @@ class LocalRuntime:
         data = r.json()
         return data.get("embedding", [])
 
+    async def embed(self, *, model: str, inputs: list[str]) -> list[list[float]]:
+        """Batch embeddings via ``/api/embed``; legacy per-text fallback on 404.
+
+        Only a 404 for the route itself falls back: Ollama answers an unknown
+        model with a 404 carrying an ``error`` body, which is raised as is.
+        """
+        r = await self._client.post(_join(self.base_url, "/api/embed"), json={"model": model, "input": inputs})
+        if _endpoint_missing(r):
+            return [await self.embeddings(model=model, text=text) for text in inputs]
+        r.raise_for_status()
+        return r.json().get("embeddings", [])
+
     async def list_models(self) -> list[str]:
         try:
             r = await self._client.get(_join(self.base_url, "/api/tags"))
@@ -74,3 +96,18 @@ class LocalRuntime:
             return out
         except Exception:
             return []
+
+    async def list_running(self) -> list[dict[str, Any]]:
+        """Models loaded in memory (``/api/ps``)."""
+        r = await self._client.get(_join(self.base_url, "/api/ps"), timeout=5)
+        r.raise_for_status()
+        return r.json().get("models", []) or []
+
+    async def keep_alive(self, *, model: str, keep_alive: float) -> None:
+        """Load *model* and keep it for *keep_alive* seconds (0 unloads)."""
+        r = await self._client.post(
+            _join(self.base_url, "/api/generate"),
+            json={"model": model, "keep_alive": keep_alive},
+            timeout=300,
+        )
+        r.raise_for_status()
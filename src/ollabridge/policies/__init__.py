@@ -18,3 +18,9 @@ from ollabridge.policies.engine import (  # noqa: F401
     load_policies,
     validate_policies_file,
 )
+from ollabridge.policies.runtime import (  # noqa: F401
+    CompiledPolicy,
+    PolicyTable,
+    PolicyTarget,
+    compile_policy,
+)
@@ -55,6 +55,7 @@ policies:
       prefer: [{provider: local}]
       fallback: false
     logging: {prompt_logging: false}
+    cache: {enabled: false}
 
   - name: fast_mode
     match: {alias: fast}
@@ -208,6 +209,26 @@ def validate_policies_file(path: Path | None = None) -> list[str]:
     return problems
 
 
+def target_denied(pol: Policy, target_type: str, provider: str | None) -> bool:
+    """True if *pol*'s allow/deny lists exclude this target."""
+    if any(
+        f.matches(target_type=target_type, provider=provider)
+        for f in pol.route.deny
+    ):
+        return True
+    if pol.route.allow and not any(
+        f.matches(target_type=target_type, provider=provider)
+        for f in pol.route.allow
+    ):
+        return True
+    return False
+
+
+def estimated_cost_per_1k(provider: str) -> float | None:
+    """Indicative USD per 1k tokens for *provider*, ``None`` if unknown."""
+    return _COST_PER_1K.get(provider.lower())
+
+
 def find_policy(
     name_or_alias: str, policies: list[Policy] | None = None
 ) -> Policy | None:
@@ -318,17 +339,7 @@ def explain_route(
     exp.prompt_logging = pol.logging.prompt_logging
 
     def denied(target_type: str, provider: str | None) -> bool:
-        if any(
-            f.matches(target_type=target_type, provider=provider)
-            for f in pol.route.deny
-        ):
-            return True
-        if pol.route.allow and not any(
-            f.matches(target_type=target_type, provider=provider)
-            for f in pol.route.allow
-        ):
-            return True
-        return False
+        return target_denied(pol, target_type, provider)
 
     candidates = pol.route.prefer or [PreferenceTarget(provider="local")]
     remaining: list[str] = []
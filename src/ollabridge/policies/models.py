@@ -77,6 +77,19 @@ class LoggingSpec(BaseModel):
     prompt_logging: bool = False
 
 
+class CacheSpec(BaseModel):
+    """Response caching for requests routed by this policy.
+
+    ``enabled`` (exact match) and ``semantic`` (paraphrase match) unset
+    follow ``CHAT_CACHE_ENABLED`` / ``SEMANTIC_CACHE_ENABLED``;
+    ``enabled: false`` turns both off.
+    """
+
+    enabled: Optional[bool] = None
+    semantic: Optional[bool] = None
+    ttl_s: Optional[int] = Field(default=None, gt=0)
+
+
 class ScopeSpec(BaseModel):
     """Workspace/project/user/team scoping (enterprise; advisory locally)."""
 
@@ -91,6 +104,7 @@ class Policy(BaseModel):
     match: PolicyMatch
     route: RouteSpec = Field(default_factory=RouteSpec)
     logging: LoggingSpec = Field(default_factory=LoggingSpec)
+    cache: CacheSpec = Field(default_factory=CacheSpec)
     scope: ScopeSpec = Field(default_factory=ScopeSpec)
     data_classification: Optional[str] = None  # e.g. public|internal|confidential
 
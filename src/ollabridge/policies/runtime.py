@@ -0,0 +1,220 @@
+"""Compiled policies for the request path.
+
+:func:`load_policies` parses YAML and merges built-ins on every call, which
+is fine for ``route explain`` but not per request. :class:`PolicyTable`
+compiles the merged policies once into a decision table keyed by the alias
+or model they match, and recompiles only when ``policies.yaml`` changes on
+disk or the provider registry version moves (policies name providers such
+as ``groq``; the table maps them to the registered provider ids).
+
+Static rules are applied at compile time: allow/deny lists and the cost
+ceiling drop targets before any request is routed, so ``cheap`` never
+reaches an expensive provider. Dynamic rules — availability and the
+observed p95 against ``max_latency_ms`` — are left to the caller, which
+checks them per request against live state.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from ollabridge.core import paths
+from ollabridge.policies.engine import (
+    builtin_policies,
+    estimated_cost_per_1k,
+    load_policies,
+    target_denied,
+)
+from ollabridge.policies.models import Policy, PreferenceTarget, TargetType
+
+log = logging.getLogger("ollabridge.policies")
+
+
+@dataclass(frozen=True)
+class PolicyTarget:
+    """One routable target of a compiled policy, in preference order."""
+
+    type: TargetType
+    provider_id: Optional[str] = None  # provider registry id; None for local
+    model: Optional[str] = None        # None on a local target = default model
+    device_tag: Optional[str] = None
+    cost_per_1k: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class CompiledPolicy:
+    name: str
+    targets: tuple[PolicyTarget, ...]
+    fallback: bool
+    max_latency_ms: Optional[int]
+    prompt_logging: bool
+    skipped: tuple[str, ...]  # why preferred targets were dropped at compile time
+    cache_enabled: Optional[bool] = None  # None = gateway default
+    cache_semantic: Optional[bool] = None
+    cache_ttl_s: Optional[int] = None
+
+
+def _provider_configs(providers: Any, name: str) -> list[Any]:
+    if providers is None:
+        return []
+    matches = []
+    for config in providers.list_providers():
+        cid, kind = config.id.lower(), (config.kind or "").lower()
+        if name in (cid, kind) or cid.startswith(name + "-"):
+            matches.append(config)
+    return matches
+
+
+def _alias_model(providers: Any, provider_id: str) -> Optional[str]:
+    """First model any alias routes to on *provider_id*."""
+    for candidates in providers.aliases.values():
+        for candidate in candidates:
+            if candidate.provider == provider_id:
+                return candidate.model
+    return None
+
+
+def compile_policy(pol: Policy, providers: Any = None) -> CompiledPolicy:
+    targets: list[PolicyTarget] = []
+    skipped: list[str] = []
+    ceiling = pol.route.max_cost_usd_per_1k_tokens
+
+    for pref in pol.route.prefer or [PreferenceTarget(provider="local")]:
+        if pref.is_local:
+            if target_denied(pol, "local_device", None):
+                skipped.append("local device denied by policy")
+                continue
+            targets.append(
+                PolicyTarget(
+                    type="local_device",
+                    model=pref.model,
+                    device_tag=pref.device_tag,
+                    cost_per_1k=0.0,
+                )
+            )
+            continue
+
+        name = pref.provider.lower()
+        if target_denied(pol, "external_provider", name):
+            skipped.append(f"provider {name!r} denied by policy")
+            continue
+        configs = _provider_configs(providers, name)
+        if not configs:
+            skipped.append(f"provider {name!r} is not registered")
+            continue
+        for config in configs:
+            if getattr(config.category, "value", config.category) == "local":
+                cost: Optional[float] = 0.0
+            else:
+                cost = estimated_cost_per_1k(name)
+                if cost is None:
+                    cost = estimated_cost_per_1k(config.kind or "")
+            if ceiling is not None and cost is not None and cost > ceiling:
+                skipped.append(
+                    f"provider {config.id!r} skipped: est. ${cost}/1k tokens exceeds ceiling ${ceiling}"
+                )
+                continue
+            model = pref.model or _alias_model(providers, config.id)
+            if not model:
+                skipped.append(f"provider {config.id!r} skipped: no model configured")
+                continue
+            targets.append(
+                PolicyTarget(
+                    type="external_provider",
+                    provider_id=config.id,
+                    model=model,
+                    cost_per_1k=cost,
+                )
+            )
+
+    return CompiledPolicy(
+        name=pol.name,
+        targets=tuple(targets),
+        fallback=pol.route.fallback,
+        max_latency_ms=pol.route.max_latency_ms,
+        prompt_logging=pol.logging.prompt_logging,
+        skipped=tuple(skipped),
+        cache_enabled=pol.cache.enabled,
+        cache_semantic=pol.cache.semantic,
+        cache_ttl_s=pol.cache.ttl_s,
+    )
+
+
+class PolicyTable:
+    """Alias/model → :class:`CompiledPolicy`, hot-reloaded from disk.
+
+    The policy file is stat'ed at most every ``reload_interval`` seconds.
+    A file that fails to parse keeps the previous table in service.
+    """
+
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        *,
+        reload_interval: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.path = Path(path) if path else paths.policies_file()
+        self.reload_interval = reload_interval
+        self._clock = clock
+        self._checked_at: float | None = None
+        self._file_stamp: tuple[int, int] | None = None
+        self._policies: list[Policy] | None = None
+        self._providers_version: int | None = None
+        self._stale = True
+        self._table: dict[str, CompiledPolicy] = {}
+        self.compiles = 0
+
+    def _stat(self) -> tuple[int, int] | None:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _refresh(self, providers: Any) -> None:
+        now = self._clock()
+        if (
+            self._policies is None
+            or self._checked_at is None
+            or now - self._checked_at >= self.reload_interval
+        ):
+            self._checked_at = now
+            stamp = self._stat()
+            if self._policies is None or stamp != self._file_stamp:
+                try:
+                    self._policies = load_policies(self.path)
+                except Exception as exc:
+                    if self._policies is None:
+                        self._policies = builtin_policies()
+                    log.warning("invalid %s, keeping current policies: %s", self.path, exc)
+                else:
+                    log.info("loaded %d routing policies", len(self._policies))
+                self._file_stamp = stamp
+                self._stale = True
+
+        version = getattr(providers, "version", None)
+        if self._stale or version != self._providers_version:
+            self._compile(providers)
+            self._providers_version = version
+            self._stale = False
+
+    def _compile(self, providers: Any) -> None:
+        table: dict[str, CompiledPolicy] = {}
+        for pol in self._policies or []:
+            compiled = compile_policy(pol, providers)
+            # First match wins, mirroring find_policy (user policies come first).
+            for key in (pol.match.alias, pol.match.model):
+                if key and key not in table:
+                    table[key] = compiled
+        self._table = table
+        self.compiles += 1
+
+    def lookup(self, model: str, providers: Any = None) -> Optional[CompiledPolicy]:
+        """The compiled policy matching *model* (an alias or model id), if any."""
+        self._refresh(providers)
+        return self._table.get(model)
@@ -1,8 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+import json
+from typing import AsyncIterator
+
 import httpx
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import (
+    RetryCallState,
+    retry,
+    retry_if_exception,
+    retry_if_not_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+)
 
+from ollabridge.core.deadline import Deadline, DeadlineExceeded, budget
+from ollabridge.core.http_pool import http_client
 from ollabridge.core.settings import settings
 
 
@@ -10,8 +23,40 @@ def _join(base: str, path: str) -> str:
     return base.rstrip("/") + "/" + path.lstrip("/")
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(min=0.5, max=4))
-async def chat(model: str, messages: list[dict], options: dict | None = None) -> str:
+def _transient(exc: BaseException) -> bool:
+    # 4xx (unknown model, bad input) fails the same way on every attempt.
+    return not (isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code < 500)
+
+
+def _endpoint_missing(r: httpx.Response) -> bool:
+    """404 for the route itself, as opposed to Ollama's JSON "model not found"."""
+    if r.status_code != 404:
+        return False
+    try:
+        body = r.json()
+    except ValueError:
+        return True
+    return not (isinstance(body, dict) and body.get("error"))
+
+
+def _deadline_spent(retry_state: RetryCallState) -> bool:
+    # No point backing off for another attempt the caller will not wait for.
+    deadline = retry_state.kwargs.get("deadline")
+    return deadline is not None and deadline.remaining() < 0.5
+
+
+@retry(
+    stop=stop_after_attempt(3) | _deadline_spent,
+    wait=wait_exponential(min=0.5, max=4),
+    retry=retry_if_not_exception_type(DeadlineExceeded),
+)
+async def chat(
+    model: str,
+    messages: list[dict],
+    options: dict | None = None,
+    *,
+    deadline: Deadline | None = None,
+) -> str:
     payload = {
         "model": model,
         "messages": messages,
@@ -20,37 +65,101 @@ async def chat(model: str, messages: list[dict], options: dict | None = None) ->
     if options:
         payload["options"] = options
 
-    async with httpx.AsyncClient(timeout=120) as client:
-        r = await client.post(_join(settings.OLLAMA_BASE_URL, settings.OLLAMA_CHAT_PATH), json=payload)
+    url = _join(settings.OLLAMA_BASE_URL, settings.OLLAMA_CHAT_PATH)
+    r = await http_client(url).post(url, json=payload, timeout=budget(deadline, 120))
+    r.raise_for_status()
+    data = r.json()
+    return data.get("message", {}).get("content", "") or ""
+
+
+async def chat_stream(
+    model: str,
+    messages: list[dict],
+    options: dict | None = None,
+    *,
+    deadline: Deadline | None = None,
+) -> AsyncIterator[str]:
+    """Stream content fragments from Ollama's NDJSON ``/api/chat``.
+
+    Not retried: once a fragment has been handed to the caller the request
+    cannot be replayed transparently.
+    """
+    payload = {
+        "model": model,
+        "messages": messages,
+        "stream": True,
+    }
+    if options:
+        payload["options"] = options
+
+    url = _join(settings.OLLAMA_BASE_URL, settings.OLLAMA_CHAT_PATH)
+    timeout = budget(deadline, 120)
+    async with http_client(url).stream("POST", url, json=payload, timeout=timeout) as r:
         r.raise_for_status()
-        data = r.json()
-        return data.get("message", {}).get("content", "") or ""
+        async for line in r.aiter_lines():
+            if not line:
+                continue
+            try:
+                obj = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if obj.get("error"):
+                raise RuntimeError(str(obj["error"]))
+            chunk = (obj.get("message") or {}).get("content") or ""
+            if chunk:
+                yield chunk
+            if obj.get("done") is True:
+                break
 
 
-@retry(stop=stop_after_attempt(3), wait=wait_exponential(min=0.5, max=4))
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(min=0.5, max=4),
+    retry=retry_if_exception(_transient),
+)
 async def embeddings(model: str, text: str) -> list[float]:
     payload = {"model": model, "prompt": text}
-    async with httpx.AsyncClient(timeout=120) as client:
-        r = await client.post(_join(settings.OLLAMA_BASE_URL, settings.OLLAMA_EMBED_PATH), json=payload)
-        r.raise_for_status()
-        data = r.json()
-        # Ollama returns {embedding: [...]}
-        return data.get("embedding", [])
+    url = _join(settings.OLLAMA_BASE_URL, settings.OLLAMA_EMBED_PATH)
+    r = await http_client(url).post(url, json=payload, timeout=120)
+    r.raise_for_status()
+    data = r.json()
+    # Ollama returns {embedding: [...]}
+    return data.get("embedding", [])
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(min=0.5, max=4),
+    retry=retry_if_exception(_transient),
+)
+async def embed(model: str, inputs: list[str]) -> list[list[float]]:
+    """Embed a batch of texts with one ``/api/embed`` call.
+
+    Falls back to concurrent legacy ``/api/embeddings`` calls when the
+    runtime predates the batch endpoint (a 404 without an ``error`` body;
+    an unknown model is a 404 with one and is raised as is).
+    """
+    url = _join(settings.OLLAMA_BASE_URL, settings.OLLAMA_BATCH_EMBED_PATH)
+    r = await http_client(url).post(url, json={"model": model, "input": inputs}, timeout=120)
+    if _endpoint_missing(r):
+        return list(await asyncio.gather(*(embeddings(model, text) for text in inputs)))
+    r.raise_for_status()
+    return r.json().get("embeddings", [])
 
 
 async def list_models() -> list[str]:
     # Not all versions expose a stable list endpoint; best-effort.
     # If unavailable, return empty list.
-    async with httpx.AsyncClient(timeout=15) as client:
-        try:
-            r = await client.get(_join(settings.OLLAMA_BASE_URL, "/api/tags"))
-            r.raise_for_status()
-            data = r.json()
-            models = []
-            for m in data.get("models", []) or []:
-                name = m.get("name")
-                if name:
-                    models.append(name)
-            return models
-        except Exception:
-            return []
+    url = _join(settings.OLLAMA_BASE_URL, "/api/tags")
+    try:
+        r = await http_client(url).get(url, timeout=15)
+        r.raise_for_status()
+        data = r.json()
+        models = []
+        for m in data.get("models", []) or []:
+            name = m.get("name")
+            if name:
+                models.append(name)
+        return models
+    except Exception:
+        return []
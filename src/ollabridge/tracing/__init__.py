@@ -6,5 +6,8 @@ Prompt and response content are NEVER stored here. See docs/PRIVACY.md.
 from ollabridge.tracing.store import (
     TraceRecord,
     TraceStore,
+    close_trace_store,
     get_trace_store,
-)  # noqa: F401
+)
+
+__all__ = ["TraceRecord", "TraceStore", "close_trace_store", "get_trace_store"]
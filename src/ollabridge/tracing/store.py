@@ -10,15 +10,23 @@ from __future__ import annotations
 
 import datetime as dt
 import json
+import logging
+import queue
 import sqlite3
 import threading
+import time
 import uuid
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 from pydantic import BaseModel, Field
 
 from ollabridge.core import paths
+from ollabridge.core.settings import settings
+
+log = logging.getLogger("ollabridge.tracing")
+
+_STOP = object()
 
 _SCHEMA = """
 CREATE TABLE IF NOT EXISTS traces (
@@ -41,11 +49,22 @@ CREATE TABLE IF NOT EXISTS traces (
     latency_ms INTEGER,
     estimated_cost_usd REAL,
     ok INTEGER NOT NULL DEFAULT 1,
-    error_category TEXT
+    error_category TEXT,
+    hedged INTEGER NOT NULL DEFAULT 0,
+    hedge_won INTEGER NOT NULL DEFAULT 0,
+    cache_hit INTEGER NOT NULL DEFAULT 0
 );
 CREATE INDEX IF NOT EXISTS idx_traces_ts ON traces (ts DESC);
 """
 
+# Columns added after the first release; older databases get them via
+# ALTER TABLE on open.
+_ADDED_COLUMNS = {
+    "hedged": "INTEGER NOT NULL DEFAULT 0",
+    "hedge_won": "INTEGER NOT NULL DEFAULT 0",
+    "cache_hit": "INTEGER NOT NULL DEFAULT 0",
+}
+
 
 def new_request_id() -> str:
     return f"req_{uuid.uuid4().hex}"
@@ -76,6 +95,9 @@ class TraceRecord(BaseModel):
     estimated_cost_usd: Optional[float] = None
     ok: bool = True
     error_category: Optional[str] = None
+    hedged: bool = False
+    hedge_won: bool = False
+    cache_hit: bool = False
 
     def to_json(self) -> str:
         return json.dumps(self.model_dump(), indent=2)
@@ -85,57 +107,254 @@ _COLUMNS = list(TraceRecord.model_fields.keys())
 
 
 class TraceStore:
-    """Small, dependency-free trace store. Safe for multi-threaded use."""
+    """Small, dependency-free trace store. Safe for multi-threaded use.
+
+    Built for sustained load: one long-lived connection in WAL mode with
+    ``synchronous=NORMAL``, and :meth:`record` only enqueues — a daemon
+    writer thread drains the queue with batched ``executemany`` inserts.
+    Reads flush pending writes first, so callers always see their own
+    traces. When the queue is full new traces are dropped and counted
+    (tracing must never slow serving down).
 
-    def __init__(self, path: Path | str | None = None) -> None:
+    Retention runs on the writer thread: every ``prune_interval`` seconds
+    everything but the newest ``retain`` rows is deleted in small rowid
+    chunks, so writers are never blocked behind one large DELETE.
+    """
+
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        *,
+        batch_size: int = 256,
+        flush_interval: float = 0.25,
+        max_queue: int = 50_000,
+        retain: int | None = None,
+        prune_interval: float = 300.0,
+    ) -> None:
         self.path = Path(path) if path else paths.traces_db_file()
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0.01, flush_interval)
+        self.retain = retain
+        self.prune_interval = prune_interval
         self._lock = threading.Lock()
+        self._queue: queue.Queue[Any] = queue.Queue(maxsize=max(1, max_queue))
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self._written = 0
+        self._dropped = 0
+        self._pruned = 0
+        self._last_prune = time.monotonic()
+        self._conn = self._connect()
         self._init_db()
 
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.path, timeout=5)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            self.path, timeout=5, check_same_thread=False, isolation_level=None
+        )
         conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
         return conn
 
     def _init_db(self) -> None:
-        self.path.parent.mkdir(parents=True, exist_ok=True)
-        with self._lock, self._connect() as conn:
-            conn.executescript(_SCHEMA)
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+            have = {r[1] for r in self._conn.execute("PRAGMA table_info(traces)")}
+            for name, ddl in _ADDED_COLUMNS.items():
+                if name not in have:
+                    self._conn.execute(f"ALTER TABLE traces ADD COLUMN {name} {ddl}")
         paths.tighten_permissions(self.path)
 
+    # ── writes ────────────────────────────────────────────────
+
     def record(self, trace: TraceRecord) -> None:
+        """Queue ``trace`` for the writer thread; never touches disk."""
+        if self._closed:
+            return
         values = trace.model_dump()
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(tuple(values[c] for c in _COLUMNS))
+        except queue.Full:
+            with self._lock:
+                self._dropped += 1
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until every trace queued before this call is written."""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write pending traces, stop the writer and close the connection."""
+        if self._closed:
+            return
+        self._closed = True
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+                thread.join(timeout)
+            except queue.Full:  # pragma: no cover - writer wedged
+                pass
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "queued": self._queue.qsize(),
+                "written": self._written,
+                "dropped": self._dropped,
+                "pruned": self._pruned,
+            }
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="ollabridge-traces", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        rows: list[tuple[Any, ...]] = []
+        waiters: list[threading.Event] = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+            stop = item is _STOP
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            elif isinstance(item, tuple):
+                rows.append(item)
+
+            if not (
+                stop
+                or waiters
+                or len(rows) >= self.batch_size
+                or time.monotonic() >= deadline
+            ):
+                continue
+            # Fold in everything already queued so one transaction covers it.
+            while len(rows) < self.batch_size * 4:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    rows.append(item)
+            if rows:
+                self._insert(rows)
+                rows = []
+            for event in waiters:
+                event.set()
+            waiters = []
+            if stop:
+                return
+            self._maybe_prune()
+            deadline = time.monotonic() + self.flush_interval
+
+    def _insert(self, rows: list[tuple[Any, ...]]) -> None:
         placeholders = ", ".join("?" for _ in _COLUMNS)
         cols = ", ".join(_COLUMNS)
-        with self._lock, self._connect() as conn:
-            conn.execute(
-                f"INSERT OR REPLACE INTO traces ({cols}) VALUES ({placeholders})",
-                [values[c] for c in _COLUMNS],
-            )
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN")
+                try:
+                    self._conn.executemany(
+                        f"INSERT OR REPLACE INTO traces ({cols}) VALUES ({placeholders})",
+                        rows,
+                    )
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                self._written += len(rows)
+        except sqlite3.Error:
+            log.warning("failed to write %d traces", len(rows), exc_info=True)
+
+    def _maybe_prune(self) -> None:
+        if not self.retain or self.prune_interval <= 0:
+            return
+        if time.monotonic() - self._last_prune < self.prune_interval:
+            return
+        self._last_prune = time.monotonic()
+        try:
+            self._prune(self.retain)
+        except sqlite3.Error:
+            log.warning("scheduled trace prune failed", exc_info=True)
+
+    # ── reads ─────────────────────────────────────────────────
 
     def get(self, request_id: str) -> TraceRecord | None:
-        with self._lock, self._connect() as conn:
-            row = conn.execute(
+        self.flush()
+        with self._lock:
+            row = self._conn.execute(
                 "SELECT * FROM traces WHERE request_id = ?", (request_id,)
             ).fetchone()
         return TraceRecord.model_validate(dict(row)) if row else None
 
     def list(self, limit: int = 50) -> list[TraceRecord]:
-        with self._lock, self._connect() as conn:
-            rows = conn.execute(
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(
                 "SELECT * FROM traces ORDER BY ts DESC LIMIT ?", (int(limit),)
             ).fetchall()
         return [TraceRecord.model_validate(dict(r)) for r in rows]
 
-    def prune(self, keep: int = 10000) -> int:
-        """Delete all but the newest *keep* traces. Returns rows removed."""
-        with self._lock, self._connect() as conn:
-            cur = conn.execute(
-                "DELETE FROM traces WHERE request_id NOT IN "
-                "(SELECT request_id FROM traces ORDER BY ts DESC LIMIT ?)",
-                (int(keep),),
-            )
-            return cur.rowcount
+    # ── retention ─────────────────────────────────────────────
+
+    def prune(self, keep: int = 10000, *, chunk: int = 1000) -> int:
+        """Delete all but the newest *keep* traces. Returns rows removed.
+
+        Rows are ordered by rowid (insertion order) and deleted in chunks
+        of ``chunk``, releasing the lock between chunks so queued writes
+        interleave with a large prune.
+        """
+        self.flush()
+        return self._prune(keep, chunk)
+
+    def _prune(self, keep: int, chunk: int = 1000) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT rowid FROM traces ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+                (max(0, int(keep)),),
+            ).fetchone()
+        if row is None:
+            return 0
+        cutoff = int(row[0])
+        removed = 0
+        while True:
+            with self._lock:
+                cur = self._conn.execute(
+                    "DELETE FROM traces WHERE rowid IN "
+                    "(SELECT rowid FROM traces WHERE rowid <= ? LIMIT ?)",
+                    (cutoff, int(chunk)),
+                )
+                removed += cur.rowcount
+                self._pruned += cur.rowcount
+            if cur.rowcount < chunk:
+                return removed
 
 
 _store: TraceStore | None = None
@@ -146,6 +365,17 @@ def get_trace_store() -> TraceStore:
     """Process-wide trace store singleton."""
     global _store
     with _store_lock:
-        if _store is None:
-            _store = TraceStore()
+        if _store is None or _store.closed:
+            _store = TraceStore(
+                retain=settings.TRACE_RETENTION_ROWS or None,
+                prune_interval=settings.TRACE_PRUNE_INTERVAL,
+            )
         return _store
+
+
+def close_trace_store() -> None:
+    """Flush and close the singleton; called from the app shutdown hook."""
+    with _store_lock:
+        store = _store
+    if store is not None:
+        store.close()
@@ -0,0 +1,151 @@
+"""Admission control: per-node queues, tenant fairness and 429 shedding."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ollabridge.core.admission import AdmissionController, AdmissionRejected
+from ollabridge.core.registry import RuntimeNodeState
+from ollabridge.core.settings import settings
+
+AUTH = {"Authorization": "Bearer test-key-abc"}
+
+
+async def _queue(ctl: AdmissionController, order: list[str], tenant: str, tag: str):
+    await ctl.admit("n", "m", limit=1, tenant=tenant)
+    order.append(tag)
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_served_round_robin_across_tenants():
+    ctl = AdmissionController()
+    await ctl.admit("n", "m", limit=1, tenant="a")
+    order: list[str] = []
+    tasks = []
+    for tenant, tag in (("a", "a1"), ("a", "a2"), ("a", "a3"), ("b", "b1")):
+        tasks.append(asyncio.create_task(_queue(ctl, order, tenant, tag)))
+        await asyncio.sleep(0)
+    assert ctl.stats()["nodes"]["n"]["queue_depth"] == {"m": 4}
+
+    for _ in range(4):
+        ctl.release("n")
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    assert order == ["a1", "b1", "a2", "a3"]
+    assert ctl.stats()["nodes"]["n"]["active"] == 1
+
+
+@pytest.mark.asyncio
+async def test_full_queue_evicts_the_heaviest_tenant_before_shedding():
+    ctl = AdmissionController(max_queue=2)
+    await ctl.admit("n", "m", limit=1, tenant="a")
+    flood = [asyncio.create_task(ctl.admit("n", "m", limit=1, tenant="a")) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    fair = asyncio.create_task(ctl.admit("n", "m", limit=1, tenant="b"))
+    await asyncio.sleep(0)
+    with pytest.raises(AdmissionRejected):
+        await flood[1]
+    with pytest.raises(AdmissionRejected) as shed:
+        await ctl.admit("n", "m", limit=1, tenant="a")
+    assert shed.value.retry_after >= 1
+    assert ctl.shed == {"queue_full": 1, "timeout": 0, "evicted": 1}
+
+    ctl.release("n")
+    ctl.release("n")
+    await asyncio.gather(flood[0], fair)
+
+
+@pytest.mark.asyncio
+async def test_wait_timeout_sheds_with_retry_after_from_drain_rate():
+    now = [100.0]
+    ctl = AdmissionController(max_wait_s=0.05, clock=lambda: now[0])
+    await ctl.admit("n", "m", limit=1)
+    for _ in range(4):  # four completions in two seconds: 2/s
+        ctl.release("n")
+        await ctl.admit("n", "m", limit=1)
+        now[0] += 0.5
+
+    with pytest.raises(AdmissionRejected) as exc:
+        await ctl.admit("n", "m", limit=1)
+    assert exc.value.retry_after == 1
+    stats = ctl.stats()
+    assert stats["shed"]["timeout"] == 1
+    assert stats["nodes"]["n"]["queue_depth"] == {}
+
+
+@pytest.fixture
+def app_client(monkeypatch):
+    monkeypatch.setattr(settings, "API_KEYS", "test-key-abc")
+    monkeypatch.setattr(settings, "AUTH_MODE", "required")
+    monkeypatch.setattr(settings, "ADMISSION_SLOTS_PER_CAPACITY", 1)
+    monkeypatch.setattr(settings, "ADMISSION_MAX_QUEUE", 0)
+
+    from ollabridge.api.main import create_app
+
+    app = create_app()
+    with TestClient(app) as client:
+        app.state.provider_router = None
+
+        async def _reset():
+            for existing in await app.state.obridge.registry.list():
+                await app.state.obridge.registry.remove(existing.node_id)
+            await app.state.obridge.registry.upsert(
+                RuntimeNodeState(node_id="edge", connector="relay_link")
+            )
+
+        asyncio.run(_reset())
+        yield app, client
+
+
+def test_saturated_node_answers_429_with_retry_after(app_client, monkeypatch):
+    app, client = app_client
+
+    async def fake_request(node_id, op, payload, **_):
+        return {"ok": True, "data": {"content": "hello"}}
+
+    monkeypatch.setattr(app.state.relay_hub, "request", fake_request)
+    body = {"model": "llama3", "messages": [{"role": "user", "content": "hi"}]}
+
+    r = client.post("/v1/chat/completions", json=body, headers=AUTH)
+    assert r.status_code == 200
+
+    asyncio.run(app.state.admission.admit("edge", "llama3", limit=1))  # hold the slot
+    r = client.post("/v1/chat/completions", json=body, headers=AUTH)
+    assert r.status_code == 429
+    assert int(r.headers["Retry-After"]) >= 1
+
+    stats = client.get("/admin/flow-metrics", headers=AUTH).json()["admission"]
+    assert stats["admitted"] == 2
+    assert stats["shed"]["queue_full"] == 1
+    assert stats["nodes"]["edge"] == {
+        "active": 1,
+        "limit": 1,
+        "queue_depth": {},
+        "oldest_wait_ms": 0,
+        "drain_per_s": stats["nodes"]["edge"]["drain_per_s"],
+    }
+
+
+def test_embedding_batches_queue_behind_the_same_slots(app_client, monkeypatch):
+    app, client = app_client
+    app.state.embedding_cache = None
+
+    async def fake_request(node_id, op, payload, **_):
+        assert op == "embeddings"
+        return {"ok": True, "data": {"embeddings": [[0.5]]}}
+
+    monkeypatch.setattr(app.state.relay_hub, "request", fake_request)
+    body = {"model": "nomic-embed-text", "input": "hello"}
+
+    assert client.post("/v1/embeddings", json=body, headers=AUTH).status_code == 200
+    assert app.state.admission.admitted == 1
+
+    asyncio.run(app.state.admission.admit("edge", "nomic-embed-text", limit=1))
+    r = client.post("/v1/embeddings", json=body, headers=AUTH)
+    assert r.status_code == 429
+    assert int(r.headers["Retry-After"]) >= 1
+    assert app.state.admission.shed["queue_full"] == 1
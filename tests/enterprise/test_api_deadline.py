@@ -0,0 +1,86 @@
+"""End-to-end request deadlines on ``/v1/chat/completions``."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ollabridge.core.registry import RuntimeNodeState
+from ollabridge.core.settings import settings
+from ollabridge.tracing import get_trace_store
+
+AUTH = {"Authorization": "Bearer test-key-abc"}
+BODY = {"model": "llama3", "messages": [{"role": "user", "content": "hi"}]}
+
+
+@pytest.fixture
+def app_client(monkeypatch):
+    monkeypatch.setattr(settings, "API_KEYS", "test-key-abc")
+    monkeypatch.setattr(settings, "AUTH_MODE", "required")
+
+    from ollabridge.api.main import create_app
+
+    app = create_app()
+    with TestClient(app) as client:
+        app.state.provider_router = None
+
+        async def _reset():
+            for existing in await app.state.obridge.registry.list():
+                await app.state.obridge.registry.remove(existing.node_id)
+            await app.state.obridge.registry.upsert(
+                RuntimeNodeState(node_id="edge", connector="relay_link")
+            )
+
+        asyncio.run(_reset())
+        yield app, client
+
+
+def test_relay_call_is_cut_off_at_the_client_deadline(app_client, monkeypatch):
+    app, client = app_client
+    seen: dict = {}
+
+    async def slow_request(node_id, op, payload, *, timeout_s=120, deadline=None):
+        seen["deadline"] = deadline
+        await asyncio.sleep(5)
+
+    monkeypatch.setattr(app.state.relay_hub, "request", slow_request)
+
+    start = time.monotonic()
+    r = client.post(
+        "/v1/chat/completions",
+        json=BODY,
+        headers={**AUTH, "X-Request-Timeout": "0.2"},
+    )
+    assert r.status_code == 504
+    assert time.monotonic() - start < 2
+    assert seen["deadline"].seconds == 0.2
+
+    trace = get_trace_store().get(r.headers["X-Request-ID"])
+    assert trace.ok is False
+    assert trace.error_category == "deadline_exceeded"
+
+
+def test_node_expected_to_miss_the_deadline_fails_fast(app_client, monkeypatch):
+    app, client = app_client
+    app.state.obridge.router.latency.observe("edge", "llama3", total_ms=5000)
+
+    async def never_called(*args, **kwargs):
+        raise AssertionError("node should have been skipped")
+
+    monkeypatch.setattr(app.state.relay_hub, "request", never_called)
+
+    r = client.post("/v1/chat/completions", json={**BODY, "timeout": 1}, headers=AUTH)
+    assert r.status_code == 504
+
+
+def test_invalid_timeouts_are_rejected(app_client):
+    _, client = app_client
+    r = client.post(
+        "/v1/chat/completions", json=BODY, headers={**AUTH, "X-Request-Timeout": "soon"}
+    )
+    assert r.status_code == 400
+    r = client.post("/v1/chat/completions", json={**BODY, "timeout": 0}, headers=AUTH)
+    assert r.status_code == 400
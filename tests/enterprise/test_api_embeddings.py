@@ -0,0 +1,150 @@
+"""Batch ``/v1/embeddings``: list inputs, sub-batching, relay fan-out."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ollabridge.core.embeddings import normalize_input, vectors_from_payload
+from ollabridge.core.registry import RuntimeNodeState
+from ollabridge.core.settings import settings
+
+AUTH = {"Authorization": "Bearer test-key-abc"}
+
+
+@pytest.fixture
+def app_client(monkeypatch):
+    monkeypatch.setattr(settings, "API_KEYS", "test-key-abc")
+    monkeypatch.setattr(settings, "AUTH_MODE", "required")
+    monkeypatch.setattr(settings, "EMBED_BATCH_SIZE", 2)
+
+    from ollabridge.api.main import create_app
+
+    app = create_app()
+    with TestClient(app) as test_client:
+        app.state.provider_router = None
+        yield app, test_client
+
+
+def _add_node(app, node: RuntimeNodeState) -> None:
+    async def _swap():
+        for existing in await app.state.obridge.registry.list():
+            await app.state.obridge.registry.remove(existing.node_id)
+        await app.state.obridge.registry.upsert(node)
+
+    asyncio.run(_swap())
+
+
+def test_list_input_is_split_into_upstream_batches(app_client, monkeypatch):
+    app, client = app_client
+    _add_node(app, RuntimeNodeState(node_id="local", connector="local_ollama"))
+    calls: list[list[str]] = []
+
+    async def fake_embed(model, inputs):
+        calls.append(list(inputs))
+        return [[float(len(text))] for text in inputs]
+
+    monkeypatch.setattr("ollabridge.providers.ollama_client.embed", fake_embed)
+    texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+    r = client.post("/v1/embeddings", headers=AUTH, json={"model": "e", "input": texts})
+    assert r.status_code == 200
+    assert sorted(calls) == [["a", "bb"], ["ccc", "dddd"], ["eeeee"]]
+    data = r.json()["data"]
+    assert [d["index"] for d in data] == [0, 1, 2, 3, 4]
+    assert [d["embedding"][0] for d in data] == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+
+@pytest.mark.parametrize("connector", ["local_ollama", "relay_link", "direct_endpoint"])
+def test_token_arrays_are_rejected_on_every_connector(app_client, monkeypatch, connector):
+    app, client = app_client
+    _add_node(app, RuntimeNodeState(node_id="n1", connector=connector, endpoint="http://n1"))
+
+    async def unexpected(*args, **kwargs):
+        raise AssertionError("token arrays must not reach a node")
+
+    monkeypatch.setattr(app.state.relay_hub, "request", unexpected)
+    monkeypatch.setattr(app.state.obridge.direct, "embeddings", unexpected)
+    for body in ([[1, 2, 3]], [1, 2, 3], ["text", [4, 5]]):
+        r = client.post("/v1/embeddings", headers=AUTH, json={"model": "e", "input": body})
+        assert r.status_code == 422
+
+
+@pytest.mark.parametrize(
+    ("capabilities", "expected_inputs"),
+    [
+        (["embed_batch"], [["x", "y"]]),
+        ([], ["x", "y"]),
+    ],
+)
+def test_relay_nodes_get_batches_only_when_advertised(
+    app_client, monkeypatch, capabilities, expected_inputs
+):
+    app, client = app_client
+    _add_node(
+        app,
+        RuntimeNodeState(
+            node_id="n1",
+            connector="relay_link",
+            meta={"via": "relay", "capabilities": capabilities},
+        ),
+    )
+    sent: list = []
+
+    async def fake_request(node_id, op, payload, **_):
+        assert op == "embeddings"
+        sent.append(payload["input"])
+        if isinstance(payload["input"], list):
+            return {"ok": True, "data": {"embeddings": [[0.5]] * len(payload["input"])}}
+        return {"ok": True, "data": {"embedding": [0.5]}}
+
+    monkeypatch.setattr(app.state.relay_hub, "request", fake_request)
+    r = client.post("/v1/embeddings", headers=AUTH, json={"model": "e", "input": ["x", "y"]})
+    assert r.status_code == 200
+    assert sorted(sent, key=str) == sorted(expected_inputs, key=str)
+    assert len(r.json()["data"]) == 2
+
+
+def test_normalize_and_parse_helpers():
+    assert normalize_input("hi") == (["hi"], True)
+    assert normalize_input([1, 2]) == ([[1, 2]], True)
+    assert normalize_input(["a", [3]]) == (["a", [3]], False)
+    with pytest.raises(ValueError):
+        normalize_input([])
+    assert vectors_from_payload(
+        {"data": [{"index": 1, "embedding": [2.0]}, {"index": 0, "embedding": [1.0]}]}, 2
+    ) == [[1.0], [2.0]]
+    with pytest.raises(RuntimeError):
+        vectors_from_payload({"embedding": [1.0]}, 2)
+
+
+@pytest.mark.asyncio
+async def test_legacy_fallback_only_when_the_batch_route_is_missing(monkeypatch):
+    import httpx
+
+    from ollabridge.providers import ollama_client
+
+    seen: list[str] = []
+    routes = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        return routes[request.url.path]()
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(ollama_client, "http_client", lambda url: client)
+
+    # Old runtime: the route is missing, so each text goes to /api/embeddings.
+    routes["/api/embed"] = lambda: httpx.Response(404, text="404 page not found")
+    routes["/api/embeddings"] = lambda: httpx.Response(200, json={"embedding": [1.0]})
+    assert await ollama_client.embed("e", ["a", "b"]) == [[1.0], [1.0]]
+    assert sorted(seen) == ["/api/embed", "/api/embeddings", "/api/embeddings"]
+
+    # Unknown model: one call, no fan-out and no retries.
+    seen.clear()
+    routes["/api/embed"] = lambda: httpx.Response(404, json={"error": "model 'e' not found"})
+    with pytest.raises(httpx.HTTPStatusError):
+        await ollama_client.embed("e", ["a", "b"])
+    assert seen == ["/api/embed"]
+    await client.aclose()
@@ -0,0 +1,101 @@
+"""``GET /v1/models``: concurrent fan-out, per-node deadline, SWR cache."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ollabridge.cache import ModelListCache
+from ollabridge.core.registry import RuntimeNodeState
+from ollabridge.core.settings import settings
+
+AUTH = {"Authorization": "Bearer test-key-abc"}
+
+
+@pytest.fixture
+def app_client(monkeypatch):
+    monkeypatch.setattr(settings, "API_KEYS", "test-key-abc")
+    monkeypatch.setattr(settings, "AUTH_MODE", "required")
+    monkeypatch.setattr(settings, "MODELS_NODE_TIMEOUT", 0.2)
+
+    from ollabridge.api.main import create_app
+
+    app = create_app()
+    with TestClient(app) as test_client:
+        app.state.provider_router = None
+
+        async def _reset():
+            for existing in await app.state.obridge.registry.list():
+                await app.state.obridge.registry.remove(existing.node_id)
+            for node_id in ("fast", "slow"):
+                await app.state.obridge.registry.upsert(
+                    RuntimeNodeState(node_id=node_id, connector="relay_link")
+                )
+
+        asyncio.run(_reset())
+        yield app, test_client
+
+
+def test_slow_node_is_cut_off_and_result_is_cached(app_client, monkeypatch):
+    app, client = app_client
+    calls: list[str] = []
+
+    async def fake_request(node_id, op, payload, **_):
+        assert op == "models"
+        calls.append(node_id)
+        if node_id == "slow":
+            await asyncio.sleep(5)
+        return {"ok": True, "data": {"data": [{"id": f"{node_id}-m", "object": "model"}]}}
+
+    monkeypatch.setattr(app.state.relay_hub, "request", fake_request)
+
+    r = client.get("/v1/models", headers=AUTH)
+    assert r.status_code == 200
+    assert r.headers["X-OllaBridge-Cache"] == "miss"
+    assert [m["id"] for m in r.json()["data"]] == ["fast-m"]
+
+    r = client.get("/v1/models", headers=AUTH)
+    assert r.headers["X-OllaBridge-Cache"] == "fresh"
+    assert sorted(calls) == ["fast", "slow"]
+
+    asyncio.run(
+        app.state.obridge.registry.upsert(
+            RuntimeNodeState(node_id="new", connector="relay_link")
+        )
+    )
+    r = client.get("/v1/models", headers=AUTH)
+    assert r.headers["X-OllaBridge-Cache"] == "miss"
+    assert [m["id"] for m in r.json()["data"]] == ["fast-m", "new-m"]
+
+
+@pytest.mark.asyncio
+async def test_stale_value_is_served_while_refreshing():
+    version = 0
+    built = 0
+    release = asyncio.Event()
+
+    async def fetch():
+        nonlocal built
+        built += 1
+        if built > 1:
+            await release.wait()
+        return [{"id": f"m{built}"}]
+
+    cache = ModelListCache(fetch, version=lambda: version, ttl=0.0, max_stale=60.0)
+    assert await cache.get() == ([{"id": "m1"}], "miss")
+
+    assert await cache.get() == ([{"id": "m1"}], "stale")
+    assert await cache.get() == ([{"id": "m1"}], "stale")
+    await asyncio.sleep(0)
+    assert built == 2  # one background refresh shared by both stale reads
+
+    release.set()
+    await asyncio.sleep(0.01)
+    models, _ = await cache.get()
+    assert models == [{"id": "m2"}]
+
+    version = 1
+    models, state = await cache.get()
+    assert state == "miss" and models == [{"id": "m3"}]
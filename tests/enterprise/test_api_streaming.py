@@ -0,0 +1,212 @@
+"""OpenAI-compatible ``stream=true`` chat: SSE framing and post-stream accounting."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ollabridge.core.registry import RuntimeNodeState
+from ollabridge.core.settings import settings
+
+AUTH = {"Authorization": "Bearer test-key-abc"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "API_KEYS", "test-key-abc")
+    monkeypatch.setattr(settings, "AUTH_MODE", "required")
+
+    from ollabridge.api.main import create_app
+
+    app = create_app()
+    with TestClient(app) as test_client:
+        app.state.provider_router = None
+        asyncio.run(
+            app.state.obridge.registry.upsert(
+                RuntimeNodeState(
+                    node_id="local",
+                    connector="local_ollama",
+                    endpoint="http://localhost:11434",
+                    tags=["local"],
+                )
+            )
+        )
+        yield test_client
+
+
+def _events(body: str) -> list[str]:
+    return [
+        line[len("data: ") :]
+        for line in body.splitlines()
+        if line.startswith("data: ")
+    ]
+
+
+def test_stream_emits_chunks_and_done(client):
+    async def fake_stream(model, messages, options=None, deadline=None):
+        for piece in ("Hel", "lo", "!"):
+            yield piece
+
+    with patch("ollabridge.providers.ollama_client.chat_stream", new=fake_stream):
+        r = client.post(
+            "/v1/chat/completions",
+            headers=AUTH,
+            json={
+                "model": "llama3",
+                "stream": True,
+                "messages": [{"role": "user", "content": "hi"}],
+            },
+        )
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+
+    events = _events(r.text)
+    assert events[-1] == "[DONE]"
+    chunks = [json.loads(e) for e in events[:-1]]
+    assert all(c["object"] == "chat.completion.chunk" for c in chunks)
+    assert chunks[0]["choices"][0]["delta"] == {"role": "assistant"}
+    text = "".join(c["choices"][0]["delta"].get("content", "") for c in chunks)
+    assert text == "Hello!"
+    assert chunks[-1]["choices"][0]["finish_reason"] == "stop"
+
+    from ollabridge.tracing import get_trace_store
+
+    trace = get_trace_store().get(r.headers["X-Request-ID"])
+    assert trace is not None
+    assert trace.ok is True
+    assert trace.provider == "ollama-local"
+    assert trace.tokens_out and trace.tokens_out > 0
+
+
+def test_stream_open_failure_returns_error_status(client):
+    async def broken_stream(model, messages, options=None, deadline=None):
+        raise RuntimeError("connection refused")
+        yield ""  # pragma: no cover
+
+    with patch("ollabridge.providers.ollama_client.chat_stream", new=broken_stream):
+        r = client.post(
+            "/v1/chat/completions",
+            headers=AUTH,
+            json={
+                "model": "llama3",
+                "stream": True,
+                "messages": [{"role": "user", "content": "hi"}],
+            },
+        )
+    assert r.status_code == 500
+
+    from ollabridge.tracing import get_trace_store
+
+    trace = get_trace_store().get(r.headers["X-Request-ID"])
+    assert trace is not None
+    assert trace.ok is False
+
+
+def test_mid_stream_failure_is_reported_in_band(client):
+    async def flaky_stream(model, messages, options=None, deadline=None):
+        yield "partial"
+        raise RuntimeError("runtime crashed")
+
+    with patch("ollabridge.providers.ollama_client.chat_stream", new=flaky_stream):
+        r = client.post(
+            "/v1/chat/completions",
+            headers=AUTH,
+            json={
+                "model": "llama3",
+                "stream": True,
+                "messages": [{"role": "user", "content": "hi"}],
+            },
+        )
+    assert r.status_code == 200
+    events = _events(r.text)
+    assert "[DONE]" not in events
+    assert "error" in json.loads(events[-1])
+
+    from ollabridge.tracing import get_trace_store
+
+    trace = get_trace_store().get(r.headers["X-Request-ID"])
+    assert trace is not None
+    assert trace.ok is False
+    assert trace.error_category == "RuntimeError"
+
+
+def test_stream_forwards_homepilot_upstream_errors(client):
+    from fastapi import FastAPI
+
+    from ollabridge.connectors.homepilot import HomePilotUpstreamError
+
+    app: FastAPI = client.app
+
+    async def _only_homepilot():
+        registry = app.state.obridge.registry
+        await registry.remove("local")
+        await registry.upsert(
+            RuntimeNodeState(
+                node_id="homepilot",
+                connector="homepilot",
+                endpoint="http://homepilot.invalid",
+                models=["persona:ghost"],
+            )
+        )
+
+    asyncio.run(_only_homepilot())
+
+    class Unpublished:
+        async def chat_stream(self, *, base, payload):
+            raise HomePilotUpstreamError(404, {"error": "persona_unpublished"})
+            yield ""  # pragma: no cover
+
+    app.state.homepilot_connector = Unpublished()
+    r = client.post(
+        "/v1/chat/completions",
+        headers=AUTH,
+        json={
+            "model": "persona:ghost",
+            "stream": True,
+            "messages": [{"role": "user", "content": "hi"}],
+        },
+    )
+    assert r.status_code == 404
+    assert r.json()["detail"] == {"error": "persona_unpublished"}
+
+    from ollabridge.tracing import get_trace_store
+
+    trace = get_trace_store().get(r.headers["X-Request-ID"])
+    assert trace.error_category == "HomePilotUpstreamError"
+
+
+def test_direct_endpoint_stream_replays_the_buffered_reply(client, monkeypatch):
+    app = client.app
+    asyncio.run(
+        app.state.obridge.registry.upsert(
+            RuntimeNodeState(
+                node_id="local", connector="direct_endpoint", endpoint="http://node.invalid"
+            )
+        )
+    )
+    sent: list[dict] = []
+
+    async def fake_chat(*, base, payload):
+        sent.append(payload)
+        return {"content": "whole reply"}
+
+    monkeypatch.setattr(app.state.obridge.direct, "chat", fake_chat)
+    r = client.post(
+        "/v1/chat/completions",
+        headers=AUTH,
+        json={
+            "model": "llama3",
+            "stream": True,
+            "messages": [{"role": "user", "content": "hi"}],
+        },
+    )
+    assert r.status_code == 200
+    chunks = [json.loads(e) for e in _events(r.text)[:-1]]
+    text = "".join(c["choices"][0]["delta"].get("content", "") for c in chunks)
+    assert text == "whole reply"
+    # The buffered node API is never asked to stream.
+    assert "stream" not in sent[0]
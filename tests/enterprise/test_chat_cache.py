@@ -0,0 +1,148 @@
+"""Exact-match chat completion cache: tiers, TTL and API integration."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ollabridge.cache import ChatCache, chat_cache_key
+from ollabridge.core.registry import RuntimeNodeState
+from ollabridge.core.settings import settings
+
+AUTH = {"Authorization": "Bearer test-key-abc"}
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def test_key_ignores_dict_order_and_unset_params():
+    a = chat_cache_key("m", MESSAGES, {"temperature": 0, "max_tokens": None})
+    b = chat_cache_key("m", [{"content": "hi", "role": "user"}], {"temperature": 0})
+    assert a == b
+    assert a != chat_cache_key("other", MESSAGES, {"temperature": 0})
+    assert a != chat_cache_key("m", MESSAGES, {"temperature": 0, "max_tokens": 5})
+
+
+def test_lru_eviction_and_ttl():
+    now = [0.0]
+    cache = ChatCache(max_entries=2, ttl_s=10, clock=lambda: now[0])
+    for key in ("a", "b", "c"):
+        cache.put(key, "m", key.upper())
+    assert cache.get("a") is None
+    assert cache.get("c") == "C"
+
+    cache.put("short", "m", "S", ttl_s=1)
+    now[0] = 5
+    assert cache.get("short") is None
+    assert cache.get("c") == "C"
+    stats = cache.stats()
+    assert stats["evictions"] == 2
+    assert stats["expired"] == 1
+
+
+def test_disk_tier_survives_restart_and_invalidates_by_model(tmp_path):
+    db = tmp_path / "chat_cache.db"
+    first = ChatCache(db_path=db)
+    first.put("k1", "llama3", "one")
+    first.put("k2", "mistral", "two")
+    first.close()
+
+    second = ChatCache(db_path=db)
+    assert second.get("k1") == "one"
+    assert second.get("k1") == "one"
+    assert second.stats()["hits_disk"] == 1
+    assert second.stats()["hits_memory"] == 1
+
+    second.invalidate("llama3")
+    second.close()
+    third = ChatCache(db_path=db)
+    assert third.get("k1") is None
+    assert third.get("k2") == "two"
+    third.close()
+
+
+@pytest.fixture
+def app_client(monkeypatch):
+    monkeypatch.setattr(settings, "API_KEYS", "test-key-abc")
+    monkeypatch.setattr(settings, "AUTH_MODE", "required")
+    monkeypatch.setattr(settings, "CHAT_CACHE_ENABLED", True)
+
+    from ollabridge.api.main import create_app
+
+    app = create_app()
+    with TestClient(app) as client:
+        app.state.provider_router = None
+
+        async def _reset():
+            for existing in await app.state.obridge.registry.list():
+                await app.state.obridge.registry.remove(existing.node_id)
+            await app.state.obridge.registry.upsert(
+                RuntimeNodeState(node_id="edge", connector="relay_link")
+            )
+
+        asyncio.run(_reset())
+        calls: list[dict] = []
+
+        async def fake_request(node_id, op, payload, **_):
+            calls.append(payload)
+            return {"ok": True, "data": {"content": f"answer {len(calls)}"}}
+
+        monkeypatch.setattr(app.state.relay_hub, "request", fake_request)
+        yield app, client, calls
+
+
+def test_repeat_deterministic_request_is_served_from_cache(app_client):
+    app, client, calls = app_client
+    body = {"model": "llama3", "messages": MESSAGES, "temperature": 0}
+
+    first = client.post("/v1/chat/completions", json=body, headers=AUTH)
+    second = client.post("/v1/chat/completions", json=body, headers=AUTH)
+    assert first.headers["X-OllaBridge-Cache"] == "miss"
+    assert second.headers["X-OllaBridge-Cache"] == "hit"
+    assert second.json()["choices"] == first.json()["choices"]
+    assert len(calls) == 1
+
+    from ollabridge.tracing import get_trace_store
+
+    trace = get_trace_store().get(second.headers["X-Request-ID"])
+    assert trace.cache_hit is True
+    assert trace.provider == "cache"
+    assert trace.device is None
+    assert trace.latency_ms == 0
+    assert get_trace_store().get(first.headers["X-Request-ID"]).cache_hit is False
+
+    stats = client.get("/admin/flow-metrics", headers=AUTH).json()["chat_cache"]
+    assert (stats["hits_memory"], stats["misses"], stats["stores"]) == (1, 1, 1)
+
+    r = client.delete("/admin/chat-cache?model=llama3", headers=AUTH)
+    assert r.json()["removed"] == 1
+    client.post("/v1/chat/completions", json=body, headers=AUTH)
+    assert len(calls) == 2
+
+
+def test_sampling_and_no_store_requests_are_not_cached(app_client):
+    app, client, calls = app_client
+    sampled = {"model": "llama3", "messages": MESSAGES, "temperature": 0.7}
+    for _ in range(2):
+        r = client.post("/v1/chat/completions", json=sampled, headers=AUTH)
+        assert "X-OllaBridge-Cache" not in r.headers
+
+    body = {"model": "llama3", "messages": MESSAGES, "temperature": 0}
+    for _ in range(2):
+        client.post(
+            "/v1/chat/completions",
+            json=body,
+            headers={**AUTH, "Cache-Control": "no-store"},
+        )
+    assert len(calls) == 4
+    assert app.state.chat_cache.stats()["stores"] == 0
+
+
+def test_private_policy_disables_caching(app_client):
+    app, client, calls = app_client
+    body = {"model": "local-private", "messages": MESSAGES, "temperature": 0}
+    for _ in range(2):
+        r = client.post("/v1/chat/completions", json=body, headers=AUTH)
+        assert r.status_code == 200
+        assert "X-OllaBridge-Cache" not in r.headers
+    assert len(calls) == 2
@@ -0,0 +1,195 @@
+"""Single-flight coalescing: shared results, teed streams, cancellation safety."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ollabridge.core.coalesce import Coalescer, StreamTee
+from ollabridge.core.registry import RuntimeNodeState
+from ollabridge.core.settings import settings
+
+AUTH = {"Authorization": "Bearer test-key-abc"}
+
+
+@pytest.mark.asyncio
+async def test_duplicates_share_one_execution_and_survive_the_leader_leaving():
+    flights = Coalescer()
+    release = asyncio.Event()
+    runs = 0
+
+    async def work():
+        nonlocal runs
+        runs += 1
+        await release.wait()
+        return "done"
+
+    leader = asyncio.create_task(flights.run("k", work))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flights.run("k", work))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    release.set()
+    assert await follower == ("done", True)
+    assert runs == 1
+    assert flights.stats() == {"leaders": 1, "coalesced": 1, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_work_is_cancelled_once_every_waiter_has_left():
+    flights = Coalescer()
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def work():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    waiters = [asyncio.create_task(flights.run("k", work)) for _ in range(2)]
+    await started.wait()
+    for w in waiters:
+        w.cancel()
+    await asyncio.wait_for(cancelled.wait(), 1)
+    assert flights.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_tee_replays_for_late_subscribers_and_outlives_an_early_exit():
+    gate = asyncio.Event()
+    closed = False
+
+    async def source():
+        nonlocal closed
+        try:
+            yield "a"
+            await gate.wait()
+            yield "b"
+        finally:
+            closed = True
+
+    tee = StreamTee(source())
+    first = tee.subscribe()
+    assert await first.__anext__() == "a"
+    late = tee.subscribe()
+    await first.aclose()  # the leader's client disconnects
+
+    gate.set()
+    assert [chunk async for chunk in late] == ["a", "b"]
+    await tee.finished
+    assert closed
+
+
+@pytest.fixture
+def app_client(monkeypatch):
+    monkeypatch.setattr(settings, "API_KEYS", "test-key-abc")
+    monkeypatch.setattr(settings, "AUTH_MODE", "required")
+
+    from ollabridge.api.main import create_app
+
+    app = create_app()
+    with TestClient(app) as client:
+        app.state.provider_router = None
+
+        async def _reset():
+            for existing in await app.state.obridge.registry.list():
+                await app.state.obridge.registry.remove(existing.node_id)
+            await app.state.obridge.registry.upsert(
+                RuntimeNodeState(node_id="edge", connector="relay_link")
+            )
+
+        asyncio.run(_reset())
+        yield app, client
+
+
+def test_concurrent_identical_chats_run_upstream_once(app_client, monkeypatch):
+    app, client = app_client
+    calls = 0
+    arrived = threading.Barrier(3)
+
+    async def fake_request(node_id, op, payload, **_):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.3)
+        return {"ok": True, "data": {"content": "shared"}}
+
+    monkeypatch.setattr(app.state.relay_hub, "request", fake_request)
+    body = {
+        "model": "llama3",
+        "temperature": 0,
+        "messages": [{"role": "user", "content": "hi"}],
+    }
+
+    def post():
+        arrived.wait()
+        return client.post("/v1/chat/completions", json=body, headers=AUTH)
+
+    with ThreadPoolExecutor(3) as pool:
+        responses = list(pool.map(lambda _: post(), range(3)))
+    assert [r.status_code for r in responses] == [200, 200, 200]
+    assert {r.json()["choices"][0]["message"]["content"] for r in responses} == {"shared"}
+    assert calls == 1
+
+    stats = client.get("/admin/flow-metrics", headers=AUTH).json()["coalescing"]
+    assert stats == {"leaders": 1, "coalesced": 2, "in_flight": 0}
+
+    # Explicit sampling asks for distinct answers, and so does the
+    # upstream default.
+    client.post(
+        "/v1/chat/completions", json={**body, "temperature": 0.8}, headers=AUTH
+    )
+    assert calls == 2
+    unset = {k: v for k, v in body.items() if k != "temperature"}
+
+    def post_unset(_):
+        return client.post("/v1/chat/completions", json=unset, headers=AUTH)
+
+    with ThreadPoolExecutor(2) as pool:
+        list(pool.map(post_unset, range(2)))
+    assert calls == 4
+
+
+def test_a_leaders_short_timeout_does_not_fail_its_followers(app_client, monkeypatch):
+    app, client = app_client
+    calls = 0
+    leader_in = threading.Event()
+
+    async def fake_request(node_id, op, payload, **_):
+        nonlocal calls
+        calls += 1
+        leader_in.set()
+        await asyncio.sleep(0.5)
+        return {"ok": True, "data": {"content": "shared"}}
+
+    monkeypatch.setattr(app.state.relay_hub, "request", fake_request)
+    body = {
+        "model": "llama3",
+        "temperature": 0,
+        "messages": [{"role": "user", "content": "q"}],
+    }
+
+    def leader():
+        return client.post(
+            "/v1/chat/completions",
+            json=body,
+            headers={**AUTH, "X-Request-Timeout": "0.2"},
+        )
+
+    def follower():
+        leader_in.wait()
+        return client.post("/v1/chat/completions", json=body, headers=AUTH)
+
+    with ThreadPoolExecutor(2) as pool:
+        first, second = pool.submit(leader), pool.submit(follower)
+        assert first.result().status_code == 504
+        assert second.result().status_code == 200
+    assert second.result().json()["choices"][0]["message"]["content"] == "shared"
+    assert calls == 1
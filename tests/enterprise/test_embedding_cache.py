@@ -0,0 +1,133 @@
+"""Embedding cache: LRU + mmap disk tiers, invalidation, API integration."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ollabridge.cache import EmbeddingCache
+from ollabridge.core.registry import RuntimeNodeState
+from ollabridge.core.settings import settings
+
+AUTH = {"Authorization": "Bearer test-key-abc"}
+
+
+def test_memory_tier_hits_and_evicts():
+    cache = EmbeddingCache(max_entries=2)
+    cache.put_many("m", ["a", "b", "c"], [[1.0], [2.0], [3.0]])
+    assert cache.get_many("m", ["a", "b", "c"]) == [None, [2.0], [3.0]]
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["hits_memory"] == 2 and stats["misses"] == 1
+
+
+def test_keys_are_model_scoped_and_nfc_normalised():
+    cache = EmbeddingCache()
+    cache.put_many("m1", ["café"], [[0.5]])
+    assert cache.get_many("m1", ["café"]) == [[0.5]]
+    assert cache.get_many("m2", ["café"]) == [None]
+
+
+def test_disk_tier_survives_restart_and_invalidates_per_model(tmp_path):
+    cache = EmbeddingCache(max_entries=10, disk_dir=tmp_path)
+    cache.put_many("m1", ["x", [1, 2]], [[0.25, 0.5], [1.0, 2.0]])
+    cache.put_many("m2", ["x"], [[9.0]])
+    cache.close()
+
+    reopened = EmbeddingCache(max_entries=10, disk_dir=tmp_path)
+    assert reopened.get_many("m1", ["x", [1, 2]]) == [[0.25, 0.5], [1.0, 2.0]]
+    assert reopened.stats()["hits_disk"] == 2
+
+    reopened.invalidate("m1")
+    assert reopened.get_many("m1", ["x"]) == [None]
+    assert reopened.get_many("m2", ["x"]) == [[9.0]]
+
+
+def test_dimension_change_resets_model(tmp_path):
+    cache = EmbeddingCache(disk_dir=tmp_path)
+    cache.put_many("m", ["a"], [[1.0, 2.0]])
+    cache.put_many("m", ["b"], [[1.0, 2.0, 3.0]])
+    assert cache.get_many("m", ["a", "b"]) == [None, [1.0, 2.0, 3.0]]
+
+
+def test_torn_row_is_cut_before_the_next_append(tmp_path):
+    cache = EmbeddingCache(disk_dir=tmp_path)
+    cache.put_many("m", ["a"], [[1.0, 2.0]])
+    cache.close()
+    (vectors,) = tmp_path.glob("*/vectors.f32")
+    with open(vectors, "ab") as fh:
+        fh.write(b"\x00" * 5)  # half-written row
+
+    reopened = EmbeddingCache(disk_dir=tmp_path)
+    reopened.put_many("m", ["b"], [[3.0, 4.0]])
+    reopened.close()
+    assert vectors.stat().st_size == 16
+    fresh = EmbeddingCache(disk_dir=tmp_path)
+    assert fresh.get_many("m", ["a", "b"]) == [[1.0, 2.0], [3.0, 4.0]]
+
+
+def test_disk_tier_is_cleared_when_it_outgrows_its_cap(tmp_path):
+    cache = EmbeddingCache(max_entries=0, disk_dir=tmp_path, disk_max_bytes=16)
+    cache.put_many("m", ["a", "b"], [[1.0], [2.0]])
+    cache.put_many("m", ["c", "d", "e"], [[3.0], [4.0], [5.0]])
+    assert cache.stats()["disk_resets"] == 1
+    # a-d fill the 16 bytes; e starts the tier over.
+    assert cache.get_many("m", ["a", "d", "e"]) == [None, None, [5.0]]
+    (vectors,) = tmp_path.glob("*/vectors.f32")
+    assert vectors.stat().st_size == 4
+
+
+@pytest.fixture
+def app_client(monkeypatch):
+    monkeypatch.setattr(settings, "API_KEYS", "test-key-abc")
+    monkeypatch.setattr(settings, "AUTH_MODE", "required")
+
+    from ollabridge.api.main import create_app
+
+    app = create_app()
+    with TestClient(app) as test_client:
+        app.state.provider_router = None
+        asyncio.run(
+            app.state.obridge.registry.upsert(
+                RuntimeNodeState(node_id="local", connector="local_ollama")
+            )
+        )
+        yield test_client
+
+
+def test_only_batch_misses_go_upstream(app_client, monkeypatch):
+    calls: list[list[str]] = []
+
+    async def fake_embed(model, inputs):
+        calls.append(list(inputs))
+        return [[float(len(text))] for text in inputs]
+
+    monkeypatch.setattr("ollabridge.providers.ollama_client.embed", fake_embed)
+
+    def post(inputs, **headers):
+        r = app_client.post(
+            "/v1/embeddings",
+            headers={**AUTH, **headers},
+            json={"model": "e", "input": inputs},
+        )
+        assert r.status_code == 200
+        return [d["embedding"][0] for d in r.json()["data"]]
+
+    assert post(["a", "bb"]) == [1.0, 2.0]
+    assert post(["bb", "ccc", "a"]) == [2.0, 3.0, 1.0]
+    assert calls == [["a", "bb"], ["ccc"]]
+
+    post(["a"], **{"Cache-Control": "no-cache"})
+    assert calls[-1] == ["a"]
+
+    metrics = app_client.get("/admin/flow-metrics", headers=AUTH).json()
+    cache_stats = metrics["embedding_cache"]
+    assert cache_stats["hits_memory"] == 2
+    assert cache_stats["bypassed"] == 1
+
+    r = app_client.delete("/admin/embedding-cache?model=e", headers=AUTH)
+    assert r.json()["removed"] == 3
+    post(["a"])
+    assert calls[-1] == ["a"]
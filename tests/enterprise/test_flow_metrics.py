@@ -0,0 +1,94 @@
+"""Windowed flow metrics: bucket rings, histograms, ``group_by``."""
+
+from __future__ import annotations
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ollabridge.core.flow_metrics import FlowMetrics, LatencyHistogram
+from ollabridge.core.settings import settings
+
+AUTH = {"Authorization": "Bearer test-key-abc"}
+
+
+class _Clock:
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_histogram_percentiles_are_within_bucket_error():
+    hist = LatencyHistogram()
+    for ms in range(1, 1001):
+        hist.record(ms)
+    assert hist.percentile(50) == pytest.approx(500, rel=0.04)
+    assert hist.percentile(99) == pytest.approx(990, rel=0.04)
+
+    other = LatencyHistogram()
+    other.record(5000)
+    hist.merge(other)
+    assert hist.total == 1001
+    assert hist.percentile(100) == pytest.approx(5000, rel=0.04)
+
+
+def test_windows_stay_exact_above_old_event_cap():
+    clock = _Clock()
+    metrics = FlowMetrics(clock=clock)
+    for _ in range(120):
+        clock.now += 1
+        for _ in range(10):  # 10 rps: 1200 requests, well past 512 events
+            metrics.record(path="/v1/chat/completions", model="m", ok=True, latency_ms=20)
+
+    windows = metrics.snapshot()["windows"]
+    assert windows["1m"]["requests"] == 600
+    assert windows["5m"]["requests"] == 1200
+    assert windows["1h"]["requests"] == 1200
+    assert windows["1m"]["rps"] == 10.0
+    assert metrics.count(8) == 80
+
+    clock.now += 400
+    windows = metrics.snapshot()["windows"]
+    assert windows["5m"]["requests"] == 0
+    assert windows["1h"]["requests"] == 1200
+
+
+def test_group_by_splits_per_model_and_node():
+    metrics = FlowMetrics(clock=_Clock())
+    metrics.record(path="/p", model="a", node="n1", ok=True, latency_ms=10, prompt_tokens=3)
+    metrics.record(path="/p", model="b", node="n1", ok=False, latency_ms=300)
+    metrics.record(path="/p", model="b", node="n2", ok=True, latency_ms=100)
+
+    by_model = metrics.snapshot("model")["groups"]
+    assert by_model["a"]["1m"]["requests"] == 1
+    assert by_model["a"]["1m"]["prompt_tokens"] == 3
+    assert by_model["b"]["1m"]["errors"] == 1
+    assert by_model["b"]["5m"]["p99_ms"] >= 290
+
+    by_node = metrics.snapshot("node")["groups"]
+    assert {k: v["1h"]["requests"] for k, v in by_node.items()} == {"n1": 2, "n2": 1}
+
+    with pytest.raises(ValueError):
+        metrics.snapshot("tenant")
+
+
+def test_flow_metrics_endpoint(monkeypatch):
+    monkeypatch.setattr(settings, "API_KEYS", "test-key-abc")
+    monkeypatch.setattr(settings, "AUTH_MODE", "required")
+
+    from ollabridge.api.main import create_app
+
+    app = create_app()
+    with TestClient(app) as client:
+        app.state.flow_metrics.record(path="/v1/embeddings", model="e", ok=True, latency_ms=7)
+
+        body = client.get("/admin/flow-metrics", headers=AUTH).json()
+        assert body["requests_1m"] == 1 and body["active"] is True
+        assert body["windows"]["1m"]["p50_ms"] == 7
+
+        body = client.get("/admin/flow-metrics?group_by=path", headers=AUTH).json()
+        assert list(body["groups"]) == ["/v1/embeddings"]
+
+        r = client.get("/admin/flow-metrics?group_by=tenant", headers=AUTH)
+        assert r.status_code == 422
@@ -0,0 +1,117 @@
+"""Shared upstream HTTP pool: per-origin reuse, loop rebinding, stats."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from ollabridge.core.http_pool import HttpClientPool
+
+
+def test_clients_are_shared_per_origin():
+    pool = HttpClientPool()
+
+    async def _run():
+        a = pool.client("http://localhost:11434/api/chat")
+        b = pool.client("http://localhost:11434/api/tags")
+        c = pool.client("http://localhost:8000/v1/models")
+        d = pool.client("https://router.huggingface.co/v1/models")
+        e = pool.client("https://router.huggingface.co:443/v1/chat/completions")
+        assert a is b
+        assert a is not c
+        assert d is e
+        await pool.aclose()
+
+    asyncio.run(_run())
+
+
+def test_new_event_loop_rebuilds_clients():
+    pool = HttpClientPool()
+
+    async def _get():
+        return pool.client("http://localhost:11434")
+
+    async def _get_and_settle():
+        client = pool.client("http://localhost:11434")
+        await asyncio.sleep(0)  # let the stale clients close
+        return client
+
+    first = asyncio.run(_get())
+    second = asyncio.run(_get_and_settle())
+    assert first is not second
+    assert first.is_closed and not second.is_closed
+
+
+@pytest.mark.asyncio
+async def test_pooled_clients_do_not_keep_cookies(monkeypatch):
+    real = httpx.AsyncClient
+    sent: list[str | None] = []
+
+    def _reply(request: httpx.Request) -> httpx.Response:
+        sent.append(request.headers.get("cookie"))
+        return httpx.Response(200, headers={"set-cookie": "session=tenant-a; Path=/"})
+
+    def _patched(*args, **kwargs):
+        kwargs["transport"] = httpx.MockTransport(_reply)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(httpx, "AsyncClient", _patched)
+    pool = HttpClientPool()
+    client = pool.client("http://upstream:9000")
+    await client.get("http://upstream:9000/a")
+    await client.get("http://upstream:9000/b")
+    assert sent == [None, None]
+    assert not client.cookies
+    await pool.aclose()
+
+
+def test_http2_is_disabled_without_h2(monkeypatch):
+    import importlib.util
+
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+    assert HttpClientPool(http2=True).http2 is False
+
+
+@pytest.mark.asyncio
+async def test_stats_report_idle_keepalive_connections(monkeypatch):
+    real = httpx.AsyncClient
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json={}))
+
+    def _patched(*args, **kwargs):
+        kwargs["transport"] = transport
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(httpx, "AsyncClient", _patched)
+    pool = HttpClientPool(max_connections=7, max_keepalive=3)
+    client = pool.client("http://upstream:9000")
+    r = await client.get("http://upstream:9000/ping")
+    assert r.status_code == 200
+
+    stats = pool.stats()
+    assert stats["limits"]["max_connections"] == 7
+    assert stats["limits"]["max_keepalive_connections"] == 3
+    assert set(stats["upstreams"]) == {"http://upstream:9000"}
+    assert set(stats["totals"]) == {"open", "active", "idle", "waiting"}
+    await pool.aclose()
+    assert pool.stats()["upstreams"] == {}
+
+
+def test_admin_endpoint_exposes_pool_stats(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from ollabridge.core.settings import settings
+
+    monkeypatch.setattr(settings, "API_KEYS", "test-key-abc")
+    monkeypatch.setattr(settings, "AUTH_MODE", "required")
+
+    from ollabridge.api.main import create_app
+
+    with TestClient(create_app()) as client:
+        r = client.get(
+            "/admin/http-pool", headers={"Authorization": "Bearer test-key-abc"}
+        )
+    assert r.status_code == 200
+    body = r.json()
+    assert {"limits", "http2", "totals", "upstreams"} <= set(body)
@@ -0,0 +1,158 @@
+"""Relay node agent: concurrent dispatch bounded by capacity, cancel frames."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from ollabridge.api.relay import RelayHub
+from ollabridge.core.registry import RuntimeRegistry
+from ollabridge.node import agent
+
+
+class _FakeSocket:
+    def __init__(self) -> None:
+        self.inbox: asyncio.Queue[str] = asyncio.Queue()
+        self.sent: list[dict] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def recv(self) -> str:
+        return await self.inbox.get()
+
+    async def send(self, data: str) -> None:
+        self.sent.append(json.loads(data))
+
+
+class _SlowRuntime:
+    def __init__(self, base_url: str) -> None:
+        self.running = 0
+        self.peak = 0
+        self.release = asyncio.Event()
+        self.cancelled: list[str] = []
+
+    async def list_models(self) -> list[str]:
+        return ["m"]
+
+    async def chat(self, *, model, messages):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled.append(messages[0]["content"])
+            raise
+        finally:
+            self.running -= 1
+        return messages[0]["content"].upper()
+
+
+def _req(req_id: str) -> str:
+    return json.dumps(
+        {
+            "type": "req",
+            "id": req_id,
+            "op": "chat",
+            "payload": {"model": "m", "messages": [{"role": "user", "content": req_id}]},
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_run_node_serves_up_to_capacity_and_honours_cancel(monkeypatch):
+    ws = _FakeSocket()
+    runtime = _SlowRuntime("")
+    monkeypatch.setattr(agent, "LocalRuntime", lambda base_url: runtime)
+    monkeypatch.setattr(agent.websockets, "connect", lambda *a, **kw: ws)
+
+    cfg = agent.NodeConfig(
+        control="ws://gw", token="t", node_id="n", runtime_base_url="", tags=[], capacity=2
+    )
+    task = asyncio.create_task(agent.run_node(cfg))
+    await ws.inbox.put(json.dumps({"type": "hello_ack"}))
+    for req_id in ("a", "b", "c"):
+        await ws.inbox.put(_req(req_id))
+    await asyncio.sleep(0.05)
+
+    assert runtime.running == 2  # "c" waits for a slot
+    await ws.inbox.put(json.dumps({"type": "cancel", "id": "a"}))
+    await asyncio.sleep(0.05)
+    assert runtime.cancelled == ["a"]
+    assert runtime.running == 2  # "c" took the freed slot
+
+    runtime.release.set()
+    await asyncio.sleep(0.05)
+    replies = {f["id"]: f["data"]["content"] for f in ws.sent if f.get("type") == "res"}
+    assert replies == {"b": "B", "c": "C"}
+    assert runtime.peak == 2
+    assert ws.sent[0]["capacity"] == 2 and "cancel" in ws.sent[0]["capabilities"]
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+class _GatewaySocket:
+    def __init__(self) -> None:
+        self.sent: list[dict] = []
+
+    async def send_text(self, data: str) -> None:
+        self.sent.append(json.loads(data))
+
+
+@pytest.mark.asyncio
+async def test_hub_sends_cancel_when_caller_gives_up():
+    hub = RelayHub(RuntimeRegistry())
+    ws = _GatewaySocket()
+    await hub.attach("n", ws)  # type: ignore[arg-type]
+
+    with pytest.raises(asyncio.TimeoutError):
+        await hub.request("n", "chat", {}, timeout_s=0.01)
+
+    req, cancel = ws.sent
+    assert req["type"] == "req"
+    assert cancel == {"type": "cancel", "id": req["id"]}
+
+
+@pytest.mark.asyncio
+async def test_run_node_streams_within_credit_window(monkeypatch):
+    ws = _FakeSocket()
+
+    class _StreamingRuntime(_SlowRuntime):
+        async def chat_stream(self, *, model, messages):
+            for piece in ("a", "b", "c"):
+                yield piece
+
+    runtime = _StreamingRuntime("")
+    monkeypatch.setattr(agent, "LocalRuntime", lambda base_url: runtime)
+    monkeypatch.setattr(agent.websockets, "connect", lambda *a, **kw: ws)
+
+    cfg = agent.NodeConfig(
+        control="ws://gw", token="t", node_id="n", runtime_base_url="", tags=[], capacity=1
+    )
+    task = asyncio.create_task(agent.run_node(cfg))
+    await ws.inbox.put(json.dumps({"type": "hello_ack"}))
+    frame = json.loads(_req("s"))
+    frame["payload"]["stream"] = True
+    frame["window"] = 1
+    await ws.inbox.put(json.dumps(frame))
+    await asyncio.sleep(0.05)
+
+    def deltas() -> list[str]:
+        return [f["content"] for f in ws.sent if f.get("type") == "delta"]
+
+    assert deltas() == ["a"]  # waits for credit
+    await ws.inbox.put(json.dumps({"type": "credit", "id": "s", "n": 5}))
+    await asyncio.sleep(0.05)
+    assert deltas() == ["a", "b", "c"]
+    assert ws.sent[-1] == {"type": "done", "id": "s"}
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
@@ -0,0 +1,203 @@
+"""Compiled routing policies: decision table, hot reload and enforcement."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ollabridge.addons.providers.base import BaseProviderAdapter
+from ollabridge.addons.providers.models import AliasCandidate, HealthStatus, ProviderConfig
+from ollabridge.addons.providers.registry import ProviderRegistry
+from ollabridge.addons.providers.router import ProviderRouter
+from ollabridge.core import paths
+from ollabridge.core.registry import RuntimeNodeState
+from ollabridge.core.settings import settings
+from ollabridge.policies import PolicyTable, compile_policy, find_policy
+
+AUTH = {"Authorization": "Bearer test-key-abc"}
+
+QUICK = (
+    "policies:\n"
+    "  - name: quick\n"
+    "    match: {alias: quick}\n"
+    "    route:\n"
+    "      prefer: [{provider: local, model: pinned}, {provider: groq}]\n"
+    "      max_latency_ms: 100\n"
+    "      fallback: false\n"
+    "  - name: gpu\n"
+    "    match: {alias: gpu}\n"
+    "    route:\n"
+    "      prefer: [{provider: local, device_tag: gpu}, {provider: groq}]\n"
+    "      fallback: false\n"
+)
+
+
+class _Adapter(BaseProviderAdapter):
+    requires_credential = False
+
+    async def chat(self, model: str, messages: list[dict], **kwargs: Any) -> dict:
+        return {"choices": [{"message": {"content": f"from {model}"}}]}
+
+
+async def _providers(*kinds: str) -> ProviderRegistry:
+    reg = ProviderRegistry()
+    for kind in kinds:
+        pid = f"{kind}-free"
+        await reg.register(
+            ProviderConfig(id=pid, name=pid, kind=kind), _Adapter(base_url="")
+        )
+        await reg.update_health(pid, HealthStatus.HEALTHY)
+    reg.set_aliases(
+        {"default": [AliasCandidate(provider=f"{k}-free", model=f"{k}-m") for k in kinds]}
+    )
+    return reg
+
+
+@pytest.mark.asyncio
+async def test_cost_ceiling_and_deny_are_applied_at_compile_time():
+    reg = await _providers("groq", "anthropic")
+    paths.policies_file().write_text(
+        "policies:\n"
+        "  - name: thrifty\n"
+        "    match: {alias: thrifty}\n"
+        "    route:\n"
+        "      prefer: [{provider: anthropic}, {provider: groq}]\n"
+        "      max_cost_usd_per_1k_tokens: 0.005\n"
+        "  - name: locked\n"
+        "    match: {alias: locked}\n"
+        "    route:\n"
+        "      deny: [{provider: groq}]\n"
+        "      prefer: [{provider: groq}, {provider: anthropic}]\n",
+        encoding="utf-8",
+    )
+    thrifty = compile_policy(find_policy("thrifty"), reg)
+    assert [(t.provider_id, t.model) for t in thrifty.targets] == [("groq-free", "groq-m")]
+    assert any("exceeds ceiling" in r for r in thrifty.skipped)
+
+    locked = compile_policy(find_policy("locked"), reg)
+    assert [t.provider_id for t in locked.targets] == ["anthropic-free"]
+    assert any("denied by policy" in r for r in locked.skipped)
+
+
+@pytest.mark.asyncio
+async def test_table_reloads_on_file_change_and_registry_version():
+    now = [0.0]
+    reg = await _providers("groq")
+    table = PolicyTable(reload_interval=2.0, clock=lambda: now[0])
+
+    assert table.lookup("quick", reg) is None
+    assert table.lookup("fast", reg) is not None
+    assert table.compiles == 1
+
+    paths.policies_file().write_text(QUICK, encoding="utf-8")
+    assert table.lookup("quick", reg) is None  # not re-stat'ed yet
+    now[0] = 5.0
+    assert table.lookup("quick", reg).max_latency_ms == 100
+    assert table.compiles == 2
+
+    # A broken edit keeps the table in service.
+    paths.policies_file().write_text("policies: [unclosed", encoding="utf-8")
+    now[0] = 10.0
+    assert table.lookup("quick", reg) is not None
+
+    await reg.unregister("groq-free")
+    assert table.lookup("quick", reg).targets[-1].type == "local_device"
+
+
+@pytest.fixture
+def policy_app(monkeypatch):
+    monkeypatch.setattr(settings, "API_KEYS", "test-key-abc")
+    monkeypatch.setattr(settings, "AUTH_MODE", "required")
+    paths.policies_file().write_text(QUICK, encoding="utf-8")
+
+    from ollabridge.api.main import create_app
+
+    app = create_app()
+    with TestClient(app) as client:
+        app.state.provider_router = ProviderRouter(asyncio.run(_providers("groq")))
+        yield app, client
+
+
+def test_policy_skips_slow_targets_and_fails_closed(policy_app):
+    app, client = policy_app
+    body = {"model": "quick", "messages": [{"role": "user", "content": "hi"}]}
+    router = app.state.obridge.router
+
+    async def _pin():
+        for node in await app.state.obridge.registry.list():
+            await app.state.obridge.registry.set_models(node.node_id, ["pinned"])
+        return node.node_id
+
+    node_id = asyncio.run(_pin())
+    for _ in range(5):
+        router.latency.observe(node_id, "pinned", total_ms=500)
+
+    r = client.post("/v1/chat/completions", json=body, headers=AUTH)
+    assert r.status_code == 200
+    assert r.json()["choices"][0]["message"]["content"] == "from groq-m"
+
+    for _ in range(5):
+        app.state.provider_router.latency.observe("groq-free", "groq-m", total_ms=500)
+    r = client.post("/v1/chat/completions", json=body, headers=AUTH)
+    assert r.status_code == 503
+    assert "quick" in r.json()["detail"]
+
+
+def test_policy_device_tag_and_provider_targets_without_local_nodes(policy_app, monkeypatch):
+    app, client = policy_app
+    body = {"model": "gpu", "messages": [{"role": "user", "content": "hi"}]}
+    registry = app.state.obridge.registry
+
+    async def fake_request(node_id, op, payload, **_):
+        return {"ok": True, "data": {"content": f"from {node_id}"}}
+
+    monkeypatch.setattr(app.state.relay_hub, "request", fake_request)
+
+    async def _nodes(*nodes: RuntimeNodeState):
+        for existing in await registry.list():
+            await registry.remove(existing.node_id)
+        for node in nodes:
+            await registry.upsert(node)
+
+    def _reply() -> str:
+        r = client.post("/v1/chat/completions", json=body, headers=AUTH)
+        assert r.status_code == 200, r.text
+        return r.json()["choices"][0]["message"]["content"]
+
+    asyncio.run(_nodes(RuntimeNodeState(node_id="laptop", connector="relay_link")))
+    assert _reply() == "from groq-m"  # no node carries the tag
+
+    asyncio.run(
+        _nodes(
+            RuntimeNodeState(node_id="laptop", connector="relay_link"),
+            RuntimeNodeState(node_id="rig", connector="relay_link", tags=["gpu"]),
+        )
+    )
+    assert {_reply() for _ in range(4)} == {"from rig"}
+
+    asyncio.run(_nodes())
+    assert _reply() == "from groq-m"
+
+
+def test_provider_served_calls_stay_off_the_local_node(policy_app):
+    app, client = policy_app
+    registry = app.state.obridge.registry
+    router = app.state.obridge.router
+    node_id = asyncio.run(registry.list())[0].node_id
+    seen: list[dict[str, int]] = []
+
+    async def chat(model, messages, **kwargs):
+        seen.append(registry.inflight_counts())
+        return {"choices": [{"message": {"content": "from groq-m"}}]}
+
+    app.state.provider_router.registry.get_adapter("groq-free").chat = chat
+    for stream in (False, True):
+        body = {"model": "gpu", "stream": stream, "messages": [{"role": "user", "content": "hi"}]}
+        r = client.post("/v1/chat/completions", json=body, headers=AUTH)
+        assert r.status_code == 200 and "from groq-m" in r.text
+    assert seen == [{}, {}]
+    assert router.latency.for_node(node_id) == {}
+    assert app.state.admission.admitted == 0  # providers skip the node's queue
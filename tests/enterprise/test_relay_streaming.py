@@ -0,0 +1,127 @@
+"""Streamed relay requests: credits, bounded buffering, disconnects, cancel."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from ollabridge.api.relay import RelayHub
+from ollabridge.core.registry import RuntimeNodeState, RuntimeRegistry
+
+
+class _GatewaySocket:
+    def __init__(self) -> None:
+        self.sent: list[dict] = []
+        self.new_frame = asyncio.Event()
+
+    async def send_text(self, data: str) -> None:
+        self.sent.append(json.loads(data))
+        self.new_frame.set()
+
+    def of_type(self, mtype: str) -> list[dict]:
+        return [f for f in self.sent if f["type"] == mtype]
+
+
+async def _hub() -> tuple[RelayHub, _GatewaySocket]:
+    registry = RuntimeRegistry()
+    await registry.upsert(RuntimeNodeState(node_id="n", connector="relay_link"))
+    hub = RelayHub(registry)
+    ws = _GatewaySocket()
+    await hub.attach("n", ws)  # type: ignore[arg-type]
+    return hub, ws
+
+
+async def _req_id(ws: _GatewaySocket) -> str:
+    while not ws.of_type("req"):
+        ws.new_frame.clear()
+        await ws.new_frame.wait()
+    return ws.of_type("req")[0]["id"]
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_deltas_and_returns_credit():
+    hub, ws = await _hub()
+    stream = hub.stream("n", "chat", {"model": "m", "messages": []}, window=4)
+    first = asyncio.ensure_future(stream.__anext__())
+    req_id = await _req_id(ws)
+
+    req = ws.of_type("req")[0]
+    assert req["window"] == 4 and req["payload"]["stream"] is True
+
+    for piece in ("a", "b"):
+        await hub.handle_frame("n", {"type": "delta", "id": req_id, "content": piece})
+    assert [await first, await stream.__anext__()] == ["a", "b"]
+    assert ws.of_type("credit") == [{"type": "credit", "id": req_id, "n": 2}]
+
+    for piece in ("c", "d"):
+        await hub.handle_frame("n", {"type": "delta", "id": req_id, "content": piece})
+    await hub.handle_frame("n", {"type": "done", "id": req_id})
+    assert [c async for c in stream] == ["c", "d"]
+    assert ws.of_type("cancel") == []
+
+
+@pytest.mark.asyncio
+async def test_node_ignoring_credit_overflows_instead_of_buffering():
+    hub, ws = await _hub()
+    stream = hub.stream("n", "chat", {}, window=2)
+    first = asyncio.ensure_future(stream.__anext__())
+    req_id = await _req_id(ws)
+    await hub.handle_frame("n", {"type": "delta", "id": req_id, "content": "a"})
+    assert await first == "a"
+
+    for piece in ("b", "c", "d"):
+        await hub.handle_frame("n", {"type": "delta", "id": req_id, "content": piece})
+
+    assert await stream.__anext__() == "b"
+    assert await stream.__anext__() == "c"
+    with pytest.raises(RuntimeError, match="overflow"):
+        await stream.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_node_disconnect_fails_stream_and_pending_requests():
+    hub, ws = await _hub()
+    stream = hub.stream("n", "chat", {})
+    first = asyncio.ensure_future(stream.__anext__())
+    pending = asyncio.ensure_future(hub.request("n", "models", {}))
+    await _req_id(ws)
+    await asyncio.sleep(0)
+
+    await hub.detach("n")
+    with pytest.raises(RuntimeError, match="node disconnected"):
+        await first
+    with pytest.raises(RuntimeError, match="node disconnected"):
+        await pending
+
+
+@pytest.mark.asyncio
+async def test_timeout_and_client_close_send_cancel():
+    hub, ws = await _hub()
+    stream = hub.stream("n", "chat", {}, timeout_s=0.01)
+    with pytest.raises(asyncio.TimeoutError):
+        await stream.__anext__()
+    assert ws.of_type("cancel")[0]["id"] == ws.of_type("req")[0]["id"]
+
+    ws.sent.clear()
+    stream = hub.stream("n", "chat", {})
+    first = asyncio.ensure_future(stream.__anext__())
+    req_id = await _req_id(ws)
+    await hub.handle_frame("n", {"type": "delta", "id": req_id, "content": "x"})
+    assert await first == "x"
+    await stream.aclose()  # the HTTP client went away
+    assert ws.of_type("cancel") == [{"type": "cancel", "id": req_id}]
+
+
+@pytest.mark.asyncio
+async def test_single_response_from_non_streaming_node():
+    hub, ws = await _hub()
+    stream = hub.stream("n", "chat", {})
+    first = asyncio.ensure_future(stream.__anext__())
+    req_id = await _req_id(ws)
+    await hub.handle_frame(
+        "n", {"type": "res", "id": req_id, "ok": True, "data": {"content": "whole"}}
+    )
+    assert await first == "whole"
+    assert [c async for c in stream] == []
@@ -0,0 +1,68 @@
+"""RequestLog write-behind: batching, flush/close, drop-on-full policy."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine, select
+
+import ollabridge.db.log_writer as log_writer
+from ollabridge.db.log_writer import RequestLogWriter
+from ollabridge.db.models import RequestLog
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    eng = create_engine(f"sqlite:///{tmp_path / 'logs.sqlite'}")
+    SQLModel.metadata.create_all(eng)
+    monkeypatch.setattr(log_writer, "session", lambda: Session(eng))
+    return eng
+
+
+def _rows(engine) -> list[RequestLog]:
+    with Session(engine) as s:
+        return list(s.exec(select(RequestLog)).all())
+
+
+def test_flush_commits_queued_rows_in_one_batch(engine):
+    writer = RequestLogWriter(batch_size=100, flush_interval=60)
+    for i in range(5):
+        assert writer.submit(RequestLog(path="/v1/chat/completions", model=f"m{i}"))
+    assert writer.flush()
+    assert sorted(r.model for r in _rows(engine)) == [f"m{i}" for i in range(5)]
+    assert writer.stats()["written"] == 5
+    writer.close()
+
+
+def test_close_drains_pending_rows(engine):
+    writer = RequestLogWriter(batch_size=100, flush_interval=60)
+    writer.submit(RequestLog(path="/v1/embeddings"))
+    writer.close()
+    assert len(_rows(engine)) == 1
+    assert writer.submit(RequestLog(path="/v1/embeddings")) is False
+
+
+def test_full_queue_drops_new_rows_without_blocking(engine, monkeypatch):
+    release = threading.Event()
+    real_commit = RequestLogWriter._commit
+
+    def _slow_commit(self, batch):
+        release.wait(5)
+        real_commit(self, batch)
+
+    monkeypatch.setattr(RequestLogWriter, "_commit", _slow_commit)
+    writer = RequestLogWriter(max_queue=2, batch_size=1, flush_interval=60)
+    # First row is picked up by the writer thread and parks in _commit.
+    writer.submit(RequestLog(path="/a"))
+    for _ in range(50):
+        if writer.stats()["queued"] == 0:
+            break
+        threading.Event().wait(0.01)
+    accepted = [writer.submit(RequestLog(path="/b")) for _ in range(5)]
+    assert accepted.count(True) == 2
+    assert writer.stats()["dropped"] == 3
+
+    release.set()
+    writer.close()
+    assert len(_rows(engine)) == 3
@@ -0,0 +1,381 @@
+"""Node selection: strategies, the model index and the latency tracker."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+
+import pytest
+
+from ollabridge.core.deadline import Deadline, DeadlineExceeded
+from ollabridge.core.latency import LatencyTracker
+from ollabridge.core.registry import RuntimeNodeState, RuntimeRegistry
+from ollabridge.core.router import Router
+
+
+async def _registry(**capacities: int) -> RuntimeRegistry:
+    registry = RuntimeRegistry()
+    for node_id, capacity in capacities.items():
+        await registry.upsert(
+            RuntimeNodeState(node_id=node_id, connector="relay_link", capacity=capacity)
+        )
+    return registry
+
+
+async def _pick(router: Router) -> str:
+    return (await router.choose_node(model="m")).node.node_id
+
+
+@pytest.mark.asyncio
+async def test_least_outstanding_weights_by_capacity():
+    registry = await _registry(laptop=1, gpu=4)
+    router = Router(registry, strategy="least_outstanding")
+
+    # Hold every request open: the 4-slot node should take four of every five.
+    picks = []
+    for _ in range(10):
+        node_id = await _pick(router)
+        registry.acquire(node_id)
+        picks.append(node_id)
+    assert picks.count("gpu") == 8 and picks.count("laptop") == 2
+    assert registry.inflight_counts() == {"gpu": 8, "laptop": 2}
+
+
+@pytest.mark.asyncio
+async def test_least_outstanding_rotates_between_idle_nodes():
+    registry = await _registry(a=1, b=1)
+    router = Router(registry, strategy="least_outstanding")
+    assert [await _pick(router) for _ in range(4)] == ["a", "b", "a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_p2c_prefers_the_less_loaded_sample():
+    registry = await _registry(a=1, b=1)
+    router = Router(registry, strategy="p2c", rng=random.Random(0))
+    for _ in range(3):
+        registry.acquire("a")
+    assert {await _pick(router) for _ in range(5)} == {"b"}
+
+
+@pytest.mark.asyncio
+async def test_track_releases_on_error_and_unknown_strategy_is_rejected():
+    registry = await _registry(a=1)
+    with pytest.raises(RuntimeError):
+        with registry.track("a"):
+            assert registry.inflight("a") == 1
+            raise RuntimeError("upstream failed")
+    assert registry.inflight("a") == 0
+
+    with pytest.raises(ValueError):
+        Router(registry, strategy="fastest")
+
+
+def test_latency_tracker_ewma_and_p95():
+    tracker = LatencyTracker(alpha=0.5, window=20)
+    for ms in (100, 200):
+        tracker.observe("n", "m", total_ms=ms, ttft_ms=ms / 10)
+    assert tracker.estimate("n", "m") == 150
+    assert tracker.estimate("n", "other") is None
+
+    for ms in range(1, 21):
+        tracker.observe("n", "m", total_ms=ms * 10)
+    stats = tracker.for_node("n")["m"]
+    assert stats["samples"] == 22
+    assert stats["total"]["p95_ms"] == 190.0
+    assert stats["ttft"] == {"ewma_ms": 15.0, "p95_ms": 20.0}
+
+
+@pytest.mark.asyncio
+async def test_latency_strategy_explores_then_prefers_fast_node():
+    registry = await _registry(fast=1, slow=1)
+    router = Router(registry, strategy="latency", exploration=0.0)
+
+    assert {await _pick(router), await _pick(router)} == {"fast", "slow"}
+    router.latency.observe("fast", "m", total_ms=100)
+    router.latency.observe("slow", "m", total_ms=500)
+    assert [await _pick(router) for _ in range(3)] == ["fast"] * 3
+
+    # A busy fast node loses to an idle slow one once the queue costs more.
+    for _ in range(5):
+        registry.acquire("fast")
+    assert await _pick(router) == "slow"
+
+    router.exploration = 1.0
+    router._rng = random.Random(1)
+    assert len({await _pick(router) for _ in range(20)}) == 2
+
+
+async def _fleet() -> RuntimeRegistry:
+    registry = RuntimeRegistry()
+    for node_id, models in (("a", ["llama3:latest"]), ("b", ["qwen2"]), ("local", [])):
+        await registry.upsert(
+            RuntimeNodeState(node_id=node_id, connector="relay_link", models=models)
+        )
+    return registry
+
+
+@pytest.mark.asyncio
+async def test_model_index_follows_upsert_refresh_and_remove():
+    registry = await _fleet()
+    ids = lambda nodes: [n.node_id for n in nodes]  # noqa: E731
+    assert ids(await registry.nodes_for_model("llama3")) == ["a"]
+    assert ids(await registry.nodes_for_model("qwen2", include_unlisted=True)) == ["b", "local"]
+
+    version = registry.version
+    assert await registry.set_models("local", ["qwen2"]) is True
+    assert await registry.set_models("local", ["qwen2"]) is False
+    assert registry.version == version + 1
+    assert ids(await registry.nodes_for_model("qwen2", include_unlisted=True)) == ["b", "local"]
+
+    await registry.upsert(RuntimeNodeState(node_id="a", connector="relay_link", models=["phi3"]))
+    assert await registry.nodes_for_model("llama3") == []
+    await registry.remove("b")
+    assert ids(await registry.nodes_for_model("qwen2")) == ["local"]
+
+
+@pytest.mark.asyncio
+async def test_router_skips_nodes_without_the_model():
+    registry = await _fleet()
+    router = Router(registry, strategy="round_robin")
+    picks = {(await router.choose_node(model="llama3")).node.node_id for _ in range(4)}
+    assert picks == {"a", "local"}  # never "b", which lists other models
+
+    strict = {
+        (await router.choose_node(model="llama3", require_model=True)).node.node_id
+        for _ in range(3)
+    }
+    assert strict == {"a"}
+
+    # Unknown everywhere: "any" falls back to every healthy node, "none" fails.
+    await registry.set_models("local", ["tinyllama"])
+    assert (await router.choose_node(model="gpt-4o")).node.node_id in {"a", "b", "local"}
+    with pytest.raises(RuntimeError):
+        await Router(registry, model_fallback="none").choose_node(model="gpt-4o")
+
+
+@pytest.mark.asyncio
+async def test_snapshots_are_immutable_and_heartbeats_do_not_republish():
+    registry = await _fleet()
+    before = registry.snapshot()
+
+    await registry.touch("a")
+    assert registry.snapshot() is before
+    assert registry.last_seen("a") >= before.by_id["a"].last_seen
+
+    await registry.touch("a", healthy=False)
+    after = registry.snapshot()
+    assert after.version == before.version + 1
+    assert before.by_id["a"].healthy is True and after.by_id["a"].healthy is False
+
+    await registry.upsert(RuntimeNodeState(node_id="z", connector="relay_link"))
+    assert [n.node_id for n in before.nodes] == ["a", "b", "local"]
+
+    # Readers never wait on writers.
+    async with registry._lock:
+        nodes = await asyncio.wait_for(registry.list(), timeout=0.1)
+    assert [n.node_id for n in nodes] == ["a", "b", "local", "z"]
+
+
+@pytest.mark.asyncio
+async def test_affinity_sticks_to_one_node_and_survives_churn():
+    registry = await _registry(a=1, b=1, c=1)
+    router = Router(registry, strategy="round_robin")
+    keys = [f"conv-{i}" for i in range(60)]
+
+    home = {k: (await router.choose_node(model="m", affinity=k)).node.node_id for k in keys}
+    again = {k: (await router.choose_node(model="m", affinity=k)).node.node_id for k in keys}
+    assert home == again
+    assert set(home.values()) == {"a", "b", "c"}
+
+    # Removing a node only moves the conversations it held.
+    await registry.remove("c")
+    moved = {k: (await router.choose_node(model="m", affinity=k)).node.node_id for k in keys}
+    assert all(moved[k] == home[k] for k in keys if home[k] != "c")
+
+
+@pytest.mark.asyncio
+async def test_affinity_spills_over_once_the_home_node_is_over_its_bound():
+    registry = await _registry(a=1, b=1)
+    router = Router(registry, affinity_load_factor=1.25)
+    home = (await router.choose_node(model="m", affinity="hot")).node.node_id
+
+    picks = []
+    for _ in range(6):
+        node_id = (await router.choose_node(model="m", affinity="hot")).node.node_id
+        registry.acquire(node_id)
+        picks.append(node_id)
+    counts = registry.inflight_counts()
+    # Never more than ceil(1.25 x half the load) on the home node.
+    assert counts[home] <= 4 and sum(counts.values()) == 6
+    assert picks[0] == home and len(set(picks)) == 2
+    assert router.affinity["spilled"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_resident_nodes_are_preferred_until_busy():
+    registry = await _registry(a=1, b=1, c=1)
+    version = registry.version
+    assert await registry.set_resident("b", ["m:latest"]) is True
+    assert await registry.set_resident("b", ["m:latest"]) is False
+    # Residency is routing state, not membership: derived views stay valid.
+    assert registry.version == version
+
+    router = Router(registry, strategy="round_robin")
+    assert [await _pick(router) for _ in range(3)] == ["b", "b", "b"]
+    assert (await router.choose_node(model="other")).node.node_id in {"a", "b", "c"}
+
+    # Once the resident node is full, cold nodes compete as well.
+    registry.acquire("b")
+    assert {await _pick(router) for _ in range(3)} == {"a", "b", "c"}
+    assert router.residency == {"warm": 3, "cold": 4}
+
+    off = Router(registry, strategy="round_robin", resident_load=None)
+    registry.release("b")
+    assert {(await off.choose_node(model="m")).node.node_id for _ in range(3)} == {"a", "b", "c"}
+
+
+def test_single_turn_chats_follow_the_strategy_and_conversations_stick(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from ollabridge.core.settings import settings
+
+    monkeypatch.setattr(settings, "API_KEYS", "test-key-abc")
+    monkeypatch.setattr(settings, "AUTH_MODE", "required")
+    monkeypatch.setattr(settings, "ROUTING_STRATEGY", "latency")
+    monkeypatch.setattr(settings, "ROUTING_EXPLORATION", 0.0)
+
+    from ollabridge.api.main import create_app
+
+    app = create_app()
+    with TestClient(app) as client:
+        app.state.provider_router = None
+        router = app.state.obridge.router
+
+        async def _reset():
+            registry = app.state.obridge.registry
+            for existing in await registry.list():
+                await registry.remove(existing.node_id)
+            for node_id in ("fast", "slow"):
+                await registry.upsert(RuntimeNodeState(node_id=node_id, connector="relay_link"))
+
+        asyncio.run(_reset())
+        for _ in range(5):
+            router.latency.observe("fast", "llama3", total_ms=100)
+            router.latency.observe("slow", "llama3", total_ms=5000)
+        served: list[str] = []
+
+        async def fake_request(node_id, op, payload, **_):
+            served.append(node_id)
+            return {"ok": True, "data": {"content": "ok"}}
+
+        monkeypatch.setattr(app.state.relay_hub, "request", fake_request)
+        auth = {"Authorization": "Bearer test-key-abc"}
+
+        for i in range(6):
+            body = {"model": "llama3", "messages": [{"role": "user", "content": f"q{i}"}]}
+            assert client.post("/v1/chat/completions", json=body, headers=auth).status_code == 200
+        assert served == ["fast"] * 6
+        assert router.affinity == {"sticky": 0, "spilled": 0}
+
+        turns = [
+            {"role": "user", "content": "hi"},
+            {"role": "assistant", "content": "hello"},
+            {"role": "user", "content": "more"},
+        ]
+        client.post("/v1/chat/completions", json={"model": "llama3", "messages": turns}, headers=auth)
+        client.post(
+            "/v1/chat/completions",
+            json={"model": "llama3", "messages": turns[:1], "user": "alice"},
+            headers=auth,
+        )
+        assert router.affinity["sticky"] == 2
+
+
+@pytest.mark.asyncio
+async def test_unmeasured_nodes_are_only_probed_a_few_times():
+    registry = await _registry(fast=1, stuck=1)
+    router = Router(registry, strategy="latency", exploration=0.0)
+    router.latency.observe("fast", "m", total_ms=100)
+
+    # "stuck" never reports a sample (its calls hang and get cancelled).
+    assert [await _pick(router) for _ in range(5)] == ["stuck"] * 3 + ["fast"] * 2
+
+
+def test_erroring_node_stops_being_preferred(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from ollabridge.core.settings import settings
+
+    monkeypatch.setattr(settings, "API_KEYS", "test-key-abc")
+    monkeypatch.setattr(settings, "AUTH_MODE", "required")
+    monkeypatch.setattr(settings, "ROUTING_STRATEGY", "latency")
+    monkeypatch.setattr(settings, "ROUTING_EXPLORATION", 0.0)
+
+    from ollabridge.api.main import create_app
+
+    app = create_app()
+    with TestClient(app) as client:
+        app.state.provider_router = None
+
+        async def _reset():
+            registry = app.state.obridge.registry
+            for existing in await registry.list():
+                await registry.remove(existing.node_id)
+            for node_id in ("broken", "ok"):
+                await registry.upsert(RuntimeNodeState(node_id=node_id, connector="relay_link"))
+
+        asyncio.run(_reset())
+        app.state.obridge.router.latency.observe("ok", "llama3", total_ms=2000)
+        served: list[str] = []
+
+        async def fake_request(node_id, op, payload, **_):
+            served.append(node_id)
+            if node_id == "broken":
+                return {"ok": False, "error": "model failed to load"}
+            return {"ok": True, "data": {"content": "ok"}}
+
+        monkeypatch.setattr(app.state.relay_hub, "request", fake_request)
+        auth = {"Authorization": "Bearer test-key-abc"}
+        codes = [
+            client.post(
+                "/v1/chat/completions",
+                json={"model": "llama3", "messages": [{"role": "user", "content": f"q{i}"}]},
+                headers=auth,
+            ).status_code
+            for i in range(4)
+        ]
+        assert served == ["broken", "ok", "ok", "ok"]
+        assert codes[1:] == [200] * 3
+
+
+@pytest.mark.asyncio
+async def test_slow_samples_age_out_of_the_policy_latency_budget():
+    now = [0.0]
+    registry = await _registry(a=1)
+    router = Router(registry, latency=LatencyTracker(max_age_s=60, clock=lambda: now[0]))
+    for _ in range(5):
+        router.latency.observe("a", "m", total_ms=900)
+
+    with pytest.raises(RuntimeError):
+        await router.choose_node(model="m", max_latency_ms=500)
+
+    now[0] = 61  # no traffic since: the slow period no longer counts
+    assert (await router.choose_node(model="m", max_latency_ms=500)).node.node_id == "a"
+    router.latency.observe("a", "m", total_ms=200)
+    assert router.latency.p95("a", "m") == 200
+
+
+@pytest.mark.asyncio
+async def test_deadline_estimates_age_out_after_a_slow_period():
+    now = [0.0]
+    registry = await _registry(a=1)
+    router = Router(registry, latency=LatencyTracker(max_age_s=60, clock=lambda: now[0]))
+    router.latency.observe("a", "m", total_ms=5000)
+
+    with pytest.raises(DeadlineExceeded):
+        await router.choose_node(model="m", deadline=Deadline(1.0))
+
+    now[0] = 61
+    assert router.latency.estimate("a", "m") is None
+    decision = await router.choose_node(model="m", deadline=Deadline(1.0))
+    assert decision.node.node_id == "a"
@@ -0,0 +1,168 @@
+"""Semantic response cache: similarity matching, scoping, bounds and persistence."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ollabridge.cache import SemanticCache
+from ollabridge.core.registry import RuntimeNodeState
+from ollabridge.core.settings import settings
+
+AUTH = {"Authorization": "Bearer test-key-abc"}
+
+
+def test_match_above_threshold_within_scope_only():
+    cache = SemanticCache(threshold=0.9)
+    cache.put("llama3", "support", [1.0, 0.0, 0.1], "reset it from settings")
+
+    assert cache.lookup("llama3", "support", [2.0, 0.0, 0.3]) == (
+        "reset it from settings",
+        pytest.approx(0.998, abs=1e-3),
+    )
+    assert cache.lookup("llama3", "support", [0.0, 1.0, 0.0]) is None
+    assert cache.lookup("llama3", "billing", [1.0, 0.0, 0.1]) is None
+    assert cache.lookup("mistral", "support", [1.0, 0.0, 0.1]) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 3, 0.25)
+    assert stats["lookup_us"]["p50"] >= 0
+
+
+def test_lru_bound_spans_scopes_and_answers_expire():
+    now = [0.0]
+    cache = SemanticCache(threshold=0.99, max_entries=2, ttl_s=10, clock=lambda: now[0])
+    cache.put("m", "a", [1.0, 0.0], "first")
+    cache.put("m", "b", [0.0, 1.0], "second")
+    assert cache.lookup("m", "a", [1.0, 0.0]) is not None  # refresh "first"
+    cache.put("m", "a", [0.7, 0.7], "third")
+    assert cache.lookup("m", "b", [0.0, 1.0]) is None
+    assert cache.stats()["evictions"] == 1
+
+    now[0] = 11
+    assert cache.lookup("m", "a", [1.0, 0.0]) is None
+    assert cache.stats()["expired"] == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_index_persists_and_is_invalidated_per_model(tmp_path):
+    first = SemanticCache(disk_dir=tmp_path)
+    first.put("llama3", "s", [1.0, 0.0], "one")
+    first.put("llama3", "s", [0.0, 1.0], "two")
+    first.put("mistral", "s", [1.0, 0.0], "three")
+    first.close()
+
+    second = SemanticCache(disk_dir=tmp_path)
+    assert second.lookup("llama3", "s", [0.0, 1.0]) == ("two", pytest.approx(1.0))
+    assert second.stats()["entries"] == 3
+    assert second.invalidate("llama3") == 2
+    second.put("mistral", "s", [0.0, 1.0], "four")
+    second.close()
+
+    third = SemanticCache(disk_dir=tmp_path)
+    assert third.lookup("llama3", "s", [1.0, 0.0]) is None
+    assert third.lookup("mistral", "s", [1.0, 0.0])[0] == "three"
+    assert third.lookup("mistral", "s", [0.0, 1.0])[0] == "four"
+    third.close()
+
+
+def test_emptied_scopes_are_removed_with_their_directories(tmp_path):
+    now = [0.0]
+    disk = tmp_path / "semantic"
+    cache = SemanticCache(max_entries=2, ttl_s=10, disk_dir=disk, clock=lambda: now[0])
+    for i in range(50):
+        cache.put("m", f"conversation-{i}", [1.0, float(i)], f"answer {i}")
+    assert len(cache._scopes) == 2
+    assert len(list(disk.iterdir())) == 2
+
+    now[0] = 11
+    for i in (48, 49):
+        assert cache.lookup("m", f"conversation-{i}", [1.0, float(i)]) is None
+    assert cache._scopes == {}
+    assert list(disk.iterdir()) == []
+    cache.close()
+
+
+def test_new_embedding_dimension_resets_the_scope():
+    cache = SemanticCache()
+    cache.put("m", "s", [1.0, 0.0], "old")
+    cache.put("m", "s", [1.0, 0.0, 0.0], "new")
+    assert cache.lookup("m", "s", [1.0, 0.0, 0.0])[0] == "new"
+    assert cache.stats()["entries"] == 1
+
+
+VECTORS = {
+    "How do I reset my password?": [1.0, 0.0, 0.05],
+    "how can I reset my password": [1.0, 0.0, 0.1],
+    "What is your refund policy?": [0.0, 1.0, 0.0],
+}
+
+
+@pytest.fixture
+def app_client(monkeypatch):
+    monkeypatch.setattr(settings, "API_KEYS", "test-key-abc")
+    monkeypatch.setattr(settings, "AUTH_MODE", "required")
+    monkeypatch.setattr(settings, "SEMANTIC_CACHE_ENABLED", True)
+
+    from ollabridge.api.main import create_app
+
+    app = create_app()
+    with TestClient(app) as client:
+        app.state.provider_router = None
+
+        async def _reset():
+            for existing in await app.state.obridge.registry.list():
+                await app.state.obridge.registry.remove(existing.node_id)
+            await app.state.obridge.registry.upsert(
+                RuntimeNodeState(node_id="edge", connector="relay_link")
+            )
+
+        asyncio.run(_reset())
+        chats: list[dict] = []
+
+        async def fake_request(node_id, op, payload, **_):
+            if op == "embeddings":
+                return {"ok": True, "data": {"embedding": VECTORS[payload["input"]]}}
+            chats.append(payload)
+            return {"ok": True, "data": {"content": f"answer {len(chats)}"}}
+
+        monkeypatch.setattr(app.state.relay_hub, "request", fake_request)
+        yield app, client, chats
+
+
+def _ask(client, question, system="You are a support bot."):
+    body = {
+        "model": "llama3",
+        "messages": [
+            {"role": "system", "content": system},
+            {"role": "user", "content": question},
+        ],
+    }
+    return client.post("/v1/chat/completions", json=body, headers=AUTH)
+
+
+def test_paraphrase_is_answered_from_the_semantic_cache(app_client):
+    app, client, chats = app_client
+
+    first = _ask(client, "How do I reset my password?")
+    assert first.headers["X-OllaBridge-Cache"] == "miss"
+    para = _ask(client, "how can I reset my password")
+    assert para.headers["X-OllaBridge-Cache"] == "semantic-hit"
+    assert para.json()["choices"][0]["message"]["content"] == "answer 1"
+    assert len(chats) == 1
+
+    from ollabridge.tracing import get_trace_store
+
+    trace = get_trace_store().get(para.headers["X-Request-ID"])
+    assert (trace.cache_hit, trace.provider, trace.latency_ms) == (True, "semantic-cache", 0)
+
+    # A different question, or the same one under another system prompt,
+    # goes upstream.
+    _ask(client, "What is your refund policy?")
+    _ask(client, "how can I reset my password", system="You are a pirate.")
+    assert len(chats) == 3
+
+    stats = client.get("/admin/flow-metrics", headers=AUTH).json()["semantic_cache"]
+    assert (stats["hits"], stats["stores"]) == (1, 3)
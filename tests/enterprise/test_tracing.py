@@ -76,3 +76,56 @@ def test_request_id_shape():
     rec = TraceRecord()
     assert rec.request_id.startswith("req_")
     assert len(rec.request_id) > 20
+
+
+def test_store_uses_wal_and_persists_on_close(tmp_path):
+    store = _store(tmp_path)
+    mode = store._conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode.lower() == "wal"
+    recs = [TraceRecord(requested_model=f"m{i}") for i in range(25)]
+    for rec in recs:
+        store.record(rec)
+    store.close()
+    reopened = TraceStore(store.path)
+    assert len(reopened.list(limit=100)) == 25
+    reopened.close()
+
+
+def test_prune_deletes_in_chunks(tmp_path):
+    store = _store(tmp_path)
+    for i in range(25):
+        store.record(TraceRecord(ts=f"2026-02-{i+1:02d}T00:00:00Z"))
+    assert store.prune(keep=4, chunk=5) == 21
+    kept = [t.ts for t in store.list(limit=100)]
+    assert kept == [f"2026-02-{i:02d}T00:00:00Z" for i in (25, 24, 23, 22)]
+    assert store.stats()["pruned"] == 21
+
+
+def test_scheduled_prune_runs_on_writer_thread(tmp_path):
+    store = TraceStore(
+        tmp_path / "traces.db", retain=5, prune_interval=0.01, flush_interval=0.01
+    )
+    for _ in range(20):
+        store.record(TraceRecord())
+    store.flush()
+    import time
+
+    deadline = time.monotonic() + 2
+    while store.stats()["pruned"] < 15 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert len(store.list(limit=100)) == 5
+    store.close()
+
+
+def test_older_database_gains_new_columns(tmp_path):
+    path = tmp_path / "traces.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE traces (request_id TEXT PRIMARY KEY, ts TEXT NOT NULL)")
+    conn.execute("INSERT INTO traces VALUES ('req_old', '2026-01-01T00:00:00Z')")
+    conn.commit()
+    conn.close()
+
+    store = TraceStore(path)
+    cols = {r[1] for r in sqlite3.connect(path).execute("PRAGMA table_info(traces)")}
+    assert {"hedged", "hedge_won", "cache_hit"} <= cols
+    assert store.get("req_old").hedged is False
@@ -0,0 +1,142 @@
+"""Warm pool: resident-model polling, pool loading and idle eviction."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+from ollabridge.addons.local_catalog.warm_pool import WarmPoolManager, WarmPoolPolicy
+from ollabridge.core.registry import RuntimeNodeState, RuntimeRegistry
+
+GB = 1024**3
+
+
+class FakeHub:
+    """Relay hub whose nodes answer the agent's ``ps`` and ``keep_alive`` ops."""
+
+    def __init__(self, loaded: dict[str, dict[str, int]]) -> None:
+        self.loaded = loaded  # node_id -> {model: size_vram}
+        self.calls: list[tuple[str, str, float]] = []
+
+    async def request(self, node_id, op, payload, **_):
+        models = self.loaded[node_id]
+        if op == "ps":
+            return {
+                "ok": True,
+                "data": {"models": [{"name": m, "size_vram": v} for m, v in models.items()]},
+            }
+        assert op == "keep_alive"
+        self.calls.append((node_id, payload["model"], payload["keep_alive"]))
+        if payload["keep_alive"] == 0:
+            models.pop(payload["model"], None)
+        else:
+            models.setdefault(payload["model"], 4 * GB)
+        return {"ok": True, "data": {}}
+
+
+class FakeCatalog:
+    def list_top(self, node_id):
+        return [SimpleNamespace(external_model_id=m) for m in ("qwen2.5:14b", "llama3:latest", "phi3")]
+
+
+async def _registry(*node_ids: str) -> RuntimeRegistry:
+    registry = RuntimeRegistry()
+    for node_id in node_ids:
+        await registry.upsert(
+            RuntimeNodeState(
+                node_id=node_id,
+                connector="relay_link",
+                meta={"capabilities": ["embed_batch", "resident"]},
+            )
+        )
+    return registry
+
+
+@pytest.mark.asyncio
+async def test_poll_records_resident_models_without_a_pool():
+    registry = await _registry("gpu")
+    await registry.upsert(RuntimeNodeState(node_id="old", connector="relay_link"))
+    hub = FakeHub({"gpu": {"llama3:latest": 5 * GB}})
+    pool = WarmPoolManager(registry, relay_hub=hub, catalog=FakeCatalog)
+
+    await pool.tick()
+    snap = registry.snapshot()
+    assert snap.by_id["gpu"].resident == ["llama3:latest"]
+    assert snap.by_id["old"].resident == []  # agent without the ps op
+    assert hub.calls == []  # pool disabled: nothing loaded or unloaded
+    assert pool.stats()["nodes"] == {
+        "gpu": {"resident": ["llama3:latest"], "vram_bytes": 5 * GB, "pool": False}
+    }
+
+
+@pytest.mark.asyncio
+async def test_pool_loads_top_models_and_refreshes_keep_alive():
+    now = [0.0]
+    registry = await _registry("gpu")
+    hub = FakeHub({"gpu": {"llama3:latest": 5 * GB}})
+    pool = WarmPoolManager(
+        registry,
+        relay_hub=hub,
+        catalog=FakeCatalog,
+        defaults=WarmPoolPolicy(enabled=True, top=2, keep_alive=600, models=("nomic-embed-text",)),
+        clock=lambda: now[0],
+    )
+
+    await pool.tick()
+    assert hub.calls == [
+        ("gpu", "nomic-embed-text", 600),
+        ("gpu", "qwen2.5:14b", 600),
+        ("gpu", "llama3:latest", 600),  # already loaded: keep-alive only
+    ]
+    assert pool.loads == 2
+
+    hub.calls.clear()
+    await pool.tick()
+    assert hub.calls == []
+
+    # A request resets the runtime's keep-alive, so the pool sets it again.
+    now[0] = 10
+    pool.note_use("gpu", "qwen2.5:14b")
+    await pool.tick()
+    assert hub.calls == [("gpu", "qwen2.5:14b", 600)]
+
+    hub.calls.clear()
+    now[0] = 400  # past half the keep-alive
+    await pool.tick()
+    assert len(hub.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_memory_pressure_unloads_idle_models_outside_the_pool():
+    now = [1000.0]
+    registry = await _registry("gpu", "laptop")
+    hub = FakeHub(
+        {
+            "gpu": {"qwen2.5:14b": 10 * GB, "mistral": 6 * GB, "phi3": 3 * GB, "gemma": 4 * GB},
+            "laptop": {"mistral": 6 * GB},
+        }
+    )
+    pool = WarmPoolManager(
+        registry,
+        relay_hub=hub,
+        catalog=FakeCatalog,
+        defaults=WarmPoolPolicy(idle_s=300),
+        overrides={"gpu": {"enabled": True, "top": 1, "vram_budget_gb": 16, "bogus": 1}},
+        clock=lambda: now[0],
+    )
+    assert pool.policy_for("laptop").enabled is False
+
+    pool.note_use("gpu", "mistral")  # oldest use, still idle by now
+    now[0] = 1400
+    pool.note_use("gpu", "gemma")  # recent: kept
+    now[0] = 1500
+    await pool.tick()
+
+    # 23 GB loaded, 16 GB budget: the pool model and the recently used one
+    # stay; the least recently used idle model (phi3, never used) goes first.
+    unloads = [(n, m) for n, m, k in hub.calls if k == 0]
+    assert unloads == [("gpu", "phi3"), ("gpu", "mistral")]
+    assert sorted(hub.loaded["gpu"]) == ["gemma", "qwen2.5:14b"]
+    assert hub.loaded["laptop"] == {"mistral": 6 * GB}  # no pool on this node
+    assert pool.unloads == 2
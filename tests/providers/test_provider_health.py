@@ -0,0 +1,139 @@
+"""Provider circuit breakers and the background health scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+import pytest
+
+from ollabridge.addons.providers.base import BaseProviderAdapter
+from ollabridge.addons.providers.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from ollabridge.addons.providers.errors import ProviderUnavailable
+from ollabridge.addons.providers.health import ProviderHealthScheduler, check_all_health
+from ollabridge.addons.providers.models import AliasCandidate, HealthStatus, ProviderConfig
+from ollabridge.addons.providers.registry import ProviderRegistry
+from ollabridge.addons.providers.router import ProviderRouter
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Adapter(BaseProviderAdapter):
+    requires_credential = False
+
+    def __init__(self, *, fail: bool = False, healthy: bool = True) -> None:
+        super().__init__(base_url="http://test")
+        self.fail = fail
+        self.healthy = healthy
+        self.chats = 0
+        self.probes = 0
+
+    async def chat(self, model: str, messages: list[dict], **kwargs: Any) -> dict:
+        self.chats += 1
+        if self.fail:
+            raise ProviderUnavailable("boom")
+        return {"choices": [{"message": {"content": "ok"}}]}
+
+    async def health_check(self) -> bool:
+        self.probes += 1
+        await asyncio.sleep(0.05)
+        return self.healthy
+
+
+async def _router(**adapters: _Adapter) -> ProviderRouter:
+    reg = ProviderRegistry(failure_threshold=2, cooldown_s=0.05)
+    for pid, adapter in adapters.items():
+        await reg.register(ProviderConfig(id=pid, name=pid, kind="openai_compatible"), adapter)
+        await reg.update_health(pid, HealthStatus.HEALTHY)
+    reg.set_aliases({"alias": [AliasCandidate(provider=pid, model="m") for pid in adapters]})
+    return ProviderRouter(reg)
+
+
+def test_breaker_opens_in_window_and_half_opens_for_one_probe():
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=3, window_s=10, cooldown_s=5, clock=clock)
+
+    for _ in range(2):
+        breaker.record_failure()
+    clock.now += 11  # the first two age out of the window
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.available()
+
+    clock.now += 5
+    assert breaker.state == HALF_OPEN
+    assert breaker.try_acquire() is True
+    assert breaker.try_acquire() is False  # single probe
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    clock.now += 5
+    assert breaker.try_acquire() is True
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.snapshot()["opened_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_router_skips_open_circuit_without_calling_it():
+    bad, good = _Adapter(fail=True), _Adapter()
+    router = await _router(bad=bad, good=good)
+
+    for _ in range(2):
+        await router.route_chat("alias", [])
+    assert bad.chats == 2
+    assert router.registry.get_breaker("bad").state == OPEN
+
+    await router.route_chat("alias", [])
+    assert bad.chats == 2
+    assert [r.provider_id for r in router.resolve("alias")] == ["good"]
+
+    await asyncio.sleep(0.06)  # cooldown over: one request probes "bad"
+    bad.fail = False
+    await router.route_chat("alias", [])
+    assert router.registry.get_breaker("bad").state == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_health_checks_run_concurrently_and_respect_open_circuits():
+    adapters = {f"p{i}": _Adapter() for i in range(4)}
+    router = await _router(**adapters)
+    registry = router.registry
+    for _ in range(2):
+        await registry.record_request("p0", latency_ms=1, success=False)
+
+    started = time.monotonic()
+    statuses = await check_all_health(registry)
+    assert time.monotonic() - started < 0.15  # four 50ms probes, not 200ms
+    assert adapters["p0"].probes == 0  # open circuit, cooling down
+    assert statuses["p1"] == HealthStatus.HEALTHY
+
+    await asyncio.sleep(0.06)
+    await check_all_health(registry)
+    assert adapters["p0"].probes == 1
+    assert registry.get_breaker("p0").state == CLOSED
+    assert registry.get_state("p0").health == HealthStatus.HEALTHY
+
+
+@pytest.mark.asyncio
+async def test_scheduler_probes_periodically_until_stopped():
+    adapter = _Adapter(healthy=False)
+    router = await _router(a=adapter)
+    scheduler = ProviderHealthScheduler(
+        router.registry, interval_s=0, initial_delay_s=0, enabled=True
+    )
+    await scheduler.start()
+    await asyncio.sleep(0.2)
+    await scheduler.stop()
+
+    assert adapter.probes >= 2
+    assert router.registry.get_state("a").health == HealthStatus.DOWN
@@ -0,0 +1,70 @@
+"""ProviderRouter under a request deadline."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from ollabridge.addons.providers.base import BaseProviderAdapter
+from ollabridge.addons.providers.models import HealthStatus, ProviderConfig
+from ollabridge.addons.providers.registry import ProviderRegistry
+from ollabridge.addons.providers.router import ProviderRouter
+from ollabridge.core.deadline import Deadline, DeadlineExceeded
+
+
+class _Adapter(BaseProviderAdapter):
+    requires_credential = False
+
+    def __init__(self, name: str, delay: float = 0.0) -> None:
+        super().__init__(base_url="")
+        self.name = name
+        self.delay = delay
+        self.calls = 0
+
+    async def chat(self, model: str, messages: list[dict], **kwargs: Any) -> dict:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"choices": [{"message": {"content": self.name}}]}
+
+
+async def _router(**delays: float) -> ProviderRouter:
+    reg = ProviderRegistry()
+    for pid, delay in delays.items():
+        await reg.register(
+            ProviderConfig(id=pid, name=pid, kind="openrouter"), _Adapter(pid, delay)
+        )
+        await reg.update_health(pid, HealthStatus.HEALTHY)
+    return ProviderRouter(reg)
+
+
+def _answer(result: dict) -> str:
+    return result["choices"][0]["message"]["content"]
+
+
+@pytest.mark.asyncio
+async def test_candidates_expected_to_miss_the_deadline_are_skipped():
+    router = await _router(slow=0.0, fast=0.0)
+    router.latency.observe("slow", "m", total_ms=10_000)
+    candidates = router.resolve_targets([("slow", "m"), ("fast", "m")])
+
+    result = await router.route_chat("m", [], candidates=candidates, deadline=Deadline(1.0))
+    assert _answer(result) == "fast"
+    assert router.registry.get_adapter("slow").calls == 0
+
+    with pytest.raises(DeadlineExceeded):
+        await router.route_chat("m", [], candidates=candidates[:1], deadline=Deadline(1.0))
+
+
+@pytest.mark.asyncio
+async def test_call_in_flight_is_cancelled_without_penalty_at_the_deadline():
+    router = await _router(hung=5.0)
+    candidates = router.resolve_targets([("hung", "m")])
+
+    with pytest.raises(DeadlineExceeded):
+        await asyncio.wait_for(
+            router.route_chat("m", [], candidates=candidates, deadline=Deadline(0.1)),
+            timeout=2,
+        )
+    assert router.registry.get_state("hung").consecutive_failures == 0
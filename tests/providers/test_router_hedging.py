@@ -0,0 +1,143 @@
+"""ProviderRouter.route_chat: hedged requests and the hedge budget."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from ollabridge.addons.providers.base import BaseProviderAdapter
+from ollabridge.addons.providers.models import (
+    AliasCandidate,
+    HealthStatus,
+    HedgePolicy,
+    HedgingConfig,
+    ProviderConfig,
+)
+from ollabridge.addons.providers.registry import ProviderRegistry
+from ollabridge.addons.providers.router import ProviderRouter
+
+
+class _Adapter(BaseProviderAdapter):
+    requires_credential = False
+
+    def __init__(self, reply: str, delay: float = 0.0) -> None:
+        super().__init__(base_url="http://test")
+        self.reply = reply
+        self.delay = delay
+        self.calls = 0
+        self.cancelled = 0
+
+    async def chat(self, model: str, messages: list[dict], **kwargs: Any) -> dict:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return {"choices": [{"message": {"content": self.reply}}]}
+
+
+async def _router(hedging: HedgingConfig | None, **adapters: _Adapter) -> ProviderRouter:
+    reg = ProviderRegistry()
+    for priority, (pid, adapter) in enumerate(adapters.items()):
+        cfg = ProviderConfig(
+            id=pid, name=pid, kind="openai_compatible", priority=200 - priority
+        )
+        await reg.register(cfg, adapter)
+        await reg.update_health(pid, HealthStatus.HEALTHY)
+    reg.set_aliases(
+        {"test-alias": [AliasCandidate(provider=pid, model="m") for pid in adapters]}
+    )
+    if hedging is not None:
+        reg.set_hedging(hedging)
+    return ProviderRouter(reg)
+
+
+def _hedge(budget: float = 1.0, **policy: Any) -> HedgingConfig:
+    return HedgingConfig(
+        budget=budget, aliases={"test-alias": HedgePolicy(min_delay_ms=0, **policy)}
+    )
+
+
+def _content(result: dict) -> str:
+    return result["choices"][0]["message"]["content"]
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_the_loser_cancelled():
+    slow, fast = _Adapter("slow", delay=5), _Adapter("fast", delay=0.01)
+    router = await _router(_hedge(delay_ms=20), a=slow, b=fast)
+
+    attribution: dict = {}
+    result = await router.route_chat("test-alias", [], attribution=attribution)
+
+    assert _content(result) == "fast"
+    assert attribution == {"provider": "b", "model": "m", "hedged": True, "hedge_won": True}
+    assert slow.cancelled == 1
+    assert router.registry.get_state("a").consecutive_failures == 0
+    assert router.hedge_budgets["test-alias"].stats()["hedge_wins"] == 1
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_never_hedges():
+    primary, backup = _Adapter("a", delay=0.0), _Adapter("b")
+    router = await _router(_hedge(delay_ms=200), a=primary, b=backup)
+
+    attribution: dict = {}
+    assert _content(await router.route_chat("test-alias", [], attribution=attribution)) == "a"
+    assert attribution["hedged"] is False
+    assert backup.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_budget_caps_hedges_and_unlisted_aliases_do_not_hedge():
+    slow, fast = _Adapter("slow", delay=0.05), _Adapter("fast")
+    router = await _router(_hedge(budget=0.0, delay_ms=1), a=slow, b=fast)
+
+    # The bucket starts with one token; with no budget it never refills.
+    assert _content(await router.route_chat("test-alias", [])) == "fast"
+    await router.registry.record_request("a", latency_ms=1)  # keep "a" ranked first
+    assert _content(await router.route_chat("test-alias", [])) == "slow"
+    assert fast.calls == 1
+    assert router.hedge_budgets["test-alias"].stats()["hedges"] == 1
+
+    plain = await _router(None, a=_Adapter("slow", delay=0.05), b=_Adapter("fast"))
+    assert _content(await plain.route_chat("test-alias", [])) == "slow"
+
+
+@pytest.mark.asyncio
+async def test_each_alias_spends_its_own_budget():
+    slow, fast = _Adapter("slow", delay=0.05), _Adapter("fast")
+    router = await _router(_hedge(budget=0.0, delay_ms=1), a=slow, b=fast)
+    aliases = router.registry.aliases
+    router.registry.set_aliases({**aliases, "other": aliases["test-alias"]})
+    router.registry.set_hedging(
+        HedgingConfig(
+            budget=0.0,
+            aliases={
+                name: HedgePolicy(min_delay_ms=0, delay_ms=1) for name in ("test-alias", "other")
+            },
+        )
+    )
+
+    assert _content(await router.route_chat("test-alias", [])) == "fast"
+    await router.registry.record_request("a", latency_ms=1)
+    assert _content(await router.route_chat("other", [])) == "fast"
+    assert {alias: s["hedges"] for alias, s in router.hedge_stats().items()} == {
+        "other": 1,
+        "test-alias": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_hedge_delay_follows_observed_p95():
+    router = await _router(_hedge(default_delay_ms=750), a=_Adapter("a"))
+    route = router.resolve("test-alias")[0]
+    policy = router.registry.hedge_policy("test-alias")
+
+    assert router._hedge_delay(policy, route) == 0.75
+    for ms in (100, 120, 400):
+        router.latency.observe("a", "m", total_ms=ms)
+    assert router._hedge_delay(policy, route) == 0.4
@@ -0,0 +1,94 @@
+"""ProviderRouter.resolve: versioned candidate cache and incremental scoring."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from ollabridge.addons.providers import router as router_mod
+from ollabridge.addons.providers.base import BaseProviderAdapter
+from ollabridge.addons.providers.models import AliasCandidate, HealthStatus, ProviderConfig
+from ollabridge.addons.providers.registry import ProviderRegistry
+from ollabridge.addons.providers.router import ProviderRouter
+
+
+class _Adapter(BaseProviderAdapter):
+    requires_credential = False
+
+    async def chat(self, model: str, messages: list[dict], **kwargs: Any) -> dict:
+        return {"choices": [{"message": {"content": model}}]}
+
+
+async def _router() -> ProviderRouter:
+    reg = ProviderRegistry()
+    for pid in ("a", "b"):
+        await reg.register(
+            ProviderConfig(id=pid, name=pid, kind="openrouter"), _Adapter(base_url="")
+        )
+        await reg.update_health(pid, HealthStatus.HEALTHY)
+    reg.set_aliases({"alias": [AliasCandidate(provider="a", model="m1")]})
+    return ProviderRouter(reg)
+
+
+@pytest.fixture
+def scored(monkeypatch) -> list[str]:
+    calls: list[str] = []
+    real = router_mod.compute_score
+
+    def _counting(config, state):
+        calls.append(config.id)
+        return real(config, state)
+
+    monkeypatch.setattr(router_mod, "compute_score", _counting)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_resolution_is_cached_and_only_changed_providers_rescored(scored):
+    router = await _router()
+    ids = lambda: [r.provider_id for r in router.resolve("vendor/model")]  # noqa: E731
+
+    assert sorted(ids()) == ["a", "b"]
+    assert sorted(ids()) == ["a", "b"]
+    assert sorted(scored) == ["a", "b"]
+
+    await router.registry.record_request("b", latency_ms=50)
+    ids()
+    assert sorted(scored) == ["a", "b", "b"]
+
+
+@pytest.mark.asyncio
+async def test_toggle_alias_reload_and_health_invalidate():
+    router = await _router()
+    registry = router.registry
+    version = registry.version
+
+    assert [r.model for r in router.resolve("alias")] == ["m1"]
+    registry.set_aliases({"alias": [AliasCandidate(provider="b", model="m2")]})
+    assert [(r.provider_id, r.model) for r in router.resolve("alias")] == [("b", "m2")]
+
+    assert registry.set_enabled("b", False) is True
+    assert router.resolve("alias") == []
+    registry.set_enabled("b", True)
+
+    await registry.update_health("b", HealthStatus.DOWN)
+    assert router.resolve("alias") == []
+    assert registry.version == version + 4
+
+    # A heartbeat-style update that keeps the health does not bump the version.
+    await registry.update_health("b", HealthStatus.DOWN)
+    assert registry.version == version + 4
+
+
+@pytest.mark.asyncio
+async def test_route_chat_reuses_the_callers_resolution(monkeypatch):
+    router = await _router()
+    candidates = router.resolve("alias")
+
+    def _fail(_):
+        raise AssertionError("resolved twice")
+
+    monkeypatch.setattr(router, "resolve", _fail)
+    result = await router.route_chat("alias", [], candidates=candidates)
+    assert result["choices"][0]["message"]["content"] == "m1"
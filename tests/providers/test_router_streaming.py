@@ -0,0 +1,79 @@
+"""ProviderRouter.route_chat_stream: failover before the first fragment only."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from ollabridge.addons.providers.base import BaseProviderAdapter
+from ollabridge.addons.providers.errors import ProviderUnavailable
+from ollabridge.addons.providers.models import AliasCandidate, HealthStatus, ProviderConfig
+from ollabridge.addons.providers.registry import ProviderRegistry
+from ollabridge.addons.providers.router import ProviderRouter
+
+
+class _Adapter(BaseProviderAdapter):
+    requires_credential = False
+
+    def __init__(self, pieces: list[str], fail_at: int | None = None) -> None:
+        super().__init__(base_url="http://test")
+        self.pieces = pieces
+        self.fail_at = fail_at
+
+    async def chat(self, model: str, messages: list[dict], **kwargs: Any) -> dict:
+        return {"choices": [{"message": {"content": "".join(self.pieces)}}]}
+
+    async def chat_stream(self, model, messages, **kwargs):
+        for i, piece in enumerate(self.pieces):
+            if self.fail_at == i:
+                raise ProviderUnavailable("boom")
+            yield piece
+
+
+async def _router(**adapters: _Adapter) -> ProviderRouter:
+    reg = ProviderRegistry()
+    for pid, adapter in adapters.items():
+        cfg = ProviderConfig(id=pid, name=pid, kind="openai_compatible", priority=100)
+        await reg.register(cfg, adapter)
+        await reg.update_health(pid, HealthStatus.HEALTHY)
+    reg.set_aliases(
+        {"test-alias": [AliasCandidate(provider=pid, model="m") for pid in adapters]}
+    )
+    return ProviderRouter(reg)
+
+
+async def _collect(stream) -> list[str]:
+    return [chunk async for chunk in stream]
+
+
+@pytest.mark.asyncio
+async def test_stream_fails_over_before_first_fragment():
+    router = await _router(
+        a=_Adapter(["never"], fail_at=0), b=_Adapter(["he", "llo"])
+    )
+    chunks = await _collect(router.route_chat_stream("test-alias", []))
+    assert chunks == ["he", "llo"]
+    assert router.registry.get_state("a").consecutive_failures == 1
+    assert router.registry.get_state("b").request_count == 1
+    assert router.latency.p95("b", "m") is not None  # feeds deadlines and hedging
+    assert router.latency.p95("a", "m") is None
+
+
+@pytest.mark.asyncio
+async def test_stream_error_after_first_fragment_propagates():
+    router = await _router(a=_Adapter(["he", "llo"], fail_at=1), b=_Adapter(["x"]))
+    got: list[str] = []
+    with pytest.raises(ProviderUnavailable):
+        async for chunk in router.route_chat_stream("test-alias", []):
+            got.append(chunk)
+    assert got == ["he"]
+    assert router.registry.get_state("b").request_count == 0
+    assert router.latency.p95("a", "m") is None  # broken streams are not samples
+
+
+@pytest.mark.asyncio
+async def test_default_chat_stream_falls_back_to_buffered_chat():
+    adapter = _Adapter(["whole reply"])
+    chunks = await _collect(BaseProviderAdapter.chat_stream(adapter, "m", []))
+    assert chunks == ["whole reply"]